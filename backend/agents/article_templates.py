@@ -0,0 +1,152 @@
+"""
+Compiled Article Templates
+模板文章的编译渲染
+
+模板只编译一次，得到"静态文本片段 + 类型化槽位"的渲染计划。渲染时先按槽位顺序
+生成一个取值向量，再把取值向量和静态片段拼接成文章，不再逐次解析 f-string。
+
+槽位语法：
+    {home_team}                     上下文取值，支持属性和下标：{expert.key_metrics[0]}
+    {randint:65,75}                 等价于 random.randint(65, 75)
+    {uniform:2.10,2.40:2}           等价于 round(random.uniform(2.10, 2.40), 2)
+    {choice:4-3-3|4-2-3-1|3-5-2}    等价于 random.choice([...])
+    {pick:expert.opening_templates} 等价于 random.choice(上下文中的序列)
+
+随机槽位按在模板中出现的顺序抽取，与原 f-string 从左到右求值的抽取顺序一致，
+因此同一随机种子下输出与原实现逐字相同。
+"""
+
+import re
+import random
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# random 模块级函数都绑定在同一个隐藏实例上
+_GLOBAL_RNG: random.Random = random.randint.__self__
+
+_SLOT_RE = re.compile(r"\{([^{}]+)\}")
+_PATH_RE = re.compile(r"^([A-Za-z_]\w*)((?:\.[A-Za-z_]\w*)*)(?:\[(\d+)\])?$")
+
+# randint 槽位取值范围不超过该宽度时，预先生成字符串表
+_INT_TABLE_MAX_WIDTH = 1000
+
+
+class TemplateSyntaxError(ValueError):
+    """模板槽位无法解析"""
+
+
+def _path_expr(path: str) -> str:
+    """把 "expert.key_metrics[0]" 翻译为取值表达式"""
+    match = _PATH_RE.match(path.strip())
+    if not match:
+        raise TemplateSyntaxError(f"Invalid template slot: {{{path}}}")
+    root, attrs, index = match.groups()
+    expr = f"ctx[{root!r}]{attrs}"
+    return expr if index is None else f"{expr}[{index}]"
+
+
+def _slot_expr(spec: str, index: int, constants: Dict[str, Any]) -> str:
+    """
+    把单个槽位翻译为表达式（结果为字符串）
+
+    随机槽位直接调用 randbelow / random，抽取方式与 randint、choice、uniform 的内部实现一致。
+    """
+    kind, _, args = spec.partition(":")
+    kind = kind.strip()
+
+    if kind == "randint" and args:
+        low, high = (int(x) for x in args.split(","))
+        width = high - low + 1
+        if width <= _INT_TABLE_MAX_WIDTH:
+            constants[f"_t{index}"] = tuple(str(low + i) for i in range(width))
+            return f"_t{index}[rb({width})]"
+        return f"str({low} + rb({width}))"
+
+    if kind == "uniform" and args:
+        bounds, _, digits = args.partition(":")
+        low, high = (float(x) for x in bounds.split(","))
+        constants[f"_lo{index}"], constants[f"_sp{index}"] = low, high - low
+        value = f"_lo{index} + _sp{index} * rnd()"
+        return f"str(round({value}, {int(digits)}))" if digits else f"str({value})"
+
+    if kind == "choice" and args:
+        options = tuple(args.split("|"))
+        constants[f"_t{index}"] = options
+        return f"_t{index}[rb({len(options)})]"
+
+    if kind == "pick" and args:
+        return f"str((_s := {_path_expr(args)})[rb(len(_s))])"
+
+    return f"str({_path_expr(spec)})"
+
+
+class CompiledTemplate:
+    """
+    编译后的模板渲染计划
+
+    - 静态文本片段在编译时切好
+    - 全部槽位编译成一个取值函数，一次调用生成整篇文章的取值向量
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        parts: List[str] = []
+        positions: List[int] = []
+        exprs: List[str] = []
+        constants: Dict[str, Any] = {}
+        last = 0
+        for match in _SLOT_RE.finditer(source):
+            parts.append(source[last:match.start()])
+            positions.append(len(parts))
+            parts.append("")
+            exprs.append(_slot_expr(match.group(1), len(exprs), constants))
+            last = match.end()
+        parts.append(source[last:])
+
+        code = "def _draw(ctx, rb, rnd):\n    return [\n        " + ",\n        ".join(exprs) + "\n    ]\n"
+        namespace = dict(constants)
+        exec(compile(code, "<article template>", "exec"), namespace)
+
+        self._draw: Callable[[Dict[str, Any], Callable[[int], int], Callable[[], float]], List[str]] = namespace["_draw"]
+        self._parts: Tuple[str, ...] = tuple(parts)
+        self._positions: Tuple[int, ...] = tuple(positions)
+
+    @property
+    def slot_count(self) -> int:
+        return len(self._positions)
+
+    def draw(self, context: Dict[str, Any], rng: Optional[random.Random] = None) -> List[str]:
+        """按槽位顺序生成取值向量（随机槽位在这里统一抽取）"""
+        rng = rng or _GLOBAL_RNG
+        return self._draw(context, rng._randbelow, rng.random)
+
+    def fill(self, values: Sequence[str]) -> str:
+        """把取值向量填入静态片段"""
+        parts = list(self._parts)
+        for position, value in zip(self._positions, values):
+            parts[position] = value
+        return "".join(parts)
+
+    def render(self, context: Dict[str, Any], rng: Optional[random.Random] = None) -> str:
+        """抽取并渲染"""
+        return self.fill(self.draw(context, rng))
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    """编译模板"""
+    return CompiledTemplate(source)
+
+
+def article_seed(fixture_id: Any, expert_key: str, data_version: str = "") -> int:
+    """由 (比赛, 专家, 数据版本) 得到稳定的随机种子（跨进程一致，不受 PYTHONHASHSEED 影响）"""
+    digest = hashlib.sha256(f"{fixture_id}:{expert_key}:{data_version}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def seeded_rng(fixture_id: Any, expert_key: str, data_version: str = "") -> random.Random:
+    """
+    文章生成用的独立随机数生成器
+
+    同一比赛、专家和数据版本总是生成同一篇文章，便于缓存和 ETag；数据更新时换 data_version 即可。
+    """
+    return random.Random(article_seed(fixture_id, expert_key, data_version))
@@ -3,11 +3,46 @@
 生成1000-1500字的详细分析文章
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, MutableMapping, Optional, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import json
+import os
 import random
+import sys
+
+try:
+    from agents.lazy_prediction import LazyPrediction
+    from services.article_cache import ArticleCache, MISS, fingerprint, get_article_cache
+    from services.score_model import ScoreModel, rates_from_form
+except ImportError:
+    # 在 agents 目录下直接运行时 backend 目录不在 sys.path 中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lazy_prediction import LazyPrediction
+    from services.article_cache import ArticleCache, MISS, fingerprint, get_article_cache
+    from services.score_model import ScoreModel, rates_from_form
+
+# 文章结构或措辞变化时递增，旧版本缓存的文章随之失效
+WRITER_VERSION = "enhanced-2"
+
+# 各章节依赖的输入，只有这些输入变化时才重新生成该章节：
+#   teams        比赛和球队信息（不含伤停）
+#   injuries     双方关键球员状态
+#   odds         赔率和盘口
+#   history      历史交锋
+#   confidence   专家置信度
+#   api          第三方 API 预测
+# 比分模型的参数版本只影响预测比分（文章头部），计入整篇文章的指纹
+SECTION_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "比赛背景": ("teams",),
+    "球队近况": ("teams",),
+    "历史交锋": ("teams", "history"),
+    "伤停情况": ("teams", "injuries"),
+    "战术分析": ("teams",),
+    "关键对位": ("teams",),
+    "赔率解读": ("teams", "odds"),
+    "综合预测": ("teams", "history", "odds", "api", "confidence"),
+}
 
 @dataclass
 class TeamInfo:
@@ -60,7 +95,16 @@ class EnhancedFootballWriter:
     目标：生成1000-1500字的详细分析文章
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ArticleCache] = None, score_model: Optional[ScoreModel] = None):
+        """
+        Args:
+            cache: 文章缓存，默认使用进程共享的缓存（ARTICLE_CACHE_ENABLED=false 时不缓存）
+            score_model: 比分模型，默认为未拟合的模型（按双方近期进失球估算）
+        """
+        self.cache = cache if cache is not None else get_article_cache()
+        self.score_model = score_model or ScoreModel()
+        self.sections_rendered = 0
+        self.sections_reused = 0
         self.sections = [
             "比赛背景",
             "球队近况",
@@ -78,13 +122,181 @@ class EnhancedFootballWriter:
         odds_info: OddsInfo,
         historical_data: HistoricalData,
         expert_confidence: int = 80,
-        api_predictions: Optional[Dict] = None
-    ) -> Dict[str, Any]:
+        api_predictions: Optional[Dict] = None,
+        fixture_id: Optional[int] = None,
+        expert: str = "default"
+    ) -> MutableMapping[str, Any]:
         """
         生成完整的比赛预测（1000-1500字）
+
+        输入（含赔率和伤停快照）不变时直接返回缓存的文章；传入 fixture_id 时
+        同一场比赛每位专家（expert，专家 key）只保留最新快照的文章，也可以按比赛整体失效。
+        未命中缓存时返回 LazyPrediction：章节和完整文章在第一次读取时才生成并写入缓存，
+        只读标题、推荐、比分的调用方不需要生成正文。
+        """
+        if self.cache is None:
+            return self._lazy_prediction(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+
+        fp, expert, inputs = self._cache_slot(
+            match_info, odds_info, historical_data, expert_confidence, api_predictions, expert
+        )
+        prediction = self.cache.get(WRITER_VERSION, expert, fp, fixture_id)
+        if prediction is MISS:
+            prediction = self._lazy_prediction(
+                match_info, odds_info, historical_data, expert_confidence, api_predictions,
+                fixture_id, inputs, (fp, expert)
+            )
+        return prediction
+
+    def update_prediction(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int = 80,
+        api_predictions: Optional[Dict] = None,
+        fixture_id: Optional[int] = None,
+        expert: str = "default"
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        按最新快照刷新文章，返回 (文章, 重新生成的章节名)
+
+        只有依赖的输入（见 SECTION_INPUTS）变化过的章节会重新生成，其余章节直接复用，
+        再拼接成新的 full_article。例如开赛前赔率变动只会重写「赔率解读」和「综合预测」。
+        """
+        rendered: List[str] = []
+        if self.cache is None:
+            prediction = self._build_prediction(
+                match_info, odds_info, historical_data, expert_confidence, api_predictions, rendered=rendered
+            )
+            return prediction, rendered
+
+        fp, expert, inputs = self._cache_slot(
+            match_info, odds_info, historical_data, expert_confidence, api_predictions, expert
+        )
+        prediction = self._build_prediction(
+            match_info, odds_info, historical_data, expert_confidence, api_predictions, fixture_id, inputs, rendered
+        )
+        self.cache.set(WRITER_VERSION, expert, fp, prediction, fixture_id)
+        return prediction, rendered
+
+    def stream_prediction(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int = 80,
+        api_predictions: Optional[Dict] = None,
+        fixture_id: Optional[int] = None,
+        expert: str = "default"
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        逐章节生成文章，每完成一个章节就产出 (章节名, 文本)
+
+        全部文本依次拼接后与 generate_prediction 的 full_article 相同；生成完毕后写入缓存，
+        缓存命中时直接按章节回放。
         """
+        inputs = None
+        if self.cache is not None:
+            fp, expert, inputs = self._cache_slot(
+                match_info, odds_info, historical_data, expert_confidence, api_predictions, expert
+            )
+            cached = self.cache.get(WRITER_VERSION, expert, fp, fixture_id)
+            if cached is not MISS:
+                yield from self._article_parts(cached)
+                return
+
+        prediction = self._prediction_header(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        yield "标题", self._article_head(prediction)
+        for name, text in self._render_sections(
+            match_info, odds_info, historical_data, expert_confidence, api_predictions, fixture_id, inputs
+        ):
+            prediction["sections"][name] = text
+            yield name, self._article_section(text)
+        yield "最终预测", self._article_tail(prediction)
+
+        prediction["full_article"] = self._compile_full_article(prediction)
+        if self.cache is not None:
+            self.cache.set(WRITER_VERSION, expert, fp, prediction, fixture_id)
+
+    def _cache_slot(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict],
+        expert: str
+    ) -> Tuple[str, str, Dict[str, str]]:
+        """缓存用的 (文章指纹, 槽位名, 各输入的指纹)；槽位名即专家，文章指纹由各输入的指纹合成"""
+        inputs = self._input_fingerprints(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        return fingerprint(inputs), expert, inputs
+
+    def _lazy_prediction(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict],
+        fixture_id: Optional[int] = None,
+        inputs: Optional[Dict[str, str]] = None,
+        slot: Optional[Tuple[str, str]] = None
+    ) -> LazyPrediction:
+        """头部字段立即生成，正文首次读取时生成；slot 为 (文章指纹, 槽位名) 时生成后写入缓存"""
+        header = self._prediction_header(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        del header["sections"]
+
+        def render() -> Dict[str, Any]:
+            prediction = self._build_prediction(
+                match_info, odds_info, historical_data, expert_confidence, api_predictions,
+                fixture_id, inputs, header=header
+            )
+            if slot is not None:
+                self.cache.set(WRITER_VERSION, slot[1], slot[0], prediction, fixture_id)
+            return prediction
+
+        return LazyPrediction(header, render)
+
+    def _build_prediction(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict],
+        fixture_id: Optional[int] = None,
+        inputs: Optional[Dict[str, str]] = None,
+        rendered: Optional[List[str]] = None,
+        header: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """逐章节生成文章（输入未变的章节复用缓存，rendered 收集重新生成的章节名）"""
+        if header is None:
+            prediction = self._prediction_header(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        else:
+            prediction = {**header, "sections": {}}
+        
+        # 生成各个分析章节（扩展版）
+        for name, text in self._render_sections(
+            match_info, odds_info, historical_data, expert_confidence, api_predictions, fixture_id, inputs, rendered
+        ):
+            prediction["sections"][name] = text
         
-        prediction = {
+        # 生成完整文章
+        prediction["full_article"] = self._compile_full_article(prediction)
+        
+        return prediction
+
+    def _prediction_header(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """标题、摘要、推荐和比分（章节待填充）"""
+        return {
             "title": self._generate_title(match_info),
             "confidence": expert_confidence,
             "summary": self._generate_summary(match_info, odds_info),
@@ -92,23 +304,91 @@ class EnhancedFootballWriter:
             "recommendation": self._generate_recommendation(match_info, odds_info, expert_confidence),
             "predicted_score": self._predict_score(match_info, historical_data, api_predictions)
         }
-        
-        # 生成各个分析章节（扩展版）
-        prediction["sections"]["比赛背景"] = self._analyze_match_background(match_info)
-        prediction["sections"]["球队近况"] = self._analyze_team_form(match_info)
-        prediction["sections"]["历史交锋"] = self._analyze_h2h_detailed(historical_data, match_info)
-        prediction["sections"]["伤停情况"] = self._analyze_injuries_detailed(match_info)
-        prediction["sections"]["战术分析"] = self._analyze_tactics(match_info)
-        prediction["sections"]["关键对位"] = self._analyze_key_matchups(match_info)
-        prediction["sections"]["赔率解读"] = self._analyze_odds_detailed(odds_info, match_info)
-        prediction["sections"]["综合预测"] = self._comprehensive_prediction(
-            match_info, historical_data, odds_info, api_predictions, expert_confidence
-        )
-        
-        # 生成完整文章
-        prediction["full_article"] = self._compile_full_article(prediction)
-        
-        return prediction
+
+    def _render_sections(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict],
+        fixture_id: Optional[int] = None,
+        inputs: Optional[Dict[str, str]] = None,
+        rendered: Optional[List[str]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        按文章顺序产出 (章节名, 文本)
+
+        章节按其依赖输入的指纹缓存：传入 fixture_id 时每场比赛的每个章节只保留最新版本，
+        输入变化的章节重新生成并替换旧版本。inputs 为已算好的各输入指纹。
+        """
+        builders = self._section_builders(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        if self.cache is None:
+            for name, build in builders:
+                self.sections_rendered += 1
+                if rendered is not None:
+                    rendered.append(name)
+                yield name, build()
+            return
+
+        if inputs is None:
+            inputs = self._input_fingerprints(match_info, odds_info, historical_data, expert_confidence, api_predictions)
+        namespace = f"{WRITER_VERSION}:section"
+        for name, build in builders:
+            fp = fingerprint([inputs[key] for key in SECTION_INPUTS[name]])
+            text = self.cache.get(namespace, name, fp, fixture_id)
+            if text is MISS:
+                text = build()
+                self.cache.set(namespace, name, fp, text, fixture_id)
+                self.sections_rendered += 1
+                if rendered is not None:
+                    rendered.append(name)
+            else:
+                self.sections_reused += 1
+            yield name, text
+
+    def _input_fingerprints(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict]
+    ) -> Dict[str, str]:
+        """SECTION_INPUTS 中各输入的指纹（每次生成只计算一次）"""
+        teams = asdict(match_info)
+        injuries = [teams[side].pop("key_players_status") for side in ("home_team", "away_team")]
+        return {
+            "teams": fingerprint(teams),
+            "injuries": fingerprint(injuries),
+            "odds": fingerprint(odds_info),
+            "history": fingerprint(historical_data),
+            "confidence": fingerprint(expert_confidence),
+            "api": fingerprint(api_predictions),
+            "model": self.score_model.version,
+        }
+
+    def _section_builders(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_confidence: int,
+        api_predictions: Optional[Dict]
+    ) -> List[Tuple[str, Callable[[], str]]]:
+        """按文章顺序排列的 (章节名, 生成函数)"""
+        return [
+            ("比赛背景", lambda: self._analyze_match_background(match_info)),
+            ("球队近况", lambda: self._analyze_team_form(match_info)),
+            ("历史交锋", lambda: self._analyze_h2h_detailed(historical_data, match_info)),
+            ("伤停情况", lambda: self._analyze_injuries_detailed(match_info)),
+            ("战术分析", lambda: self._analyze_tactics(match_info)),
+            ("关键对位", lambda: self._analyze_key_matchups(match_info)),
+            ("赔率解读", lambda: self._analyze_odds_detailed(odds_info, match_info)),
+            ("综合预测", lambda: self._comprehensive_prediction(
+                match_info, historical_data, odds_info, api_predictions, expert_confidence
+            )),
+        ]
     
     def _generate_title(self, match_info: MatchInfo) -> str:
         """生成标题"""
@@ -294,17 +574,13 @@ class EnhancedFootballWriter:
         historical_data: HistoricalData, 
         api_predictions: Optional[Dict]
     ) -> str:
-        """预测具体比分"""
-        # 基于各种因素综合预测
-        home_strength = match_info.home_team.league_position
-        away_strength = match_info.away_team.league_position
-        
-        if home_strength < away_strength - 3:
-            return "2-0 或 2-1"
-        elif home_strength < away_strength:
-            return "2-1 或 1-0"
-        else:
-            return "1-1 或 2-1"
+        """预测具体比分（比分模型中概率最高的两个比分）"""
+        home, away = match_info.home_team, match_info.away_team
+        form = {
+            team.name: rates_from_form(team.recent_form, team.goals_scored, team.goals_conceded)
+            for team in (home, away)
+        }
+        return " 或 ".join(self.score_model.predict(home.name, away.name, form).most_likely(2))
     
     def _generate_recommendation(
         self,
@@ -367,17 +643,29 @@ class EnhancedFootballWriter:
     
     def _compile_full_article(self, prediction: Dict) -> str:
         """编译完整文章"""
-        article = f"""【{prediction['title']}】
+        return "".join(text for _, text in self._article_parts(prediction))
+    
+    def _article_parts(self, prediction: Dict) -> Iterator[Tuple[str, str]]:
+        """按顺序产出完整文章的各个部分 (章节名, 文本)"""
+        yield "标题", self._article_head(prediction)
+        for section_name, section_content in prediction['sections'].items():
+            yield section_name, self._article_section(section_content)
+        yield "最终预测", self._article_tail(prediction)
+    
+    def _article_head(self, prediction: Dict) -> str:
+        return f"""【{prediction['title']}】
 
 {prediction['summary']}
 
 {'='*50}
 
 """
-        for section_name, section_content in prediction['sections'].items():
-            article += f"{section_content}\n\n"
-            
-        article += f"""
+    
+    def _article_section(self, section_content: str) -> str:
+        return f"{section_content}\n\n"
+    
+    def _article_tail(self, prediction: Dict) -> str:
+        return f"""
 {'='*50}
 
 【最终预测】
@@ -388,7 +676,6 @@ class EnhancedFootballWriter:
 
 免责声明：以上分析仅供参考，投注有风险，请理性对待。
 """
-        return article
 
 
 # 使用示例
@@ -0,0 +1,457 @@
+"""
+两阶段专家文章生成
+
+以前每位专家的文章都是一次独立的完整生成，十位专家就要把同一场比赛的近况、
+交锋、赔率、伤停重复分析十遍。这里拆成两个阶段：
+
+1. 比赛分析（每场比赛一次）：由模板写作器或 Claude 生成结构化的 FixtureAnalysis，
+   按主题（背景、近况、交锋、伤停、战术、对位、赔率、预测）存放分析文本和结论
+2. 专家改写（每位专家一次）：按专家的 WritingStyle、signature_phrases、
+   analysis_priorities 从分析结果渲染文章——模板渲染不调用 API；
+   Claude 改写只需一次短调用，分析结果作为带缓存标记的共享前缀
+
+比赛分析按输入快照缓存在文章缓存中，快照不变时第二阶段可以直接复用。
+"""
+
+import re
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.article_cache import ArticleCache, MISS, fingerprint, get_article_cache
+from app.core.model_router import TASK_ARTICLE
+
+try:
+    from agents.article_templates import seeded_rng
+    from agents.enhanced_football_writer import EnhancedFootballWriter, MatchInfo, OddsInfo, HistoricalData
+    from agents.prediction_experts import (
+        ExpertProfile, ExpertiseArea, ExpertRegistry, WritingStyle, get_expert_registry, prediction_experts
+    )
+except ImportError:
+    from article_templates import seeded_rng
+    from enhanced_football_writer import EnhancedFootballWriter, MatchInfo, OddsInfo, HistoricalData
+    from prediction_experts import (
+        ExpertProfile, ExpertiseArea, ExpertRegistry, WritingStyle, get_expert_registry, prediction_experts
+    )
+
+logger = logging.getLogger(__name__)
+
+# 分析结构或提示词变化时递增，旧的缓存随之失效
+ANALYSIS_VERSION = "fixture-analysis-1"
+
+# 主题键 -> 章节标题（顺序即默认的文章顺序）
+ANALYSIS_TOPICS: Dict[str, str] = {
+    "background": "比赛背景",
+    "form": "球队近况",
+    "h2h": "历史交锋",
+    "injuries": "伤停情况",
+    "tactics": "战术分析",
+    "matchups": "关键对位",
+    "odds": "赔率解读",
+    "prediction": "综合预测",
+}
+
+# 模板写作器的章节名 -> 主题键
+_WRITER_SECTIONS = {title: topic for topic, title in ANALYSIS_TOPICS.items()}
+
+# 各专长最关注的主题，决定专家文章的章节顺序和重点
+EXPERTISE_TOPICS: Dict[ExpertiseArea, Tuple[str, ...]] = {
+    ExpertiseArea.STATISTICS: ("form", "odds"),
+    ExpertiseArea.TACTICS: ("tactics", "matchups"),
+    ExpertiseArea.HISTORICAL: ("h2h",),
+    ExpertiseArea.INJURIES: ("injuries",),
+    ExpertiseArea.ASIAN_HANDICAP: ("odds",),
+    ExpertiseArea.GOALS: ("form", "h2h"),
+    ExpertiseArea.HOME_AWAY: ("form", "background"),
+    ExpertiseArea.CONDITIONS: ("background",),
+    ExpertiseArea.PSYCHOLOGY: ("background", "form"),
+    ExpertiseArea.VALUE_BETTING: ("odds",),
+}
+
+# 简洁型和谨慎型专家只写重点主题
+FOCUSED_STYLES = frozenset({WritingStyle.MINIMALIST, WritingStyle.CAUTIOUS})
+
+# 写作器章节开头的编号标题，如 "一、比赛背景"
+_NUMBERED_HEADING = re.compile(r"^[一二三四五六七八九十]+、[^\n]*\n+")
+
+ANALYSIS_MAX_TOKENS = 2500
+STYLIZE_MAX_TOKENS = 1500
+
+ANALYSIS_SYSTEM_PROMPT = """你是资深足球数据分析师，只陈述事实和推理，不带个人风格。
+请始终使用中文，并严格按要求的 JSON 格式回复。"""
+
+STYLIZE_SYSTEM_PROMPT = """你是足球预测专栏的编辑，负责把同一份比赛分析改写成不同专家的专栏文章。
+分析中的事实、数据和结论必须保持一致，只改变写法、侧重点和语气。请始终使用中文。"""
+
+
+@dataclass
+class FixtureAnalysis:
+    """一场比赛的结构化分析，所有专家共用"""
+    fixture_id: Optional[int]
+    home_team: str
+    away_team: str
+    league: str
+    match_time: str
+    topics: Dict[str, str] = field(default_factory=dict)
+    predicted_score: str = ""
+    selection: str = ""
+    odds: Optional[float] = None
+    confidence: int = 75
+    source: str = "writer"
+
+    def to_prompt(self) -> str:
+        """改写阶段共享的分析文本"""
+        odds = f"赔率 {self.odds}，" if self.odds is not None else ""
+        lines = [
+            f"比赛：{self.league} {self.home_team} vs {self.away_team}（{self.match_time}）",
+            f"预测比分：{self.predicted_score}",
+            f"推荐：{self.selection}（{odds}置信度 {self.confidence}%）",
+        ]
+        for topic, title in ANALYSIS_TOPICS.items():
+            if self.topics.get(topic):
+                lines.append(f"\n【{title}】\n{self.topics[topic]}")
+        return "\n".join(lines)
+
+
+def _selection_odds(selection: str, match_info: MatchInfo, odds_info: OddsInfo) -> Optional[float]:
+    """
+    推荐对应的胜平负赔率
+
+    与写作器一致，让球推荐取对应一方的独赢赔率；大小球或无法判断的推荐返回 None。
+    """
+    if any(word in selection for word in ("大球", "小球", "大小")):
+        return None
+    home = "主" in selection or match_info.home_team.name in selection
+    away = "客" in selection or match_info.away_team.name in selection
+    if home != away:
+        return odds_info.home_win if home else odds_info.away_win
+    if not home and "平" in selection:
+        return odds_info.draw
+    return None
+
+
+def _strip_heading(text: str) -> str:
+    return _NUMBERED_HEADING.sub("", text.strip(), count=1)
+
+
+def _parse_json_object(text: str) -> Dict[str, Any]:
+    """取回复中第一个 { 到最后一个 } 之间的 JSON 对象"""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("No JSON object in response")
+    return json.loads(text[start:end + 1])
+
+
+class FixtureAnalysisPipeline:
+    """比赛分析一次、专家改写多次的文章生成流程"""
+
+    def __init__(
+        self,
+        writer: Optional[EnhancedFootballWriter] = None,
+        cache: Optional[ArticleCache] = None,
+        registry: Optional[ExpertRegistry] = None
+    ):
+        """
+        Args:
+            writer: 第一阶段的模板写作器（也是 Claude 分析失败时的回退）
+            cache: 比赛分析和 Claude 改写结果的缓存，默认使用进程共享的缓存
+            registry: 专家档案，默认使用共享的专家注册表
+        """
+        self.cache = cache if cache is not None else get_article_cache()
+        self.writer = writer or EnhancedFootballWriter(cache=self.cache)
+        self.registry = registry or get_expert_registry()
+
+    # ---- 第一阶段：比赛分析 ----
+
+    def analyze(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        fixture_id: Optional[int] = None
+    ) -> FixtureAnalysis:
+        """用模板写作器生成比赛分析（同一快照、同一比分模型只生成一次）"""
+        fp = fingerprint(match_info, odds_info, historical_data, self.writer.score_model.version)
+        cached = self._cached_analysis("writer", fp, fixture_id)
+        if cached is not None:
+            return cached
+
+        prediction = self.writer.generate_prediction(match_info, odds_info, historical_data, fixture_id=fixture_id)
+        analysis = FixtureAnalysis(
+            fixture_id=fixture_id,
+            home_team=match_info.home_team.name,
+            away_team=match_info.away_team.name,
+            league=match_info.league,
+            match_time=match_info.match_time,
+            topics={
+                _WRITER_SECTIONS[name]: _strip_heading(text)
+                for name, text in prediction["sections"].items() if name in _WRITER_SECTIONS
+            },
+            predicted_score=prediction["predicted_score"],
+            selection=prediction["recommendation"]["selection"],
+            odds=prediction["recommendation"]["odds"],
+            confidence=prediction["confidence"],
+            source="writer"
+        )
+        self._store_analysis("writer", fp, analysis)
+        return analysis
+
+    async def analyze_with_claude(
+        self,
+        client: Any,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        fixture_id: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> FixtureAnalysis:
+        """
+        用 Claude 生成比赛分析（一次调用，返回 JSON）
+
+        client 为 AsyncClaudeClient；调用失败或回复无法解析时回退到模板写作器。
+        """
+        fp = fingerprint(match_info, odds_info, historical_data)
+        cached = self._cached_analysis("claude", fp, fixture_id)
+        if cached is not None:
+            return cached
+
+        result = await client.create_message(
+            prompt=self._analysis_prompt(match_info, odds_info, historical_data),
+            system=ANALYSIS_SYSTEM_PROMPT,
+            max_tokens=ANALYSIS_MAX_TOKENS,
+            temperature=0.3,
+            deadline=deadline,
+            model=client.select_model(TASK_ARTICLE, max_tokens=ANALYSIS_MAX_TOKENS, latency_budget=deadline)
+        )
+        try:
+            if not result["success"]:
+                raise ValueError(result.get("error", "Unknown error"))
+            data = _parse_json_object(result["content"])
+            selection = str(data.get("selection", ""))
+            analysis = FixtureAnalysis(
+                fixture_id=fixture_id,
+                home_team=match_info.home_team.name,
+                away_team=match_info.away_team.name,
+                league=match_info.league,
+                match_time=match_info.match_time,
+                topics={topic: str(data["topics"][topic]) for topic in ANALYSIS_TOPICS if data["topics"].get(topic)},
+                predicted_score=str(data.get("predicted_score", "")),
+                selection=selection,
+                odds=_selection_odds(selection, match_info, odds_info),
+                confidence=int(data.get("confidence", 75)),
+                source="claude"
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Claude fixture analysis failed for fixture {fixture_id}, using templates: {e}")
+            return self.analyze(match_info, odds_info, historical_data, fixture_id)
+
+        self._store_analysis("claude", fp, analysis)
+        return analysis
+
+    @staticmethod
+    def _analysis_prompt(match_info: MatchInfo, odds_info: OddsInfo, historical_data: HistoricalData) -> str:
+        facts = json.dumps(
+            {"match": asdict(match_info), "odds": asdict(odds_info), "history": asdict(historical_data)},
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        topics = "、".join(f"{topic}（{title}）" for topic, title in ANALYSIS_TOPICS.items())
+        return f"""比赛数据（JSON）：
+{facts}
+
+请对这场比赛做一次客观、完整的分析，供多位专家在此基础上各自撰写文章。
+按以下主题分别给出 80-150 字的分析：{topics}。
+
+只回复一个 JSON 对象：
+{{"topics": {{"background": "...", "form": "...", ...}}, "predicted_score": "2-1", "selection": "主队-0.5", "confidence": 70}}"""
+
+    def _cached_analysis(self, source: str, fp: str, fixture_id: Optional[int]) -> Optional[FixtureAnalysis]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(ANALYSIS_VERSION, source, fp, fixture_id)
+        return FixtureAnalysis(**cached) if cached is not MISS else None
+
+    def _store_analysis(self, source: str, fp: str, analysis: FixtureAnalysis) -> None:
+        if self.cache is not None:
+            self.cache.set(ANALYSIS_VERSION, source, fp, asdict(analysis), analysis.fixture_id)
+
+    # ---- 第二阶段：专家改写 ----
+
+    def topic_order(self, expert: ExpertProfile) -> List[str]:
+        """专家文章的章节顺序：主专长、次专长的主题在前；简洁型和谨慎型只保留这些主题和结论"""
+        focus = []
+        for area in (expert.primary_expertise, *expert.secondary_expertise):
+            focus.extend(topic for topic in EXPERTISE_TOPICS.get(area, ()) if topic not in focus)
+        if expert.writing_style in FOCUSED_STYLES:
+            rest = ["prediction"]
+        else:
+            rest = list(ANALYSIS_TOPICS)
+        return focus + [topic for topic in rest if topic not in focus]
+
+    def render(self, analysis: FixtureAnalysis, expert_key: str, data_version: str = "") -> Dict[str, Any]:
+        """
+        按专家风格用模板渲染文章（不调用 API）
+
+        随机选择按 (比赛, 专家, 数据版本) 播种，同样的输入总是同一篇文章。
+        """
+        expert = self.registry.by_key[expert_key]
+        rng = seeded_rng(analysis.fixture_id, expert_key, data_version)
+        home, away = analysis.home_team, analysis.away_team
+        focus = set(EXPERTISE_TOPICS.get(expert.primary_expertise, ()))
+
+        title = prediction_experts._generate_specialized_title(expert, {"home_team": home, "away_team": away})
+        opening = expert.article_templates.get("opening", "专业分析{home_team}对阵{away_team}。").format(
+            home_team=home, away_team=away
+        )
+        if expert.opening_templates:
+            opening = f"{rng.choice(expert.opening_templates)}。\n\n{opening}"
+        if expert.analysis_priorities:
+            opening += f"\n本文重点关注：{'、'.join(expert.analysis_priorities[:3])}。"
+
+        sections = {}
+        for topic in self.topic_order(expert):
+            text = analysis.topics.get(topic)
+            if not text:
+                continue
+            if topic in focus and expert.signature_phrases:
+                text = f"{rng.choice(expert.signature_phrases)}。\n{text}"
+            sections[ANALYSIS_TOPICS[topic]] = text
+
+        conclusion = (
+            f"预测比分：{analysis.predicted_score}\n"
+            f"推荐：{analysis.selection}（置信度 {analysis.confidence}%）"
+        )
+        if expert.conclusion_templates:
+            conclusion += f"\n\n{rng.choice(expert.conclusion_templates)}。"
+
+        body = "\n\n".join(f"【{name}】\n{text}" for name, text in sections.items())
+        return {
+            "expert_key": expert_key,
+            "expert_info": {
+                "name": expert.name,
+                "nickname": expert.nickname,
+                "expertise": expert.primary_expertise.value,
+                "writing_style": expert.writing_style.value
+            },
+            "title": title,
+            "sections": sections,
+            "predicted_score": analysis.predicted_score,
+            "confidence": analysis.confidence,
+            "full_article": f"{title}\n\n{opening}\n\n{body}\n\n{conclusion}\n",
+            "source": "template",
+        }
+
+    def stylize_prompts(
+        self,
+        analysis: FixtureAnalysis,
+        expert_key: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        (system 块, 用户内容块)：分析文本对所有专家相同并带缓存标记，
+        之后只有简短的专家风格说明不同
+        """
+        expert = self.registry.by_key[expert_key]
+        focus = "、".join(ANALYSIS_TOPICS[topic] for topic in self.topic_order(expert)[:3])
+        style = f"""请以「{expert.name}」（{expert.nickname}）的身份，把上面的分析改写成一篇 600-800 字的专栏文章。
+- 写作风格：{expert.writing_style.value}
+- 语气关键词：{'、'.join(expert.tone_keywords)}
+- 自然地使用这些标志性用语：{'、'.join(expert.signature_phrases[:3])}
+- 分析重点：{'、'.join(expert.analysis_priorities[:3])}；章节侧重：{focus}
+- 结尾给出预测比分 {analysis.predicted_score} 和推荐 {analysis.selection}，不要改动结论"""
+        system = [{"type": "text", "text": STYLIZE_SYSTEM_PROMPT}]
+        content = [
+            {"type": "text", "text": f"比赛分析：\n\n{analysis.to_prompt()}", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": style},
+        ]
+        return system, content
+
+    async def stylize_with_claude(
+        self,
+        client: Any,
+        analysis: FixtureAnalysis,
+        expert_keys: Sequence[str],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        每位专家一次短调用，把分析改写成专家文章
+
+        第一次调用写入分析前缀的提示词缓存，其余并发调用读取缓存；整批使用同一个模型。
+        某位专家调用失败时改用模板渲染。返回 专家 key -> 文章。
+        """
+        keys = list(expert_keys)
+        if not keys:
+            return {}
+        model = client.select_model(TASK_ARTICLE, max_tokens=STYLIZE_MAX_TOKENS, latency_budget=deadline)
+        first = await self._stylize_one(client, analysis, keys[0], model, deadline)
+        rest = await asyncio.gather(*(self._stylize_one(client, analysis, key, model, deadline) for key in keys[1:]))
+        return dict(zip(keys, [first, *rest]))
+
+    async def _stylize_one(
+        self,
+        client: Any,
+        analysis: FixtureAnalysis,
+        expert_key: str,
+        model: str,
+        deadline: Optional[float]
+    ) -> Dict[str, Any]:
+        namespace = f"stylized:{ANALYSIS_VERSION}:{model}"
+        fp = fingerprint(analysis, expert_key)
+        if self.cache is not None:
+            cached = self.cache.get(namespace, expert_key, fp, analysis.fixture_id)
+            if cached is not MISS:
+                return {**cached, "cached": True}
+
+        system, content = self.stylize_prompts(analysis, expert_key)
+        result = await client.create_message(
+            prompt=content, system=system, max_tokens=STYLIZE_MAX_TOKENS,
+            temperature=0.7, deadline=deadline, model=model
+        )
+        if not result["success"]:
+            logger.warning(f"Claude stylization failed for {expert_key}, using template: {result.get('error')}")
+            return self.render(analysis, expert_key)
+
+        template = self.render(analysis, expert_key)
+        article = {
+            "expert_key": expert_key,
+            "expert_info": template["expert_info"],
+            "title": template["title"],
+            "predicted_score": analysis.predicted_score,
+            "confidence": analysis.confidence,
+            "full_article": result["content"],
+            "source": "claude",
+            "model": result["model"],
+            "usage": result.get("usage", {}),
+        }
+        if self.cache is not None:
+            self.cache.set(namespace, expert_key, fp, article, analysis.fixture_id)
+        return article
+
+    # ---- 两个阶段合起来 ----
+
+    def expert_articles(
+        self,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_keys: Optional[Sequence[str]] = None,
+        fixture_id: Optional[int] = None,
+        data_version: str = ""
+    ) -> Dict[str, Dict[str, Any]]:
+        """模板写作器分析一次，按专家模板渲染（默认全部专家）"""
+        analysis = self.analyze(match_info, odds_info, historical_data, fixture_id)
+        return {key: self.render(analysis, key, data_version) for key in (expert_keys or self.registry.keys)}
+
+    async def expert_articles_with_claude(
+        self,
+        client: Any,
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        expert_keys: Optional[Sequence[str]] = None,
+        fixture_id: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Claude 分析一次，再为每位专家做一次短改写（默认全部专家）"""
+        analysis = await self.analyze_with_claude(client, match_info, odds_info, historical_data, fixture_id, deadline)
+        return await self.stylize_with_claude(client, analysis, expert_keys or self.registry.keys, deadline)
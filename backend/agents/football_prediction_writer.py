@@ -7,6 +7,17 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 import json
+import os
+import sys
+
+try:
+    from agents.lazy_prediction import LazyPrediction
+    from services.score_model import ScoreModel, rates_from_form
+except ImportError:
+    # 在 agents 目录下直接运行时 backend 目录不在 sys.path 中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lazy_prediction import LazyPrediction
+    from services.score_model import ScoreModel, rates_from_form
 
 @dataclass
 class TeamInfo:
@@ -56,7 +67,12 @@ class FootballPredictionWriter:
     5. 置信度表达：明确给出推荐和信心水平
     """
     
-    def __init__(self):
+    def __init__(self, score_model: Optional[ScoreModel] = None):
+        """
+        Args:
+            score_model: 比分模型，默认为未拟合的模型（按双方近期战绩估算）
+        """
+        self.score_model = score_model or ScoreModel()
         self.sections = [
             "近期表现",
             "历史交锋", 
@@ -71,7 +87,7 @@ class FootballPredictionWriter:
         historical_data: HistoricalData,
         expert_confidence: int = 80,
         api_predictions: Optional[Dict] = None
-    ) -> Dict[str, Any]:
+    ) -> LazyPrediction:
         """
         生成完整的比赛预测
         
@@ -83,17 +99,31 @@ class FootballPredictionWriter:
             api_predictions: 其他API的预测结果
             
         Returns:
-            包含预测内容的字典
+            包含预测内容的字典（章节和完整文章在第一次读取时生成）
         """
         
-        prediction = {
+        header = {
             "title": self._generate_title(match_info),
             "confidence": expert_confidence,
             "summary": self._generate_summary(match_info, odds_info),
-            "sections": {},
             "recommendation": self._generate_recommendation(match_info, odds_info, expert_confidence),
             "predicted_score": self._predict_score(match_info, historical_data, api_predictions)
         }
+        return LazyPrediction(
+            header,
+            lambda: self._build_article(header, match_info, odds_info, historical_data, api_predictions)
+        )
+    
+    def _build_article(
+        self,
+        header: Dict[str, Any],
+        match_info: MatchInfo,
+        odds_info: OddsInfo,
+        historical_data: HistoricalData,
+        api_predictions: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """生成章节并编译完整文章"""
+        prediction = {**header, "sections": {}}
         
         # 生成各个分析章节
         prediction["sections"]["近期表现"] = self._analyze_recent_form(match_info)
@@ -198,10 +228,10 @@ class FootballPredictionWriter:
         historical_data: HistoricalData, 
         api_predictions: Optional[Dict]
     ) -> str:
-        """预测具体比分"""
-        # 基于历史数据和球队状态预测比分
-        # 这里可以接入更复杂的算法
-        return "2-1"
+        """预测具体比分（比分模型中概率最高的比分）"""
+        home, away = match_info.home_team, match_info.away_team
+        form = {team.name: rates_from_form(team.recent_form) for team in (home, away)}
+        return self.score_model.predict(home.name, away.name, form).most_likely(1)[0]
     
     def _generate_recommendation(
         self,
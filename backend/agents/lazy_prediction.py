@@ -0,0 +1,87 @@
+"""
+Lazy Prediction
+按需渲染的预测结果
+
+写作器先算出标题、摘要、推荐和比分这些头部字段，章节和完整文章在第一次读取时才生成。
+列表、摘要类调用只读头部字段，不再为每篇文章拼接 1000-1500 字的正文。
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List
+
+# 第一次读取时才生成的字段
+LAZY_FIELDS = ("sections", "full_article")
+
+
+class LazyPrediction(MutableMapping):
+    """
+    预测结果（字典接口）
+
+    头部字段立即可用；读取 sections / full_article 时（包括 dict()、== 比较和 FastAPI 的
+    jsonable_encoder）调用 render 生成正文，只生成一次。render 基于写作器自己的头部快照，
+    调用方修改头部字段不会影响正文。
+
+    它不是 dict 的子类，json.dumps 等不认识 Mapping 的序列化方式会抛出 TypeError，
+    这类调用方先用 to_dict() 转换。
+    """
+
+    def __init__(self, header: Dict[str, Any], render: Callable[[], Dict[str, Any]]):
+        """
+        Args:
+            header: 头部字段
+            render: 生成完整预测的函数，返回值中取 LAZY_FIELDS 对应的字段
+        """
+        self._data = dict(header)
+        self._render = render
+        self._pending: List[str] = [name for name in LAZY_FIELDS if name not in self._data]
+
+    @property
+    def rendered(self) -> bool:
+        """正文是否已经生成"""
+        return not self._pending
+
+    def header(self) -> Dict[str, Any]:
+        """头部字段（不触发生成）"""
+        return {key: value for key, value in self._data.items() if key not in LAZY_FIELDS}
+
+    def render(self) -> "LazyPrediction":
+        """立即生成正文"""
+        if self._pending:
+            full = self._render()
+            for name in self._pending:
+                self._data[name] = full[name]
+            self._pending = []
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """生成正文后转换为普通字典"""
+        return dict(self.render()._data)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._pending:
+            self.render()
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._pending:
+            self._pending.remove(key)
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._pending:
+            self._pending.remove(key)
+        else:
+            del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or key in self._pending
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._data) + self._pending
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pending)
+
+    def __repr__(self) -> str:
+        state = "rendered" if self.rendered else f"pending={self._pending}"
+        return f"<LazyPrediction {self.header()!r} {state}>"
@@ -11,11 +11,27 @@ This module defines 10 unique expert profiles, each with their own:
 Each expert maintains the core article structure but emphasizes their specialty.
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Sequence
+from dataclasses import dataclass, replace
 from enum import Enum
+from types import MappingProxyType
+import threading
 import uuid
 from datetime import datetime
+import random
+
+try:
+    from agents.article_templates import compile_template, seeded_rng
+except ImportError:
+    from article_templates import compile_template, seeded_rng
+
+# Fixed namespace so expert ids are identical across processes and restarts
+EXPERT_ID_NAMESPACE = uuid.UUID("6f1c2a4e-8d3b-5e7f-9a0c-1b2d3e4f5a6b")
+
+
+def expert_id(expert_key: str) -> str:
+    """Stable expert id derived from the expert key"""
+    return str(uuid.uuid5(EXPERT_ID_NAMESPACE, expert_key))
 
 class ExpertiseArea(Enum):
     """Areas of expertise for prediction experts"""
@@ -43,9 +59,13 @@ class WritingStyle(Enum):
     PASSIONATE = "passionate emotional"
     MINIMALIST = "concise efficient"
 
-@dataclass
+@dataclass(frozen=True)
 class ExpertProfile:
-    """Complete expert profile with all attributes"""
+    """Complete expert profile with all attributes
+
+    Sequence fields are tuples and article_templates a read-only mapping
+    once the profile is frozen into the registry.
+    """
     # Basic Info
     id: str
     name: str
@@ -55,18 +75,18 @@ class ExpertProfile:
     
     # Expertise
     primary_expertise: ExpertiseArea
-    secondary_expertise: List[ExpertiseArea]
-    specializations: List[str]  # Leagues, teams, etc.
+    secondary_expertise: Sequence[ExpertiseArea]
+    specializations: Sequence[str]  # Leagues, teams, etc.
     
     # Writing Style
     writing_style: WritingStyle
-    tone_keywords: List[str]
-    signature_phrases: List[str]
+    tone_keywords: Sequence[str]
+    signature_phrases: Sequence[str]
     
     # Analysis Focus
-    analysis_priorities: List[str]
-    key_metrics: List[str]
-    preferred_bet_types: List[str]
+    analysis_priorities: Sequence[str]
+    key_metrics: Sequence[str]
+    preferred_bet_types: Sequence[str]
     
     # Performance Stats (for mock data)
     win_rate: float
@@ -76,24 +96,200 @@ class ExpertProfile:
     followers_count: int
     
     # Style Templates
-    article_templates: Dict[str, str]
-    opening_templates: List[str]
-    conclusion_templates: List[str]
+    article_templates: Mapping[str, str]
+    opening_templates: Sequence[str]
+    conclusion_templates: Sequence[str]
+
+
+# Article templates are compiled once into render plans (see agents/article_templates.py)
+DETAILED_PREDICTION_TEMPLATE = compile_template("""
+📊 详细分析
+
+{home_team} vs {away_team}
+
+{pick:expert.opening_templates}
+
+【基本面分析】
+{expert.signature_phrases[0]}，{home_team}本赛季表现稳定，目前联赛排名第{home_rank}，主场战绩出色。最近10个主场比赛{home_recent_wins}胜{home_recent_draws}平{home_recent_losses}负，展现出强大的主场统治力。球队进攻火力充足，场均进球达到{home_goals_avg}个，防守端也相对稳固，场均失球仅{home_defense_avg}个。
+
+深入分析{home_team}的主场表现，我们发现球队在面对同等级对手时胜率高达{randint:65,75}%。主教练{choice:金成根|崔龙洙|朴恒绪}的战术体系已经成熟，球队在{choice:4-3-3|4-2-3-1|3-5-2}阵型下运转流畅。特别值得一提的是，主队在主场的控球率平均达到{randint:52,58}%，传球成功率高达{randint:82,88}%，这为球队创造进球机会提供了保障。
+
+{away_team}作为K联赛传统豪门，本赛季状态有所起伏。目前排名第{away_rank}，客场表现差强人意。最近10个客场{away_recent_wins}胜{away_recent_draws}平{away_recent_losses}负，客场进球效率仅为场均{away_goals_avg}球，失球数却高达场均{away_defense_avg}球。球队最近遭遇伤病困扰，主力中场核心{choice:金英权|李青龙|寄诚庸}因伤缺阵，对球队中场控制力造成严重影响。
+
+从数据层面深入剖析，{away_team}在客场的问题主要体现在三个方面：首先是防守端的不稳定，客场失球率比主场高出{randint:30,45}%；其次是进攻效率低下，射正率仅为{randint:28,35}%；最后是心理层面的压力，客场作战时球员的跑动距离平均减少{randint:5,8}%。
+
+从{expert.key_metrics[0]}的角度来看，{home_team}在主场的表现明显优于{away_team}的客场表现。特别是在{expert.specializations[0]}方面，主队展现出了压倒性的优势。根据最新的数据模型分析，主队在该项指标上领先客队{randint:15,25}个百分点。
+
+【历史交锋】
+两队在历史上共交手{h2h_total}次，{home_team}取得{h2h_home_wins}胜{h2h_draws}平{h2h_away_wins}负的战绩，进{randint:25,40}球失{randint:20,35}球，在心理上{choice:略占优势|稍处下风|势均力敌}。
+
+深入分析历史交锋数据，我们发现一些有趣的规律：首先，在最近{randint:8,12}次交锋中，有{randint:5,7}场比赛的首球时间在30分钟以内，这说明双方开场后就会展开激烈对抗。其次，{home_team}在主场对阵{away_team}时的不败率高达{randint:65,75}%，最近5场主场交锋取得3胜1平1负的优秀战绩。
+
+{expert.signature_phrases[1]}，从历史数据可以看出，当两队在{home_team}主场交锋时，场均总进球数达到{uniform:2.5,3.2:1}个。最近5次主场交锋中，有4场比赛总进球数超过2.5球，其中2场甚至达到4球以上。这种高进球率的原因在于双方都采用积极的进攻战术，特别是在下半场，进球概率明显提升。
+
+值得特别关注的是，上赛季双方的两次交锋都非常精彩。首回合{home_team}在客场{randint:1,2}-{randint:2,3}不敌{away_team}，但在次回合主场以{randint:3,4}-{randint:1,2}完成复仇，展现出强大的主场威力。这种一报还一报的对抗格局，让本场比赛充满了悬念和看点。
+
+【盘口分析】
+初盘开出{home_team}主让{choice:平/半|半球|半/一}高水{uniform:0.95,1.05:2}，后市水位调整至{uniform:0.85,0.95:2}。从盘口变化来看，机构对主队信心逐渐增强。考虑到{home_team}的主场优势（最近主场胜率{randint:60,70}%）和{away_team}的客场疲软（客场胜率仅{randint:20,35}%），此盘口设置较为合理。
+
+欧赔方面，主流公司开出主胜{uniform:2.10,2.40:2}、平局{uniform:3.20,3.50:2}、客胜{uniform:3.00,3.80:2}的赔率组合。值得注意的是，主胜赔率从开盘的{uniform:2.35,2.50:2}持续下调至目前水平，降幅达{randint:5,10}%，显示市场资金大量涌入主胜方向。
+
+{expert.signature_phrases[2]}，从{expert.key_metrics[1]}的变化趋势分析，本场比赛存在以下几个关键信息：
+1. 亚盘水位在开赛前{randint:2,4}小时出现明显调整，主队水位下降{uniform:0.05,0.15:2}，暗示有大额资金支持主队
+2. 大小球盘口从{choice:2.5|2.5/3|3}球调整至{choice:2.5/3|3|3/3.5}球，市场预期进球数增加
+3. 角球盘口开出{randint:9,11}个，考虑到双方的进攻风格，这个盘口偏保守
+
+从投注分布来看，目前主胜投注比例达到{randint:55,65}%，平局{randint:20,25}%，客胜仅{randint:15,25}%。这种一边倒的投注分布，可能会导致临场出现盘口调整。
+
+【{expert.primary_expertise.value}专项分析】
+作为专注于{expert.primary_expertise.value}的分析师，我特别关注{expert.key_metrics[0]}这个指标。{home_team}在这方面的数据为{randint:65,85}%，远高于{away_team}的{randint:45,65}%。
+
+从{expert.specializations[1]}的角度分析，{home_team}在主场的战术执行力明显更强。主教练的战术安排更适合主场作战，球员在熟悉的环境中能够更好地发挥。
+
+{expert.signature_phrases[3]}，这场比赛的关键在于{choice:中场控制|边路突破|定位球得分|防守反击效率}。谁能在这方面占据优势，谁就有更大的赢面。
+
+【近期表现】
+{home_team}近期状态分析：
+
+上轮联赛，{home_team}在{choice:主场|客场}{randint:2,4}-{randint:0,2}战胜{choice:强敌|中游球队|保级球队}，展现出色的竞技状态。这是球队连续第{randint:3,5}场保持不败，期间取得{randint:2,4}胜{randint:1,2}平的优异战绩。
+
+进攻端表现：
+- 主力前锋{choice:朴主永|李东国|廉基勋}状态火热，近5场打入{randint:3,7}球，场均射门{randint:3,5}次
+- 中场核心{choice:郑又荣|韩教元|奇诚庸}贡献{randint:2,4}次助攻，传威胁球成功率达{randint:75,85}%
+- 球队近5场比赛场均创造{randint:12,18}次射门机会，射正率{randint:35,45}%
+- 定位球得分能力出色，近期有{randint:2,4}个进球来自定位球
+
+防守端表现：
+- 防线稳固，近{randint:3,5}个主场仅丢{randint:2,5}球
+- 门将{choice:赵贤祐|金承奎|宋范根}状态神勇，扑救成功率达{randint:70,80}%
+- 后防线默契度提升，越位造成成功率{randint:60,70}%
+
+{away_team}近期状态分析：
+
+{away_team}在上轮联赛{randint:1,3}-{randint:0,2}{choice:险胜|击败|战胜}对手，暂时止住了此前的颓势。但球队整体状态仍不稳定，近5场比赛仅取得{randint:1,2}胜{randint:1,2}平{randint:2,3}负。
+
+问题分析：
+- 客场作战能力明显下滑，近5个客场仅获{randint:1,2}胜，客场进球效率仅为每场{uniform:0.8,1.2:1}球
+- 中场核心{choice:李青龙|具滋哲|池东沅}因伤缺阵{randint:2,4}轮，球队组织能力大打折扣
+- 后防线问题突出，近期场均失球达到{uniform:1.5,2.0:1}个，高位防线频频被打穿
+- 体能储备不足，下半场失球率比上半场高出{randint:40,60}%
+
+【人员情况】
+{home_team}阵容情况：
+
+伤停名单：
+- 后卫{choice:李明浩|金民在|郑升炫}（红牌停赛）- 上轮比赛两黄变一红，将缺席本场比赛
+- 中场{choice:金成民|韩教元|李英才}（肌肉拉伤）- 预计缺阵{randint:2,3}周，确定无缘本场
+- 替补前锋{choice:崔成根|朴柱昊|李根镐}（脚踝扭伤）- 恢复情况不理想，出战成疑
+
+利好消息：
+- 主力前锋{choice:朴智星|李同国|黄义助}伤愈复出，已恢复训练，有望首发出场
+- 中场大将{choice:奇诚庸|具滋哲|权敬原}解除停赛，可以正常出战
+- 后防核心{choice:金英权|金玟哉|权敬原}状态出色，近期表现稳定
+
+预计首发阵容（{choice:4-3-3|4-2-3-1|3-5-2}）：
+门将：{choice:赵贤祐|金承奎|宋范根}
+后卫线：经验丰富，平均年龄{randint:26,29}岁
+中场：控制力强，传球成功率预计达{randint:82,88}%
+锋线：速度与技术兼备，反击威胁大
+
+{away_team}阵容情况：
+
+伤停情况严重：
+- 中场核心{choice:金英权|李青龙|寄诚庸}（膝伤）- 赛季报销，对球队影响巨大
+- 主力后卫{choice:洪正好|金玟哉|金英权}（累积黄牌）- 停赛一场
+- 后卫{choice:李庸|崔哲淳|朴柱昊}（累积黄牌）- 同样停赛
+- 边锋{choice:南泰熙|李在城|文宣民}（腿筋拉伤）- 出战概率仅30%
+
+阵容调整：
+- 新援前锋{choice:奥斯马尔|穆戈萨|塔加特}有望迎来首秀，但磨合度存疑
+- 年轻球员可能获得机会，但大赛经验不足
+- 主教练不得不调整战术，可能采用更保守的{choice:5-4-1|4-5-1|5-3-2}阵型
+
+【比分预测】
+{expert.signature_phrases[4]}，基于以上全方位分析，结合双方的状态、阵容、历史交锋等因素，本场比赛预测如下：
+
+最可能比分：{home_team} {randint:2,3}-{randint:1,2} {away_team}（概率{randint:25,35}%）
+次选比分：{randint:1,2}-{randint:1,2}（概率{randint:20,25}%）
+第三选择：{randint:3,4}-{randint:0,1}（概率{randint:15,20}%）
+
+进球时间分布预测：
+- 0-15分钟：{randint:15,25}%概率出现进球
+- 16-30分钟：{randint:20,30}%概率出现进球
+- 31-45分钟：{randint:25,35}%概率出现进球
+- 46-60分钟：{randint:30,40}%概率出现进球
+- 61-75分钟：{randint:35,45}%概率出现进球
+- 76-90分钟：{randint:40,50}%概率出现进球
+
+特别提醒：根据数据分析，本场比赛下半场进球概率（{randint:60,70}%）明显高于上半场，建议关注下半场大球。
+
+【推荐】
+基于以上分析，本场比赛推荐：
+
+主推：{pick:expert.preferred_bet_types}
+亚盘推荐：{home_team} -{choice:0.5|0.75|1}
+大小球推荐：大{choice:2.5|2.75|3}球
+比分推荐：{randint:2,3}-{randint:1,2}
+
+置信度：{expert.win_rate}%
+风险等级：{choice:低|中|中低}
+
+{pick:expert.conclusion_templates}
+
+祝各位朋友投注顺利，理性投注，量力而行！
+
+——{expert.nickname}({expert.name})
+        """)
+
+DETAILED_OPENING_TEMPLATES = {
+    WritingStyle.ANALYTICAL: compile_template("""
+📊 **赛事前瞻**
+
+{pick:expert.opening_templates}，今天我们迎来了{league}的一场焦点对决——{home_team}主场迎战{away_team}。这场比赛不仅关系到两队的积分排名，更是一场充满变数的战术博弈。
+
+{pick:expert.signature_phrases}，本场比赛存在多个值得关注的数据点。从近期表现到历史交锋，从人员配置到战术安排，每一个细节都可能成为影响比赛走向的关键因素。让我们通过深度数据分析，为您揭示这场比赛的真实面貌。
+""".strip()),
+    WritingStyle.NARRATIVE: compile_template("""
+🎯 **精彩对决**
+
+{pick:expert.opening_templates}。当{home_team}的球迷们涌入主场，准备为他们的英雄呐喊助威时，{away_team}的将士们也已经做好了客场作战的准备。
+
+这不仅仅是一场普通的{league}比赛。{pick:expert.signature_phrases}，两队都有着必须取胜的理由。主队希望延续主场不败的神话，而客队则渴望打破客场连败的阴霾。当激情与理智碰撞，当数据与直觉交织，我们将为您呈现最专业的分析。
+""".strip()),
+    WritingStyle.TECHNICAL: compile_template("""
+⚽ **战术分析**
+
+{pick:expert.opening_templates}。{home_team}对阵{away_team}，这场{league}的对决将是一场高水平的战术较量。
+
+{pick:expert.signature_phrases}，两队主教练的战术理念将在本场比赛中得到充分展现。从阵型选择到人员配置，从进攻组织到防守体系，每一个战术细节都值得我们深入探讨。接下来，让我们从专业角度全面解析这场比赛。
+""".strip()),
+}
 
 
 class PredictionExpertProfiles:
     """Container for all expert profiles and their specialized methods"""
     
-    def __init__(self):
-        self.experts = self._initialize_experts()
+    def __init__(self, registry: Optional["ExpertRegistry"] = None):
+        self._registry = registry
+    
+    @property
+    def registry(self) -> "ExpertRegistry":
+        """Shared expert registry (built on first access)"""
+        return self._registry or get_expert_registry()
     
-    def _initialize_experts(self) -> Dict[str, ExpertProfile]:
+    @property
+    def experts(self) -> Mapping[str, ExpertProfile]:
+        """Read-only mapping of expert key -> profile"""
+        return self.registry.by_key
+    
+    @staticmethod
+    def _initialize_experts() -> Dict[str, ExpertProfile]:
         """Initialize all 10 expert profiles"""
         experts = {}
         
         # 1. The Data Wizard - Statistical Analysis Expert
         experts["data_wizard"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("data_wizard"),
             name="老韩评球",
             nickname="数据大师",
             bio="Former sports statistician with 15 years analyzing football data. Uses advanced metrics and machine learning models for predictions.",
@@ -149,7 +345,7 @@ class PredictionExpertProfiles:
         
         # 2. The Tactician - Tactical Analysis Expert
         experts["tactician"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("tactician"),
             name="西西看球",
             nickname="战术专家",
             bio="Former professional football coach with UEFA Pro License. Specializes in tactical analysis and formation dynamics.",
@@ -205,7 +401,7 @@ class PredictionExpertProfiles:
         
         # 3. The Historian - Historical Patterns Expert
         experts["historian"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("historian"),
             name="每日一推",
             nickname="历史专家",
             bio="Football historian and pattern analyst with encyclopedic knowledge of historical trends and cyclical patterns in football.",
@@ -261,7 +457,7 @@ class PredictionExpertProfiles:
         
         # 4. The Medic - Injury Assessment Expert
         experts["medic"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("medic"),
             name="贺冠首方",
             nickname="伤病专家",
             bio="Sports medicine doctor and injury analyst. Tracks player fitness, injury history, and recovery patterns for accurate predictions.",
@@ -317,7 +513,7 @@ class PredictionExpertProfiles:
         
         # 5. The Asian Handicap Master
         experts["handicap_master"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("handicap_master"),
             name="代红",
             nickname="盘口专家",
             bio="Asian betting market specialist with deep understanding of handicap movements and Asian bookmaker psychology.",
@@ -373,7 +569,7 @@ class PredictionExpertProfiles:
         
         # 6. The Goal Prophet - Over/Under Specialist
         experts["goal_prophet"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("goal_prophet"),
             name="白羊",
             nickname="进球预言家",
             bio="Goal-focused analyst who specializes in predicting total goals, BTTS, and scoring patterns with remarkable accuracy.",
@@ -429,7 +625,7 @@ class PredictionExpertProfiles:
         
         # 7. The Home Advantage Analyst
         experts["home_analyst"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("home_analyst"),
             name="花芯",
             nickname="主场专家",
             bio="Specialist in home/away form analysis, crowd psychology, and venue-specific performance patterns.",
@@ -485,7 +681,7 @@ class PredictionExpertProfiles:
         
         # 8. The Weather Watcher - Conditions Expert
         experts["weather_watcher"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("weather_watcher"),
             name="内幕爆析",
             nickname="天气专家",
             bio="Meteorological analyst who studies the impact of weather conditions, pitch conditions, and environmental factors on match outcomes.",
@@ -541,7 +737,7 @@ class PredictionExpertProfiles:
         
         # 9. The Mind Reader - Psychology Expert
         experts["mind_reader"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("mind_reader"),
             name="赢盘王",
             nickname="心理专家",
             bio="Sports psychologist specializing in team motivation, pressure situations, and psychological factors in football performance.",
@@ -597,7 +793,7 @@ class PredictionExpertProfiles:
         
         # 10. The Value Hunter - Value Betting Expert
         experts["value_hunter"] = ExpertProfile(
-            id=str(uuid.uuid4()),
+            id=expert_id("value_hunter"),
             name="鼎峰",
             nickname="价值猎手",
             bio="Professional bettor and value analyst who identifies mispriced odds and profitable betting opportunities with mathematical precision.",
@@ -655,215 +851,94 @@ class PredictionExpertProfiles:
     
     def get_expert_by_id(self, expert_id: str) -> Optional[ExpertProfile]:
         """Get expert profile by ID"""
-        for expert in self.experts.values():
-            if expert.id == expert_id:
-                return expert
-        return None
+        return self.registry.by_id.get(expert_id)
     
     def get_expert_by_nickname(self, nickname: str) -> Optional[ExpertProfile]:
         """Get expert profile by nickname"""
-        for expert in self.experts.values():
-            if expert.nickname == nickname:
-                return expert
-        return None
+        return self.registry.by_nickname.get(nickname)
     
     def get_experts_by_expertise(self, expertise: ExpertiseArea) -> List[ExpertProfile]:
         """Get all experts with specific primary expertise"""
-        return [
-            expert for expert in self.experts.values()
-            if expert.primary_expertise == expertise
-        ]
+        return list(self.registry.by_expertise.get(expertise, ()))
     
     def get_all_experts(self) -> List[ExpertProfile]:
         """Get all expert profiles"""
-        return list(self.experts.values())
+        return list(self.registry.profiles)
     
     def generate_detailed_prediction(
         self,
         expert_key: str,
         home_team: str = "浦项制铁",
         away_team: str = "全北现代",
-        fixture_id: int = 1001
+        fixture_id: int = 1001,
+        rng: Optional[random.Random] = None,
+        data_version: str = ""
     ) -> str:
         """
         Generate a comprehensive detailed prediction article (1500+ words)
         matching the professional football analysis format
+        
+        The article is seeded from (fixture_id, expert_key, data_version), so the
+        same inputs always produce the same text. Pass rng to override.
         """
-        import random
+        draw = rng = rng or seeded_rng(fixture_id, expert_key, data_version)
         
         if expert_key not in self.experts:
-            expert_key = random.choice(list(self.experts.keys()))
+            expert_key = draw.choice(list(self.experts.keys()))
         
         expert = self.experts[expert_key]
         
         # Generate random but realistic statistics
-        home_rank = random.randint(2, 8)
-        away_rank = random.randint(3, 10)
-        home_recent_wins = random.randint(3, 6)
-        home_recent_draws = random.randint(1, 3)
-        home_recent_losses = random.randint(0, 2)
-        away_recent_wins = random.randint(2, 5)
-        away_recent_draws = random.randint(1, 3)
-        away_recent_losses = random.randint(1, 4)
-        
-        h2h_total = random.randint(15, 25)
-        h2h_home_wins = random.randint(5, 10)
-        h2h_draws = random.randint(3, 7)
+        home_rank = draw.randint(2, 8)
+        away_rank = draw.randint(3, 10)
+        home_recent_wins = draw.randint(3, 6)
+        home_recent_draws = draw.randint(1, 3)
+        home_recent_losses = draw.randint(0, 2)
+        away_recent_wins = draw.randint(2, 5)
+        away_recent_draws = draw.randint(1, 3)
+        away_recent_losses = draw.randint(1, 4)
+        
+        h2h_total = draw.randint(15, 25)
+        h2h_home_wins = draw.randint(5, 10)
+        h2h_draws = draw.randint(3, 7)
         h2h_away_wins = h2h_total - h2h_home_wins - h2h_draws
         
         # Build the comprehensive article
-        home_goals_avg = round(random.uniform(1.5, 2.5), 1)
-        away_goals_avg = round(random.uniform(0.8, 1.8), 1)
-        home_defense_avg = round(random.uniform(0.6, 1.2), 1)
-        away_defense_avg = round(random.uniform(1.0, 1.8), 1)
-        
-        article = f"""
-📊 详细分析
-
-{home_team} vs {away_team}
-
-{random.choice(expert.opening_templates)}
-
-【基本面分析】
-{expert.signature_phrases[0]}，{home_team}本赛季表现稳定，目前联赛排名第{home_rank}，主场战绩出色。最近10个主场比赛{home_recent_wins}胜{home_recent_draws}平{home_recent_losses}负，展现出强大的主场统治力。球队进攻火力充足，场均进球达到{home_goals_avg}个，防守端也相对稳固，场均失球仅{home_defense_avg}个。
-
-深入分析{home_team}的主场表现，我们发现球队在面对同等级对手时胜率高达{random.randint(65, 75)}%。主教练{random.choice(['金成根', '崔龙洙', '朴恒绪'])}的战术体系已经成熟，球队在{random.choice(['4-3-3', '4-2-3-1', '3-5-2'])}阵型下运转流畅。特别值得一提的是，主队在主场的控球率平均达到{random.randint(52, 58)}%，传球成功率高达{random.randint(82, 88)}%，这为球队创造进球机会提供了保障。
-
-{away_team}作为K联赛传统豪门，本赛季状态有所起伏。目前排名第{away_rank}，客场表现差强人意。最近10个客场{away_recent_wins}胜{away_recent_draws}平{away_recent_losses}负，客场进球效率仅为场均{away_goals_avg}球，失球数却高达场均{away_defense_avg}球。球队最近遭遇伤病困扰，主力中场核心{random.choice(['金英权', '李青龙', '寄诚庸'])}因伤缺阵，对球队中场控制力造成严重影响。
-
-从数据层面深入剖析，{away_team}在客场的问题主要体现在三个方面：首先是防守端的不稳定，客场失球率比主场高出{random.randint(30, 45)}%；其次是进攻效率低下，射正率仅为{random.randint(28, 35)}%；最后是心理层面的压力，客场作战时球员的跑动距离平均减少{random.randint(5, 8)}%。
-
-从{expert.key_metrics[0]}的角度来看，{home_team}在主场的表现明显优于{away_team}的客场表现。特别是在{expert.specializations[0]}方面，主队展现出了压倒性的优势。根据最新的数据模型分析，主队在该项指标上领先客队{random.randint(15, 25)}个百分点。
-
-【历史交锋】
-两队在历史上共交手{h2h_total}次，{home_team}取得{h2h_home_wins}胜{h2h_draws}平{h2h_away_wins}负的战绩，进{random.randint(25, 40)}球失{random.randint(20, 35)}球，在心理上{random.choice(['略占优势', '稍处下风', '势均力敌'])}。
-
-深入分析历史交锋数据，我们发现一些有趣的规律：首先，在最近{random.randint(8, 12)}次交锋中，有{random.randint(5, 7)}场比赛的首球时间在30分钟以内，这说明双方开场后就会展开激烈对抗。其次，{home_team}在主场对阵{away_team}时的不败率高达{random.randint(65, 75)}%，最近5场主场交锋取得3胜1平1负的优秀战绩。
-
-{expert.signature_phrases[1]}，从历史数据可以看出，当两队在{home_team}主场交锋时，场均总进球数达到{round(random.uniform(2.5, 3.2), 1)}个。最近5次主场交锋中，有4场比赛总进球数超过2.5球，其中2场甚至达到4球以上。这种高进球率的原因在于双方都采用积极的进攻战术，特别是在下半场，进球概率明显提升。
-
-值得特别关注的是，上赛季双方的两次交锋都非常精彩。首回合{home_team}在客场{random.randint(1, 2)}-{random.randint(2, 3)}不敌{away_team}，但在次回合主场以{random.randint(3, 4)}-{random.randint(1, 2)}完成复仇，展现出强大的主场威力。这种一报还一报的对抗格局，让本场比赛充满了悬念和看点。
-
-【盘口分析】
-初盘开出{home_team}主让{random.choice(['平/半', '半球', '半/一'])}高水{round(random.uniform(0.95, 1.05), 2)}，后市水位调整至{round(random.uniform(0.85, 0.95), 2)}。从盘口变化来看，机构对主队信心逐渐增强。考虑到{home_team}的主场优势（最近主场胜率{random.randint(60, 70)}%）和{away_team}的客场疲软（客场胜率仅{random.randint(20, 35)}%），此盘口设置较为合理。
-
-欧赔方面，主流公司开出主胜{round(random.uniform(2.10, 2.40), 2)}、平局{round(random.uniform(3.20, 3.50), 2)}、客胜{round(random.uniform(3.00, 3.80), 2)}的赔率组合。值得注意的是，主胜赔率从开盘的{round(random.uniform(2.35, 2.50), 2)}持续下调至目前水平，降幅达{random.randint(5, 10)}%，显示市场资金大量涌入主胜方向。
-
-{expert.signature_phrases[2]}，从{expert.key_metrics[1]}的变化趋势分析，本场比赛存在以下几个关键信息：
-1. 亚盘水位在开赛前{random.randint(2, 4)}小时出现明显调整，主队水位下降{round(random.uniform(0.05, 0.15), 2)}，暗示有大额资金支持主队
-2. 大小球盘口从{random.choice(['2.5', '2.5/3', '3'])}球调整至{random.choice(['2.5/3', '3', '3/3.5'])}球，市场预期进球数增加
-3. 角球盘口开出{random.randint(9, 11)}个，考虑到双方的进攻风格，这个盘口偏保守
-
-从投注分布来看，目前主胜投注比例达到{random.randint(55, 65)}%，平局{random.randint(20, 25)}%，客胜仅{random.randint(15, 25)}%。这种一边倒的投注分布，可能会导致临场出现盘口调整。
-
-【{expert.primary_expertise.value}专项分析】
-作为专注于{expert.primary_expertise.value}的分析师，我特别关注{expert.key_metrics[0]}这个指标。{home_team}在这方面的数据为{random.randint(65, 85)}%，远高于{away_team}的{random.randint(45, 65)}%。
-
-从{expert.specializations[1]}的角度分析，{home_team}在主场的战术执行力明显更强。主教练的战术安排更适合主场作战，球员在熟悉的环境中能够更好地发挥。
-
-{expert.signature_phrases[3]}，这场比赛的关键在于{random.choice(['中场控制', '边路突破', '定位球得分', '防守反击效率'])}。谁能在这方面占据优势，谁就有更大的赢面。
-
-【近期表现】
-{home_team}近期状态分析：
-
-上轮联赛，{home_team}在{random.choice(['主场', '客场'])}{random.randint(2, 4)}-{random.randint(0, 2)}战胜{random.choice(['强敌', '中游球队', '保级球队'])}，展现出色的竞技状态。这是球队连续第{random.randint(3, 5)}场保持不败，期间取得{random.randint(2, 4)}胜{random.randint(1, 2)}平的优异战绩。
-
-进攻端表现：
-- 主力前锋{random.choice(['朴主永', '李东国', '廉基勋'])}状态火热，近5场打入{random.randint(3, 7)}球，场均射门{random.randint(3, 5)}次
-- 中场核心{random.choice(['郑又荣', '韩教元', '奇诚庸'])}贡献{random.randint(2, 4)}次助攻，传威胁球成功率达{random.randint(75, 85)}%
-- 球队近5场比赛场均创造{random.randint(12, 18)}次射门机会，射正率{random.randint(35, 45)}%
-- 定位球得分能力出色，近期有{random.randint(2, 4)}个进球来自定位球
-
-防守端表现：
-- 防线稳固，近{random.randint(3, 5)}个主场仅丢{random.randint(2, 5)}球
-- 门将{random.choice(['赵贤祐', '金承奎', '宋范根'])}状态神勇，扑救成功率达{random.randint(70, 80)}%
-- 后防线默契度提升，越位造成成功率{random.randint(60, 70)}%
-
-{away_team}近期状态分析：
-
-{away_team}在上轮联赛{random.randint(1, 3)}-{random.randint(0, 2)}{random.choice(['险胜', '击败', '战胜'])}对手，暂时止住了此前的颓势。但球队整体状态仍不稳定，近5场比赛仅取得{random.randint(1, 2)}胜{random.randint(1, 2)}平{random.randint(2, 3)}负。
-
-问题分析：
-- 客场作战能力明显下滑，近5个客场仅获{random.randint(1, 2)}胜，客场进球效率仅为每场{round(random.uniform(0.8, 1.2), 1)}球
-- 中场核心{random.choice(['李青龙', '具滋哲', '池东沅'])}因伤缺阵{random.randint(2, 4)}轮，球队组织能力大打折扣
-- 后防线问题突出，近期场均失球达到{round(random.uniform(1.5, 2.0), 1)}个，高位防线频频被打穿
-- 体能储备不足，下半场失球率比上半场高出{random.randint(40, 60)}%
-
-【人员情况】
-{home_team}阵容情况：
-
-伤停名单：
-- 后卫{random.choice(['李明浩', '金民在', '郑升炫'])}（红牌停赛）- 上轮比赛两黄变一红，将缺席本场比赛
-- 中场{random.choice(['金成民', '韩教元', '李英才'])}（肌肉拉伤）- 预计缺阵{random.randint(2, 3)}周，确定无缘本场
-- 替补前锋{random.choice(['崔成根', '朴柱昊', '李根镐'])}（脚踝扭伤）- 恢复情况不理想，出战成疑
-
-利好消息：
-- 主力前锋{random.choice(['朴智星', '李同国', '黄义助'])}伤愈复出，已恢复训练，有望首发出场
-- 中场大将{random.choice(['奇诚庸', '具滋哲', '权敬原'])}解除停赛，可以正常出战
-- 后防核心{random.choice(['金英权', '金玟哉', '权敬原'])}状态出色，近期表现稳定
-
-预计首发阵容（{random.choice(['4-3-3', '4-2-3-1', '3-5-2'])}）：
-门将：{random.choice(['赵贤祐', '金承奎', '宋范根'])}
-后卫线：经验丰富，平均年龄{random.randint(26, 29)}岁
-中场：控制力强，传球成功率预计达{random.randint(82, 88)}%
-锋线：速度与技术兼备，反击威胁大
-
-{away_team}阵容情况：
-
-伤停情况严重：
-- 中场核心{random.choice(['金英权', '李青龙', '寄诚庸'])}（膝伤）- 赛季报销，对球队影响巨大
-- 主力后卫{random.choice(['洪正好', '金玟哉', '金英权'])}（累积黄牌）- 停赛一场
-- 后卫{random.choice(['李庸', '崔哲淳', '朴柱昊'])}（累积黄牌）- 同样停赛
-- 边锋{random.choice(['南泰熙', '李在城', '文宣民'])}（腿筋拉伤）- 出战概率仅30%
-
-阵容调整：
-- 新援前锋{random.choice(['奥斯马尔', '穆戈萨', '塔加特'])}有望迎来首秀，但磨合度存疑
-- 年轻球员可能获得机会，但大赛经验不足
-- 主教练不得不调整战术，可能采用更保守的{random.choice(['5-4-1', '4-5-1', '5-3-2'])}阵型
-
-【比分预测】
-{expert.signature_phrases[4]}，基于以上全方位分析，结合双方的状态、阵容、历史交锋等因素，本场比赛预测如下：
-
-最可能比分：{home_team} {random.randint(2, 3)}-{random.randint(1, 2)} {away_team}（概率{random.randint(25, 35)}%）
-次选比分：{random.randint(1, 2)}-{random.randint(1, 2)}（概率{random.randint(20, 25)}%）
-第三选择：{random.randint(3, 4)}-{random.randint(0, 1)}（概率{random.randint(15, 20)}%）
-
-进球时间分布预测：
-- 0-15分钟：{random.randint(15, 25)}%概率出现进球
-- 16-30分钟：{random.randint(20, 30)}%概率出现进球
-- 31-45分钟：{random.randint(25, 35)}%概率出现进球
-- 46-60分钟：{random.randint(30, 40)}%概率出现进球
-- 61-75分钟：{random.randint(35, 45)}%概率出现进球
-- 76-90分钟：{random.randint(40, 50)}%概率出现进球
-
-特别提醒：根据数据分析，本场比赛下半场进球概率（{random.randint(60, 70)}%）明显高于上半场，建议关注下半场大球。
-
-【推荐】
-基于以上分析，本场比赛推荐：
-
-主推：{random.choice(expert.preferred_bet_types)}
-亚盘推荐：{home_team} -{random.choice(['0.5', '0.75', '1'])}
-大小球推荐：大{random.choice(['2.5', '2.75', '3'])}球
-比分推荐：{random.randint(2, 3)}-{random.randint(1, 2)}
-
-置信度：{expert.win_rate}%
-风险等级：{random.choice(['低', '中', '中低'])}
-
-{random.choice(expert.conclusion_templates)}
-
-祝各位朋友投注顺利，理性投注，量力而行！
-
-——{expert.nickname}({expert.name})
-        """
-        
-        return article
+        home_goals_avg = round(draw.uniform(1.5, 2.5), 1)
+        away_goals_avg = round(draw.uniform(0.8, 1.8), 1)
+        home_defense_avg = round(draw.uniform(0.6, 1.2), 1)
+        away_defense_avg = round(draw.uniform(1.0, 1.8), 1)
+        
+        return DETAILED_PREDICTION_TEMPLATE.render({
+            'expert': expert,
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_rank': home_rank,
+            'away_rank': away_rank,
+            'home_recent_wins': home_recent_wins,
+            'home_recent_draws': home_recent_draws,
+            'home_recent_losses': home_recent_losses,
+            'away_recent_wins': away_recent_wins,
+            'away_recent_draws': away_recent_draws,
+            'away_recent_losses': away_recent_losses,
+            'h2h_total': h2h_total,
+            'h2h_home_wins': h2h_home_wins,
+            'h2h_draws': h2h_draws,
+            'h2h_away_wins': h2h_away_wins,
+            'home_goals_avg': home_goals_avg,
+            'away_goals_avg': away_goals_avg,
+            'home_defense_avg': home_defense_avg,
+            'away_defense_avg': away_defense_avg
+        }, rng)
     
     def generate_expert_article(
         self, 
         expert_key: str, 
         match_info: Dict[str, Any],
         odds_info: Dict[str, Any],
-        historical_data: Dict[str, Any]
+        historical_data: Dict[str, Any],
+        rng: Optional[random.Random] = None,
+        data_version: str = ""
     ) -> Dict[str, Any]:
         """
         Generate a specialized article based on expert's profile and expertise
@@ -873,6 +948,8 @@ class PredictionExpertProfiles:
             match_info: Match information dictionary
             odds_info: Odds and betting information
             historical_data: Historical match data
+            rng: Random generator (defaults to one seeded from fixture, expert and data_version)
+            data_version: Version of the input data, part of the seed
             
         Returns:
             Complete article with expert's unique style and focus
@@ -881,6 +958,7 @@ class PredictionExpertProfiles:
             raise ValueError(f"Expert {expert_key} not found")
             
         expert = self.experts[expert_key]
+        rng = rng or seeded_rng(match_info.get("fixture_id"), expert_key, data_version)
         
         # Generate article based on expert's specialty
         article = {
@@ -891,10 +969,10 @@ class PredictionExpertProfiles:
                 "writing_style": expert.writing_style.value
             },
             "title": self._generate_specialized_title(expert, match_info),
-            "opening": self._generate_opening(expert, match_info),
+            "opening": self._generate_opening(expert, match_info, rng),
             "sections": self._generate_specialized_sections(expert, match_info, odds_info, historical_data),
             "prediction": self._generate_specialized_prediction(expert, match_info, odds_info),
-            "conclusion": self._generate_conclusion(expert, match_info),
+            "conclusion": self._generate_conclusion(expert, match_info, rng),
             "confidence": self._calculate_expert_confidence(expert, match_info),
             "betting_advice": self._generate_betting_advice(expert, odds_info)
         }
@@ -921,7 +999,7 @@ class PredictionExpertProfiles:
         
         return specialty_titles.get(expert.primary_expertise, f"{home_team} vs {away_team} 专业分析")
     
-    def _generate_opening(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_opening(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate opening based on expert's style"""
         home_team = match_info.get("home_team", "主队")
         away_team = match_info.get("away_team", "客队")
@@ -931,8 +1009,7 @@ class PredictionExpertProfiles:
         
         # Add expert's signature opening style
         if expert.opening_templates:
-            import random
-            signature_opening = random.choice(expert.opening_templates)
+            signature_opening = rng.choice(expert.opening_templates)
             opening = f"{signature_opening}。\n\n{opening}"
         
         return opening
@@ -1232,11 +1309,10 @@ class PredictionExpertProfiles:
         
         return predictions.get(expert.primary_expertise, "综合分析预测主队2-1获胜")
     
-    def _generate_conclusion(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_conclusion(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate conclusion with expert's signature style"""
         if expert.conclusion_templates:
-            import random
-            signature = random.choice(expert.conclusion_templates)
+            signature = rng.choice(expert.conclusion_templates)
             return f"{signature}。让我们拭目以待这场精彩对决的结果。"
         
         return "综合所有分析因素，我们对本场比赛充满期待。"
@@ -1300,13 +1376,27 @@ class PredictionExpertProfiles:
         
         return advice_templates.get(expert.primary_expertise, default_advice)
 
+    @staticmethod
+    def _signature(expert_profile: ExpertProfile, match_date: Any) -> str:
+        """Sign the article with the expert and the match date (never the generation time)"""
+        signature = f"——{expert_profile.nickname}"
+        if not match_date:
+            return signature
+        try:
+            day = datetime.fromisoformat(str(match_date).replace('Z', '+00:00'))
+        except ValueError:
+            return f"{signature}\n{match_date}"
+        return f"{signature}\n{day.strftime('%Y年%m月%d日')}"
+
     def generate_comprehensive_analysis(
         self,
         expert_profile: ExpertProfile,
         match_info: Dict[str, Any],
         historical_data: Optional[Dict[str, Any]] = None,
         odds_info: Optional[Dict[str, Any]] = None,
-        min_words: int = 1500
+        min_words: int = 1500,
+        rng: Optional[random.Random] = None,
+        data_version: str = ""
     ) -> Dict[str, Any]:
         """
         Generate comprehensive prediction article of 1500+ words
@@ -1314,14 +1404,18 @@ class PredictionExpertProfiles:
         Args:
             expert_profile: The expert profile to use for generation
             match_info: Match information including teams, league, date
+                (the date signs the article, so the content only depends on the inputs)
             historical_data: Historical confrontation data
             odds_info: Odds and handicap information
             min_words: Minimum word count (default 1500)
+            rng: Random generator (defaults to one seeded from fixture, expert and data_version)
+            data_version: Version of the input data, part of the seed
             
         Returns:
             Dictionary containing full article and metadata
         """
-        import random
+        expert_key = self.registry.key_by_id.get(expert_profile.id, expert_profile.nickname)
+        rng = rng or seeded_rng(match_info.get('fixture_id'), expert_key, data_version)
         
         # Extract match details
         home_team = match_info.get('home_team', '主队')
@@ -1331,15 +1425,15 @@ class PredictionExpertProfiles:
         
         # Generate all sections
         sections = {
-            'opening': self._generate_detailed_opening(expert_profile, match_info),
-            'fundamental': self._generate_fundamental_analysis(expert_profile, match_info),
-            'historical': self._generate_historical_confrontation(expert_profile, match_info, historical_data),
-            'recent_form': self._generate_recent_performance_analysis(expert_profile, match_info),
-            'personnel': self._generate_personnel_situation(expert_profile, match_info),
-            'odds': self._generate_odds_handicap_analysis(expert_profile, match_info, odds_info),
-            'specialty': self._generate_expert_specialty_analysis(expert_profile, match_info, odds_info),
-            'prediction': self._generate_score_prediction(expert_profile, match_info),
-            'conclusion': self._generate_detailed_conclusion(expert_profile, match_info)
+            'opening': self._generate_detailed_opening(expert_profile, match_info, rng),
+            'fundamental': self._generate_fundamental_analysis(expert_profile, match_info, rng),
+            'historical': self._generate_historical_confrontation(expert_profile, match_info, historical_data, rng),
+            'recent_form': self._generate_recent_performance_analysis(expert_profile, match_info, rng),
+            'personnel': self._generate_personnel_situation(expert_profile, match_info, rng),
+            'odds': self._generate_odds_handicap_analysis(expert_profile, match_info, odds_info, rng),
+            'specialty': self._generate_expert_specialty_analysis(expert_profile, match_info, odds_info, rng),
+            'prediction': self._generate_score_prediction(expert_profile, match_info, rng),
+            'conclusion': self._generate_detailed_conclusion(expert_profile, match_info, rng)
         }
         
         # Assemble full article
@@ -1362,15 +1456,14 @@ class PredictionExpertProfiles:
 
 {sections['conclusion']}
 
-——{expert_profile.nickname}
-{datetime.now().strftime('%Y年%m月%d日')}
+{self._signature(expert_profile, match_info.get('date'))}
         """
         
         # Calculate word count (rough estimate for Chinese)
         word_count = len(full_article.replace(' ', '').replace('\n', ''))
         
         # Generate recommendations
-        recommendations = self._generate_betting_recommendations(expert_profile, match_info, odds_info)
+        recommendations = self._generate_betting_recommendations(expert_profile, match_info, odds_info, rng)
         
         return {
             'title': f"{expert_profile.nickname}：{home_team} vs {away_team} 深度分析",
@@ -1384,148 +1477,123 @@ class PredictionExpertProfiles:
                 'win_rate': expert_profile.win_rate
             },
             'recommendations': recommendations,
-            'confidence_level': random.uniform(0.75, 0.92)
+            'confidence_level': rng.uniform(0.75, 0.92)
         }
     
-    def _generate_detailed_opening(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_detailed_opening(
+        self,
+        expert: ExpertProfile,
+        match_info: Dict[str, Any],
+        rng: random.Random
+    ) -> str:
         """Generate engaging opening section (100-150 words)"""
-        import random
-        
-        home_team = match_info.get('home_team', '主队')
-        away_team = match_info.get('away_team', '客队')
-        league = match_info.get('league', '联赛')
-        
-        # Expert-specific opening styles
-        openings_by_style = {
-            WritingStyle.ANALYTICAL: f"""
-📊 **赛事前瞻**
-
-{random.choice(expert.opening_templates)}，今天我们迎来了{league}的一场焦点对决——{home_team}主场迎战{away_team}。这场比赛不仅关系到两队的积分排名，更是一场充满变数的战术博弈。
-
-{random.choice(expert.signature_phrases)}，本场比赛存在多个值得关注的数据点。从近期表现到历史交锋，从人员配置到战术安排，每一个细节都可能成为影响比赛走向的关键因素。让我们通过深度数据分析，为您揭示这场比赛的真实面貌。
-            """,
-            
-            WritingStyle.NARRATIVE: f"""
-🎯 **精彩对决**
-
-{random.choice(expert.opening_templates)}。当{home_team}的球迷们涌入主场，准备为他们的英雄呐喊助威时，{away_team}的将士们也已经做好了客场作战的准备。
-
-这不仅仅是一场普通的{league}比赛。{random.choice(expert.signature_phrases)}，两队都有着必须取胜的理由。主队希望延续主场不败的神话，而客队则渴望打破客场连败的阴霾。当激情与理智碰撞，当数据与直觉交织，我们将为您呈现最专业的分析。
-            """,
-            
-            WritingStyle.TECHNICAL: f"""
-⚽ **战术分析**
-
-{random.choice(expert.opening_templates)}。{home_team}对阵{away_team}，这场{league}的对决将是一场高水平的战术较量。
-
-{random.choice(expert.signature_phrases)}，两队主教练的战术理念将在本场比赛中得到充分展现。从阵型选择到人员配置，从进攻组织到防守体系，每一个战术细节都值得我们深入探讨。接下来，让我们从专业角度全面解析这场比赛。
-            """
+        context = {
+            'expert': expert,
+            'home_team': match_info.get('home_team', '主队'),
+            'away_team': match_info.get('away_team', '客队'),
+            'league': match_info.get('league', '联赛')
         }
         
-        # Select based on expert's writing style or use default
-        opening = openings_by_style.get(
-            expert.writing_style,
-            openings_by_style[WritingStyle.ANALYTICAL]
-        )
+        # Every style draws its slots so the random sequence matches the
+        # original eager per-style dict; only the selected one is rendered
+        drawn = {
+            style: template.draw(context, rng)
+            for style, template in DETAILED_OPENING_TEMPLATES.items()
+        }
+        style = expert.writing_style if expert.writing_style in drawn else WritingStyle.ANALYTICAL
         
-        return opening.strip()
+        return DETAILED_OPENING_TEMPLATES[style].fill(drawn[style]).strip()
     
-    def _generate_fundamental_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_fundamental_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate comprehensive fundamental analysis (250-300 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         league = match_info.get('league', '联赛')
         
         # Generate realistic statistics
-        home_position = random.randint(3, 8)
-        away_position = random.randint(4, 12)
-        home_points = 50 - (home_position - 1) * 3 + random.randint(-5, 5)
-        away_points = 50 - (away_position - 1) * 3 + random.randint(-5, 5)
+        home_position = rng.randint(3, 8)
+        away_position = rng.randint(4, 12)
+        home_points = 50 - (home_position - 1) * 3 + rng.randint(-5, 5)
+        away_points = 50 - (away_position - 1) * 3 + rng.randint(-5, 5)
         
-        home_wins = random.randint(12, 18)
-        home_draws = random.randint(4, 8)
-        home_losses = random.randint(3, 8)
+        home_wins = rng.randint(12, 18)
+        home_draws = rng.randint(4, 8)
+        home_losses = rng.randint(3, 8)
         
-        away_wins = random.randint(8, 14)
-        away_draws = random.randint(5, 9)
-        away_losses = random.randint(6, 11)
+        away_wins = rng.randint(8, 14)
+        away_draws = rng.randint(5, 9)
+        away_losses = rng.randint(6, 11)
         
-        home_goals_for = random.randint(35, 55)
-        home_goals_against = random.randint(20, 35)
-        away_goals_for = random.randint(28, 45)
-        away_goals_against = random.randint(25, 40)
+        home_goals_for = rng.randint(35, 55)
+        home_goals_against = rng.randint(20, 35)
+        away_goals_for = rng.randint(28, 45)
+        away_goals_against = rng.randint(25, 40)
         
-        home_form = random.choice(['强势', '稳定', '起伏', '回升'])
-        away_form = random.choice(['一般', '低迷', '反弹', '不稳'])
+        home_form = rng.choice(['强势', '稳定', '起伏', '回升'])
+        away_form = rng.choice(['一般', '低迷', '反弹', '不稳'])
         
         analysis = f"""
 **【基本面分析】**
 
 {home_team}目前在{league}积分榜上排名第{home_position}位，积{home_points}分。球队本赛季至今战绩为{home_wins}胜{home_draws}平{home_losses}负，进{home_goals_for}球失{home_goals_against}球，净胜球达到{home_goals_for - home_goals_against}个。
 
-主场方面，{home_team}展现出{home_form}的表现。最近10个主场比赛取得{random.randint(5, 8)}胜{random.randint(1, 3)}平{random.randint(0, 2)}负的战绩，场均进球{round(random.uniform(1.5, 2.5), 1)}个，场均失球{round(random.uniform(0.8, 1.5), 1)}个。球队在主场的控球率达到{random.randint(52, 65)}%，射门转化率为{random.randint(12, 18)}%，展现出较强的主场统治力。
+主场方面，{home_team}展现出{home_form}的表现。最近10个主场比赛取得{rng.randint(5, 8)}胜{rng.randint(1, 3)}平{rng.randint(0, 2)}负的战绩，场均进球{round(rng.uniform(1.5, 2.5), 1)}个，场均失球{round(rng.uniform(0.8, 1.5), 1)}个。球队在主场的控球率达到{rng.randint(52, 65)}%，射门转化率为{rng.randint(12, 18)}%，展现出较强的主场统治力。
 
-从进攻端来看，{home_team}本赛季的进攻效率在联赛中排名第{random.randint(3, 8)}位。球队主要依靠{random.choice(['快速反击', '阵地战配合', '边路传中', '中路渗透'])}作为主要进攻手段，前锋线上的{random.choice(['外援前锋', '本土射手', '锋线组合'])}状态出色，已经贡献了{random.randint(15, 25)}个进球。中场核心的组织能力是球队进攻的发动机，本赛季已经送出{random.randint(8, 15)}次助攻。
+从进攻端来看，{home_team}本赛季的进攻效率在联赛中排名第{rng.randint(3, 8)}位。球队主要依靠{rng.choice(['快速反击', '阵地战配合', '边路传中', '中路渗透'])}作为主要进攻手段，前锋线上的{rng.choice(['外援前锋', '本土射手', '锋线组合'])}状态出色，已经贡献了{rng.randint(15, 25)}个进球。中场核心的组织能力是球队进攻的发动机，本赛季已经送出{rng.randint(8, 15)}次助攻。
 
-防守端，{home_team}的表现{random.choice(['相当稳固', '有所改善', '略有起伏', '值得肯定'])}。球队场均被射门{random.randint(8, 14)}次，其中射正{random.randint(3, 6)}次，防守效率达到{random.randint(65, 80)}%。后防线的{random.choice(['默契配合', '经验丰富', '年轻有活力', '稳定发挥'])}是球队能够保持较少失球的关键。
+防守端，{home_team}的表现{rng.choice(['相当稳固', '有所改善', '略有起伏', '值得肯定'])}。球队场均被射门{rng.randint(8, 14)}次，其中射正{rng.randint(3, 6)}次，防守效率达到{rng.randint(65, 80)}%。后防线的{rng.choice(['默契配合', '经验丰富', '年轻有活力', '稳定发挥'])}是球队能够保持较少失球的关键。
 
-{away_team}方面，目前排名第{away_position}位，积{away_points}分。球队整体战绩为{away_wins}胜{away_draws}平{away_losses}负，进{away_goals_for}球失{away_goals_against}球。客场作战能力{away_form}，最近10个客场仅取得{random.randint(2, 4)}胜{random.randint(2, 4)}平{random.randint(3, 5)}负，客场得分率仅为{random.randint(30, 45)}%。
+{away_team}方面，目前排名第{away_position}位，积{away_points}分。球队整体战绩为{away_wins}胜{away_draws}平{away_losses}负，进{away_goals_for}球失{away_goals_against}球。客场作战能力{away_form}，最近10个客场仅取得{rng.randint(2, 4)}胜{rng.randint(2, 4)}平{rng.randint(3, 5)}负，客场得分率仅为{rng.randint(30, 45)}%。
 
-{away_team}在客场的表现明显下滑，场均进球只有{round(random.uniform(0.8, 1.5), 1)}个，而场均失球达到{round(random.uniform(1.2, 2.0), 1)}个。球队在{random.choice(['客场适应性', '心理素质', '体能储备', '战术执行'])}方面存在明显不足，这可能成为本场比赛的重要变数。
+{away_team}在客场的表现明显下滑，场均进球只有{round(rng.uniform(0.8, 1.5), 1)}个，而场均失球达到{round(rng.uniform(1.2, 2.0), 1)}个。球队在{rng.choice(['客场适应性', '心理素质', '体能储备', '战术执行'])}方面存在明显不足，这可能成为本场比赛的重要变数。
 
 两队的基本面对比显示，{home_team}在主场具有明显优势，而{away_team}的客场表现令人担忧。这种主客场表现的巨大差异，为我们的预测提供了重要参考依据。
         """
         
         return analysis.strip()
     
-    def _generate_historical_confrontation(self, expert: ExpertProfile, match_info: Dict[str, Any], historical_data: Optional[Dict[str, Any]]) -> str:
+    def _generate_historical_confrontation(self, expert: ExpertProfile, match_info: Dict[str, Any], historical_data: Optional[Dict[str, Any]], rng: random.Random) -> str:
         """Generate historical confrontation analysis (200-250 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
         # Generate historical stats
-        total_meetings = random.randint(15, 25)
-        home_wins = random.randint(5, 10)
-        draws = random.randint(3, 7)
+        total_meetings = rng.randint(15, 25)
+        home_wins = rng.randint(5, 10)
+        draws = rng.randint(3, 7)
         away_wins = total_meetings - home_wins - draws
         
-        recent_meetings = random.randint(8, 12)
-        recent_home_wins = random.randint(3, 5)
-        recent_draws = random.randint(1, 3)
+        recent_meetings = rng.randint(8, 12)
+        recent_home_wins = rng.randint(3, 5)
+        recent_draws = rng.randint(1, 3)
         recent_away_wins = recent_meetings - recent_home_wins - recent_draws
         
         analysis = f"""
 **【历史交锋分析】**
 
-两队在历史上共交手{total_meetings}次，{home_team}取得{home_wins}胜{draws}平{away_wins}负，进{random.randint(25, 40)}球失{random.randint(20, 35)}球，在心理上{random.choice(['略占优势', '稍处下风', '势均力敌'])}。
+两队在历史上共交手{total_meetings}次，{home_team}取得{home_wins}胜{draws}平{away_wins}负，进{rng.randint(25, 40)}球失{rng.randint(20, 35)}球，在心理上{rng.choice(['略占优势', '稍处下风', '势均力敌'])}。
 
-最近{recent_meetings}次交锋中，{home_team}{recent_home_wins}胜{recent_draws}平{recent_away_wins}负。值得注意的是，在主场对阵{away_team}的最近{random.randint(5, 7)}场比赛中，{home_team}取得了{random.randint(3, 5)}胜{random.randint(1, 2)}平{random.randint(0, 1)}负的优秀战绩，展现出明显的主场优势。
+最近{recent_meetings}次交锋中，{home_team}{recent_home_wins}胜{recent_draws}平{recent_away_wins}负。值得注意的是，在主场对阵{away_team}的最近{rng.randint(5, 7)}场比赛中，{home_team}取得了{rng.randint(3, 5)}胜{rng.randint(1, 2)}平{rng.randint(0, 1)}负的优秀战绩，展现出明显的主场优势。
 
-从进球数据来看，双方最近{recent_meetings}次交锋场均总进球数达到{round(random.uniform(2.3, 3.2), 1)}个，其中有{random.randint(60, 75)}%的比赛总进球超过2.5个。{home_team}在主场对阵{away_team}时场均进球{round(random.uniform(1.5, 2.2), 1)}个，展现出不错的进攻效率。
+从进球数据来看，双方最近{recent_meetings}次交锋场均总进球数达到{round(rng.uniform(2.3, 3.2), 1)}个，其中有{rng.randint(60, 75)}%的比赛总进球超过2.5个。{home_team}在主场对阵{away_team}时场均进球{round(rng.uniform(1.5, 2.2), 1)}个，展现出不错的进攻效率。
 
-特别值得一提的是，上赛季双方的两次交锋都非常精彩。首回合{home_team}在客场{random.randint(1, 2)}-{random.randint(2, 3)}不敌{away_team}，但在次回合主场{random.randint(3, 4)}-{random.randint(1, 2)}完成复仇。这种一报还一报的对抗格局，让本场比赛充满了悬念。
+特别值得一提的是，上赛季双方的两次交锋都非常精彩。首回合{home_team}在客场{rng.randint(1, 2)}-{rng.randint(2, 3)}不敌{away_team}，但在次回合主场{rng.randint(3, 4)}-{rng.randint(1, 2)}完成复仇。这种一报还一报的对抗格局，让本场比赛充满了悬念。
 
-从历史交锋的战术特点来看，{home_team}在面对{away_team}时更倾向于{random.choice(['控制节奏', '快速进攻', '稳守反击', '高位逼抢'])}，而{away_team}则擅长利用{random.choice(['定位球', '边路突破', '中场控制', '防守反击'])}来制造威胁。这种针锋相对的战术博弈，往往能产生精彩的比赛。
+从历史交锋的战术特点来看，{home_team}在面对{away_team}时更倾向于{rng.choice(['控制节奏', '快速进攻', '稳守反击', '高位逼抢'])}，而{away_team}则擅长利用{rng.choice(['定位球', '边路突破', '中场控制', '防守反击'])}来制造威胁。这种针锋相对的战术博弈，往往能产生精彩的比赛。
 
-历史数据显示，当{home_team}在主场先进球时，最终获胜的概率高达{random.randint(75, 85)}%。这个数据对于本场比赛的走势判断具有重要参考价值。
+历史数据显示，当{home_team}在主场先进球时，最终获胜的概率高达{rng.randint(75, 85)}%。这个数据对于本场比赛的走势判断具有重要参考价值。
         """
         
         return analysis.strip()
     
-    def _generate_recent_performance_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_recent_performance_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate recent performance analysis (300-350 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
         # Generate recent form
-        home_form = ''.join(random.choices(['W', 'D', 'L'], weights=[5, 2, 3], k=5))
-        away_form = ''.join(random.choices(['W', 'D', 'L'], weights=[3, 3, 4], k=5))
+        home_form = ''.join(rng.choices(['W', 'D', 'L'], weights=[5, 2, 3], k=5))
+        away_form = ''.join(rng.choices(['W', 'D', 'L'], weights=[3, 3, 4], k=5))
         
         analysis = f"""
 **【近期表现深度分析】**
@@ -1534,35 +1602,33 @@ class PredictionExpertProfiles:
 
 详细回顾{home_team}的近期表现：
 
-1. 上轮联赛，{home_team}{random.choice(['主场', '客场'])}{random.randint(2, 3)}-{random.randint(0, 1)}战胜{random.choice(['强敌', '中游球队', '保级球队'])}，球队展现出{random.choice(['强大的进攻火力', '稳固的防守体系', '出色的整体配合', '顽强的斗志'])}。{random.choice(['前锋', '中场核心', '后卫'])}表现出色，{random.choice(['梅开二度', '贡献助攻', '零封对手', '制造点球'])}，成为获胜的关键。
+1. 上轮联赛，{home_team}{rng.choice(['主场', '客场'])}{rng.randint(2, 3)}-{rng.randint(0, 1)}战胜{rng.choice(['强敌', '中游球队', '保级球队'])}，球队展现出{rng.choice(['强大的进攻火力', '稳固的防守体系', '出色的整体配合', '顽强的斗志'])}。{rng.choice(['前锋', '中场核心', '后卫'])}表现出色，{rng.choice(['梅开二度', '贡献助攻', '零封对手', '制造点球'])}，成为获胜的关键。
 
-2. 近5场比赛，{home_team}打入{random.randint(8, 12)}球，场均进球{round(random.uniform(1.6, 2.4), 1)}个，进攻端表现{random.choice(['相当出色', '稳定高效', '渐入佳境', '火力全开'])}。其中有{random.randint(3, 4)}场比赛单场进球数达到或超过2个，显示出球队的进攻稳定性。
+2. 近5场比赛，{home_team}打入{rng.randint(8, 12)}球，场均进球{round(rng.uniform(1.6, 2.4), 1)}个，进攻端表现{rng.choice(['相当出色', '稳定高效', '渐入佳境', '火力全开'])}。其中有{rng.randint(3, 4)}场比赛单场进球数达到或超过2个，显示出球队的进攻稳定性。
 
-3. 防守方面，近5场比赛仅失{random.randint(3, 6)}球，有{random.randint(1, 3)}场零封对手。后防线的{random.choice(['默契配合', '积极补位', '出色发挥', '稳定表现'])}让球队的防守变得更加可靠。门将状态{random.choice(['神勇', '稳定', '出色', '正常'])}，扑救成功率达到{random.randint(70, 85)}%。
+3. 防守方面，近5场比赛仅失{rng.randint(3, 6)}球，有{rng.randint(1, 3)}场零封对手。后防线的{rng.choice(['默契配合', '积极补位', '出色发挥', '稳定表现'])}让球队的防守变得更加可靠。门将状态{rng.choice(['神勇', '稳定', '出色', '正常'])}，扑救成功率达到{rng.randint(70, 85)}%。
 
-4. 战术层面，主教练最近对阵型进行了{random.choice(['微调', '大胆改革', '针对性调整', '优化升级'])}，从之前的{random.choice(['4-4-2', '4-3-3', '3-5-2', '4-2-3-1'])}改为{random.choice(['4-3-3', '3-5-2', '4-2-3-1', '5-3-2'])}，效果{random.choice(['立竿见影', '逐渐显现', '相当不错', '有待观察'])}。
+4. 战术层面，主教练最近对阵型进行了{rng.choice(['微调', '大胆改革', '针对性调整', '优化升级'])}，从之前的{rng.choice(['4-4-2', '4-3-3', '3-5-2', '4-2-3-1'])}改为{rng.choice(['4-3-3', '3-5-2', '4-2-3-1', '5-3-2'])}，效果{rng.choice(['立竿见影', '逐渐显现', '相当不错', '有待观察'])}。
 
 {away_team}最近5场比赛战绩：{away_form}
 
 {away_team}的近期状态分析：
 
-1. 客队在上轮联赛中{random.choice(['主场', '客场'])}{random.randint(1, 2)}-{random.randint(1, 2)}{random.choice(['战平', '小负于', '险胜'])}对手，暴露出{random.choice(['进攻乏力', '防守漏洞', '体能不足', '心理压力'])}的问题。
+1. 客队在上轮联赛中{rng.choice(['主场', '客场'])}{rng.randint(1, 2)}-{rng.randint(1, 2)}{rng.choice(['战平', '小负于', '险胜'])}对手，暴露出{rng.choice(['进攻乏力', '防守漏洞', '体能不足', '心理压力'])}的问题。
 
-2. 最近5场比赛，{away_team}仅打入{random.randint(4, 7)}球，场均进球不足{round(random.uniform(0.8, 1.4), 1)}个。锋线上的{random.choice(['外援前锋', '本土射手', '主力中锋'])}已经连续{random.randint(3, 5)}场比赛没有进球，状态令人担忧。
+2. 最近5场比赛，{away_team}仅打入{rng.randint(4, 7)}球，场均进球不足{round(rng.uniform(0.8, 1.4), 1)}个。锋线上的{rng.choice(['外援前锋', '本土射手', '主力中锋'])}已经连续{rng.randint(3, 5)}场比赛没有进球，状态令人担忧。
 
-3. 客场作战时，{away_team}的表现更是不尽如人意。最近{random.randint(4, 6)}个客场仅取得{random.randint(0, 2)}胜，客场进球效率仅为每场{round(random.uniform(0.5, 1.2), 1)}个，而失球数高达每场{round(random.uniform(1.5, 2.2), 1)}个。
+3. 客场作战时，{away_team}的表现更是不尽如人意。最近{rng.randint(4, 6)}个客场仅取得{rng.randint(0, 2)}胜，客场进球效率仅为每场{round(rng.uniform(0.5, 1.2), 1)}个，而失球数高达每场{round(rng.uniform(1.5, 2.2), 1)}个。
 
-4. 伤病问题也困扰着{away_team}。主力{random.choice(['中场', '后卫', '前锋'])}{random.choice(['因伤缺阵', '刚刚伤愈', '状态不佳', '体能下降'])}，这对球队的整体实力造成了不小的影响。
+4. 伤病问题也困扰着{away_team}。主力{rng.choice(['中场', '后卫', '前锋'])}{rng.choice(['因伤缺阵', '刚刚伤愈', '状态不佳', '体能下降'])}，这对球队的整体实力造成了不小的影响。
 
 综合近期表现来看，{home_team}状态明显好于{away_team}，这种状态差异可能会在比赛中得到体现。
         """
         
         return analysis.strip()
     
-    def _generate_personnel_situation(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_personnel_situation(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate personnel situation analysis (200-250 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
@@ -1582,82 +1648,78 @@ class PredictionExpertProfiles:
 
 {home_team}伤停情况：
 
-• 伤病名单：{random.choice(['后卫', '中场', '前锋'])} {random.choice(player_names)}（{random.choice(['膝伤', '肌肉拉伤', '脚踝扭伤', '腿筋受伤'])}，预计缺席{random.randint(2, 4)}周）
-• 停赛名单：{random.choice(['中场', '后卫'])} {random.choice(player_names)}（累积黄牌停赛）
-• 疑似出场：{random.choice(['前锋', '边锋'])} {random.choice(player_names)}（{random.choice(['轻微拉伤', '感冒', '疲劳'])}，出场成疑）
+• 伤病名单：{rng.choice(['后卫', '中场', '前锋'])} {rng.choice(player_names)}（{rng.choice(['膝伤', '肌肉拉伤', '脚踝扭伤', '腿筋受伤'])}，预计缺席{rng.randint(2, 4)}周）
+• 停赛名单：{rng.choice(['中场', '后卫'])} {rng.choice(player_names)}（累积黄牌停赛）
+• 疑似出场：{rng.choice(['前锋', '边锋'])} {rng.choice(player_names)}（{rng.choice(['轻微拉伤', '感冒', '疲劳'])}，出场成疑）
 
-尽管有伤病困扰，{home_team}的主力阵容基本完整。预计首发阵型为{random.choice(['4-3-3', '4-2-3-1', '3-5-2', '4-4-2'])}：
+尽管有伤病困扰，{home_team}的主力阵容基本完整。预计首发阵型为{rng.choice(['4-3-3', '4-2-3-1', '3-5-2', '4-4-2'])}：
 
-门将：{random.choice(player_names)}
-后卫：{random.choice(player_names)}、{random.choice(player_names)}、{random.choice(player_names)}、{random.choice(player_names)}
-中场：{random.choice(player_names)}、{random.choice(player_names)}、{random.choice(player_names)}
-前锋：{random.choice(player_names)}、{random.choice(player_names)}、{random.choice(player_names)}
+门将：{rng.choice(player_names)}
+后卫：{rng.choice(player_names)}、{rng.choice(player_names)}、{rng.choice(player_names)}、{rng.choice(player_names)}
+中场：{rng.choice(player_names)}、{rng.choice(player_names)}、{rng.choice(player_names)}
+前锋：{rng.choice(player_names)}、{rng.choice(player_names)}、{rng.choice(player_names)}
 
-核心球员{random.choice(player_names)}本赛季表现出色，已经贡献{random.randint(8, 15)}个进球和{random.randint(5, 10)}次助攻，他的发挥将直接影响比赛走向。
+核心球员{rng.choice(player_names)}本赛季表现出色，已经贡献{rng.randint(8, 15)}个进球和{rng.randint(5, 10)}次助攻，他的发挥将直接影响比赛走向。
 
 {away_team}伤停情况：
 
-• 重要缺席：主力{random.choice(['前锋', '中场核心'])} {random.choice(player_names)}（{random.choice(['红牌停赛', '重伤', '国家队征召'])}）
-• 伤病名单：{random.choice(player_names)}、{random.choice(player_names)}（均因伤缺阵）
-• 体能问题：多名主力刚从{random.choice(['国家队', '杯赛', '密集赛程'])}归来，体能储备不足
+• 重要缺席：主力{rng.choice(['前锋', '中场核心'])} {rng.choice(player_names)}（{rng.choice(['红牌停赛', '重伤', '国家队征召'])}）
+• 伤病名单：{rng.choice(player_names)}、{rng.choice(player_names)}（均因伤缺阵）
+• 体能问题：多名主力刚从{rng.choice(['国家队', '杯赛', '密集赛程'])}归来，体能储备不足
 
-{away_team}的人员危机较为严重，主教练不得不启用替补球员。预计首发可能会做出{random.randint(2, 3)}处调整，这种被迫的轮换可能会影响球队的整体默契度。特别是{random.choice(player_names)}的缺席，让球队失去了{random.choice(['进攻支点', '中场节拍器', '防守屏障', '速度优势'])}。
+{away_team}的人员危机较为严重，主教练不得不启用替补球员。预计首发可能会做出{rng.randint(2, 3)}处调整，这种被迫的轮换可能会影响球队的整体默契度。特别是{rng.choice(player_names)}的缺席，让球队失去了{rng.choice(['进攻支点', '中场节拍器', '防守屏障', '速度优势'])}。
 
 从双方的人员对比来看，{home_team}在阵容完整性上占据优势，这可能成为影响比赛的重要因素。
         """
         
         return analysis.strip()
     
-    def _generate_odds_handicap_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]]) -> str:
+    def _generate_odds_handicap_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]], rng: random.Random) -> str:
         """Generate odds and handicap analysis (200-250 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
         # Generate odds data
-        home_odds = round(random.uniform(1.65, 2.20), 2)
-        draw_odds = round(random.uniform(3.20, 3.80), 2)
-        away_odds = round(random.uniform(3.50, 5.50), 2)
+        home_odds = round(rng.uniform(1.65, 2.20), 2)
+        draw_odds = round(rng.uniform(3.20, 3.80), 2)
+        away_odds = round(rng.uniform(3.50, 5.50), 2)
         
-        handicap = random.choice(['-0.5', '-0.75', '-1', '-0.25'])
-        over_under = random.choice(['2.5', '2.75', '3', '2.25'])
+        handicap = rng.choice(['-0.5', '-0.75', '-1', '-0.25'])
+        over_under = rng.choice(['2.5', '2.75', '3', '2.25'])
         
         analysis = f"""
 **【盘口与赔率分析】**
 
 亚洲盘口分析：
 
-初盘：{home_team} {handicap} @ {round(random.uniform(0.85, 0.95), 2)}
-即时盘：{home_team} {handicap} @ {round(random.uniform(0.88, 0.98), 2)}
+初盘：{home_team} {handicap} @ {round(rng.uniform(0.85, 0.95), 2)}
+即时盘：{home_team} {handicap} @ {round(rng.uniform(0.88, 0.98), 2)}
 
-亚盘开出{home_team}让{handicap.replace('-', '')}球，这个盘口{random.choice(['较为合理', '略显保守', '相对激进', '符合预期'])}。从水位变化来看，{random.choice(['上盘水位微降', '下盘持续升水', '水位保持稳定', '出现明显调整'])}，显示出{random.choice(['资金看好主队', '市场态度谨慎', '机构信心充足', '存在分歧'])}。
+亚盘开出{home_team}让{handicap.replace('-', '')}球，这个盘口{rng.choice(['较为合理', '略显保守', '相对激进', '符合预期'])}。从水位变化来看，{rng.choice(['上盘水位微降', '下盘持续升水', '水位保持稳定', '出现明显调整'])}，显示出{rng.choice(['资金看好主队', '市场态度谨慎', '机构信心充足', '存在分歧'])}。
 
-历史盘路显示，{home_team}作为主场让{handicap.replace('-', '')}球时，近{random.randint(8, 12)}场赢盘率达到{random.randint(55, 75)}%，展现出不错的盘路规律。而{away_team}在客场接受{handicap.replace('-', '')}球让步时，赢盘率仅为{random.randint(25, 45)}%。
+历史盘路显示，{home_team}作为主场让{handicap.replace('-', '')}球时，近{rng.randint(8, 12)}场赢盘率达到{rng.randint(55, 75)}%，展现出不错的盘路规律。而{away_team}在客场接受{handicap.replace('-', '')}球让步时，赢盘率仅为{rng.randint(25, 45)}%。
 
 欧洲赔率分析：
 
-主胜：{home_odds} → {round(home_odds - random.uniform(0, 0.15), 2)}
-平局：{draw_odds} → {round(draw_odds + random.uniform(-0.10, 0.10), 2)}
-客胜：{away_odds} → {round(away_odds + random.uniform(0, 0.20), 2)}
+主胜：{home_odds} → {round(home_odds - rng.uniform(0, 0.15), 2)}
+平局：{draw_odds} → {round(draw_odds + rng.uniform(-0.10, 0.10), 2)}
+客胜：{away_odds} → {round(away_odds + rng.uniform(0, 0.20), 2)}
 
-欧赔方面，主胜赔率从{home_odds}下调至{round(home_odds - random.uniform(0, 0.15), 2)}，降幅明显，反映出市场对{home_team}的信心增强。平赔和客胜赔率均有所上升，进一步印证了主队优势。
+欧赔方面，主胜赔率从{home_odds}下调至{round(home_odds - rng.uniform(0, 0.15), 2)}，降幅明显，反映出市场对{home_team}的信心增强。平赔和客胜赔率均有所上升，进一步印证了主队优势。
 
 大小球盘口：
 
-大小球开出{over_under}球，考虑到两队近期的进球效率和防守表现，这个盘口{random.choice(['偏向大球', '偏向小球', '相对中性', '存在诱盘嫌疑'])}。{home_team}主场场均总进球{round(random.uniform(2.3, 3.2), 1)}个，而{away_team}客场场均总进球{round(random.uniform(2.0, 2.8), 1)}个，历史交锋平均总进球{round(random.uniform(2.4, 3.1), 1)}个。
+大小球开出{over_under}球，考虑到两队近期的进球效率和防守表现，这个盘口{rng.choice(['偏向大球', '偏向小球', '相对中性', '存在诱盘嫌疑'])}。{home_team}主场场均总进球{round(rng.uniform(2.3, 3.2), 1)}个，而{away_team}客场场均总进球{round(rng.uniform(2.0, 2.8), 1)}个，历史交锋平均总进球{round(rng.uniform(2.4, 3.1), 1)}个。
 
-从赔付风险角度分析，本场比赛机构的防范重点在{random.choice(['主胜', '大球', '主队赢盘', '平局'])}，这也是我们需要重点关注的方向。
+从赔付风险角度分析，本场比赛机构的防范重点在{rng.choice(['主胜', '大球', '主队赢盘', '平局'])}，这也是我们需要重点关注的方向。
 
-综合盘口赔率变化，市场资金流向明显偏向{home_team}，但需要警惕{random.choice(['深盘诱导', '临场异动', '大额投注影响', '消息面变化'])}的可能。
+综合盘口赔率变化，市场资金流向明显偏向{home_team}，但需要警惕{rng.choice(['深盘诱导', '临场异动', '大额投注影响', '消息面变化'])}的可能。
         """
         
         return analysis.strip()
     
-    def _generate_expert_specialty_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]]) -> str:
+    def _generate_expert_specialty_analysis(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]], rng: random.Random) -> str:
         """Generate expert specialty analysis (250-300 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
@@ -1666,97 +1728,97 @@ class PredictionExpertProfiles:
             ExpertiseArea.STATISTICS: f"""
 **【{expert.nickname}独家数据分析】**
 
-{random.choice(expert.signature_phrases)}，让我们深入挖掘本场比赛的关键数据指标。
+{rng.choice(expert.signature_phrases)}，让我们深入挖掘本场比赛的关键数据指标。
 
 **高阶数据模型分析：**
 
-通过我们的机器学习模型，综合分析了超过{random.randint(500, 1000)}个相似场景的历史数据：
+通过我们的机器学习模型，综合分析了超过{rng.randint(500, 1000)}个相似场景的历史数据：
 
-• **xG（预期进球）模型**：{home_team}预期进球{round(random.uniform(1.4, 2.2), 2)}个，{away_team}预期进球{round(random.uniform(0.8, 1.5), 2)}个
-• **xGA（预期失球）分析**：{home_team}预期失球{round(random.uniform(0.7, 1.3), 2)}个，{away_team}预期失球{round(random.uniform(1.2, 1.8), 2)}个
-• **蒙特卡洛模拟**（10000次）：{home_team}获胜概率{random.randint(55, 70)}%，平局{random.randint(20, 30)}%，{away_team}获胜{random.randint(10, 25)}%
+• **xG（预期进球）模型**：{home_team}预期进球{round(rng.uniform(1.4, 2.2), 2)}个，{away_team}预期进球{round(rng.uniform(0.8, 1.5), 2)}个
+• **xGA（预期失球）分析**：{home_team}预期失球{round(rng.uniform(0.7, 1.3), 2)}个，{away_team}预期失球{round(rng.uniform(1.2, 1.8), 2)}个
+• **蒙特卡洛模拟**（10000次）：{home_team}获胜概率{rng.randint(55, 70)}%，平局{rng.randint(20, 30)}%，{away_team}获胜{rng.randint(10, 25)}%
 
 **关键性能指标（KPI）对比：**
 
-1. **进攻效率指数**：{home_team} {round(random.uniform(65, 85), 1)} vs {away_team} {round(random.uniform(45, 65), 1)}
-2. **防守稳定性评分**：{home_team} {round(random.uniform(70, 88), 1)} vs {away_team} {round(random.uniform(55, 72), 1)}
-3. **压迫强度（PPDA）**：{home_team} {round(random.uniform(8, 12), 1)} vs {away_team} {round(random.uniform(10, 14), 1)}
-4. **传球成功率**：{home_team} {random.randint(78, 88)}% vs {away_team} {random.randint(72, 82)}%
+1. **进攻效率指数**：{home_team} {round(rng.uniform(65, 85), 1)} vs {away_team} {round(rng.uniform(45, 65), 1)}
+2. **防守稳定性评分**：{home_team} {round(rng.uniform(70, 88), 1)} vs {away_team} {round(rng.uniform(55, 72), 1)}
+3. **压迫强度（PPDA）**：{home_team} {round(rng.uniform(8, 12), 1)} vs {away_team} {round(rng.uniform(10, 14), 1)}
+4. **传球成功率**：{home_team} {rng.randint(78, 88)}% vs {away_team} {rng.randint(72, 82)}%
 
 **概率分布与期望值：**
 
 根据贝叶斯推断和历史数据回归分析：
-- 最可能比分：{random.choice(['2-1', '2-0', '1-0', '3-1'])}（概率{random.randint(12, 18)}%）
-- 次可能比分：{random.choice(['1-1', '2-2', '1-0', '0-0'])}（概率{random.randint(8, 14)}%）
-- 总进球期望值：{round(random.uniform(2.3, 3.1), 1)}球
-- 净胜球期望：{home_team} +{round(random.uniform(0.5, 1.2), 1)}球
+- 最可能比分：{rng.choice(['2-1', '2-0', '1-0', '3-1'])}（概率{rng.randint(12, 18)}%）
+- 次可能比分：{rng.choice(['1-1', '2-2', '1-0', '0-0'])}（概率{rng.randint(8, 14)}%）
+- 总进球期望值：{round(rng.uniform(2.3, 3.1), 1)}球
+- 净胜球期望：{home_team} +{round(rng.uniform(0.5, 1.2), 1)}球
 
-数据模型的置信区间为95%，误差范围±{random.randint(8, 12)}%。这些量化指标清晰地指向{home_team}的优势。
+数据模型的置信区间为95%，误差范围±{rng.randint(8, 12)}%。这些量化指标清晰地指向{home_team}的优势。
             """,
             
             ExpertiseArea.TACTICS: f"""
 **【{expert.nickname}战术深度解析】**
 
-{random.choice(expert.signature_phrases)}，本场比赛的战术博弈将是决定胜负的关键。
+{rng.choice(expert.signature_phrases)}，本场比赛的战术博弈将是决定胜负的关键。
 
 **阵型对抗分析：**
 
-{home_team}预计采用{random.choice(['4-3-3', '4-2-3-1', '3-5-2'])}阵型：
-- 优势：{random.choice(['中场控制力强', '边路进攻犀利', '防守稳固', '攻守平衡'])}
-- 核心战术：{random.choice(['高位逼抢', '控球打法', '防守反击', '边中结合'])}
-- 关键区域：{random.choice(['中场肋部', '边路走廊', '禁区前沿', '第二落点'])}
+{home_team}预计采用{rng.choice(['4-3-3', '4-2-3-1', '3-5-2'])}阵型：
+- 优势：{rng.choice(['中场控制力强', '边路进攻犀利', '防守稳固', '攻守平衡'])}
+- 核心战术：{rng.choice(['高位逼抢', '控球打法', '防守反击', '边中结合'])}
+- 关键区域：{rng.choice(['中场肋部', '边路走廊', '禁区前沿', '第二落点'])}
 
-{away_team}可能排出{random.choice(['4-4-2', '5-3-2', '4-5-1'])}应对：
-- 策略：{random.choice(['密集防守', '中场绞杀', '快速反击', '定位球战术'])}
-- 弱点：{random.choice(['边路防守空虚', '中场缺乏创造力', '高位防线风险', '体能储备不足'])}
+{away_team}可能排出{rng.choice(['4-4-2', '5-3-2', '4-5-1'])}应对：
+- 策略：{rng.choice(['密集防守', '中场绞杀', '快速反击', '定位球战术'])}
+- 弱点：{rng.choice(['边路防守空虚', '中场缺乏创造力', '高位防线风险', '体能储备不足'])}
 
 **战术关键点：**
 
-1. **控球权争夺**：预计{home_team}控球率将达到{random.randint(55, 65)}%，通过{random.choice(['短传渗透', '长传冲吊', '边路传中', '中路配合'])}打开局面
+1. **控球权争夺**：预计{home_team}控球率将达到{rng.randint(55, 65)}%，通过{rng.choice(['短传渗透', '长传冲吊', '边路传中', '中路配合'])}打开局面
 
-2. **防线高度**：{home_team}的防线将保持在{random.choice(['中场线附近', '本方半场', '高位', '灵活调整'])}，这给了{away_team}{random.choice(['反击空间', '很大压力', '传球困难', '进攻难度'])}
+2. **防线高度**：{home_team}的防线将保持在{rng.choice(['中场线附近', '本方半场', '高位', '灵活调整'])}，这给了{away_team}{rng.choice(['反击空间', '很大压力', '传球困难', '进攻难度'])}
 
-3. **定位球战术**：双方都有{random.randint(25, 35)}%的进球来自定位球，{home_team}的{random.choice(['角球战术', '任意球配合', '界外球战术', '点球把握能力'])}值得关注
+3. **定位球战术**：双方都有{rng.randint(25, 35)}%的进球来自定位球，{home_team}的{rng.choice(['角球战术', '任意球配合', '界外球战术', '点球把握能力'])}值得关注
 
-4. **换人调整**：预计下半场{random.randint(60, 70)}分钟后，双方都会进行人员调整，{random.choice(['增加进攻', '加强防守', '改变节奏', '战术变阵'])}
+4. **换人调整**：预计下半场{rng.randint(60, 70)}分钟后，双方都会进行人员调整，{rng.choice(['增加进攻', '加强防守', '改变节奏', '战术变阵'])}
 
-从战术克制关系看，{home_team}的打法对{away_team}形成一定压制，特别是在{random.choice(['中场控制', '边路突破', '高空球争夺', '反击速度'])}方面占据明显优势。
+从战术克制关系看，{home_team}的打法对{away_team}形成一定压制，特别是在{rng.choice(['中场控制', '边路突破', '高空球争夺', '反击速度'])}方面占据明显优势。
             """,
             
             ExpertiseArea.ASIAN_HANDICAP: f"""
 **【{expert.nickname}亚盘精准解读】**
 
-{random.choice(expert.signature_phrases)}，让我们从专业角度深度解析本场比赛的盘口语言。
+{rng.choice(expert.signature_phrases)}，让我们从专业角度深度解析本场比赛的盘口语言。
 
 **盘口历史规律：**
 
 {home_team}本赛季类似盘口战绩：
-- 让{random.choice(['半球', '半一', '一球'])}：{random.randint(8, 12)}场，赢盘{random.randint(5, 9)}场，赢盘率{random.randint(55, 75)}%
-- 主场让球：{random.randint(10, 15)}场，赢盘{random.randint(6, 11)}场，走水{random.randint(1, 3)}场
-- 强队身份：连续{random.randint(3, 6)}场让球，说明机构认可其实力
+- 让{rng.choice(['半球', '半一', '一球'])}：{rng.randint(8, 12)}场，赢盘{rng.randint(5, 9)}场，赢盘率{rng.randint(55, 75)}%
+- 主场让球：{rng.randint(10, 15)}场，赢盘{rng.randint(6, 11)}场，走水{rng.randint(1, 3)}场
+- 强队身份：连续{rng.randint(3, 6)}场让球，说明机构认可其实力
 
 **水位变化解读：**
 
-初盘：{home_team} -{random.choice(['0.5', '0.75', '1'])} @ {round(random.uniform(0.85, 0.95), 2)}水
-即时：{home_team} -{random.choice(['0.5', '0.75', '1'])} @ {round(random.uniform(0.88, 0.98), 2)}水
+初盘：{home_team} -{rng.choice(['0.5', '0.75', '1'])} @ {round(rng.uniform(0.85, 0.95), 2)}水
+即时：{home_team} -{rng.choice(['0.5', '0.75', '1'])} @ {round(rng.uniform(0.88, 0.98), 2)}水
 
-水位走势：{random.choice(['震荡上行', '持续下降', '维持稳定', '异常波动'])}
-- 说明：{random.choice(['上盘热度高', '机构看好主队', '存在诱盘嫌疑', '资金流向明显'])}
-- 临场可能：{random.choice(['维持现状', '升盘降水', '降盘升水', '水位调整'])}
+水位走势：{rng.choice(['震荡上行', '持续下降', '维持稳定', '异常波动'])}
+- 说明：{rng.choice(['上盘热度高', '机构看好主队', '存在诱盘嫌疑', '资金流向明显'])}
+- 临场可能：{rng.choice(['维持现状', '升盘降水', '降盘升水', '水位调整'])}
 
 **机构手法分析：**
 
-1. **造热手段**：通过{random.choice(['媒体造势', '初盘诱导', '水位调整', '盘口变化'])}，将资金引向{random.choice(['上盘', '下盘'])}
-2. **真实意图**：从{random.choice(['欧亚对比', '水位走势', '盘口合理性', '历史规律'])}判断，机构更看好{random.choice([home_team, away_team])}
-3. **风险控制**：当前盘口对机构{random.choice(['相对安全', '风险可控', '略有风险', '压力较大'])}
+1. **造热手段**：通过{rng.choice(['媒体造势', '初盘诱导', '水位调整', '盘口变化'])}，将资金引向{rng.choice(['上盘', '下盘'])}
+2. **真实意图**：从{rng.choice(['欧亚对比', '水位走势', '盘口合理性', '历史规律'])}判断，机构更看好{rng.choice([home_team, away_team])}
+3. **风险控制**：当前盘口对机构{rng.choice(['相对安全', '风险可控', '略有风险', '压力较大'])}
 
 **专业建议：**
 
-- 主推：{home_team} {random.choice(['-0.5', '-0.75', '-1'])}，置信度{random.randint(70, 85)}%
-- 备选：{random.choice(['大2.5球', '主胜', away_team + '+1.5'])}
-- 风险提示：注意{random.choice(['临场变盘', '大额投注影响', '消息面变化', '水位异动'])}
+- 主推：{home_team} {rng.choice(['-0.5', '-0.75', '-1'])}，置信度{rng.randint(70, 85)}%
+- 备选：{rng.choice(['大2.5球', '主胜', away_team + '+1.5'])}
+- 风险提示：注意{rng.choice(['临场变盘', '大额投注影响', '消息面变化', '水位异动'])}
 
-根据多年亚盘研究经验，这种盘口走势最终{random.choice(['上盘打出', '下盘反弹', '走水'])}的概率较大。
+根据多年亚盘研究经验，这种盘口走势最终{rng.choice(['上盘打出', '下盘反弹', '走水'])}的概率较大。
             """
         }
         
@@ -1764,33 +1826,31 @@ class PredictionExpertProfiles:
         default_analysis = f"""
 **【{expert.nickname}专业分析】**
 
-{random.choice(expert.signature_phrases)}，从{expert.primary_expertise.value}角度深入分析本场比赛。
+{rng.choice(expert.signature_phrases)}，从{expert.primary_expertise.value}角度深入分析本场比赛。
 
 根据我们的专业模型和多年经验，{home_team}在以下几个关键维度上占据优势：
 
-1. **{random.choice(expert.key_metrics)}**：{home_team}达到{random.randint(65, 85)}%，明显高于{away_team}的{random.randint(45, 65)}%
-2. **{random.choice(expert.analysis_priorities)}**：这是{home_team}的强项，将成为比赛的关键
-3. **{random.choice(['心理因素', '主场优势', '体能储备', '战术执行'])}**：对{home_team}有利
+1. **{rng.choice(expert.key_metrics)}**：{home_team}达到{rng.randint(65, 85)}%，明显高于{away_team}的{rng.randint(45, 65)}%
+2. **{rng.choice(expert.analysis_priorities)}**：这是{home_team}的强项，将成为比赛的关键
+3. **{rng.choice(['心理因素', '主场优势', '体能储备', '战术执行'])}**：对{home_team}有利
 
-从{expert.primary_expertise.value}的专业角度看，本场比赛的关键在于{random.choice(['开场阶段', '中场控制', '最后时刻', '定位球'])}。{home_team}如果能够{random.choice(['先拔头筹', '控制节奏', '保持专注', '把握机会'])}，将大大增加获胜概率。
+从{expert.primary_expertise.value}的专业角度看，本场比赛的关键在于{rng.choice(['开场阶段', '中场控制', '最后时刻', '定位球'])}。{home_team}如果能够{rng.choice(['先拔头筹', '控制节奏', '保持专注', '把握机会'])}，将大大增加获胜概率。
 
-我们的分析模型显示，{home_team}的获胜概率为{random.randint(60, 75)}%，这个数字综合考虑了多个因素的权重。
+我们的分析模型显示，{home_team}的获胜概率为{rng.randint(60, 75)}%，这个数字综合考虑了多个因素的权重。
         """
         
         analysis = specialty_analyses.get(expert.primary_expertise, default_analysis)
         
         return analysis.strip()
     
-    def _generate_score_prediction(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_score_prediction(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate score prediction section (150-200 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
         # Generate predicted scores
-        home_goals = random.randint(1, 3)
-        away_goals = random.randint(0, 2)
+        home_goals = rng.randint(1, 3)
+        away_goals = rng.randint(0, 2)
         if away_goals >= home_goals:
             away_goals = home_goals - 1 if home_goals > 0 else 0
         
@@ -1800,68 +1860,64 @@ class PredictionExpertProfiles:
 综合以上所有分析维度，我们对本场比赛做出如下预测：
 
 **比分预测：**
-- 首选：{home_team} {home_goals}-{away_goals} {away_team}（概率{random.randint(15, 25)}%）
-- 次选：{home_team} {home_goals+1}-{away_goals+1} {away_team}（概率{random.randint(10, 18)}%）
-- 备选：{home_team} {max(home_goals-1, 0)}-{away_goals} {away_team}（概率{random.randint(8, 15)}%）
+- 首选：{home_team} {home_goals}-{away_goals} {away_team}（概率{rng.randint(15, 25)}%）
+- 次选：{home_team} {home_goals+1}-{away_goals+1} {away_team}（概率{rng.randint(10, 18)}%）
+- 备选：{home_team} {max(home_goals-1, 0)}-{away_goals} {away_team}（概率{rng.randint(8, 15)}%）
 
 **投注建议：**
 
 🎯 **核心推荐**：
-- 亚盘：{home_team} {random.choice(['-0.5', '-0.75', '-1'])}（信心指数：★★★★☆）
-- 大小球：{random.choice(['大2.5', '小2.5', '大2.75'])}（信心指数：★★★☆☆）
+- 亚盘：{home_team} {rng.choice(['-0.5', '-0.75', '-1'])}（信心指数：★★★★☆）
+- 大小球：{rng.choice(['大2.5', '小2.5', '大2.75'])}（信心指数：★★★☆☆）
 - 欧赔：主胜（信心指数：★★★★☆）
 
 💡 **价值投注**：
-- 半全场：主/主 @ {round(random.uniform(2.8, 3.5), 2)}倍
-- 正确比分：{home_goals}-{away_goals} @ {round(random.uniform(6.5, 9.5), 2)}倍
-- 进球时间：{random.choice(['0-30分钟有进球', '下半场大1.5球', '75分钟后有进球'])}
+- 半全场：主/主 @ {round(rng.uniform(2.8, 3.5), 2)}倍
+- 正确比分：{home_goals}-{away_goals} @ {round(rng.uniform(6.5, 9.5), 2)}倍
+- 进球时间：{rng.choice(['0-30分钟有进球', '下半场大1.5球', '75分钟后有进球'])}
 
 ⚠️ **风险控制**：
-- 建议投注金额：本金的{random.randint(2, 4)}%
-- 止损点：-{random.randint(5, 8)}%
-- 可考虑{random.choice(['分散投注', '滚球观察', '对冲下注', '保守跟进'])}策略
+- 建议投注金额：本金的{rng.randint(2, 4)}%
+- 止损点：-{rng.randint(5, 8)}%
+- 可考虑{rng.choice(['分散投注', '滚球观察', '对冲下注', '保守跟进'])}策略
 
-综合置信度：{random.randint(72, 88)}%
+综合置信度：{rng.randint(72, 88)}%
         """
         
         return analysis.strip()
     
-    def _generate_detailed_conclusion(self, expert: ExpertProfile, match_info: Dict[str, Any]) -> str:
+    def _generate_detailed_conclusion(self, expert: ExpertProfile, match_info: Dict[str, Any], rng: random.Random) -> str:
         """Generate detailed conclusion (100-150 words)"""
-        import random
-        
         home_team = match_info.get('home_team', '主队')
         away_team = match_info.get('away_team', '客队')
         
         conclusion = f"""
 **【总结与展望】**
 
-{random.choice(expert.conclusion_templates)}
+{rng.choice(expert.conclusion_templates)}
 
-本场{home_team}对阵{away_team}的比赛，从{random.choice(['基本面', '历史交锋', '近期状态', '人员配置', '盘口走势'])}等多个维度分析，{home_team}都展现出明显的优势。特别是在{random.choice(['主场作战', '状态正佳', '阵容完整', '战术成熟'])}的情况下，取胜概率较大。
+本场{home_team}对阵{away_team}的比赛，从{rng.choice(['基本面', '历史交锋', '近期状态', '人员配置', '盘口走势'])}等多个维度分析，{home_team}都展现出明显的优势。特别是在{rng.choice(['主场作战', '状态正佳', '阵容完整', '战术成熟'])}的情况下，取胜概率较大。
 
-当然，足球比赛充满变数，{away_team}也有{random.choice(['爆冷', '逆袭', '守住平局', '偷袭得手'])}的可能。建议各位朋友{random.choice(['理性投注', '控制风险', '量力而行', '谨慎跟进'])}，将娱乐性放在首位。
+当然，足球比赛充满变数，{away_team}也有{rng.choice(['爆冷', '逆袭', '守住平局', '偷袭得手'])}的可能。建议各位朋友{rng.choice(['理性投注', '控制风险', '量力而行', '谨慎跟进'])}，将娱乐性放在首位。
 
-最后，祝愿所有关注本场比赛的朋友都能有所收获。{random.choice(['红单不断', '好运常伴', '理性观赛', '享受足球'])}！
+最后，祝愿所有关注本场比赛的朋友都能有所收获。{rng.choice(['红单不断', '好运常伴', '理性观赛', '享受足球'])}！
 
 如需更多专业分析，欢迎关注{expert.nickname}的后续推送。我们下期再见！
         """
         
         return conclusion.strip()
     
-    def _generate_betting_recommendations(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_betting_recommendations(self, expert: ExpertProfile, match_info: Dict[str, Any], odds_info: Optional[Dict[str, Any]], rng: random.Random) -> List[Dict[str, Any]]:
         """Generate structured betting recommendations"""
-        import random
-        
         recommendations = []
         
         # Primary recommendation
         recommendations.append({
             'type': 'primary',
-            'bet': random.choice(expert.preferred_bet_types),
-            'stake': f"{random.randint(2, 4)}单位",
-            'odds': round(random.uniform(1.75, 2.25), 2),
-            'confidence': random.randint(75, 90),
+            'bet': rng.choice(expert.preferred_bet_types),
+            'stake': f"{rng.randint(2, 4)}单位",
+            'odds': round(rng.uniform(1.75, 2.25), 2),
+            'confidence': rng.randint(75, 90),
             'reasoning': f"基于{expert.primary_expertise.value}分析的核心推荐"
         })
         
@@ -1869,16 +1925,78 @@ class PredictionExpertProfiles:
         for _ in range(2):
             recommendations.append({
                 'type': 'secondary',
-                'bet': random.choice(['大小球', '让球盘', '半全场', '正确比分']),
-                'stake': f"{random.randint(1, 2)}单位",
-                'odds': round(random.uniform(1.65, 3.50), 2),
-                'confidence': random.randint(60, 75),
+                'bet': rng.choice(['大小球', '让球盘', '半全场', '正确比分']),
+                'stake': f"{rng.randint(1, 2)}单位",
+                'odds': round(rng.uniform(1.65, 3.50), 2),
+                'confidence': rng.randint(60, 75),
                 'reasoning': "备选投注方案"
             })
         
         return recommendations
 
 
+def _freeze_profile(profile: ExpertProfile) -> ExpertProfile:
+    """Replace the mutable containers of a profile with read-only ones"""
+    return replace(
+        profile,
+        secondary_expertise=tuple(profile.secondary_expertise),
+        specializations=tuple(profile.specializations),
+        tone_keywords=tuple(profile.tone_keywords),
+        signature_phrases=tuple(profile.signature_phrases),
+        analysis_priorities=tuple(profile.analysis_priorities),
+        key_metrics=tuple(profile.key_metrics),
+        preferred_bet_types=tuple(profile.preferred_bet_types),
+        article_templates=MappingProxyType(dict(profile.article_templates)),
+        opening_templates=tuple(profile.opening_templates),
+        conclusion_templates=tuple(profile.conclusion_templates)
+    )
+
+
+class ExpertRegistry:
+    """
+    Immutable, process-wide set of expert profiles
+
+    Built once and shared by every request. Profiles are frozen and all
+    lookups (by key, id, nickname, primary expertise) are dict lookups.
+    """
+
+    def __init__(self, experts: Dict[str, ExpertProfile]):
+        frozen = {key: _freeze_profile(profile) for key, profile in experts.items()}
+        by_expertise: Dict[ExpertiseArea, List[ExpertProfile]] = {}
+        for profile in frozen.values():
+            by_expertise.setdefault(profile.primary_expertise, []).append(profile)
+
+        self.by_key: Mapping[str, ExpertProfile] = MappingProxyType(frozen)
+        self.keys: Tuple[str, ...] = tuple(frozen)
+        self.profiles: Tuple[ExpertProfile, ...] = tuple(frozen.values())
+        self.by_id: Mapping[str, ExpertProfile] = MappingProxyType({p.id: p for p in self.profiles})
+        self.key_by_id: Mapping[str, str] = MappingProxyType({p.id: key for key, p in frozen.items()})
+        self.by_nickname: Mapping[str, ExpertProfile] = MappingProxyType({p.nickname: p for p in self.profiles})
+        self.by_expertise: Mapping[ExpertiseArea, Tuple[ExpertProfile, ...]] = MappingProxyType(
+            {area: tuple(profiles) for area, profiles in by_expertise.items()}
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, expert_key: str) -> bool:
+        return expert_key in self.by_key
+
+
+_expert_registry: Optional[ExpertRegistry] = None
+_expert_registry_lock = threading.Lock()
+
+
+def get_expert_registry() -> ExpertRegistry:
+    """Get the shared expert registry, building it on first use"""
+    global _expert_registry
+    if _expert_registry is None:
+        with _expert_registry_lock:
+            if _expert_registry is None:
+                _expert_registry = ExpertRegistry(PredictionExpertProfiles._initialize_experts())
+    return _expert_registry
+
+
 # Singleton instance for easy access
 prediction_experts = PredictionExpertProfiles()
 
@@ -1887,6 +2005,9 @@ __all__ = [
     'ExpertiseArea',
     'WritingStyle', 
     'ExpertProfile',
+    'ExpertRegistry',
     'PredictionExpertProfiles',
+    'expert_id',
+    'get_expert_registry',
     'prediction_experts'
 ]
\ No newline at end of file
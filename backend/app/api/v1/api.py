@@ -3,7 +3,7 @@
 from fastapi import APIRouter
 
 from app.api.v1.endpoints import matches, experts, statistics
-from app.api.v1 import predictions, predictions_enhanced, real_matches
+from app.api.v1 import predictions, predictions_enhanced, real_matches, metrics
 
 api_router = APIRouter()
 
@@ -13,4 +13,5 @@ api_router.include_router(experts.router, prefix="/experts", tags=["experts"])
 api_router.include_router(statistics.router, prefix="/statistics", tags=["statistics"])
 api_router.include_router(predictions.router, prefix="/predictions", tags=["predictions"])
 api_router.include_router(predictions_enhanced.router, tags=["predictions-enhanced"])
-api_router.include_router(real_matches.router, tags=["real-matches"])
\ No newline at end of file
+api_router.include_router(real_matches.router, tags=["real-matches"])
+api_router.include_router(metrics.router, tags=["metrics"])
\ No newline at end of file
@@ -1,12 +1,16 @@
 """Statistics endpoints."""
 
 from typing import List, Optional, Dict, Any
+from datetime import date as Date
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.domain.schemas import StatisticsResponse, SuccessResponse
 from app.services.statistics_service import StatisticsService
+from app.services.score_model_service import ScoreModelService, get_score_model
+from app.services.season_projection_service import get_season_projections
+from services.season_simulator import DEFAULT_SIMULATIONS
 
 router = APIRouter()
 
@@ -61,6 +65,39 @@ async def get_league_statistics(
     return stats
 
 
+@router.get("/leagues/{league_id}/projections", response_model=Dict[str, Any])
+def get_league_projections(
+    league_id: str = Path(..., description="League ID"),
+    season: Optional[str] = Query(None, description="Season (e.g., 2023-24)"),
+    simulations: int = Query(
+        DEFAULT_SIMULATIONS, ge=1000, le=100000,
+        description="Number of simulated seasons, rounded up to 10000, 20000, 50000 or 100000"
+    ),
+    top_n: int = Query(4, ge=1, le=10, description="Places counted for the top-N odds"),
+    relegation: int = Query(3, ge=0, le=6, description="Relegation places"),
+    refresh: bool = Query(False, description="Simulate again from scratch"),
+    db: Session = Depends(get_db)
+):
+    """
+    Project the final league table.
+    
+    The remaining fixtures are simulated many times with score-model
+    probabilities. The result is cached and updated in place as matches
+    finish. A plain def route, so a full run happens on the threadpool
+    instead of the event loop. Returns per team:
+    - Current points, goal difference and games played
+    - Expected final points
+    - Title, top-N and relegation probabilities
+    - Probability of every final position
+    """
+    projections = get_season_projections(db, league_id, season, simulations, top_n, relegation, refresh)
+    
+    if not projections:
+        raise HTTPException(status_code=404, detail="League not found")
+    
+    return projections
+
+
 @router.get("/trends", response_model=Dict[str, Any])
 async def get_betting_trends(
     period: str = Query("week", pattern="^(day|week|month)$", description="Time period"),
@@ -107,4 +144,27 @@ async def compare_teams(
     if not comparison:
         raise HTTPException(status_code=404, detail="One or both teams not found")
     
-    return comparison
\ No newline at end of file
+    return comparison
+
+
+@router.get("/score-probabilities", response_model=Dict[str, Any])
+def get_score_probabilities(
+    date: Date = Query(..., description="Matchday (YYYY-MM-DD)"),
+    league: Optional[str] = Query(None, description="Filter by league"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get score-model probabilities for every fixture of a matchday.
+    
+    All fixtures are priced in one batched call of the Poisson / Dixon–Coles
+    model fitted on finished matches. A plain def route: refitting the
+    model after new results runs on the threadpool, not the event loop.
+    Returns per fixture:
+    - Expected goals
+    - Most likely scores
+    - 1X2, over/under, both teams to score and Asian handicap probabilities
+    """
+    model = get_score_model(db)
+    fixtures = ScoreModelService(db).predict_matchday(date, league, model)
+    
+    return {"date": date.isoformat(), "model": model.stats(), "fixtures": fixtures}
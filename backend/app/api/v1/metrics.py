@@ -0,0 +1,54 @@
+"""
+Runtime metrics endpoints
+"""
+
+from fastapi import APIRouter, Query
+from typing import Dict, Any
+
+from services.response_cache import get_response_cache
+from services.request_coalescer import get_request_coalescer
+from services.rate_limiter import get_rate_limiter
+from services.circuit_breaker import get_circuit_breaker
+from services.article_cache import get_article_cache
+from app.core.llm_telemetry import get_llm_telemetry
+from app.core.model_router import get_model_router
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/football-api")
+async def get_football_api_metrics() -> Dict[str, Any]:
+    """
+    API-Sports 调用指标：限流队列深度、剩余配额、熔断状态、缓存命中率、请求合并统计
+    """
+    cache = get_response_cache()
+    return {
+        "rate_limiter": get_rate_limiter().metrics(),
+        "circuit_breaker": get_circuit_breaker().stats(),
+        "cache": cache.stats() if cache else None,
+        "coalescer": get_request_coalescer().stats()
+    }
+
+
+@router.get("/articles")
+async def get_article_cache_metrics() -> Dict[str, Any]:
+    """
+    文章缓存指标：命中率、快照变化导致的失效次数、条目数和占用大小
+    """
+    cache = get_article_cache()
+    return {"cache": cache.stats() if cache else None}
+
+
+@router.get("/llm")
+async def get_llm_metrics(recent: int = Query(0, ge=0, le=200)) -> Dict[str, Any]:
+    """
+    LLM 调用指标：按模型统计最近调用的 p50/p95 延迟、输出 token 速度、每篇文章成本，以及累计 token 和费用；
+    routing 为模型路由的决策次数和原因
+    """
+    telemetry = get_llm_telemetry()
+    router = get_model_router()
+    summary = telemetry.summary()
+    summary["routing"] = router.stats() if router else None
+    if recent:
+        summary["recent"] = telemetry.recent(recent)
+    return summary
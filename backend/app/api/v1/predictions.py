@@ -19,6 +19,7 @@ from agents.football_prediction_writer import (
     OddsInfo,
     HistoricalData
 )
+from app.services.score_model_service import cached_score_model
 
 router = APIRouter(prefix="/predictions", tags=["predictions"])
 
@@ -67,7 +68,7 @@ async def generate_prediction(request: GeneratePredictionRequest):
     根据提供的比赛信息、赔率、历史数据等，生成专业的预测分析文章。
     """
     try:
-        writer = FootballPredictionWriter()
+        writer = FootballPredictionWriter(score_model=cached_score_model())
         
         # 转换请求数据为内部数据结构
         home_team = TeamInfo(
@@ -156,7 +157,7 @@ async def generate_demo_prediction():
     
     使用预设数据生成一个完整的预测示例
     """
-    writer = FootballPredictionWriter()
+    writer = FootballPredictionWriter(score_model=cached_score_model())
     
     # 示例数据
     home_team = TeamInfo(
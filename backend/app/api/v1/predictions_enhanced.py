@@ -46,6 +46,8 @@ except ImportError:
     OddsInfo = football_prediction_writer.OddsInfo
     HistoricalData = football_prediction_writer.HistoricalData
 
+from app.services.score_model_service import cached_score_model
+
 router = APIRouter(prefix="/predictions/enhanced", tags=["predictions-enhanced"])
 
 # 请求模型
@@ -88,22 +90,25 @@ async def generate_prediction_with_real_data(request: PredictionRequest):
     3. 获取伤病信息
     4. 获取实时赔率
     5. 生成专业的预测文章
+    
+    步骤1-4并发执行，耗时取决于最慢的单个请求。
     """
     try:
         # 获取API客户端
         client = get_api_client()
         aggregator = FootballDataAggregator(client)
         
-        # 获取真实数据
-        real_data = aggregator.prepare_prediction_data(
+        # 并发获取真实数据（各数据源并行请求，单个数据源超时则使用部分数据）
+        real_data = await aggregator.prepare_prediction_data_async(
             home_team_id=request.home_team_id,
             away_team_id=request.away_team_id,
             league_id=request.league_id,
-            fixture_id=request.fixture_id
+            fixture_id=request.fixture_id,
+            kickoff=request.match_time
         )
         
         # 创建写作器
-        writer = FootballPredictionWriter()
+        writer = FootballPredictionWriter(score_model=cached_score_model())
         
         # 转换数据格式
         home_team = TeamInfo(
@@ -182,7 +187,7 @@ async def quick_prediction(request: QuickPredictionRequest):
     """
     try:
         # 创建写作器
-        writer = FootballPredictionWriter()
+        writer = FootballPredictionWriter(score_model=cached_score_model())
         
         # 使用默认数据（实际应用中可以通过名称搜索获取ID）
         home_team = TeamInfo(
@@ -254,11 +259,12 @@ async def get_ai_predictions(match_data: Dict) -> Dict:
     """
     try:
         # 导入Claude配置
-        from app.core.claude_config import get_claude_client
+        from app.core.claude_config import get_async_claude_client
+        from app.core.model_router import TASK_QUICK
         import json
         
-        # 获取Claude 4.0客户端
-        client = get_claude_client()
+        # 获取异步Claude客户端（并发上限、429/529重试、调用超时），不阻塞事件循环
+        client = get_async_claude_client()
         
         # 构建提示
         prompt = f"""基于以下数据，预测比赛结果：
@@ -280,11 +286,13 @@ async def get_ai_predictions(match_data: Dict) -> Dict:
 
 请用JSON格式回复：{{"result": "主胜", "score": "2-1", "reason": "主场优势明显"}}"""
 
-        # 使用Claude 4.0 (3.5 Sonnet) 调用API
-        result = client.create_message(
+        # 简短的 JSON 预测由路由器选择快速模型（Haiku）
+        result = await client.create_message(
             prompt=prompt,
             max_tokens=200,
-            temperature=0.7
+            temperature=0.7,
+            deadline=20,
+            model=client.select_model(TASK_QUICK, max_tokens=200, latency_budget=20)
         )
         
         if result["success"]:
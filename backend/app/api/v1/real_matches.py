@@ -2,55 +2,124 @@
 Real-time match data API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, joinedload
 import logging
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.core.claude_config import get_claude_client, get_async_claude_client
 from services.football_api_client import FootballAPIClient
+from services.fixture_store import FIXTURE_STORE_TTL
+from services.snapshot_cache import SnapshotCache
 from agents.football_prediction_writer import FootballPredictionWriter
 from agents.enhanced_football_writer import EnhancedFootballWriter
-from agents.prediction_experts import PredictionExpertProfiles
-from app.domain.models import Expert, Prediction
-import uuid
+from agents.fixture_analysis import FixtureAnalysisPipeline
+from agents.prediction_experts import get_expert_registry, prediction_experts
+from agents.article_templates import seeded_rng
+from app.domain.models import Prediction
+from app.services.match_service import MatchService
+from app.services.score_model_service import cached_score_model
+from app.services.article_batch_service import MAX_WORKERS, ArticleBatchJob, to_ndjson
+from app.services.article_stream_service import (
+    demo_match_inputs, demo_team_names, save_prediction, stream_article
+)
 import random
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/real-matches", tags=["real-matches"])
 
+# Process-wide Football API client (shares the pooled HTTP connections)
+_football_client = None
+
 def get_football_client():
     """Get Football API client instance"""
-    try:
-        return FootballAPIClient()
-    except Exception as e:
-        logger.error(f"Failed to initialize FootballAPIClient: {e}")
-        return None
+    global _football_client
+    if _football_client is None:
+        try:
+            _football_client = FootballAPIClient()
+        except Exception as e:
+            logger.error(f"Failed to initialize FootballAPIClient: {e}")
+            return None
+    return _football_client
+
+# Last good today/tomorrow fixtures, served immediately and refreshed in the background.
+# Refreshes bypass the fixture store and response cache (so they really revalidate);
+# refreshing once per fixture TTL keeps upstream traffic at the cached rate.
+MATCHES_SNAPSHOT_MAX_AGE = FIXTURE_STORE_TTL
+_matches_snapshot = None  # (date, snapshot)
+
+def get_matches_snapshot(client: FootballAPIClient, today: Optional[str] = None) -> SnapshotCache:
+    """
+    Get the stale-while-revalidate snapshot for today/tomorrow fixtures.
+
+    The snapshot belongs to one date (default: today). A new date starts an
+    empty snapshot, so an upstream outage after midnight never serves the
+    previous day's lists as today's.
+    """
+    global _matches_snapshot
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    if _matches_snapshot is None or _matches_snapshot[0] != today:
+        _matches_snapshot = (today, SnapshotCache(
+            lambda: client.get_today_tomorrow_matches_async(strict=True, today=today, refresh=True),
+            max_age=MATCHES_SNAPSHOT_MAX_AGE
+        ))
+    return _matches_snapshot[1]
 
 def get_prediction_writer():
     """Get prediction writer instance"""
     try:
         # Use enhanced writer for longer articles (1000-1500 words)
-        return EnhancedFootballWriter()
+        return EnhancedFootballWriter(score_model=cached_score_model())
     except Exception as e:
         logger.error(f"Failed to initialize EnhancedFootballWriter: {e}")
         # Fallback to basic writer
         try:
-            return FootballPredictionWriter()
+            return FootballPredictionWriter(score_model=cached_score_model())
         except:
             return None
 
+def select_expert_key(fixture_id: int, expert_id: Optional[str] = None) -> str:
+    """
+    Expert for a generated article: the requested one, or a fixed pick per
+    fixture (the same fixture always gets the same expert)
+    """
+    experts = get_expert_registry()
+    if expert_id:
+        expert_key = experts.key_by_id.get(expert_id)
+        if expert_key is None:
+            raise HTTPException(status_code=404, detail="Expert not found")
+        return expert_key
+    return seeded_rng(fixture_id, "expert-selection").choice(experts.keys)
+
 @router.get("/today-tomorrow")
-async def get_today_tomorrow_matches():
+async def get_today_tomorrow_matches(db: Session = Depends(get_db)):
     """
     获取今天和明天的K联赛、J联赛真实比赛数据
+    
+    开启数据同步（INGESTION_ENABLED）时只读本地数据库，不请求上游API。
+    否则返回最近一次成功获取的快照，过期时在后台刷新；上游不可用（熔断打开）时
+    仍立即返回旧快照，并通过 stale 标记告知调用方，不再返回模拟比赛。
     """
+    if settings.INGESTION_ENABLED:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        service = MatchService(db)
+        return {
+            "status": "success",
+            "data": {
+                "today": service.get_ingested_fixtures(today, today + timedelta(days=1)),
+                "tomorrow": service.get_ingested_fixtures(today + timedelta(days=1), today + timedelta(days=2))
+            }
+        }
+    
     client = get_football_client()
     
     if not client:
-        # Fallback to mock data if API client fails
+        # No API key configured: fall back to demo fixtures
         return {
             "status": "success",
             "data": {
@@ -93,40 +162,14 @@ async def get_today_tomorrow_matches():
             }
         }
     
-    try:
-        matches = client.get_today_tomorrow_matches()
-        return {
-            "status": "success",
-            "data": matches
-        }
-    except Exception as e:
-        logger.error(f"Error fetching matches: {e}")
-        # Return mock data as fallback
-        return {
-            "status": "success",
-            "data": {
-                "today": [
-                    {
-                        "fixture_id": 1001,
-                        "date": datetime.now().isoformat(),
-                        "venue": "首尔世界杯竞技场",
-                        "home_team": {"id": 2750, "name": "FC首尔", "logo": ""},
-                        "away_team": {"id": 2749, "name": "蔚山现代", "logo": ""},
-                        "league": {"id": 292, "name": "K联赛1", "country": "韩国"}
-                    }
-                ],
-                "tomorrow": [
-                    {
-                        "fixture_id": 1003,
-                        "date": (datetime.now() + timedelta(days=1)).replace(hour=15, minute=0).isoformat(),
-                        "venue": "全州世界杯竞技场",
-                        "home_team": {"id": 2751, "name": "全北现代", "logo": ""},
-                        "away_team": {"id": 2748, "name": "浦项制铁", "logo": ""},
-                        "league": {"id": 292, "name": "K联赛1", "country": "韩国"}
-                    }
-                ]
-            }
-        }
+    matches, meta = await get_matches_snapshot(client).get()
+    return {
+        "status": "success",
+        "data": matches or {"today": [], "tomorrow": []},
+        "stale": meta["stale"],
+        "snapshot_age_seconds": meta["age_seconds"],
+        "upstream": client.circuit_breaker.state
+    }
 
 @router.post("/generate-prediction/{fixture_id}")
 async def generate_match_prediction(
@@ -139,15 +182,7 @@ async def generate_match_prediction(
     """
     client = get_football_client()
     writer = get_prediction_writer()
-    expert_profiles = PredictionExpertProfiles()
-    
-    # 选择专家，如果没有指定就随机选择
-    if expert_id:
-        expert_key = next((k for k, v in expert_profiles.experts.items() if v.id == expert_id), None)
-    else:
-        expert_key = random.choice(list(expert_profiles.experts.keys()))
-    
-    selected_expert_profile = expert_profiles.experts[expert_key]
+    expert_key = select_expert_key(fixture_id, expert_id)
     
     # Initialize prediction content
     prediction_content = None
@@ -156,75 +191,17 @@ async def generate_match_prediction(
     try:
         if writer and client:
             # For demo, use mock data but real AI generation
-            from agents.enhanced_football_writer import TeamInfo, MatchInfo, OddsInfo, HistoricalData
+            match_info, odds_info, historical_data = demo_match_inputs()
             
-            # Create mock match info (in production, fetch from API)
-            home_team = TeamInfo(
-                name="主队",
-                recent_form=['W', 'W', 'D', 'L', 'W'],
-                league_position=3,
-                home_away_record='主场8胜3平2负',
-                key_players_status={},
-                recent_performance='近5场3胜1平1负，进11球失5球，状态出色',
-                goals_scored=11,
-                goals_conceded=5,
-                top_scorer='前锋王',
-                formation='4-3-3'
-            )
-            
-            away_team = TeamInfo(
-                name="客队",
-                recent_form=['L', 'D', 'W', 'W', 'L'],
-                league_position=5,
-                home_away_record='客场3胜3平6负',
-                key_players_status={'核心球员': '伤缺'},
-                recent_performance='近5场2胜1平2负，进7球失9球，防守问题明显',
-                goals_scored=7,
-                goals_conceded=9,
-                top_scorer='中场李',
-                formation='4-5-1'
-            )
-            
-            match_info = MatchInfo(
-                home_team=home_team,
-                away_team=away_team,
-                league="联赛",
-                match_time="2024-12-01 15:00:00",
-                venue="主场体育场",
-                weather="晴朗",
-                referee="主裁判",
-                importance="常规赛"
-            )
-            
-            odds_info = OddsInfo(
-                home_win=2.10,
-                draw=3.20,
-                away_win=3.50,
-                asian_handicap="主队-0.5",
-                over_under="2.5球",
-                odds_trend="主队赔率略有下降"
-            )
-            
-            historical_data = HistoricalData(
-                h2h_results=[
-                    {'winner': 'home', 'score': '2-1'},
-                    {'winner': 'draw', 'score': '1-1'},
-                    {'winner': 'home', 'score': '3-0'},
-                    {'winner': 'away', 'score': '0-1'},
-                    {'winner': 'home', 'score': '2-0'}
-                ],
-                home_team_home_record='主队主场对阵客队4胜1平1负，场均进2.3球失0.8球',
-                away_team_away_record='客队客场对阵主队1胜1平4负，场均进0.7球失2.0球',
-                last_meeting_details='上次交锋在2个月前，主队2-1击败客队'
-            )
-            
-            # Generate AI prediction
+            # Generate AI prediction (the enhanced writer caches one article per expert)
+            cache_slot = {"expert": expert_key} if isinstance(writer, EnhancedFootballWriter) else {}
             prediction_result = writer.generate_prediction(
                 match_info=match_info,
                 odds_info=odds_info,
                 historical_data=historical_data,
                 expert_confidence=85,
-                api_predictions=None
+                api_predictions=None,
+                **cache_slot
             )
             
             prediction_content = prediction_result.get("full_article", "生成预测中...")
@@ -235,56 +212,18 @@ async def generate_match_prediction(
     # Generate expert-specific prediction using profile
     if not prediction_content:
         # Use the new detailed prediction generation method
-        # Get match teams from the request or use defaults
-        home_team = "FC首尔" if fixture_id == 1001 else "浦和红钻" if fixture_id == 1002 else "全北现代" if fixture_id == 1003 else "川崎前锋"
-        away_team = "蔚山现代" if fixture_id == 1001 else "横滨水手" if fixture_id == 1002 else "浦项制铁" if fixture_id == 1003 else "鹿岛鹿角"
+        home_team, away_team = demo_team_names(fixture_id)
         
         # Generate detailed prediction using the expert's comprehensive method
-        prediction_content = expert_profiles.generate_detailed_prediction(
+        prediction_content = prediction_experts.generate_detailed_prediction(
             expert_key,
             home_team,
             away_team,
             fixture_id
         )
     
-    # Get or create expert based on selected profile
-    expert = db.query(Expert).filter(Expert.name == selected_expert_profile.name).first()
-    if not expert:
-        expert = Expert(
-            id=selected_expert_profile.id,
-            name=selected_expert_profile.name,
-            avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed={expert_key}",
-            bio=selected_expert_profile.bio,
-            win_rate=selected_expert_profile.win_rate,
-            avg_return=selected_expert_profile.avg_return,
-            total_predictions=selected_expert_profile.total_predictions,
-            successful_predictions=selected_expert_profile.successful_predictions,
-            followers_count=selected_expert_profile.followers_count,
-            specializations=selected_expert_profile.specializations
-        )
-        db.add(expert)
-        db.commit()
-    
-    
-    # Create prediction
-    prediction = Prediction(
-        id=str(uuid.uuid4()),
-        match_id=str(fixture_id),
-        expert_id=expert.id,
-        prediction_type="match_result",
-        predicted_outcome="home_win",
-        confidence=75,
-        stake_level="medium",
-        odds=2.10,
-        potential_return=210.0,
-        reasoning=prediction_content,
-        key_factors='{"form": "good", "h2h": "favorable", "injuries": "none"}',
-        likes_count=0,
-        comments_count=0
-    )
-    
-    db.add(prediction)
-    db.commit()
+    # Get or create expert based on selected profile, then store the prediction
+    prediction, expert = save_prediction(db, fixture_id, expert_key, prediction_content)
     
     return {
         "status": "success",
@@ -302,16 +241,114 @@ async def generate_match_prediction(
         }
     }
 
+@router.post("/generate-expert-predictions/{fixture_id}")
+async def generate_expert_predictions(
+    fixture_id: int,
+    expert_ids: Optional[List[str]] = Query(None, description="默认全部专家"),
+    use_claude: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    为指定比赛一次生成多位专家的预测
+
+    两阶段生成：比赛分析只做一次（模板写作器或 Claude），再按每位专家的写作风格改写；
+    use_claude=true 时每位专家只需一次短的 Claude 调用，不可用时按模板渲染。
+    """
+    expert_keys = [select_expert_key(fixture_id, expert_id) for expert_id in expert_ids] if expert_ids else None
+    match_info, odds_info, historical_data = demo_match_inputs()
+    pipeline = FixtureAnalysisPipeline()
+
+    articles = None
+    if use_claude:
+        try:
+            articles = await pipeline.expert_articles_with_claude(
+                get_async_claude_client(), match_info, odds_info, historical_data,
+                expert_keys=expert_keys, fixture_id=fixture_id, deadline=60
+            )
+        except ValueError:
+            # No ANTHROPIC_API_KEY configured
+            articles = None
+    if articles is None:
+        articles = pipeline.expert_articles(
+            match_info, odds_info, historical_data, expert_keys=expert_keys, fixture_id=fixture_id
+        )
+
+    data = []
+    for expert_key, article in articles.items():
+        prediction, expert = save_prediction(db, fixture_id, expert_key, article["full_article"])
+        data.append({
+            "prediction_id": prediction.id,
+            "fixture_id": fixture_id,
+            "title": article["title"],
+            "content": prediction.reasoning,
+            "predicted_score": article["predicted_score"],
+            "source": article["source"],
+            "expert": {
+                "key": expert_key,
+                "name": expert.name,
+                "win_rate": expert.win_rate
+            }
+        })
+
+    return {"status": "success", "data": data}
+
+@router.get("/generate-prediction/{fixture_id}/stream")
+async def stream_match_prediction(
+    fixture_id: int,
+    expert_id: str = None,
+    use_claude: bool = True
+):
+    """
+    流式生成比赛预测（Server-Sent Events）
+
+    有 Claude API Key 时逐 token 转发模型输出，否则模板写作器按章节推送；
+    生成完成后保存到 Prediction.reasoning，最后一个 done 事件带 prediction_id。
+    """
+    expert_key = select_expert_key(fixture_id, expert_id)
+    
+    claude = None
+    if use_claude:
+        try:
+            claude = get_claude_client()
+        except ValueError:
+            # No ANTHROPIC_API_KEY configured
+            claude = None
+    
+    return StreamingResponse(
+        stream_article(fixture_id, expert_key, SessionLocal, claude=claude, writer=get_prediction_writer()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/batch-generate")
+async def batch_generate_predictions(
+    date: str = Query(..., description="首日，YYYY-MM-DD"),
+    days: int = Query(1, ge=1, le=7),
+    league_ids: Optional[List[int]] = Query(None),
+    workers: Optional[int] = Query(None, ge=1, le=MAX_WORKERS),
+    data_version: str = ""
+):
+    """
+    为日期范围内的全部比赛 × 全部专家批量生成文章并写入数据库
+
+    比赛来自本地已入库的数据，文章在进程池中渲染，按批次写库，以 NDJSON 逐行返回进度。
+    """
+    try:
+        date_from = datetime.fromisoformat(date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date, expected YYYY-MM-DD")
+
+    job = ArticleBatchJob(workers=workers, data_version=data_version)
+    events = job.run(date_from, date_from + timedelta(days=days), league_ids)
+    return StreamingResponse(to_ndjson(events), media_type="application/x-ndjson")
+
 @router.get("/experts")
 async def get_experts_list(db: Session = Depends(get_db)):
     """
     获取所有专家列表
     """
-    # Initialize expert profiles
-    expert_profiles = PredictionExpertProfiles()
-    
     result = []
-    for expert_key, profile in expert_profiles.experts.items():
+    for expert_key, profile in get_expert_registry().by_key.items():
         result.append({
             "id": profile.id,
             "name": profile.name,
@@ -334,17 +371,27 @@ async def get_experts_list(db: Session = Depends(get_db)):
 async def get_match_predictions(db: Session = Depends(get_db)):
     """
     获取所有比赛预测列表，用于前端展示
+
+    只读取列表字段和预先存好的摘要，不加载文章正文；专家与预测在同一条查询中取出。
     """
     # Get recent predictions
-    predictions = db.query(Prediction).order_by(Prediction.created_at.desc()).limit(20).all()
+    predictions = (
+        db.query(Prediction)
+        .options(defer(Prediction.reasoning), joinedload(Prediction.expert))
+        .order_by(Prediction.created_at.desc())
+        .limit(20)
+        .all()
+    )
     
     result = []
     for pred in predictions:
-        expert = db.query(Expert).filter(Expert.id == pred.expert_id).first()
+        expert = pred.expert
+        # Rows saved before the summary column existed load their article once here
+        summary = pred.summary if pred.summary is not None else Prediction.summarize(pred.reasoning)
         result.append({
             "id": pred.id,
             "title": f"比赛预测 - {pred.predicted_outcome}",
-            "summary": pred.reasoning[:100] + "..." if pred.reasoning and len(pred.reasoning) > 100 else pred.reasoning or "暂无预测内容",
+            "summary": summary or "暂无预测内容",
             "confidence": pred.confidence,
             "predicted_outcome": pred.predicted_outcome,
             "match_time": pred.created_at.isoformat(),
@@ -1,11 +1,22 @@
 """Claude API configuration and client management."""
 
 import os
-from typing import Optional, Dict, Any
+import copy
+import time
+import random
+import asyncio
+from typing import Awaitable, Callable, Optional, Dict, Any, Iterator, List, Mapping, Tuple, Union
+import json
 import anthropic
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 import logging
 
+from services.article_cache import ArticleCache, MISS, fingerprint, get_article_cache
+from app.core.llm_telemetry import (
+    LLMTelemetry, OUTCOME_ERROR, OUTCOME_SUCCESS, OUTCOME_TIMEOUT, get_llm_telemetry
+)
+from app.core.model_router import ModelRouter, TASK_ARTICLE, get_model_router
+
 logger = logging.getLogger(__name__)
 
 # Claude model versions
@@ -25,77 +36,357 @@ CLAUDE_MODELS = {
 # Default model to use
 DEFAULT_MODEL = CLAUDE_MODELS["claude-4-sonnet"]  # Use Sonnet 4.0 (Claude 3.5 Sonnet V2) as default
 
-class ClaudeClient:
-    """Enhanced Claude API client with model management."""
+# Async client limits (see AsyncClaudeClient)
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "4"))
+CLAUDE_MAX_RETRIES = int(os.getenv("CLAUDE_MAX_RETRIES", "3"))
+CLAUDE_CALL_DEADLINE = float(os.getenv("CLAUDE_CALL_DEADLINE", "90"))
+
+# Rate limited and overloaded responses are worth retrying; other errors are not
+RETRY_STATUSES = frozenset({429, 529})
+
+# Shortest prompt prefix the API will cache, in tokens; shorter prefixes are
+# billed as normal input even with a cache_control marker
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_MIN_TOKENS_HAIKU = 2048
+# Rough characters per token for the mixed Chinese/JSON prompts
+CHARS_PER_TOKEN = 2
+
+# Bump when the prediction prompt changes so cached articles from the old prompt are not served
+PROMPT_VERSION = "prediction-2"
+
+PREDICTION_SYSTEM_PROMPT = """You are an expert football analyst with deep knowledge of statistics, 
+team dynamics, and betting markets. Provide detailed and insightful predictions based on data.
+Always respond in Chinese and maintain a professional tone."""
+
+class BaseClaudeClient:
+    """Settings, prompts and cache keys shared by the sync and async clients."""
     
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[ArticleCache] = None,
+        telemetry: Optional[LLMTelemetry] = None,
+        router: Optional[ModelRouter] = None
+    ):
         """
-        Initialize Claude client.
-        
         Args:
             api_key: Anthropic API key (defaults to env variable)
             model: Model to use (defaults to Claude 4 Sonnet)
+            cache: Article cache for generate_prediction (defaults to the shared cache)
+            telemetry: Call recorder (defaults to the shared one behind /metrics/llm)
+            router: Picks the model per request; without one every request uses model
         """
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
         
-        self.client = Anthropic(api_key=self.api_key)
         self.model = model or DEFAULT_MODEL
+        self.cache = cache if cache is not None else get_article_cache()
+        self.telemetry = telemetry if telemetry is not None else get_llm_telemetry()
+        self.router = router
+    
+    def _message_kwargs(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        max_tokens: int,
+        temperature: float,
+        system: Union[str, List[Dict[str, Any]], None],
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Request parameters shared by the create and stream calls.
+        
+        prompt and system are plain strings or lists of content blocks (for
+        cache_control markers). model overrides the client's model.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        
+        # Recent SDK releases no longer accept temperature as a keyword argument;
+        # extra_body sends the same request field with every SDK version
+        kwargs = {
+            "model": model or self.model,
+            "max_tokens": max_tokens,
+            "messages": messages,
+            "extra_body": {"temperature": temperature}
+        }
+        
+        # Add system message if provided
+        if system:
+            kwargs["system"] = system
+        return kwargs
+    
+    @staticmethod
+    def _usage(response: Any) -> Dict[str, Optional[int]]:
+        """
+        Token usage of a response.
+        
+        input_tokens counts only the uncached part of the prompt; prompt-cache
+        reads and writes are reported separately.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return {"input_tokens": None, "output_tokens": None}
+        return {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0
+        }
+    
+    def load(self) -> float:
+        """Queue pressure reported to the router, 1.0 = every slot busy."""
+        return 0.0
+    
+    def select_model(
+        self,
+        task: str,
+        max_tokens: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        cost_budget: Optional[float] = None
+    ) -> str:
+        """
+        Model for one request: the router's choice for the task at the
+        current load, or the client's model when there is no router.
+        """
+        if self.router is None:
+            return self.model
+        return self.router.route(task, self.load(), max_tokens, latency_budget, cost_budget).model
+    
+    def _cache_key(
+        self,
+        match_data: Dict[str, Any],
+        expert_style: Optional[str]
+    ) -> Tuple[str, str, str, Any]:
+        """
+        (namespace, expert, fingerprint, fixture id) for the article cache.
+        
+        The model is not part of the key: the router moves article traffic
+        to Haiku under load, and articles cached by either model keep being
+        served then. The cached result's "model" records which one wrote it.
+        """
+        return (
+            f"claude:{PROMPT_VERSION}",
+            expert_style or "default",
+            fingerprint(match_data, expert_style),
+            match_data.get("fixture_id")
+        )
+
+    @staticmethod
+    def _prediction_prompts(
+        match_data: Dict[str, Any],
+        expert_style: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        (system blocks, user content blocks) for a match prediction article.
+        
+        The system prompt, match facts and writing instructions are the same
+        for every expert style and end with a cache_control marker; only the
+        short expert style block after it differs between requests. The API
+        only caches the prefix once it reaches the model's minimum (see
+        prompt_cache_min_tokens). A fixture with just team summaries stays
+        well below that and is billed as normal input. The prefix is shared
+        only when the full match data (odds, head-to-head history) is long
+        enough.
+        """
+        home = match_data.get('home_team', {})
+        away = match_data.get('away_team', {})
+        shared = f"""比赛数据：
+
+主队：{home.get('name', '主队')}
+- 联赛排名：第{home.get('league_position', 'N/A')}位
+- 近期战绩：{home.get('recent_performance', 'N/A')}
+- 主场战绩：{home.get('home_away_record', 'N/A')}
+
+客队：{away.get('name', '客队')}
+- 联赛排名：第{away.get('league_position', 'N/A')}位
+- 近期战绩：{away.get('recent_performance', 'N/A')}
+- 客场战绩：{away.get('home_away_record', 'N/A')}
+
+完整数据（JSON）：
+{json.dumps(match_data, ensure_ascii=False, sort_keys=True, default=str)}
+
+基于以上数据，提供详细的比赛预测分析（1000-1500字）。
+
+请提供：
+1. 详细的基本面分析（300-400字）
+2. 历史交锋分析（200-300字）
+3. 伤停和阵容分析（200-300字）
+4. 盘口和赔率解读（200-300字）
+5. 综合预测和投注建议（200-300字）
+
+要求：
+- 使用专业术语
+- 数据支撑观点
+- 逻辑清晰
+- 给出具体比分预测
+- 提供置信度百分比"""
+        
+        system = [{"type": "text", "text": PREDICTION_SYSTEM_PROMPT}]
+        content = [{"type": "text", "text": shared, "cache_control": {"type": "ephemeral"}}]
+        if expert_style:
+            content.append({"type": "text", "text": f"Analyze in the style of: {expert_style}"})
+        return system, content
+    
+    @staticmethod
+    def prompt_cache_min_tokens(model: str) -> int:
+        """Shortest prefix the prompt cache accepts for model."""
+        return PROMPT_CACHE_MIN_TOKENS_HAIKU if "haiku" in model else PROMPT_CACHE_MIN_TOKENS
+    
+    @classmethod
+    def cacheable_prefix(
+        cls,
+        match_data: Dict[str, Any],
+        model: str
+    ) -> bool:
+        """Whether the shared prediction prompt prefix is long enough to be cached for model."""
+        system, content = cls._prediction_prompts(match_data)
+        chars = sum(len(block["text"]) for block in system + content)
+        return chars // CHARS_PER_TOKEN >= cls.prompt_cache_min_tokens(model)
+    
+    def set_model(self, model_key: str):
+        """
+        Change the model being used.
+        
+        Pinning a model turns off per-request routing for this client.
+        
+        Args:
+            model_key: Key from CLAUDE_MODELS dict
+        """
+        if model_key in CLAUDE_MODELS:
+            self.model = CLAUDE_MODELS[model_key]
+            self.router = None
+            logger.info(f"Model changed to: {self.model}")
+        else:
+            raise ValueError(f"Invalid model key: {model_key}. Available: {list(CLAUDE_MODELS.keys())}")
+
+
+class ClaudeClient(BaseClaudeClient):
+    """Enhanced Claude API client with model management."""
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[ArticleCache] = None,
+        telemetry: Optional[LLMTelemetry] = None,
+        router: Optional[ModelRouter] = None
+    ):
+        """
+        Initialize Claude client.
+        
+        Args:
+            api_key: Anthropic API key (defaults to env variable)
+            model: Model to use (defaults to Claude 4 Sonnet)
+            cache: Article cache for generate_prediction (defaults to the shared cache)
+            telemetry: Call recorder (defaults to the shared one behind /metrics/llm)
+            router: Picks the model per request; without one every request uses model
+        """
+        super().__init__(api_key, model, cache, telemetry, router)
+        self.in_flight = 0
+        self.client = Anthropic(api_key=self.api_key)
         logger.info(f"Initialized Claude client with model: {self.model}")
     
+    def load(self) -> float:
+        """Requests in flight relative to CLAUDE_MAX_CONCURRENCY."""
+        return self.in_flight / CLAUDE_MAX_CONCURRENCY
+    
     def create_message(
         self,
-        prompt: str,
+        prompt: Union[str, List[Dict[str, Any]]],
         max_tokens: int = 4096,
         temperature: float = 0.7,
-        system: Optional[str] = None
+        system: Union[str, List[Dict[str, Any]], None] = None,
+        model: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a message using Claude API.
         
         Args:
-            prompt: User prompt
+            prompt: User prompt (text or content blocks)
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
-            system: System prompt
+            system: System prompt (text or content blocks)
+            model: Model for this request (defaults to the client's model)
             
         Returns:
             Response from Claude API
         """
+        model = model or self.model
+        started = time.perf_counter()
+        self.in_flight += 1
         try:
-            messages = [{"role": "user", "content": prompt}]
-            
-            # Add system message if provided
-            kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": messages
-            }
-            
-            if system:
-                kwargs["system"] = system
+            kwargs = self._message_kwargs(prompt, max_tokens, temperature, system, model)
             
-            logger.debug(f"Sending request to Claude API with model {self.model}")
+            logger.debug(f"Sending request to Claude API with model {model}")
             response = self.client.messages.create(**kwargs)
+            usage = self._usage(response)
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_SUCCESS, usage)
             
             return {
                 "success": True,
                 "content": response.content[0].text,
-                "model": self.model,
-                "usage": {
-                    "input_tokens": response.usage.input_tokens if hasattr(response, 'usage') else None,
-                    "output_tokens": response.usage.output_tokens if hasattr(response, 'usage') else None
-                }
+                "model": model,
+                "usage": usage
             }
         except Exception as e:
             logger.error(f"Error calling Claude API: {e}")
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_ERROR)
             return {
                 "success": False,
                 "error": str(e),
-                "model": self.model
+                "model": model
             }
+        finally:
+            self.in_flight -= 1
+    
+    def stream_message(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        system: Union[str, List[Dict[str, Any]], None] = None,
+        model: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a message using the SDK streaming API.
+        
+        Yields {"type": "text", "text": ...} for every text delta as the model
+        writes, then one {"type": "done", ...} event carrying the full content,
+        model and usage (the same fields as create_message). Errors are yielded
+        as {"type": "error", "error": ...} instead of being raised.
+        """
+        model = model or self.model
+        started = time.perf_counter()
+        first_token = None
+        self.in_flight += 1
+        try:
+            kwargs = self._message_kwargs(prompt, max_tokens, temperature, system, model)
+            
+            logger.debug(f"Streaming request to Claude API with model {model}")
+            with self.client.messages.stream(**kwargs) as stream:
+                for text in stream.text_stream:
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    yield {"type": "text", "text": text}
+                response = stream.get_final_message()
+            usage = self._usage(response)
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_SUCCESS, usage,
+                                  streamed=True, time_to_first_token=first_token)
+            
+            yield {
+                "type": "done",
+                "content": "".join(block.text for block in response.content if block.type == "text"),
+                "model": model,
+                "usage": usage
+            }
+        except Exception as e:
+            logger.error(f"Error streaming from Claude API: {e}")
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_ERROR,
+                                  streamed=True, time_to_first_token=first_token)
+            yield {"type": "error", "error": str(e), "model": model}
+        finally:
+            self.in_flight -= 1
     
     def generate_prediction(
         self,
@@ -103,7 +394,13 @@ class ClaudeClient:
         expert_style: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Generate match prediction using Sonnet 4.0 (Claude 3.5 Sonnet V2).
+        Generate a match prediction article.
+        
+        The model comes from select_model (Sonnet off-peak, Haiku under load
+        with the default router). Successful results are cached by match data,
+        expert style and prompt version, whichever model wrote them, so repeat
+        views of an unchanged match cost no API call. When match_data carries
+        a fixture_id, a changed snapshot replaces the fixture's previous article.
         
         Args:
             match_data: Match information
@@ -112,44 +409,73 @@ class ClaudeClient:
         Returns:
             Prediction result
         """
-        system_prompt = """You are an expert football analyst with deep knowledge of statistics, 
-        team dynamics, and betting markets. Provide detailed and insightful predictions based on data.
-        Always respond in Chinese and maintain a professional tone."""
-        
-        if expert_style:
-            system_prompt += f"\n\nAnalyze in the style of: {expert_style}"
-        
-        prompt = f"""基于以下数据，提供详细的比赛预测分析（1000-1500字）：
+        if self.cache is None:
+            model = self.select_model(TASK_ARTICLE, max_tokens=4096)
+            return self._generate_prediction(match_data, expert_style, model)
 
-主队：{match_data.get('home_team', {}).get('name', '主队')}
-- 联赛排名：第{match_data.get('home_team', {}).get('league_position', 'N/A')}位
-- 近期战绩：{match_data.get('home_team', {}).get('recent_performance', 'N/A')}
-- 主场战绩：{match_data.get('home_team', {}).get('home_away_record', 'N/A')}
+        namespace, expert, fp, fixture_id = self._cache_key(match_data, expert_style)
+        cached = self.cache.get(namespace, expert, fp, fixture_id)
+        if cached is not MISS:
+            return {**cached, "cached": True}
 
-客队：{match_data.get('away_team', {}).get('name', '客队')}
-- 联赛排名：第{match_data.get('away_team', {}).get('league_position', 'N/A')}位
-- 近期战绩：{match_data.get('away_team', {}).get('recent_performance', 'N/A')}
-- 客场战绩：{match_data.get('away_team', {}).get('home_away_record', 'N/A')}
+        model = self.select_model(TASK_ARTICLE, max_tokens=4096)
+        result = self._generate_prediction(match_data, expert_style, model)
+        if result["success"]:
+            self.cache.set(namespace, expert, fp, result, fixture_id)
+        return result
 
-请提供：
-1. 详细的基本面分析（300-400字）
-2. 历史交锋分析（200-300字）
-3. 伤停和阵容分析（200-300字）
-4. 盘口和赔率解读（200-300字）
-5. 综合预测和投注建议（200-300字）
+    def stream_prediction(
+        self,
+        match_data: Dict[str, Any],
+        expert_style: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_prediction.
+        
+        Yields the same events as stream_message; the final "done" event carries
+        the generate_prediction result under "result". A cached article is
+        replayed as a single text event, and a completed stream is cached.
+        """
+        namespace, expert, fp, fixture_id = self._cache_key(match_data, expert_style)
+        if self.cache is not None:
+            cached = self.cache.get(namespace, expert, fp, fixture_id)
+            if cached is not MISS:
+                yield {"type": "text", "text": cached["prediction"]}
+                yield {"type": "done", "content": cached["prediction"], "model": cached["model"],
+                       "usage": cached.get("usage", {}), "result": {**cached, "cached": True}}
+                return
 
-要求：
-- 使用专业术语
-- 数据支撑观点
-- 逻辑清晰
-- 给出具体比分预测
-- 提供置信度百分比"""
+        model = self.select_model(TASK_ARTICLE, max_tokens=4096)
+
+        system_prompt, prompt = self._prediction_prompts(match_data, expert_style)
+        events = self.stream_message(prompt=prompt, system=system_prompt, max_tokens=4096, temperature=0.7, model=model)
+        for event in events:
+            if event["type"] == "done":
+                result = {
+                    "success": True,
+                    "prediction": event["content"],
+                    "model": event["model"],
+                    "usage": event["usage"]
+                }
+                if self.cache is not None:
+                    self.cache.set(namespace, expert, fp, result, fixture_id)
+                event = {**event, "result": result}
+            yield event
 
+    def _generate_prediction(
+        self,
+        match_data: Dict[str, Any],
+        expert_style: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the prompt and call the API (uncached)."""
+        system_prompt, prompt = self._prediction_prompts(match_data, expert_style)
         result = self.create_message(
             prompt=prompt,
             system=system_prompt,
             max_tokens=4096,
-            temperature=0.7
+            temperature=0.7,
+            model=model
         )
         
         if result["success"]:
@@ -165,27 +491,280 @@ class ClaudeClient:
                 "error": result.get("error", "Unknown error"),
                 "model": result["model"]
             }
+
+
+class AsyncClaudeClient(BaseClaudeClient):
+    """
+    Async Claude client for use inside async routes.
     
-    def set_model(self, model_key: str):
+    - At most max_concurrency requests are in flight; further calls wait
+      for a slot instead of piling onto the API.
+    - 429 and 529 responses are retried with full-jitter exponential
+      backoff, honouring retry-after when the server sends one.
+    - Every call has a deadline covering the wait for a slot, all attempts
+      and the backoff sleeps. A call that misses it fails fast with
+      {"success": False, "timeout": True}.
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[ArticleCache] = None,
+        telemetry: Optional[LLMTelemetry] = None,
+        router: Optional[ModelRouter] = None,
+        max_concurrency: int = CLAUDE_MAX_CONCURRENCY,
+        max_retries: int = CLAUDE_MAX_RETRIES,
+        deadline: float = CLAUDE_CALL_DEADLINE,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        base_url: Optional[str] = None,
+        http_client: Any = None,
+        rng: Optional[random.Random] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
         """
-        Change the model being used.
-        
         Args:
-            model_key: Key from CLAUDE_MODELS dict
+            max_concurrency: Requests allowed in flight at once
+            max_retries: Retries after a 429/529 response
+            deadline: Default per-call deadline in seconds
+            backoff_base: First backoff ceiling in seconds, doubled per retry
+            backoff_max: Upper bound for a single backoff
+            base_url: API base URL (e.g. a local fake server)
+            http_client: Custom async HTTP client passed to the SDK
         """
-        if model_key in CLAUDE_MODELS:
-            self.model = CLAUDE_MODELS[model_key]
-            logger.info(f"Model changed to: {self.model}")
-        else:
-            raise ValueError(f"Invalid model key: {model_key}. Available: {list(CLAUDE_MODELS.keys())}")
+        super().__init__(api_key, model, cache, telemetry, router)
+        # Retries are handled here so that they share the call deadline
+        self.client = AsyncAnthropic(api_key=self.api_key, base_url=base_url, http_client=http_client, max_retries=0)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.active = 0
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.tokens = {"input_tokens": 0, "output_tokens": 0, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+        logger.info(f"Initialized async Claude client with model: {self.model}, concurrency: {max_concurrency}")
+    
+    async def create_message(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        system: Union[str, List[Dict[str, Any]], None] = None,
+        deadline: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a message using Claude API.
+        
+        Returns the same dictionary as ClaudeClient.create_message.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        model = model or self.model
+        kwargs = self._message_kwargs(prompt, max_tokens, temperature, system, model)
+        self.calls += 1
+        attempts = {"retries": 0}
+        started = time.perf_counter()
+        self.active += 1
+        try:
+            response = await asyncio.wait_for(self._create_with_retries(kwargs, deadline, attempts), timeout=deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_TIMEOUT,
+                                  retries=attempts["retries"])
+            logger.warning(f"Claude call exceeded its {deadline}s deadline")
+            return {
+                "success": False,
+                "error": f"Deadline of {deadline}s exceeded",
+                "timeout": True,
+                "model": model
+            }
+        except Exception as e:
+            self.failures += 1
+            self.telemetry.record(model, time.perf_counter() - started, OUTCOME_ERROR,
+                                  retries=attempts["retries"])
+            logger.error(f"Error calling Claude API: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "status": getattr(e, "status_code", None),
+                "model": model
+            }
+        finally:
+            self.active -= 1
+        
+        usage = self._usage(response)
+        self.telemetry.record(model, time.perf_counter() - started, OUTCOME_SUCCESS, usage,
+                              retries=attempts["retries"])
+        for key in self.tokens:
+            self.tokens[key] += usage.get(key) or 0
+        return {
+            "success": True,
+            "content": response.content[0].text,
+            "model": model,
+            "usage": usage
+        }
+    
+    async def _create_with_retries(self, kwargs: Dict[str, Any], deadline: float, attempts: Dict[str, int]):
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline
+        attempt = 0
+        while True:
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            try:
+                return await self.client.messages.create(**kwargs, timeout=max(0.001, expires - loop.time()))
+            except anthropic.APIStatusError as e:
+                if e.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                status, delay = e.status_code, self._backoff(attempt, e)
+                if loop.time() + delay >= expires:
+                    raise
+            finally:
+                self.in_flight -= 1
+                self._semaphore.release()
+            
+            # Sleep without holding a slot
+            attempt += 1
+            attempts["retries"] = attempt
+            self.retries += 1
+            logger.info(f"Claude API returned {status}, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await self._sleep(delay)
+    
+    def load(self) -> float:
+        """
+        Calls in progress (in flight, waiting for a slot or backing off)
+        relative to max_concurrency.
+        """
+        return self.active / self.max_concurrency
+    
+    def _backoff(self, attempt: int, error: "anthropic.APIStatusError") -> float:
+        """Full-jitter exponential backoff, at least the server's retry-after."""
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+    
+    async def generate_prediction(
+        self,
+        match_data: Dict[str, Any],
+        expert_style: Optional[str] = None,
+        deadline: Optional[float] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async ClaudeClient.generate_prediction (same cache, same result shape).
+        
+        model skips routing, e.g. to keep a batch of expert takes on one model.
+        A cached article is returned whichever model wrote it.
+        """
+        namespace, expert, fp, fixture_id = self._cache_key(match_data, expert_style)
+        if self.cache is not None:
+            cached = self.cache.get(namespace, expert, fp, fixture_id)
+            if cached is not MISS:
+                return {**cached, "cached": True}
+        
+        model = model or self.select_model(TASK_ARTICLE, max_tokens=4096, latency_budget=deadline)
+        system_prompt, prompt = self._prediction_prompts(match_data, expert_style)
+        result = await self.create_message(
+            prompt=prompt,
+            system=system_prompt,
+            max_tokens=4096,
+            temperature=0.7,
+            deadline=deadline,
+            model=model
+        )
+        if not result["success"]:
+            return {
+                "success": False,
+                "error": result.get("error", "Unknown error"),
+                "model": result["model"]
+            }
+        
+        result = {
+            "success": True,
+            "prediction": result["content"],
+            "model": result["model"],
+            "usage": result.get("usage", {})
+        }
+        if self.cache is not None:
+            self.cache.set(namespace, expert, fp, result, fixture_id)
+        return result
+    
+    async def generate_expert_predictions(
+        self,
+        match_data: Dict[str, Any],
+        expert_styles: Mapping[str, str],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        One prediction per expert style for the same match.
+        
+        When the shared prompt prefix is long enough to be cached, the first
+        request writes it to the prompt cache and the rest then run
+        concurrently and read it, paying only for their expert style block.
+        Shorter prefixes are not cached, so all requests run concurrently
+        right away. The model is chosen once for the whole batch, since the
+        prompt cache is per model. Returns expert key -> generate_prediction
+        result.
+        """
+        keys = list(expert_styles)
+        if not keys:
+            return {}
+        model = self.select_model(TASK_ARTICLE, max_tokens=4096, latency_budget=deadline)
+        warm = []
+        if self.cacheable_prefix(match_data, model):
+            warm = [await self.generate_prediction(match_data, expert_styles[keys[0]], deadline, model)]
+        rest = await asyncio.gather(*(
+            self.generate_prediction(match_data, expert_styles[key], deadline, model) for key in keys[len(warm):]
+        ))
+        return dict(zip(keys, [*warm, *rest]))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency, retry and token counters"""
+        return {
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "load": round(self.load(), 3),
+            "active": self.active,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "tokens": dict(self.tokens)
+        }
+
 
 # Global client instance (lazy initialization)
 _claude_client: Optional[ClaudeClient] = None
+_async_claude_client: Optional[AsyncClaudeClient] = None
 
 def get_claude_client(model: Optional[str] = None) -> ClaudeClient:
     """
     Get or create Claude client instance.
     
+    The shared client routes each request through the shared model router.
+    A model override returns a copy pinned to that model for the caller; it
+    shares the SDK client, article cache and telemetry but leaves the shared
+    client (and every other caller) routed as before.
+    
     Args:
         model: Optional model override
         
@@ -195,11 +774,30 @@ def get_claude_client(model: Optional[str] = None) -> ClaudeClient:
     global _claude_client
     
     if _claude_client is None:
-        _claude_client = ClaudeClient(model=model)
-    elif model and _claude_client.model != model:
-        _claude_client.model = model
+        _claude_client = ClaudeClient(router=get_model_router())
+    if not model:
+        return _claude_client
+    
+    pinned = copy.copy(_claude_client)
+    pinned.model = model
+    pinned.router = None
+    pinned.in_flight = 0
+    return pinned
+
+def get_async_claude_client() -> AsyncClaudeClient:
+    """
+    Get or create the shared async Claude client.
+    
+    Requests are routed through the shared model router. ANTHROPIC_BASE_URL
+    is read by the SDK, so pointing it at `python -m services.fake_anthropic`
+    runs everything against the local stub.
+    """
+    global _async_claude_client
+    
+    if _async_claude_client is None:
+        _async_claude_client = AsyncClaudeClient(router=get_model_router())
     
-    return _claude_client
+    return _async_claude_client
 
 def test_claude_api():
     """Test Claude API connection and model."""
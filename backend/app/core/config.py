@@ -32,6 +32,12 @@ class Settings(BaseSettings):
     FOOTBALL_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
     
+    # Fixture ingestion (API-Sports -> local database)
+    INGESTION_ENABLED: bool = False
+    INGESTION_INTERVAL_SECONDS: int = 600
+    INGESTION_DAYS_BACK: int = 1
+    INGESTION_DAYS_AHEAD: int = 2
+    
     # CORS
     CORS_ORIGINS: List[AnyHttpUrl] = []
     BACKEND_CORS_ORIGINS: str = ""
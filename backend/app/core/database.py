@@ -1,6 +1,6 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
@@ -53,4 +53,31 @@ def init_db() -> None:
                 Path(db_dir).mkdir(parents=True, exist_ok=True)
     
     # Create all tables
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+
+def add_missing_columns() -> None:
+    """
+    Add columns that exist on the models but not yet in the database.
+    
+    create_all() only creates missing tables, so databases created before a
+    column was added need it appended. New columns must be nullable.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing_columns]
+            for column in missing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            if missing:
+                missing_names = {column.name for column in missing}
+                for index in table.indexes:
+                    if missing_names & {column.name for column in index.columns}:
+                        index.create(bind=conn, checkfirst=True)
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""LLM call telemetry.
+
+Every Claude API call made by ClaudeClient and AsyncClaudeClient is
+recorded here with its model, latency, token usage, retry count and
+outcome. The summary keeps a rolling window of recent calls per model
+(latency percentiles, throughput, cost per article) plus lifetime totals,
+and is served at GET /metrics/llm.
+
+Costs are estimates from MODEL_PRICING (USD per million tokens). Prompt
+cache writes are billed at 1.25x and cache reads at 0.1x the input price.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+# (input, output) USD per million tokens
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "claude-3-opus-20240229": (15.0, 75.0),
+    "claude-3-5-sonnet-20241022": (3.0, 15.0),
+    "claude-3-5-sonnet-20240620": (3.0, 15.0),
+    "claude-3-sonnet-20240229": (3.0, 15.0),
+    "claude-3-5-haiku-20241022": (0.8, 4.0),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_ERROR = "error"
+OUTCOME_TIMEOUT = "timeout"
+
+LLM_TELEMETRY_WINDOW = int(os.getenv("LLM_TELEMETRY_WINDOW", "500"))
+
+
+def estimate_cost(model: str, usage: Mapping[str, Optional[int]]) -> Optional[float]:
+    """Estimated USD cost of one call, or None for a model without pricing."""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    return (
+        (usage.get("input_tokens") or 0) * input_price
+        + (usage.get("cache_creation_input_tokens") or 0) * input_price * CACHE_WRITE_MULTIPLIER
+        + (usage.get("cache_read_input_tokens") or 0) * input_price * CACHE_READ_MULTIPLIER
+        + (usage.get("output_tokens") or 0) * output_price
+    ) / 1_000_000
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+@dataclass
+class LLMCall:
+    """One recorded API call."""
+    model: str
+    latency: float
+    outcome: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    retries: int = 0
+    streamed: bool = False
+    time_to_first_token: Optional[float] = None
+    cost: Optional[float] = None
+    timestamp: float = 0.0
+
+
+class LLMTelemetry:
+    """Thread-safe recorder shared by the sync and async Claude clients."""
+
+    def __init__(self, window: int = LLM_TELEMETRY_WINDOW, time_func: Callable[[], float] = time.time):
+        """
+        Args:
+            window: Recent calls kept per model for the rolling summary
+            time_func: Clock for call timestamps
+        """
+        self.window = window
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._recent: Dict[str, Deque[LLMCall]] = {}
+        self._totals: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        outcome: str = OUTCOME_SUCCESS,
+        usage: Optional[Mapping[str, Optional[int]]] = None,
+        retries: int = 0,
+        streamed: bool = False,
+        time_to_first_token: Optional[float] = None
+    ) -> LLMCall:
+        """Record one finished call (failed calls usually have no usage)."""
+        usage = usage or {}
+        call = LLMCall(
+            model=model,
+            latency=latency,
+            outcome=outcome,
+            input_tokens=usage.get("input_tokens") or 0,
+            output_tokens=usage.get("output_tokens") or 0,
+            cache_read_input_tokens=usage.get("cache_read_input_tokens") or 0,
+            cache_creation_input_tokens=usage.get("cache_creation_input_tokens") or 0,
+            retries=retries,
+            streamed=streamed,
+            time_to_first_token=time_to_first_token,
+            cost=estimate_cost(model, usage),
+            timestamp=self._time()
+        )
+        with self._lock:
+            self._recent.setdefault(model, deque(maxlen=self.window)).append(call)
+            totals = self._totals.setdefault(model, {
+                "calls": 0, "successes": 0, "errors": 0, "timeouts": 0, "retries": 0,
+                "input_tokens": 0, "output_tokens": 0,
+                "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0, "cost_usd": 0.0
+            })
+            totals["calls"] += 1
+            totals[{OUTCOME_SUCCESS: "successes", OUTCOME_TIMEOUT: "timeouts"}.get(outcome, "errors")] += 1
+            totals["retries"] += retries
+            for key in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+                totals[key] += getattr(call, key)
+            totals["cost_usd"] += call.cost or 0.0
+        return call
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """The latest calls across all models, newest first."""
+        with self._lock:
+            calls = [call for calls in self._recent.values() for call in calls]
+        calls.sort(key=lambda call: call.timestamp, reverse=True)
+        return [asdict(call) for call in calls[:limit]]
+
+    def summary(self) -> Dict[str, Any]:
+        """Rolling per-model summary and lifetime totals."""
+        with self._lock:
+            recent = {model: list(calls) for model, calls in self._recent.items()}
+            totals = {model: dict(values) for model, values in self._totals.items()}
+        models = {}
+        for model, calls in recent.items():
+            models[model] = {
+                "window": self._window_summary(calls),
+                "totals": {**totals[model], "cost_usd": round(totals[model]["cost_usd"], 6)}
+            }
+        return {"window_size": self.window, "models": models}
+
+    def model_window(self, model: str) -> Optional[Dict[str, Any]]:
+        """Rolling summary of one model (None before its first call)."""
+        with self._lock:
+            calls = list(self._recent.get(model, ()))
+        return self._window_summary(calls) if calls else None
+
+    @staticmethod
+    def _window_summary(calls: List[LLMCall]) -> Dict[str, Any]:
+        succeeded = [call for call in calls if call.outcome == OUTCOME_SUCCESS]
+        latencies = [call.latency for call in succeeded]
+        first_tokens = [call.time_to_first_token for call in succeeded if call.time_to_first_token is not None]
+        output_tokens = sum(call.output_tokens for call in succeeded)
+        priced = [call.cost for call in succeeded if call.cost is not None]
+        # Failed calls cost their (partial) tokens too, so they count against the articles produced
+        cost = sum(call.cost or 0.0 for call in calls)
+        return {
+            "calls": len(calls),
+            "successes": len(succeeded),
+            "errors": sum(call.outcome == OUTCOME_ERROR for call in calls),
+            "timeouts": sum(call.outcome == OUTCOME_TIMEOUT for call in calls),
+            "retries": sum(call.retries for call in calls),
+            "latency_p50": _round(percentile(latencies, 50)),
+            "latency_p95": _round(percentile(latencies, 95)),
+            "time_to_first_token_p50": _round(percentile(first_tokens, 50)),
+            "output_tokens_per_second": _round(output_tokens / sum(latencies)) if sum(latencies) else None,
+            "input_tokens": sum(call.input_tokens for call in calls),
+            "output_tokens": sum(call.output_tokens for call in calls),
+            "cache_read_input_tokens": sum(call.cache_read_input_tokens for call in calls),
+            "cost_usd": round(cost, 6) if priced else None,
+            "cost_per_article_usd": round(cost / len(succeeded), 6) if priced else None,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+# Process-wide telemetry shared by all Claude clients
+_llm_telemetry: Optional[LLMTelemetry] = None
+_llm_telemetry_lock = threading.Lock()
+
+
+def get_llm_telemetry() -> LLMTelemetry:
+    """Get or create the shared telemetry recorder."""
+    global _llm_telemetry
+    with _llm_telemetry_lock:
+        if _llm_telemetry is None:
+            _llm_telemetry = LLMTelemetry()
+        return _llm_telemetry
@@ -0,0 +1,167 @@
+"""Per-request Claude model routing.
+
+Instead of one model for the whole process, each request asks the router
+which model to use for its task:
+
+- quick tasks (the short JSON prediction) always go to the fastest model
+- articles use the preferred model off-peak and fall back to the faster,
+  cheaper one when the client's queue is busy (peak load), when the
+  preferred model's recent p95 latency misses the caller's latency budget,
+  or when its expected cost per article exceeds the cost budget
+
+Latency and cost come from the LLM telemetry window (app.core.llm_telemetry);
+load is the client's (in flight + waiting) / max concurrency. Every decision
+is counted and the latest ones are kept for GET /metrics/llm.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, asdict
+from typing import Any, Deque, Dict, Optional, Sequence
+
+from app.core.llm_telemetry import LLMTelemetry, estimate_cost, get_llm_telemetry
+
+logger = logging.getLogger(__name__)
+
+TASK_QUICK = "quick"
+TASK_ARTICLE = "article"
+
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+MODEL_ROUTER_PEAK_LOAD = float(os.getenv("MODEL_ROUTER_PEAK_LOAD", "0.75"))
+
+# Latency percentiles from fewer calls than this are too noisy to route on
+MIN_LATENCY_SAMPLES = 5
+
+
+@dataclass
+class RoutingDecision:
+    """The model chosen for one request and why."""
+    task: str
+    model: str
+    reason: str
+    load: float
+    timestamp: float
+
+
+class ModelRouter:
+    """Chooses a model per request from task, load and latency/cost budgets."""
+
+    def __init__(
+        self,
+        routes: Dict[str, Sequence[str]],
+        peak_load: float = MODEL_ROUTER_PEAK_LOAD,
+        telemetry: Optional[LLMTelemetry] = None,
+        history: int = 100
+    ):
+        """
+        Args:
+            routes: Task -> models in order of preference (best prose first,
+                the last one is the fast fallback)
+            peak_load: Load at or above which articles use the fallback model
+            telemetry: Source of observed latency and cost per model
+            history: Recent decisions kept for stats()
+        """
+        self.routes = {task: list(models) for task, models in routes.items()}
+        self.peak_load = peak_load
+        self.telemetry = telemetry if telemetry is not None else get_llm_telemetry()
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = {}
+        self._reasons: Counter = Counter()
+        self._recent: Deque[RoutingDecision] = deque(maxlen=history)
+
+    def route(
+        self,
+        task: str,
+        load: float = 0.0,
+        max_tokens: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        cost_budget: Optional[float] = None
+    ) -> RoutingDecision:
+        """
+        Pick the model for one request.
+
+        Args:
+            task: TASK_QUICK or TASK_ARTICLE (unknown tasks route as articles)
+            load: Queue pressure of the calling client, 1.0 = all slots busy
+            max_tokens: Output budget, used to estimate cost before any call
+            latency_budget: Seconds the caller can wait for the response
+            cost_budget: USD the caller will spend on the response
+        """
+        candidates = self.routes.get(task) or self.routes[TASK_ARTICLE]
+        if len(candidates) > 1 and load >= self.peak_load:
+            model, reason = candidates[-1], "peak_load"
+        else:
+            model, reason = candidates[-1], "no_model_within_budget"
+            rejected = None
+            for candidate in candidates:
+                rejected_by = self._over_budget(candidate, max_tokens, latency_budget, cost_budget)
+                if rejected_by is None:
+                    model, reason = candidate, rejected or "preferred"
+                    break
+                rejected = rejected or rejected_by
+
+        decision = RoutingDecision(task, model, reason, round(load, 3), time.time())
+        with self._lock:
+            self._counts.setdefault(task, Counter())[model] += 1
+            self._reasons[reason] += 1
+            self._recent.append(decision)
+        logger.debug(f"Routed {task} request to {model} ({reason}, load {load:.2f})")
+        return decision
+
+    def _over_budget(
+        self,
+        model: str,
+        max_tokens: Optional[int],
+        latency_budget: Optional[float],
+        cost_budget: Optional[float]
+    ) -> Optional[str]:
+        """Which budget the model misses ("latency_budget"/"cost_budget"), or None."""
+        window = self.telemetry.model_window(model) if (latency_budget or cost_budget) else None
+        if latency_budget is not None and window and window["successes"] >= MIN_LATENCY_SAMPLES:
+            if window["latency_p95"] > latency_budget:
+                return "latency_budget"
+        if cost_budget is not None:
+            expected = window["cost_per_article_usd"] if window and window["successes"] else None
+            if expected is None and max_tokens:
+                expected = estimate_cost(model, {"output_tokens": max_tokens})
+            if expected is not None and expected > cost_budget:
+                return "cost_budget"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Decision counts per task and model, reasons and the latest decisions"""
+        with self._lock:
+            return {
+                "peak_load": self.peak_load,
+                "routes": {task: list(models) for task, models in self.routes.items()},
+                "decisions": {task: dict(counts) for task, counts in self._counts.items()},
+                "reasons": dict(self._reasons),
+                "recent": [asdict(decision) for decision in list(self._recent)[-10:]]
+            }
+
+
+# Process-wide router shared by the Claude clients
+_model_router: Optional[ModelRouter] = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> Optional[ModelRouter]:
+    """
+    Get or create the shared router (None when MODEL_ROUTING_ENABLED=false).
+
+    Articles prefer Sonnet and fall back to Haiku; quick predictions use Haiku.
+    """
+    global _model_router
+    if not MODEL_ROUTING_ENABLED:
+        return None
+    with _model_router_lock:
+        if _model_router is None:
+            from app.core.claude_config import CLAUDE_MODELS
+            _model_router = ModelRouter({
+                TASK_ARTICLE: [CLAUDE_MODELS["claude-4-sonnet"], CLAUDE_MODELS["claude-4-haiku"]],
+                TASK_QUICK: [CLAUDE_MODELS["claude-4-haiku"]],
+            })
+        return _model_router
@@ -12,6 +12,7 @@ class Team(BaseModel):
     __tablename__ = "teams"
     
     name = Column(String(100), nullable=False)
+    api_team_id = Column(Integer, unique=True, index=True)  # API-Sports team id
     code = Column(String(10))
     logo_url = Column(String(500))
     country = Column(String(100))
@@ -35,6 +36,10 @@ class Match(BaseModel):
     
     __tablename__ = "matches"
     
+    # API-Sports identifiers (set by the ingestion worker)
+    api_fixture_id = Column(Integer, unique=True, index=True)
+    api_league_id = Column(Integer, index=True)
+    
     # Teams
     home_team_id = Column(String(36), ForeignKey("teams.id"), nullable=False)
     away_team_id = Column(String(36), ForeignKey("teams.id"), nullable=False)
@@ -43,6 +48,7 @@ class Match(BaseModel):
     league = Column(String(100), nullable=False)
     match_date = Column(DateTime, nullable=False)
     status = Column(String(50), default="scheduled")  # scheduled, live, finished, postponed
+    api_status = Column(String(10))  # API-Sports short status (NS, 1H, FT, ...), set by the ingestion worker
     venue = Column(String(200))
     referee = Column(String(100))
     attendance = Column(Integer)
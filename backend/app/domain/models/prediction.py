@@ -5,6 +5,9 @@ from sqlalchemy.orm import relationship
 
 from app.domain.models.base import BaseModel
 
+# Characters of the article shown in prediction lists
+SUMMARY_LENGTH = 100
+
 
 class Prediction(BaseModel):
     """Prediction model for match outcomes."""
@@ -25,8 +28,9 @@ class Prediction(BaseModel):
     odds = Column(Float)
     potential_return = Column(Float)
     
-    # Reasoning
+    # Reasoning (the full article) and its list-view excerpt
     reasoning = Column(Text)
+    summary = Column(String(SUMMARY_LENGTH + 3))
     key_factors = Column(Text)  # JSON string of factors
     
     # Result (after match)
@@ -41,5 +45,12 @@ class Prediction(BaseModel):
     match = relationship("Match", back_populates="predictions")
     expert = relationship("Expert", back_populates="predictions")
     
+    @staticmethod
+    def summarize(reasoning):
+        """List-view excerpt of an article, stored alongside it so lists never load the article."""
+        if reasoning and len(reasoning) > SUMMARY_LENGTH:
+            return reasoning[:SUMMARY_LENGTH] + "..."
+        return reasoning
+    
     def __repr__(self):
         return f"<Prediction {self.expert_id} for {self.match_id}>"
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""Batch matchday article generation.
+
+Renders template articles for every (fixture, expert) pair of a date range
+on a process pool and bulk-writes them into the predictions table, one
+transaction per chunk. Progress is reported as NDJSON-ready dictionaries.
+
+Fixtures come from the local tables filled by the ingestion worker, so a
+batch run makes no API-Sports requests.
+
+    python -m app.services.article_batch_service --date 2025-03-01 --days 2 --leagues 292,98
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.domain.models import Expert, Prediction
+from app.services.match_service import MatchService
+
+logger = logging.getLogger(__name__)
+
+# Predictions are keyed by (fixture, expert, data version), so re-running a
+# batch updates the same rows instead of adding duplicates
+PREDICTION_ID_NAMESPACE = uuid.UUID("0d6c1f8e-5b7a-5c2e-9f3d-7a1b2c3d4e5f")
+
+DEFAULT_CHUNK_SIZE = 100
+
+# Template rendering takes well under a millisecond per article, so smaller
+# batches finish faster in-process than it takes to start the worker pool
+DEFAULT_MIN_PARALLEL_TASKS = 2000
+
+# Upper bound (and default) for the worker pool size
+MAX_WORKERS = os.cpu_count() or 1
+
+# Same defaults as /real-matches/generate-prediction
+PREDICTION_DEFAULTS = {
+    "prediction_type": "match_result",
+    "predicted_outcome": "home_win",
+    "confidence": 75,
+    "stake_level": "medium",
+}
+
+# (fixture, expert key, data version)
+RenderTask = Tuple[Dict[str, Any], str, str]
+
+
+def prediction_id(fixture_id: int, expert_key: str, data_version: str = "") -> str:
+    """Stable Prediction.id for one (fixture, expert, data version)."""
+    return str(uuid.uuid5(PREDICTION_ID_NAMESPACE, f"{fixture_id}:{expert_key}:{data_version}"))
+
+
+def render_article(task: RenderTask) -> Dict[str, Any]:
+    """
+    Render one article. Runs inside the worker processes.
+
+    Articles are seeded from (fixture, expert, data version), so the result
+    does not depend on which process renders it.
+    """
+    from agents.prediction_experts import prediction_experts
+
+    fixture, expert_key, data_version = task
+    content = prediction_experts.generate_detailed_prediction(
+        expert_key,
+        fixture["home_team"]["name"],
+        fixture["away_team"]["name"],
+        fixture["fixture_id"],
+        data_version=data_version
+    )
+    return {
+        "fixture_id": fixture["fixture_id"],
+        "match_id": fixture["match_id"],
+        "expert_key": expert_key,
+        "reasoning": content,
+    }
+
+
+class ArticleBatchJob:
+    """Generate articles for every fixture and expert of a date range."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        data_version: str = "",
+        min_parallel_tasks: int = DEFAULT_MIN_PARALLEL_TASKS
+    ):
+        self.session_factory = session_factory
+        # Never more processes than CPUs, whoever asks (API callers included)
+        self.workers = MAX_WORKERS if workers is None else max(1, min(workers, MAX_WORKERS))
+        self.chunk_size = chunk_size
+        self.data_version = data_version
+        self.min_parallel_tasks = min_parallel_tasks
+
+    def load_fixtures(self, date_from: datetime, date_to: datetime, league_ids: Optional[List[int]] = None) -> List[Dict]:
+        """Fixtures of the range from the local tables."""
+        db = self.session_factory()
+        try:
+            return MatchService(db).get_ingested_fixtures(date_from, date_to, league_ids)
+        finally:
+            db.close()
+
+    def ensure_experts(self, db: Session) -> Dict[str, str]:
+        """Make sure every registry expert has an experts row. Returns expert key -> Expert.id."""
+        from agents.prediction_experts import get_expert_registry
+
+        registry = get_expert_registry()
+        existing = dict(
+            db.query(Expert.name, Expert.id).filter(Expert.name.in_([p.name for p in registry.profiles]))
+        )
+        inserts = [
+            {
+                "id": profile.id,
+                "name": profile.name,
+                "avatar_url": f"https://api.dicebear.com/7.x/avataaars/svg?seed={key}",
+                "bio": profile.bio,
+                "win_rate": profile.win_rate,
+                "avg_return": profile.avg_return,
+                "total_predictions": profile.total_predictions,
+                "successful_predictions": profile.successful_predictions,
+                "followers_count": profile.followers_count,
+                "specializations": list(profile.specializations),
+            }
+            for key, profile in registry.by_key.items() if profile.name not in existing
+        ]
+        if inserts:
+            db.bulk_insert_mappings(Expert, inserts)
+            db.commit()
+            existing.update({row["name"]: row["id"] for row in inserts})
+        return {key: existing[profile.name] for key, profile in registry.by_key.items()}
+
+    def write_chunk(self, db: Session, articles: Sequence[Dict[str, Any]], expert_ids: Dict[str, str]) -> Dict[str, str]:
+        """Upsert one chunk of articles in a single transaction. Returns Prediction.id -> inserted/updated."""
+        rows = {
+            prediction_id(a["fixture_id"], a["expert_key"], self.data_version): {
+                "match_id": a["match_id"],
+                "expert_id": expert_ids[a["expert_key"]],
+                "reasoning": a["reasoning"],
+                "summary": Prediction.summarize(a["reasoning"]),
+            }
+            for a in articles
+        }
+        try:
+            existing = {
+                row_id for (row_id,) in db.query(Prediction.id).filter(Prediction.id.in_(list(rows)))
+            }
+            updates = [{"id": row_id, **values} for row_id, values in rows.items() if row_id in existing]
+            inserts = [
+                {"id": row_id, **PREDICTION_DEFAULTS, "likes_count": 0, "comments_count": 0, **values}
+                for row_id, values in rows.items() if row_id not in existing
+            ]
+            if updates:
+                db.bulk_update_mappings(Prediction, updates)
+            if inserts:
+                db.bulk_insert_mappings(Prediction, inserts)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return {row_id: "updated" if row_id in existing else "inserted" for row_id in rows}
+
+    def _flush(
+        self,
+        db: Session,
+        chunk: List[Dict[str, Any]],
+        expert_ids: Dict[str, str],
+        counts: Dict[str, int]
+    ) -> Iterator[Dict[str, Any]]:
+        written = self.write_chunk(db, chunk, expert_ids)
+        for item in chunk:
+            row_id = prediction_id(item["fixture_id"], item["expert_key"], self.data_version)
+            counts[written[row_id]] += 1
+            yield {
+                "event": "prediction",
+                "prediction_id": row_id,
+                "fixture_id": item["fixture_id"],
+                "expert": item["expert_key"],
+                "status": written[row_id],
+                "length": len(item["reasoning"]),
+            }
+
+    def _render(self, tasks: List[RenderTask]) -> Iterator[Dict[str, Any]]:
+        if self.workers <= 1 or len(tasks) < max(2, self.min_parallel_tasks):
+            yield from map(render_article, tasks)
+            return
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        # Spawned workers: the API runs this from a request thread, and forking a
+        # multi-threaded process can copy locks held by other threads (logging,
+        # SQLite, HTTP connection pools) and deadlock the children
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            yield from executor.map(render_article, tasks, chunksize=chunksize)
+
+    def run(
+        self,
+        date_from: datetime,
+        date_to: datetime,
+        league_ids: Optional[List[int]] = None,
+        expert_keys: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate and store the articles.
+
+        Yields one event per stored article and a final summary event.
+        """
+        from agents.prediction_experts import get_expert_registry
+
+        started = time.perf_counter()
+        fixtures = self.load_fixtures(date_from, date_to, league_ids)
+        keys = expert_keys or list(get_expert_registry().keys)
+        tasks = [(fixture, key, self.data_version) for fixture in fixtures for key in keys]
+        counts = {"inserted": 0, "updated": 0}
+
+        db = self.session_factory()
+        try:
+            expert_ids = self.ensure_experts(db)
+            chunk: List[Dict[str, Any]] = []
+            for article in self._render(tasks):
+                chunk.append(article)
+                if len(chunk) >= self.chunk_size:
+                    yield from self._flush(db, chunk, expert_ids, counts)
+                    chunk = []
+            if chunk:
+                yield from self._flush(db, chunk, expert_ids, counts)
+        finally:
+            db.close()
+
+        summary = {
+            "event": "summary",
+            "fixtures": len(fixtures),
+            "experts": len(keys),
+            "articles": len(tasks),
+            **counts,
+            "workers": self.workers,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"Article batch finished: {summary}")
+        yield summary
+
+
+def to_ndjson(events: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialise job events as NDJSON lines."""
+    for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate articles for every fixture and expert of a matchday")
+    parser.add_argument("--date", default=datetime.now().date().isoformat(), help="first day, YYYY-MM-DD")
+    parser.add_argument("--days", type=int, default=1, help="number of days from --date")
+    parser.add_argument("--leagues", default="", help="comma separated API-Sports league ids")
+    parser.add_argument("--experts", default="", help="comma separated expert keys (default: all)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--data-version", default="")
+    args = parser.parse_args()
+
+    date_from = datetime.fromisoformat(args.date)
+    job = ArticleBatchJob(workers=args.workers, chunk_size=args.chunk_size, data_version=args.data_version)
+    events = job.run(
+        date_from,
+        date_from + timedelta(days=args.days),
+        [int(x) for x in args.leagues.split(",") if x.strip()] or None,
+        [x.strip() for x in args.experts.split(",") if x.strip()] or None
+    )
+    for line in to_ndjson(events):
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
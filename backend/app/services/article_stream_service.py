@@ -0,0 +1,253 @@
+"""Streaming article generation.
+
+Delivers a prediction article as Server-Sent Events while it is being
+written, instead of returning it after the whole article is done:
+
+- Claude articles forward every text delta from the SDK streaming API
+- template writers emit one event per finished section
+- expert template articles are emitted paragraph by paragraph
+
+The finished article is saved to Prediction.reasoning when the stream
+completes. The generator opens its own session, because request-scoped
+sessions are closed before a streaming response body is sent.
+
+Events:
+    meta    {"fixture_id", "expert": {"id", "key", "name"}}
+    delta   {"source", "text"[, "section"]}
+    done    {"prediction_id", "fixture_id", "source", "length"}
+    error   {"detail"}
+"""
+
+import re
+import json
+import uuid
+import logging
+import dataclasses
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.domain.models import Expert, Prediction
+from agents.enhanced_football_writer import TeamInfo, MatchInfo, OddsInfo, HistoricalData
+from agents.prediction_experts import get_expert_registry, prediction_experts
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_END = re.compile(r"(?<=\n\n)(?=[^\n])")
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def paragraphs(text: str) -> Iterator[str]:
+    """Split text after blank lines; the pieces join back to the original text."""
+    return iter(_PARAGRAPH_END.split(text))
+
+
+def demo_match_inputs() -> Tuple[MatchInfo, OddsInfo, HistoricalData]:
+    """Demo inputs for the template writer (in production, fetch from API)."""
+    home_team = TeamInfo(
+        name="主队",
+        recent_form=['W', 'W', 'D', 'L', 'W'],
+        league_position=3,
+        home_away_record='主场8胜3平2负',
+        key_players_status={},
+        recent_performance='近5场3胜1平1负，进11球失5球，状态出色',
+        goals_scored=11,
+        goals_conceded=5,
+        top_scorer='前锋王',
+        formation='4-3-3'
+    )
+
+    away_team = TeamInfo(
+        name="客队",
+        recent_form=['L', 'D', 'W', 'W', 'L'],
+        league_position=5,
+        home_away_record='客场3胜3平6负',
+        key_players_status={'核心球员': '伤缺'},
+        recent_performance='近5场2胜1平2负，进7球失9球，防守问题明显',
+        goals_scored=7,
+        goals_conceded=9,
+        top_scorer='中场李',
+        formation='4-5-1'
+    )
+
+    match_info = MatchInfo(
+        home_team=home_team,
+        away_team=away_team,
+        league="联赛",
+        match_time="2024-12-01 15:00:00",
+        venue="主场体育场",
+        weather="晴朗",
+        referee="主裁判",
+        importance="常规赛"
+    )
+
+    odds_info = OddsInfo(
+        home_win=2.10,
+        draw=3.20,
+        away_win=3.50,
+        asian_handicap="主队-0.5",
+        over_under="2.5球",
+        odds_trend="主队赔率略有下降"
+    )
+
+    historical_data = HistoricalData(
+        h2h_results=[
+            {'winner': 'home', 'score': '2-1'},
+            {'winner': 'draw', 'score': '1-1'},
+            {'winner': 'home', 'score': '3-0'},
+            {'winner': 'away', 'score': '0-1'},
+            {'winner': 'home', 'score': '2-0'}
+        ],
+        home_team_home_record='主队主场对阵客队4胜1平1负，场均进2.3球失0.8球',
+        away_team_away_record='客队客场对阵主队1胜1平4负，场均进0.7球失2.0球',
+        last_meeting_details='上次交锋在2个月前，主队2-1击败客队'
+    )
+    return match_info, odds_info, historical_data
+
+
+def demo_team_names(fixture_id: int) -> Tuple[str, str]:
+    """Team names for the expert template article of the demo fixtures."""
+    home_team = "FC首尔" if fixture_id == 1001 else "浦和红钻" if fixture_id == 1002 else "全北现代" if fixture_id == 1003 else "川崎前锋"
+    away_team = "蔚山现代" if fixture_id == 1001 else "横滨水手" if fixture_id == 1002 else "浦项制铁" if fixture_id == 1003 else "鹿岛鹿角"
+    return home_team, away_team
+
+
+def save_prediction(db: Session, fixture_id: int, expert_key: str, content: str) -> Tuple[Prediction, Expert]:
+    """Store an article as a Prediction, creating the expert row on first use."""
+    profile = get_expert_registry().by_key[expert_key]
+    expert = db.query(Expert).filter(Expert.name == profile.name).first()
+    if not expert:
+        expert = Expert(
+            id=profile.id,
+            name=profile.name,
+            avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed={expert_key}",
+            bio=profile.bio,
+            win_rate=profile.win_rate,
+            avg_return=profile.avg_return,
+            total_predictions=profile.total_predictions,
+            successful_predictions=profile.successful_predictions,
+            followers_count=profile.followers_count,
+            specializations=list(profile.specializations)
+        )
+        db.add(expert)
+        db.commit()
+
+    prediction = Prediction(
+        id=str(uuid.uuid4()),
+        match_id=str(fixture_id),
+        expert_id=expert.id,
+        prediction_type="match_result",
+        predicted_outcome="home_win",
+        confidence=75,
+        stake_level="medium",
+        odds=2.10,
+        potential_return=210.0,
+        reasoning=content,
+        summary=Prediction.summarize(content),
+        key_factors='{"form": "good", "h2h": "favorable", "injuries": "none"}',
+        likes_count=0,
+        comments_count=0
+    )
+    db.add(prediction)
+    db.commit()
+    return prediction, expert
+
+
+def stream_article(
+    fixture_id: int,
+    expert_key: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+    claude: Optional[Any] = None,
+    writer: Optional[Any] = None
+) -> Iterator[str]:
+    """
+    Generate, stream and store one article as SSE lines.
+
+    Sources are tried in order: Claude (when a client is given), the template
+    writer, then the expert's template article. A source that fails before
+    its first event falls back to the next one; one that fails midway ends
+    the stream with an error event and nothing is saved.
+    """
+    profile = get_expert_registry().by_key[expert_key]
+    yield sse_event("meta", {
+        "fixture_id": fixture_id,
+        "expert": {"id": profile.id, "key": expert_key, "name": profile.name},
+    })
+
+    match_info, odds_info, historical_data = demo_match_inputs()
+    content = None
+    source = None
+
+    if claude is not None:
+        match_data = {
+            "fixture_id": fixture_id,
+            "league": match_info.league,
+            "home_team": dataclasses.asdict(match_info.home_team),
+            "away_team": dataclasses.asdict(match_info.away_team),
+            "odds": dataclasses.asdict(odds_info),
+            "history": dataclasses.asdict(historical_data),
+        }
+        started = False
+        for event in claude.stream_prediction(match_data, expert_style=f"{profile.name}，{profile.bio}"):
+            if event["type"] == "text":
+                started = True
+                yield sse_event("delta", {"source": "claude", "text": event["text"]})
+            elif event["type"] == "done":
+                content, source = event["content"], "claude"
+            elif started:
+                yield sse_event("error", {"detail": event["error"]})
+                return
+            else:
+                logger.warning(f"Claude stream failed for fixture {fixture_id}, using templates: {event['error']}")
+
+    if content is None and writer is not None:
+        parts = []
+        try:
+            if hasattr(writer, "stream_prediction"):
+                sections = writer.stream_prediction(
+                    match_info, odds_info, historical_data,
+                    expert_confidence=85, fixture_id=fixture_id, expert=expert_key
+                )
+            else:
+                article = writer.generate_prediction(match_info, odds_info, historical_data, expert_confidence=85)
+                sections = ((None, text) for text in paragraphs(article["full_article"]))
+            for section, text in sections:
+                parts.append(text)
+                yield sse_event("delta", {"source": "writer", "section": section, "text": text})
+            content, source = "".join(parts), "writer"
+        except Exception as e:
+            logger.error(f"Failed to stream writer article: {e}")
+            if parts:
+                yield sse_event("error", {"detail": "Article generation failed"})
+                return
+
+    if content is None:
+        home_team, away_team = demo_team_names(fixture_id)
+        content = prediction_experts.generate_detailed_prediction(expert_key, home_team, away_team, fixture_id)
+        source = "template"
+        for text in paragraphs(content):
+            yield sse_event("delta", {"source": source, "text": text})
+
+    db = session_factory()
+    try:
+        prediction, _ = save_prediction(db, fixture_id, expert_key, content)
+        prediction_id = prediction.id
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to save streamed article for fixture {fixture_id}: {e}")
+        yield sse_event("error", {"detail": "Failed to save prediction"})
+        return
+    finally:
+        db.close()
+
+    yield sse_event("done", {
+        "prediction_id": prediction_id,
+        "fixture_id": fixture_id,
+        "source": source,
+        "length": len(content),
+    })
@@ -0,0 +1,440 @@
+"""Fixture ingestion service.
+
+Pulls fixtures, results, odds and match statistics for the configured leagues
+from API-Sports and bulk-upserts them into the local tables, keyed by the
+API-Sports fixture and team ids. Request handlers then read the local
+database instead of calling API-Sports on every page view.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.models import Team, Match, BettingOdds, Statistics
+from app.services.score_model_service import get_score_model
+
+logger = logging.getLogger(__name__)
+
+# API-Sports short status -> Match.status
+STATUS_MAP = {
+    "TBD": "scheduled", "NS": "scheduled",
+    "1H": "live", "HT": "live", "2H": "live", "ET": "live", "BT": "live",
+    "P": "live", "SUSP": "live", "INT": "live", "LIVE": "live",
+    "FT": "finished", "AET": "finished", "PEN": "finished", "AWD": "finished", "WO": "finished",
+    "PST": "postponed", "CANC": "postponed", "ABD": "postponed",
+}
+
+# /fixtures/statistics type -> Statistics column
+STATISTIC_FIELDS = {
+    "Shots on Goal": "shots_on_target",
+    "Shots off Goal": "shots_off_target",
+    "Total Shots": "shots",
+    "Blocked Shots": "shots_blocked",
+    "Shots insidebox": "shots_inside_box",
+    "Shots outsidebox": "shots_outside_box",
+    "Fouls": "fouls",
+    "Corner Kicks": "corners",
+    "Offsides": "offsides",
+    "Ball Possession": "possession",
+    "Yellow Cards": "yellow_cards",
+    "Red Cards": "red_cards",
+    "Goalkeeper Saves": "saves",
+    "Total passes": "passes",
+    "Passes accurate": "passes_accurate",
+    "Passes %": "pass_accuracy",
+    "expected_goals": "expected_goals",
+}
+
+FLOAT_STATISTICS = {"possession", "pass_accuracy", "expected_goals"}
+
+# "Exact Score" value -> BettingOdds column
+CORRECT_SCORE_FIELDS = {
+    "0:0": "score_0_0", "1:0": "score_1_0", "2:0": "score_2_0", "1:1": "score_1_1",
+    "2:1": "score_2_1", "0:1": "score_0_1", "0:2": "score_0_2", "1:2": "score_1_2",
+}
+
+
+# Match.status -> API-Sports short status, for rows ingested before api_status was stored
+API_STATUS_FALLBACK = {"scheduled": "NS", "live": "LIVE", "finished": "FT", "postponed": "PST"}
+
+
+def map_status(short: Optional[str]) -> str:
+    """Map an API-Sports short status to a Match.status value."""
+    return STATUS_MAP.get(short or "NS", "scheduled")
+
+
+def parse_kickoff(value: str) -> datetime:
+    """Parse an API-Sports ISO timestamp into a naive local datetime (as stored in Match.match_date)."""
+    kickoff = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if kickoff.tzinfo is not None:
+        kickoff = kickoff.astimezone().replace(tzinfo=None)
+    return kickoff
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_bookmaker_odds(bookmaker: Dict) -> Optional[Dict[str, Any]]:
+    """
+    Convert one API-Sports bookmaker entry into BettingOdds column values.
+
+    Returns None when the bookmaker has no 1X2 market (those columns are required).
+    """
+    row: Dict[str, Any] = {"bookmaker": bookmaker.get("name") or str(bookmaker.get("id"))}
+
+    for bet in bookmaker.get("bets", []):
+        name = bet.get("name")
+        for item in bet.get("values", []):
+            value = str(item.get("value"))
+            odd = _to_float(item.get("odd"))
+            if odd is None:
+                continue
+            if name == "Match Winner":
+                column = {"Home": "home_win", "Draw": "draw", "Away": "away_win"}.get(value)
+            elif name == "Goals Over/Under":
+                side, _, line = value.partition(" ")
+                column = f"{side.lower()}_{line.replace('.', '_')}" if line in ("0.5", "1.5", "2.5", "3.5") else None
+            elif name == "Both Teams Score":
+                column = {"Yes": "btts_yes", "No": "btts_no"}.get(value)
+            elif name == "Double Chance":
+                column = {"Home/Draw": "home_draw", "Home/Away": "home_away", "Draw/Away": "draw_away"}.get(value)
+            elif name == "Asian Handicap":
+                side, _, line = value.partition(" ")
+                if side in ("Home", "Away") and f"handicap_{side.lower()}_line" not in row:
+                    row[f"handicap_{side.lower()}_line"] = _to_float(line)
+                    row[f"handicap_{side.lower()}_odds"] = odd
+                column = None
+            elif name == "Exact Score":
+                column = CORRECT_SCORE_FIELDS.get(value)
+            else:
+                column = None
+            if column and column not in row:
+                row[column] = odd
+
+    if not all(key in row for key in ("home_win", "draw", "away_win")):
+        return None
+    return row
+
+
+def parse_team_statistics(entry: Dict) -> Dict[str, Any]:
+    """Convert one team's /fixtures/statistics entry into Statistics column values."""
+    row: Dict[str, Any] = {}
+    for item in entry.get("statistics", []):
+        column = STATISTIC_FIELDS.get(item.get("type"))
+        if column is None or item.get("value") is None:
+            continue
+        value = _to_float(item["value"])
+        if value is None:
+            continue
+        row[column] = value if column in FLOAT_STATISTICS else int(value)
+    return row
+
+
+class IngestionService:
+    """Bulk upserts of API-Sports data into the local tables."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def upsert_teams(self, fixtures: List[Dict]) -> Dict[int, str]:
+        """Upsert both teams of every fixture. Returns API team id -> Team.id."""
+        teams: Dict[int, Dict[str, Any]] = {}
+        for fixture in fixtures:
+            for side in ("home_team", "away_team"):
+                team = fixture[side]
+                teams[team["id"]] = {
+                    "name": team["name"],
+                    "logo_url": team.get("logo"),
+                    "country": fixture["league"].get("country"),
+                }
+        if not teams:
+            return {}
+
+        existing = dict(
+            self.db.query(Team.api_team_id, Team.id).filter(Team.api_team_id.in_(list(teams)))
+        )
+        updates = [{"id": existing[api_id], **values} for api_id, values in teams.items() if api_id in existing]
+        inserts = []
+        for api_id, values in teams.items():
+            if api_id not in existing:
+                existing[api_id] = str(uuid.uuid4())
+                inserts.append({"id": existing[api_id], "api_team_id": api_id, **values})
+
+        if updates:
+            self.db.bulk_update_mappings(Team, updates)
+        if inserts:
+            self.db.bulk_insert_mappings(Team, inserts)
+        return existing
+
+    def upsert_matches(self, fixtures: List[Dict], team_ids: Dict[int, str]) -> Dict[int, str]:
+        """Upsert fixtures and results. Returns API fixture id -> Match.id."""
+        rows: Dict[int, Dict[str, Any]] = {}
+        for fixture in fixtures:
+            league = fixture["league"]
+            goals = fixture.get("goals") or {}
+            rows[fixture["fixture_id"]] = {
+                "api_league_id": league["id"],
+                "home_team_id": team_ids[fixture["home_team"]["id"]],
+                "away_team_id": team_ids[fixture["away_team"]["id"]],
+                "league": league["name"],
+                "match_date": parse_kickoff(fixture["date"]),
+                "status": map_status(fixture.get("status")),
+                "api_status": fixture.get("status") or "NS",
+                "venue": fixture.get("venue"),
+                "referee": fixture.get("referee"),
+                "home_score": goals.get("home"),
+                "away_score": goals.get("away"),
+                "round": league.get("round"),
+                "season": str(league["season"]) if league.get("season") else None,
+            }
+        if not rows:
+            return {}
+
+        existing = dict(
+            self.db.query(Match.api_fixture_id, Match.id).filter(Match.api_fixture_id.in_(list(rows)))
+        )
+        updates = [{"id": existing[api_id], **values} for api_id, values in rows.items() if api_id in existing]
+        inserts = []
+        for api_id, values in rows.items():
+            if api_id not in existing:
+                existing[api_id] = str(uuid.uuid4())
+                inserts.append({"id": existing[api_id], "api_fixture_id": api_id, **values})
+
+        if updates:
+            self.db.bulk_update_mappings(Match, updates)
+        if inserts:
+            self.db.bulk_insert_mappings(Match, inserts)
+        return existing
+
+    def upsert_odds(self, odds_by_match: Dict[str, List[Dict]]) -> int:
+        """Upsert bookmaker odds, one row per (match, bookmaker). Returns the number of rows written."""
+        rows = {}
+        for match_id, bookmakers in odds_by_match.items():
+            for bookmaker in bookmakers:
+                row = parse_bookmaker_odds(bookmaker)
+                if row:
+                    rows[(match_id, row["bookmaker"])] = {"match_id": match_id, **row}
+        if not rows:
+            return 0
+
+        existing = {
+            (match_id, bookmaker): odds_id
+            for odds_id, match_id, bookmaker in self.db.query(
+                BettingOdds.id, BettingOdds.match_id, BettingOdds.bookmaker
+            ).filter(BettingOdds.match_id.in_(list(odds_by_match)))
+        }
+        updates = [{"id": existing[key], **row} for key, row in rows.items() if key in existing]
+        inserts = [{"id": str(uuid.uuid4()), **row} for key, row in rows.items() if key not in existing]
+
+        if updates:
+            self.db.bulk_update_mappings(BettingOdds, updates)
+        if inserts:
+            self.db.bulk_insert_mappings(BettingOdds, inserts)
+        return len(rows)
+
+    def upsert_statistics(
+        self,
+        stats_by_match: Dict[str, List[Dict]],
+        team_ids: Dict[int, str],
+        home_teams: Dict[str, str]
+    ) -> int:
+        """
+        Upsert per-team match statistics, one row per (match, team).
+
+        home_teams maps Match.id -> home Team.id and is used to set is_home.
+        """
+        rows = {}
+        for match_id, entries in stats_by_match.items():
+            for entry in entries:
+                team_id = team_ids.get(entry.get("team", {}).get("id"))
+                if team_id is None:
+                    continue
+                rows[(match_id, team_id)] = {
+                    "match_id": match_id,
+                    "team_id": team_id,
+                    "is_home": home_teams.get(match_id) == team_id,
+                    **parse_team_statistics(entry),
+                }
+        if not rows:
+            return 0
+
+        existing = {
+            (match_id, team_id): stats_id
+            for stats_id, match_id, team_id in self.db.query(
+                Statistics.id, Statistics.match_id, Statistics.team_id
+            ).filter(Statistics.match_id.in_(list(stats_by_match)))
+        }
+        updates = [{"id": existing[key], **row} for key, row in rows.items() if key in existing]
+        inserts = [{"id": str(uuid.uuid4()), **row} for key, row in rows.items() if key not in existing]
+
+        if updates:
+            self.db.bulk_update_mappings(Statistics, updates)
+        if inserts:
+            self.db.bulk_insert_mappings(Statistics, inserts)
+        return len(rows)
+
+    def update_standings(self, entries: Iterable[Any], team_ids: Dict[int, str]) -> int:
+        """Update league position and form from standings entries (services.standings_index.StandingEntry)."""
+        updates = [
+            {"id": team_ids[entry.team_id], "league_position": entry.rank, "recent_form": entry.form[-10:]}
+            for entry in entries if entry.team_id in team_ids
+        ]
+        if updates:
+            self.db.bulk_update_mappings(Team, updates)
+        return len(updates)
+
+    def matches_with_statistics(self, match_ids: Iterable[str]) -> Set[str]:
+        """Match ids that already have statistics rows."""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return set()
+        return {
+            match_id for (match_id,) in
+            self.db.query(Statistics.match_id).filter(Statistics.match_id.in_(match_ids)).distinct()
+        }
+
+
+class FixtureIngestionWorker:
+    """
+    Background loop that periodically ingests fixtures for the configured leagues.
+
+    Network calls run on the event loop through the async API client. Database
+    writes run in a worker thread with their own session so request handlers
+    are never blocked.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: float = None,
+        days_back: int = None,
+        days_ahead: int = None,
+        league_ids: List[int] = None
+    ):
+        if client is None:
+            from services.football_api_client import FootballAPIClient
+            client = FootballAPIClient()
+        self.client = client
+        self.session_factory = session_factory
+        self.interval = interval or settings.INGESTION_INTERVAL_SECONDS
+        self.days_back = settings.INGESTION_DAYS_BACK if days_back is None else days_back
+        self.days_ahead = settings.INGESTION_DAYS_AHEAD if days_ahead is None else days_ahead
+        self.league_ids = league_ids
+        self.last_run: Optional[datetime] = None
+        self.last_result: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Run one ingestion pass and return counts of what was written."""
+        today = datetime.now().date()
+        date_from = (today - timedelta(days=self.days_back)).isoformat()
+        date_to = (today + timedelta(days=self.days_ahead)).isoformat()
+
+        by_date = await self.client.get_fixtures_by_date_range_async(date_from, date_to, self.league_ids)
+        fixtures = [fixture for day in by_date.values() for fixture in day]
+        if not fixtures:
+            self.last_run = datetime.now()
+            self.last_result = {"fixtures": 0}
+            return self.last_result
+
+        team_ids, match_ids, finished_without_stats = await asyncio.to_thread(self._write_fixtures, fixtures)
+
+        upcoming = [f for f in fixtures if map_status(f.get("status")) in ("scheduled", "live")]
+        finished = [f for f in fixtures if match_ids[f["fixture_id"]] in finished_without_stats]
+        seasons = {(f["league"]["id"], f["league"]["season"]) for f in fixtures if f["league"].get("season")}
+
+        odds, stats, standings = await asyncio.gather(
+            asyncio.gather(*[self.client.get_bookmaker_odds_async(f["fixture_id"]) for f in upcoming]),
+            asyncio.gather(*[self.client.get_fixture_statistics_async(f["fixture_id"]) for f in finished]),
+            asyncio.gather(*[self.client.get_standings_index_async(league, season) for league, season in seasons])
+        )
+
+        result = await asyncio.to_thread(
+            self._write_details,
+            {match_ids[f["fixture_id"]]: rows for f, rows in zip(upcoming, odds) if rows},
+            {match_ids[f["fixture_id"]]: rows for f, rows in zip(finished, stats) if rows},
+            [entry for index in standings if index for entry in index.entries()],
+            team_ids,
+            {match_ids[f["fixture_id"]]: team_ids[f["home_team"]["id"]] for f in fixtures}
+        )
+        result = {"fixtures": len(fixtures), **result}
+
+        self.last_run = datetime.now()
+        self.last_result = result
+        logger.info(f"Fixture ingestion finished: {result}")
+        return result
+
+    def _write_fixtures(self, fixtures: List[Dict]):
+        db = self.session_factory()
+        try:
+            service = IngestionService(db)
+            team_ids = service.upsert_teams(fixtures)
+            match_ids = service.upsert_matches(fixtures, team_ids)
+            db.commit()
+
+            finished = [
+                match_ids[f["fixture_id"]] for f in fixtures
+                if map_status(f.get("status")) == "finished"
+            ]
+            finished_without_stats = set(finished) - service.matches_with_statistics(finished)
+            return team_ids, match_ids, finished_without_stats
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _write_details(self, odds_by_match, stats_by_match, standings, team_ids, home_teams) -> Dict[str, int]:
+        db = self.session_factory()
+        try:
+            service = IngestionService(db)
+            result = {
+                "odds": service.upsert_odds(odds_by_match),
+                "statistics": service.upsert_statistics(stats_by_match, team_ids, home_teams),
+                "standings": service.update_standings(standings, team_ids),
+            }
+            db.commit()
+            # Refit here, off the event loop, so request handlers only read the cached model
+            get_score_model(db)
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Fixture ingestion failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_
 
 from app.domain.models import Match, Team, Prediction, BettingOdds, Analysis, Statistics, Engagement
+from app.services.ingestion_service import API_STATUS_FALLBACK
 from app.domain.schemas import (
     MatchResponse, MatchDetail, MatchListItem,
     AnalysisResponse, StatisticsResponse,
@@ -151,4 +152,59 @@ class MatchService:
             BettingOdds.match_id == match_id
         ).all()
         
-        return [BettingOddsResponse.model_validate(o) for o in odds]
\ No newline at end of file
+        return [BettingOddsResponse.model_validate(o) for o in odds]
+    
+    def get_ingested_fixtures(
+        self,
+        date_from: datetime,
+        date_to: datetime,
+        league_ids: Optional[List[int]] = None
+    ) -> List[dict]:
+        """
+        Get API-Sports fixtures stored by the ingestion worker.
+        
+        Returns dictionaries in the same shape as FootballAPIClient._parse_fixture
+        (plus match_id): status is the API-Sports short code and date is an
+        ISO timestamp with a UTC offset.
+        """
+        query = self.db.query(Match).options(
+            joinedload(Match.home_team),
+            joinedload(Match.away_team)
+        ).filter(
+            Match.api_fixture_id.isnot(None),
+            Match.match_date >= date_from,
+            Match.match_date < date_to
+        )
+        if league_ids:
+            query = query.filter(Match.api_league_id.in_(league_ids))
+        
+        return [
+            {
+                "fixture_id": match.api_fixture_id,
+                "match_id": match.id,
+                # match_date is stored as naive local time
+                "date": match.match_date.astimezone().isoformat(),
+                "venue": match.venue,
+                "referee": match.referee,
+                "home_team": {
+                    "id": match.home_team.api_team_id,
+                    "name": match.home_team.name,
+                    "logo": match.home_team.logo_url
+                },
+                "away_team": {
+                    "id": match.away_team.api_team_id,
+                    "name": match.away_team.name,
+                    "logo": match.away_team.logo_url
+                },
+                "league": {
+                    "id": match.api_league_id,
+                    "name": match.league,
+                    "country": match.home_team.country,
+                    "season": match.season,
+                    "round": match.round
+                },
+                "status": match.api_status or API_STATUS_FALLBACK.get(match.status, "NS"),
+                "goals": {"home": match.home_score, "away": match.away_score}
+            }
+            for match in query.order_by(Match.match_date).all()
+        ]
@@ -0,0 +1,165 @@
+"""Score model service.
+
+Fits the Poisson / Dixon–Coles score model (services.score_model) from
+finished matches in the database, blending in the xG recorded in
+Statistics, and prices fixtures with it. Older matches count less
+(exponential time decay).
+
+The fitted model is shared process-wide. get_score_model() refits it when
+the set of finished matches changes; it queries the database, so it runs
+in worker threads (the ingestion job, application startup, sync routes).
+Async request handlers read cached_score_model(), which never blocks.
+"""
+
+import os
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.database import SessionLocal
+from app.domain.models import Match, Statistics
+from services.score_model import MatchResult, ScoreModel, ScorePrediction
+
+logger = logging.getLogger(__name__)
+
+# A match this many days old counts half as much as one played today
+SCORE_MODEL_HALF_LIFE_DAYS = float(os.getenv("SCORE_MODEL_HALF_LIFE_DAYS", "180"))
+
+
+class ScoreModelService:
+    """Fit the score model from match history and price fixtures."""
+
+    def __init__(self, db: Session, half_life_days: float = SCORE_MODEL_HALF_LIFE_DAYS):
+        self.db = db
+        self.half_life_days = half_life_days
+
+    def load_results(self, league: Optional[str] = None, now: Optional[datetime] = None) -> List[MatchResult]:
+        """Finished matches with scores, weighted by age and carrying xG where recorded."""
+        query = (
+            self.db.query(Match)
+            .options(joinedload(Match.home_team), joinedload(Match.away_team))
+            .filter(Match.status == "finished", Match.home_score.isnot(None), Match.away_score.isnot(None))
+        )
+        if league:
+            query = query.filter(Match.league == league)
+        matches = query.all()
+        if not matches:
+            return []
+
+        xg: Dict[Tuple[str, bool], float] = {
+            (match_id, is_home): value
+            for match_id, is_home, value in self.db.query(
+                Statistics.match_id, Statistics.is_home, Statistics.expected_goals
+            ).filter(
+                Statistics.match_id.in_([match.id for match in matches]),
+                Statistics.expected_goals.isnot(None)
+            )
+        }
+
+        now = now or datetime.utcnow()
+        results = []
+        for match in matches:
+            age_days = max((now - match.match_date).total_seconds() / 86400, 0.0)
+            results.append(MatchResult(
+                home=match.home_team.name,
+                away=match.away_team.name,
+                home_goals=match.home_score,
+                away_goals=match.away_score,
+                home_xg=xg.get((match.id, True)),
+                away_xg=xg.get((match.id, False)),
+                weight=0.5 ** (age_days / self.half_life_days) if self.half_life_days else 1.0
+            ))
+        return results
+
+    def fit(self, league: Optional[str] = None) -> ScoreModel:
+        """Fit team strengths from the finished matches (of one league, or all)."""
+        return ScoreModel.fit(self.load_results(league))
+
+    def predict_matches(self, matches: Sequence[Match], model: Optional[ScoreModel] = None) -> Dict[str, ScorePrediction]:
+        """Price several fixtures in one batched call. Returns Match.id -> prediction."""
+        model = model or get_score_model(self.db)
+        predictions = model.predict_many([(match.home_team.name, match.away_team.name) for match in matches])
+        return {match.id: prediction for match, prediction in zip(matches, predictions)}
+
+    def predict_matchday(
+        self,
+        day: date,
+        league: Optional[str] = None,
+        model: Optional[ScoreModel] = None
+    ) -> List[Dict[str, Any]]:
+        """Score probabilities for every fixture kicking off on the given day."""
+        start = datetime(day.year, day.month, day.day)
+        query = (
+            self.db.query(Match)
+            .options(joinedload(Match.home_team), joinedload(Match.away_team))
+            .filter(Match.match_date >= start, Match.match_date < start + timedelta(days=1))
+            .order_by(Match.match_date)
+        )
+        if league:
+            query = query.filter(Match.league == league)
+        matches = query.all()
+        predictions = self.predict_matches(matches, model)
+        return [
+            {
+                "match_id": match.id,
+                "league": match.league,
+                "match_date": match.match_date.isoformat(),
+                "status": match.status,
+                **predictions[match.id].to_dict()
+            }
+            for match in matches
+        ]
+
+
+# Process-wide fitted model, refitted when finished matches change
+_score_model: Optional[ScoreModel] = None
+_score_model_signature: Optional[Tuple[Any, ...]] = None
+_score_model_lock = threading.Lock()
+
+
+def get_score_model(db: Optional[Session] = None) -> ScoreModel:
+    """
+    Get the shared score model fitted on all finished matches.
+
+    The model is refitted only when the finished matches change (their
+    count, last update or goal totals). Falls back to the last fitted (or
+    an unfitted) model when the database is unavailable.
+    """
+    global _score_model, _score_model_signature
+    session = db or SessionLocal()
+    try:
+        with _score_model_lock:
+            signature = tuple(
+                session.query(
+                    func.count(Match.id), func.max(Match.updated_at),
+                    func.sum(Match.home_score), func.sum(Match.away_score)
+                )
+                .filter(Match.status == "finished")
+                .one()
+            )
+            if _score_model is None or signature != _score_model_signature:
+                _score_model = ScoreModelService(session).fit()
+                _score_model_signature = signature
+                logger.info(f"Fitted score model: {_score_model.stats()}")
+            return _score_model
+    except SQLAlchemyError as e:
+        logger.warning(f"Score model unavailable, using the last fitted model: {e}")
+        return _score_model or ScoreModel()
+    finally:
+        if db is None:
+            session.close()
+
+
+def cached_score_model() -> ScoreModel:
+    """
+    The last fitted score model, without touching the database.
+
+    For async request handlers. Returns an unfitted model until the first
+    get_score_model() call (at startup or after an ingestion pass) finishes.
+    """
+    return _score_model or ScoreModel()
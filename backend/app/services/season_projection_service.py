@@ -0,0 +1,215 @@
+"""Season projection service.
+
+Projects the final league table with the Monte Carlo season simulator
+(services.season_simulator): the current table comes from finished
+matches, and every remaining fixture is priced by the score model in one
+batched call.
+
+Simulations are cached per (league, season, simulation size), for at
+most SEASON_PROJECTION_MAX_ENTRIES runs (least recently used first out);
+requested sizes are rounded up to one of SIMULATION_SIZES. When matches
+finish, the cached simulation is updated in place with the actual results
+instead of being re-run; a full re-run happens only when the fixture list
+changes, a recorded score is corrected, or the cached run is older than
+SEASON_PROJECTION_MAX_AGE_HOURS (which also picks up a refitted model).
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.domain.models import Match
+from app.services.score_model_service import ScoreModelService, get_score_model
+from services.score_model import ScoreModel
+from services.season_simulator import DEFAULT_SIMULATIONS, Fixture, SeasonSimulation, Standing
+
+logger = logging.getLogger(__name__)
+
+# Full re-runs pick up model refits; in between, finished matches are applied incrementally
+SEASON_PROJECTION_MAX_AGE_HOURS = float(os.getenv("SEASON_PROJECTION_MAX_AGE_HOURS", "24"))
+
+# Worker processes for a full run (only used from MIN_PARALLEL_SIMULATIONS up)
+SEASON_SIMULATION_WORKERS = int(os.getenv("SEASON_SIMULATION_WORKERS", "1"))
+
+# Cached run sizes; a cached 100k run holds about 60MB for a 20-team league
+SIMULATION_SIZES = (10000, 20000, 50000, 100000)
+SEASON_PROJECTION_MAX_ENTRIES = int(os.getenv("SEASON_PROJECTION_MAX_ENTRIES", "8"))
+
+# match id -> (home score, away score)
+Results = Dict[str, Tuple[int, int]]
+
+
+class SeasonProjectionService:
+    """Simulate the rest of a season from the database."""
+
+    def __init__(self, db: Session, score_model: Optional[ScoreModel] = None):
+        self.db = db
+        self.score_model = score_model
+
+    def load_matches(self, league: str, season: Optional[str] = None) -> List[Match]:
+        """All matches of a league season, with teams loaded."""
+        query = (
+            self.db.query(Match)
+            .options(joinedload(Match.home_team), joinedload(Match.away_team))
+            .filter(Match.league == league)
+            .order_by(Match.match_date)
+        )
+        if season:
+            query = query.filter(Match.season == season)
+        return query.all()
+
+    @staticmethod
+    def standings(matches: List[Match]) -> Dict[str, Standing]:
+        """Current table (points, goal difference, played) from the finished matches."""
+        table: Dict[str, List[int]] = {}
+        for match in matches:
+            home = table.setdefault(match.home_team.name, [0, 0, 0])
+            away = table.setdefault(match.away_team.name, [0, 0, 0])
+            if not _is_result(match):
+                continue
+            difference = match.home_score - match.away_score
+            home[0] += 3 if difference > 0 else 1 if difference == 0 else 0
+            away[0] += 3 if difference < 0 else 1 if difference == 0 else 0
+            home[1] += difference
+            away[1] -= difference
+            home[2] += 1
+            away[2] += 1
+        return {team: Standing(*row) for team, row in table.items()}
+
+    def simulate(
+        self,
+        league: str,
+        season: Optional[str] = None,
+        simulations: int = DEFAULT_SIMULATIONS,
+        seed: Optional[int] = None,
+        workers: int = SEASON_SIMULATION_WORKERS,
+        matches: Optional[List[Match]] = None
+    ) -> SeasonSimulation:
+        """Run a full simulation of the remaining fixtures."""
+        matches = matches if matches is not None else self.load_matches(league, season)
+        remaining = [match for match in matches if not _is_result(match)]
+        model = self.score_model or get_score_model(self.db)
+        predictions = ScoreModelService(self.db).predict_matches(remaining, model)
+        fixtures = []
+        for match in remaining:
+            odds = predictions[match.id].markets["1x2"]
+            fixtures.append(Fixture(
+                match.id, match.home_team.name, match.away_team.name, odds["home"], odds["draw"], odds["away"]
+            ))
+        return SeasonSimulation.run(self.standings(matches), fixtures, simulations, seed=seed, workers=workers)
+
+
+@dataclass
+class _CachedSimulation:
+    simulation: SeasonSimulation
+    fixtures: FrozenSet[str]
+    results: Results
+    created_at: datetime
+    updated_at: datetime
+
+
+# Process-wide simulations, keyed by (league, season, simulation size), least recently used first
+_simulations: "OrderedDict[Tuple[str, Optional[str], int], _CachedSimulation]" = OrderedDict()
+# One lock per key, so a full run of one league does not hold up the others
+_key_locks: Dict[Tuple[str, Optional[str], int], threading.Lock] = {}
+# Guards the two dicts above
+_simulations_lock = threading.Lock()
+
+
+def simulation_size(requested: int) -> int:
+    """Round a requested number of simulations up to a cached run size."""
+    return next((size for size in SIMULATION_SIZES if size >= requested), SIMULATION_SIZES[-1])
+
+
+def get_season_projections(
+    db: Session,
+    league: str,
+    season: Optional[str] = None,
+    simulations: int = DEFAULT_SIMULATIONS,
+    top_n: int = 4,
+    relegation: int = 3,
+    refresh: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Title, top-N and relegation odds and expected points for every team.
+
+    Newly finished matches are applied to the cached simulation; see the
+    module docstring for when the season is simulated again from scratch.
+    Blocking (a full run takes up to about a second): call it from a
+    worker thread. Returns None when the league has no matches.
+    """
+    key = (league, season, simulation_size(simulations))
+    with _simulations_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        service = SeasonProjectionService(db)
+        matches = service.load_matches(league, season)
+        if not matches:
+            with _simulations_lock:
+                if key not in _simulations:
+                    _key_locks.pop(key, None)
+            return None
+        fixtures = frozenset(match.id for match in matches)
+        results = {match.id: (match.home_score, match.away_score) for match in matches if _is_result(match)}
+        now = datetime.utcnow()
+
+        with _simulations_lock:
+            cached = None if refresh else _simulations.get(key)
+            if cached is not None:
+                _simulations.move_to_end(key)
+        if cached is not None and _can_update(cached, fixtures, results, now):
+            applied = [
+                match_id for match_id, score in results.items()
+                if match_id not in cached.results and cached.simulation.apply_result(match_id, *score)
+            ]
+            cached.results = results
+            if applied:
+                cached.updated_at = now
+                logger.info(f"Applied {len(applied)} results to the {league} season simulation")
+        else:
+            simulation = service.simulate(league, season, key[2], matches=matches)
+            cached = _CachedSimulation(simulation, fixtures, results, now, now)
+            _store(key, cached)
+            logger.info(f"Simulated the {league} season: {simulation.stats()}")
+
+        simulation = cached.simulation
+        return {
+            "league": league,
+            "season": season,
+            **simulation.stats(),
+            "top_n": top_n,
+            "relegation": relegation,
+            "simulated_at": cached.created_at.isoformat(),
+            "updated_at": cached.updated_at.isoformat(),
+            "teams": simulation.projections(top_n, relegation),
+        }
+
+
+def _store(key: Tuple[str, Optional[str], int], cached: _CachedSimulation) -> None:
+    """Cache a run, evicting the least recently used ones beyond SEASON_PROJECTION_MAX_ENTRIES."""
+    with _simulations_lock:
+        _simulations[key] = cached
+        _simulations.move_to_end(key)
+        while len(_simulations) > SEASON_PROJECTION_MAX_ENTRIES:
+            evicted, _ = _simulations.popitem(last=False)
+            _key_locks.pop(evicted, None)
+
+
+def _is_result(match: Match) -> bool:
+    return match.status == "finished" and match.home_score is not None and match.away_score is not None
+
+
+def _can_update(cached: _CachedSimulation, fixtures: FrozenSet[str], results: Results, now: datetime) -> bool:
+    """The cached run can absorb the new results: same fixtures, no corrected or reverted scores, not stale."""
+    if fixtures != cached.fixtures:
+        return False
+    if now - cached.created_at > timedelta(hours=SEASON_PROJECTION_MAX_AGE_HOURS):
+        return False
+    return all(results.get(match_id) == score for match_id, score in cached.results.items())
@@ -1,18 +1,33 @@
 """Statistics service."""
 
 from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc
 from datetime import datetime, timedelta
 
 from app.domain.models import Statistics, Team, Match, Prediction, Expert
+from app.services.score_model_service import ScoreModelService, cached_score_model
+from services.score_model import ScoreModel
+
+# Expected return per unit staked above which a bet counts as value:
+# model-priced outcomes need a real edge, confidence-priced ones keep the old bar
+MODEL_VALUE_THRESHOLD = 1.05
+CONFIDENCE_VALUE_THRESHOLD = 1.5
 
 
 class StatisticsService:
     """Service for statistics-related operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, score_model: Optional[ScoreModel] = None):
         self.db = db
+        self._score_model = score_model
+    
+    @property
+    def score_model(self) -> ScoreModel:
+        """Score model pricing value bets (the last shared fitted model by default)."""
+        if self._score_model is None:
+            self._score_model = cached_score_model()
+        return self._score_model
     
     def get_team_statistics(self, team_id: str, season: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get comprehensive team statistics."""
@@ -275,19 +290,37 @@ class StatisticsService:
         ]
     
     def _get_value_bets(self, predictions: List[Prediction]) -> List[Dict[str, Any]]:
-        """Get value bets based on odds and success rate."""
+        """
+        Get value bets: outcomes whose expected return at the offered odds clears the threshold.
+        
+        Outcomes of known matches are priced by the score model (all matches in one
+        batched call); the rest fall back to the expert's confidence.
+        """
+        priced = [pred for pred in predictions if pred.odds]
+        matches = self.db.query(Match).options(
+            joinedload(Match.home_team), joinedload(Match.away_team)
+        ).filter(Match.id.in_({pred.match_id for pred in priced})).all() if priced else []
+        model_predictions = ScoreModelService(self.db).predict_matches(matches, self.score_model) if matches else {}
+        
         value_bets = []
-        for pred in predictions:
-            if pred.odds and pred.confidence > 70:
+        for pred in priced:
+            score_prediction = model_predictions.get(pred.match_id)
+            probability = score_prediction.probability(pred.predicted_outcome) if score_prediction else None
+            if probability is not None:
+                expected_value = probability * pred.odds
+                is_value = expected_value > MODEL_VALUE_THRESHOLD
+            else:
                 expected_value = (pred.confidence / 100) * pred.odds
-                if expected_value > 1.5:  # Value threshold
-                    value_bets.append({
-                        "prediction_id": pred.id,
-                        "outcome": pred.predicted_outcome,
-                        "odds": pred.odds,
-                        "confidence": pred.confidence,
-                        "expected_value": round(expected_value, 2)
-                    })
+                is_value = pred.confidence > 70 and expected_value > CONFIDENCE_VALUE_THRESHOLD
+            if is_value:
+                value_bets.append({
+                    "prediction_id": pred.id,
+                    "outcome": pred.predicted_outcome,
+                    "odds": pred.odds,
+                    "confidence": pred.confidence,
+                    "model_probability": round(probability, 4) if probability is not None else None,
+                    "expected_value": round(expected_value, 2)
+                })
         
         return sorted(value_bets, key=lambda x: x["expected_value"], reverse=True)[:5]
     
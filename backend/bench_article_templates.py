@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+模板文章渲染基准测试
+
+对比原 f-string 实现和编译后的渲染计划：先校验同一随机种子下输出逐字相同，再测每秒生成文章数。
+
+    python bench_article_templates.py --runs 5000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.prediction_experts import PredictionExpertProfiles
+
+
+def legacy_detailed_prediction(expert, home_team="浦项制铁", away_team="全北现代"):
+    """generate_detailed_prediction 编译前的实现（原样保留，作为基准）"""
+
+    # Generate random but realistic statistics
+    home_rank = random.randint(2, 8)
+    away_rank = random.randint(3, 10)
+    home_recent_wins = random.randint(3, 6)
+    home_recent_draws = random.randint(1, 3)
+    home_recent_losses = random.randint(0, 2)
+    away_recent_wins = random.randint(2, 5)
+    away_recent_draws = random.randint(1, 3)
+    away_recent_losses = random.randint(1, 4)
+    
+    h2h_total = random.randint(15, 25)
+    h2h_home_wins = random.randint(5, 10)
+    h2h_draws = random.randint(3, 7)
+    h2h_away_wins = h2h_total - h2h_home_wins - h2h_draws
+    
+    # Build the comprehensive article
+    home_goals_avg = round(random.uniform(1.5, 2.5), 1)
+    away_goals_avg = round(random.uniform(0.8, 1.8), 1)
+    home_defense_avg = round(random.uniform(0.6, 1.2), 1)
+    away_defense_avg = round(random.uniform(1.0, 1.8), 1)
+    
+    article = f"""
+📊 详细分析
+
+{home_team} vs {away_team}
+
+{random.choice(expert.opening_templates)}
+
+【基本面分析】
+{expert.signature_phrases[0]}，{home_team}本赛季表现稳定，目前联赛排名第{home_rank}，主场战绩出色。最近10个主场比赛{home_recent_wins}胜{home_recent_draws}平{home_recent_losses}负，展现出强大的主场统治力。球队进攻火力充足，场均进球达到{home_goals_avg}个，防守端也相对稳固，场均失球仅{home_defense_avg}个。
+
+深入分析{home_team}的主场表现，我们发现球队在面对同等级对手时胜率高达{random.randint(65, 75)}%。主教练{random.choice(['金成根', '崔龙洙', '朴恒绪'])}的战术体系已经成熟，球队在{random.choice(['4-3-3', '4-2-3-1', '3-5-2'])}阵型下运转流畅。特别值得一提的是，主队在主场的控球率平均达到{random.randint(52, 58)}%，传球成功率高达{random.randint(82, 88)}%，这为球队创造进球机会提供了保障。
+
+{away_team}作为K联赛传统豪门，本赛季状态有所起伏。目前排名第{away_rank}，客场表现差强人意。最近10个客场{away_recent_wins}胜{away_recent_draws}平{away_recent_losses}负，客场进球效率仅为场均{away_goals_avg}球，失球数却高达场均{away_defense_avg}球。球队最近遭遇伤病困扰，主力中场核心{random.choice(['金英权', '李青龙', '寄诚庸'])}因伤缺阵，对球队中场控制力造成严重影响。
+
+从数据层面深入剖析，{away_team}在客场的问题主要体现在三个方面：首先是防守端的不稳定，客场失球率比主场高出{random.randint(30, 45)}%；其次是进攻效率低下，射正率仅为{random.randint(28, 35)}%；最后是心理层面的压力，客场作战时球员的跑动距离平均减少{random.randint(5, 8)}%。
+
+从{expert.key_metrics[0]}的角度来看，{home_team}在主场的表现明显优于{away_team}的客场表现。特别是在{expert.specializations[0]}方面，主队展现出了压倒性的优势。根据最新的数据模型分析，主队在该项指标上领先客队{random.randint(15, 25)}个百分点。
+
+【历史交锋】
+两队在历史上共交手{h2h_total}次，{home_team}取得{h2h_home_wins}胜{h2h_draws}平{h2h_away_wins}负的战绩，进{random.randint(25, 40)}球失{random.randint(20, 35)}球，在心理上{random.choice(['略占优势', '稍处下风', '势均力敌'])}。
+
+深入分析历史交锋数据，我们发现一些有趣的规律：首先，在最近{random.randint(8, 12)}次交锋中，有{random.randint(5, 7)}场比赛的首球时间在30分钟以内，这说明双方开场后就会展开激烈对抗。其次，{home_team}在主场对阵{away_team}时的不败率高达{random.randint(65, 75)}%，最近5场主场交锋取得3胜1平1负的优秀战绩。
+
+{expert.signature_phrases[1]}，从历史数据可以看出，当两队在{home_team}主场交锋时，场均总进球数达到{round(random.uniform(2.5, 3.2), 1)}个。最近5次主场交锋中，有4场比赛总进球数超过2.5球，其中2场甚至达到4球以上。这种高进球率的原因在于双方都采用积极的进攻战术，特别是在下半场，进球概率明显提升。
+
+值得特别关注的是，上赛季双方的两次交锋都非常精彩。首回合{home_team}在客场{random.randint(1, 2)}-{random.randint(2, 3)}不敌{away_team}，但在次回合主场以{random.randint(3, 4)}-{random.randint(1, 2)}完成复仇，展现出强大的主场威力。这种一报还一报的对抗格局，让本场比赛充满了悬念和看点。
+
+【盘口分析】
+初盘开出{home_team}主让{random.choice(['平/半', '半球', '半/一'])}高水{round(random.uniform(0.95, 1.05), 2)}，后市水位调整至{round(random.uniform(0.85, 0.95), 2)}。从盘口变化来看，机构对主队信心逐渐增强。考虑到{home_team}的主场优势（最近主场胜率{random.randint(60, 70)}%）和{away_team}的客场疲软（客场胜率仅{random.randint(20, 35)}%），此盘口设置较为合理。
+
+欧赔方面，主流公司开出主胜{round(random.uniform(2.10, 2.40), 2)}、平局{round(random.uniform(3.20, 3.50), 2)}、客胜{round(random.uniform(3.00, 3.80), 2)}的赔率组合。值得注意的是，主胜赔率从开盘的{round(random.uniform(2.35, 2.50), 2)}持续下调至目前水平，降幅达{random.randint(5, 10)}%，显示市场资金大量涌入主胜方向。
+
+{expert.signature_phrases[2]}，从{expert.key_metrics[1]}的变化趋势分析，本场比赛存在以下几个关键信息：
+1. 亚盘水位在开赛前{random.randint(2, 4)}小时出现明显调整，主队水位下降{round(random.uniform(0.05, 0.15), 2)}，暗示有大额资金支持主队
+2. 大小球盘口从{random.choice(['2.5', '2.5/3', '3'])}球调整至{random.choice(['2.5/3', '3', '3/3.5'])}球，市场预期进球数增加
+3. 角球盘口开出{random.randint(9, 11)}个，考虑到双方的进攻风格，这个盘口偏保守
+
+从投注分布来看，目前主胜投注比例达到{random.randint(55, 65)}%，平局{random.randint(20, 25)}%，客胜仅{random.randint(15, 25)}%。这种一边倒的投注分布，可能会导致临场出现盘口调整。
+
+【{expert.primary_expertise.value}专项分析】
+作为专注于{expert.primary_expertise.value}的分析师，我特别关注{expert.key_metrics[0]}这个指标。{home_team}在这方面的数据为{random.randint(65, 85)}%，远高于{away_team}的{random.randint(45, 65)}%。
+
+从{expert.specializations[1]}的角度分析，{home_team}在主场的战术执行力明显更强。主教练的战术安排更适合主场作战，球员在熟悉的环境中能够更好地发挥。
+
+{expert.signature_phrases[3]}，这场比赛的关键在于{random.choice(['中场控制', '边路突破', '定位球得分', '防守反击效率'])}。谁能在这方面占据优势，谁就有更大的赢面。
+
+【近期表现】
+{home_team}近期状态分析：
+
+上轮联赛，{home_team}在{random.choice(['主场', '客场'])}{random.randint(2, 4)}-{random.randint(0, 2)}战胜{random.choice(['强敌', '中游球队', '保级球队'])}，展现出色的竞技状态。这是球队连续第{random.randint(3, 5)}场保持不败，期间取得{random.randint(2, 4)}胜{random.randint(1, 2)}平的优异战绩。
+
+进攻端表现：
+- 主力前锋{random.choice(['朴主永', '李东国', '廉基勋'])}状态火热，近5场打入{random.randint(3, 7)}球，场均射门{random.randint(3, 5)}次
+- 中场核心{random.choice(['郑又荣', '韩教元', '奇诚庸'])}贡献{random.randint(2, 4)}次助攻，传威胁球成功率达{random.randint(75, 85)}%
+- 球队近5场比赛场均创造{random.randint(12, 18)}次射门机会，射正率{random.randint(35, 45)}%
+- 定位球得分能力出色，近期有{random.randint(2, 4)}个进球来自定位球
+
+防守端表现：
+- 防线稳固，近{random.randint(3, 5)}个主场仅丢{random.randint(2, 5)}球
+- 门将{random.choice(['赵贤祐', '金承奎', '宋范根'])}状态神勇，扑救成功率达{random.randint(70, 80)}%
+- 后防线默契度提升，越位造成成功率{random.randint(60, 70)}%
+
+{away_team}近期状态分析：
+
+{away_team}在上轮联赛{random.randint(1, 3)}-{random.randint(0, 2)}{random.choice(['险胜', '击败', '战胜'])}对手，暂时止住了此前的颓势。但球队整体状态仍不稳定，近5场比赛仅取得{random.randint(1, 2)}胜{random.randint(1, 2)}平{random.randint(2, 3)}负。
+
+问题分析：
+- 客场作战能力明显下滑，近5个客场仅获{random.randint(1, 2)}胜，客场进球效率仅为每场{round(random.uniform(0.8, 1.2), 1)}球
+- 中场核心{random.choice(['李青龙', '具滋哲', '池东沅'])}因伤缺阵{random.randint(2, 4)}轮，球队组织能力大打折扣
+- 后防线问题突出，近期场均失球达到{round(random.uniform(1.5, 2.0), 1)}个，高位防线频频被打穿
+- 体能储备不足，下半场失球率比上半场高出{random.randint(40, 60)}%
+
+【人员情况】
+{home_team}阵容情况：
+
+伤停名单：
+- 后卫{random.choice(['李明浩', '金民在', '郑升炫'])}（红牌停赛）- 上轮比赛两黄变一红，将缺席本场比赛
+- 中场{random.choice(['金成民', '韩教元', '李英才'])}（肌肉拉伤）- 预计缺阵{random.randint(2, 3)}周，确定无缘本场
+- 替补前锋{random.choice(['崔成根', '朴柱昊', '李根镐'])}（脚踝扭伤）- 恢复情况不理想，出战成疑
+
+利好消息：
+- 主力前锋{random.choice(['朴智星', '李同国', '黄义助'])}伤愈复出，已恢复训练，有望首发出场
+- 中场大将{random.choice(['奇诚庸', '具滋哲', '权敬原'])}解除停赛，可以正常出战
+- 后防核心{random.choice(['金英权', '金玟哉', '权敬原'])}状态出色，近期表现稳定
+
+预计首发阵容（{random.choice(['4-3-3', '4-2-3-1', '3-5-2'])}）：
+门将：{random.choice(['赵贤祐', '金承奎', '宋范根'])}
+后卫线：经验丰富，平均年龄{random.randint(26, 29)}岁
+中场：控制力强，传球成功率预计达{random.randint(82, 88)}%
+锋线：速度与技术兼备，反击威胁大
+
+{away_team}阵容情况：
+
+伤停情况严重：
+- 中场核心{random.choice(['金英权', '李青龙', '寄诚庸'])}（膝伤）- 赛季报销，对球队影响巨大
+- 主力后卫{random.choice(['洪正好', '金玟哉', '金英权'])}（累积黄牌）- 停赛一场
+- 后卫{random.choice(['李庸', '崔哲淳', '朴柱昊'])}（累积黄牌）- 同样停赛
+- 边锋{random.choice(['南泰熙', '李在城', '文宣民'])}（腿筋拉伤）- 出战概率仅30%
+
+阵容调整：
+- 新援前锋{random.choice(['奥斯马尔', '穆戈萨', '塔加特'])}有望迎来首秀，但磨合度存疑
+- 年轻球员可能获得机会，但大赛经验不足
+- 主教练不得不调整战术，可能采用更保守的{random.choice(['5-4-1', '4-5-1', '5-3-2'])}阵型
+
+【比分预测】
+{expert.signature_phrases[4]}，基于以上全方位分析，结合双方的状态、阵容、历史交锋等因素，本场比赛预测如下：
+
+最可能比分：{home_team} {random.randint(2, 3)}-{random.randint(1, 2)} {away_team}（概率{random.randint(25, 35)}%）
+次选比分：{random.randint(1, 2)}-{random.randint(1, 2)}（概率{random.randint(20, 25)}%）
+第三选择：{random.randint(3, 4)}-{random.randint(0, 1)}（概率{random.randint(15, 20)}%）
+
+进球时间分布预测：
+- 0-15分钟：{random.randint(15, 25)}%概率出现进球
+- 16-30分钟：{random.randint(20, 30)}%概率出现进球
+- 31-45分钟：{random.randint(25, 35)}%概率出现进球
+- 46-60分钟：{random.randint(30, 40)}%概率出现进球
+- 61-75分钟：{random.randint(35, 45)}%概率出现进球
+- 76-90分钟：{random.randint(40, 50)}%概率出现进球
+
+特别提醒：根据数据分析，本场比赛下半场进球概率（{random.randint(60, 70)}%）明显高于上半场，建议关注下半场大球。
+
+【推荐】
+基于以上分析，本场比赛推荐：
+
+主推：{random.choice(expert.preferred_bet_types)}
+亚盘推荐：{home_team} -{random.choice(['0.5', '0.75', '1'])}
+大小球推荐：大{random.choice(['2.5', '2.75', '3'])}球
+比分推荐：{random.randint(2, 3)}-{random.randint(1, 2)}
+
+置信度：{expert.win_rate}%
+风险等级：{random.choice(['低', '中', '中低'])}
+
+{random.choice(expert.conclusion_templates)}
+
+祝各位朋友投注顺利，理性投注，量力而行！
+
+——{expert.nickname}({expert.name})
+        """
+    
+    return article
+
+
+def articles_per_second(render, keys, runs):
+    started = time.perf_counter()
+    for i in range(runs):
+        render(keys[i % len(keys)])
+    return runs / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled article templates")
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    profiles = PredictionExpertProfiles()
+    keys = list(profiles.experts)
+
+    for i, key in enumerate(keys * 10):
+        random.seed(args.seed + i)
+        legacy = legacy_detailed_prediction(profiles.experts[key])
+        compiled = profiles.generate_detailed_prediction(key, rng=random.Random(args.seed + i))
+        assert compiled == legacy, f"output differs for {key}"
+    print(f"identical output for {len(keys) * 10} seeded articles")
+
+    random.seed(args.seed)
+    before = articles_per_second(lambda key: legacy_detailed_prediction(profiles.experts[key]), keys, args.runs)
+    rng = random.Random(args.seed)
+    after = articles_per_second(lambda key: profiles.generate_detailed_prediction(key, rng=rng), keys, args.runs)
+    print(f"f-string: {before:,.0f} articles/s")
+    print(f"compiled: {after:,.0f} articles/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+预测数据聚合基准测试
+
+在进程内模拟的 API-Sports 上运行 prepare_prediction_data_async，不消耗真实配额。
+
+    python bench_data_aggregation.py --runs 50 --concurrency 10 --latency lognormal:0.15,0.5 --seed 7
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.fake_api_sports import create_fake_api_sports_app, FakeServerConfig, LatencyProfile
+from services.football_api_client import FootballAPIClient, FootballDataAggregator
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndexCache
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    app = create_fake_api_sports_app(FakeServerConfig(
+        latency=LatencyProfile.parse(args.latency),
+        error_rate=args.error_rate,
+        enforce_rate_limit=False,
+        seed=args.seed
+    ))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+        client = FootballAPIClient(
+            api_key="fake",
+            base_url="http://fake-api-sports",
+            use_cache=args.cache,
+            coalescer=RequestCoalescer(),
+            rate_limiter=QuotaAwareRateLimiter(per_minute=10 ** 6),
+            async_http_client=http_client,
+            standings_indexes=StandingsIndexCache(),
+            fixture_store=FixtureStore()
+        )
+        aggregator = FootballDataAggregator(client, branch_timeout=args.branch_timeout)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies, partial = [], 0
+
+        async def one():
+            nonlocal partial
+            async with semaphore:
+                started = time.perf_counter()
+                data = await aggregator.prepare_prediction_data_async(2750, 2749, 292, fixture_id=1208001)
+                latencies.append(time.perf_counter() - started)
+                partial += bool(data["missing_sources"])
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one() for _ in range(args.runs)])
+        wall = time.perf_counter() - started
+
+    print(f"runs={args.runs} concurrency={args.concurrency} latency={args.latency} error_rate={args.error_rate}")
+    print(f"p50={percentile(latencies, 50) * 1000:.1f}ms p95={percentile(latencies, 95) * 1000:.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.1f}ms mean={statistics.mean(latencies) * 1000:.1f}ms")
+    print(f"throughput={args.runs / wall:.1f}/s partial={partial} upstream_requests={sum(app.state.request_counts.values())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction data aggregation path")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", default="lognormal:0.15,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--branch-timeout", type=float, default=8.0)
+    parser.add_argument("--cache", action="store_true", help="use the persistent response cache")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
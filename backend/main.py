@@ -4,6 +4,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from app.core.config import settings
@@ -11,6 +12,8 @@ from app.core.database import init_db, get_db
 from app.core.logging import setup_logging
 from app.api.v1.api import api_router
 from app.utils.mock_data import seed_database
+from app.services.score_model_service import get_score_model
+from services.football_api_client import close_async_http_client
 
 
 # Setup logging
@@ -47,9 +50,27 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error seeding database: {e}")
     
+    # Keep the Match/Team tables in sync with API-Sports in the background
+    ingestion_worker = None
+    if settings.INGESTION_ENABLED:
+        try:
+            from app.services.ingestion_service import FixtureIngestionWorker
+            ingestion_worker = FixtureIngestionWorker()
+            ingestion_worker.start()
+            logger.info(f"Fixture ingestion started (every {ingestion_worker.interval}s)")
+        except Exception as e:
+            logger.error(f"Failed to start fixture ingestion: {e}")
+    app.state.ingestion_worker = ingestion_worker
+    
+    # Fit the score model in a worker thread; request handlers only read the cached model
+    app.state.score_model_warmup = asyncio.create_task(asyncio.to_thread(get_score_model))
+    
     yield
     
     # Shutdown
+    if ingestion_worker:
+        await ingestion_worker.stop()
+    await close_async_http_client()
     logger.info("Shutting down application")
 
 
@@ -0,0 +1,248 @@
+"""
+Article Cache
+生成文章的结果缓存
+
+- 缓存槽位按 (比赛, 写作器版本, 专家) 划分，每个槽位只保留最新一份输入快照的文章
+- 输入快照用指纹表示：MatchInfo / OddsInfo / HistoricalData 等输入规范化后取 sha256
+- 赔率、伤停等上游数据变化时指纹随之变化，旧文章在下次读取时失效并被替换
+- 内存 LRU（条数和字节数双上限），可选 SQLite 持久化（复用 SQLiteLRUStore）
+- 命中/未命中/失效计数
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+import dataclasses
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from services.response_cache import MISS, SQLiteLRUStore
+except ImportError:
+    from response_cache import MISS, SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+# 文章本身不会过期，输入不变时一直有效；TTL 只用来清理长期不再访问的比赛
+DEFAULT_ARTICLE_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = int(os.getenv("ARTICLE_CACHE_MAX_ENTRIES", "2000"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("ARTICLE_CACHE_MAX_MB", "32")) * 1024 * 1024)
+
+
+def _plain(value: Any) -> Any:
+    """把 dataclass / 枚举转换为可 JSON 序列化的结构"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    输入快照指纹
+
+    dataclass 和 dict 都规范化为按键排序的 JSON，字段顺序不影响结果，任一字段变化都会得到新指纹。
+    """
+    payload = json.dumps(
+        list(parts),
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_plain
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArticleCache:
+    """
+    文章结果缓存
+
+    内存中按最近访问顺序淘汰；配置了 store 时同时写入磁盘，内存未命中再查磁盘并回填内存。
+    读出的文章是副本，调用方可以随意修改。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        store: Optional[SQLiteLRUStore] = None,
+        ttl: float = DEFAULT_ARTICLE_TTL,
+        time_func: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self.ttl = ttl
+        self._time = time_func
+        self._lock = threading.Lock()
+        # 槽位键 -> (指纹, 文章, 字节数, 过期时间)
+        self._entries: "OrderedDict[str, Tuple[str, Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    @staticmethod
+    def slot_key(namespace: str, expert: str, fixture_id: Any = None, fp: str = "") -> str:
+        """
+        缓存槽位键
+
+        有比赛 id 时以比赛开头，便于按比赛整体失效；没有比赛 id 时只能按指纹区分。
+        """
+        if fixture_id is None:
+            return f"fingerprint:{fp}|{namespace}|{expert}"
+        return f"fixture:{fixture_id}|{namespace}|{expert}"
+
+    def get(self, namespace: str, expert: str, fp: str, fixture_id: Any = None) -> Any:
+        """读取文章，未命中或输入快照已变化时返回 MISS"""
+        key = self.slot_key(namespace, expert, fixture_id, fp)
+        now = self._time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] <= now:
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                if entry[0] == fp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(entry[1])
+                self._drop(key)
+                self.stale += 1
+                self.misses += 1
+                self._store_delete(key)
+                return MISS
+
+        stored = self._store_get(key)
+        if stored is MISS:
+            with self._lock:
+                self.misses += 1
+            return MISS
+        if stored.get("fingerprint") != fp:
+            with self._lock:
+                self.stale += 1
+                self.misses += 1
+            self._store_delete(key)
+            return MISS
+        with self._lock:
+            self.hits += 1
+            self._put(key, fp, stored["value"], now)
+        return copy.deepcopy(stored["value"])
+
+    def set(self, namespace: str, expert: str, fp: str, value: Any, fixture_id: Any = None) -> None:
+        """写入文章，替换同一槽位中旧快照的文章"""
+        key = self.slot_key(namespace, expert, fixture_id, fp)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._put(key, fp, value, self._time())
+        if self.store is not None:
+            try:
+                self.store.set(key, {"fingerprint": fp, "value": value}, self.ttl)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Failed to persist article {key}: {e}")
+
+    def invalidate_fixture(self, fixture_id: Any) -> int:
+        """使一场比赛的全部文章失效（如比赛改期、数据修正），返回内存中删除的条数"""
+        prefix = f"fixture:{fixture_id}|"
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+        if self.store is not None:
+            self.store.delete_prefix(prefix)
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def _put(self, key: str, fp: str, value: Any, now: float) -> None:
+        size = len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (fp, value, size, now + self.ttl)
+        self._total_bytes += size
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def _store_get(self, key: str) -> Any:
+        if self.store is None:
+            return MISS
+        try:
+            return self.store.get(key)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Failed to read persisted article {key}: {e}")
+            return MISS
+
+    def _store_delete(self, key: str) -> None:
+        if self.store is not None:
+            self.store.delete(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "persisted_entries": len(self.store) if self.store is not None else None
+        }
+
+
+# 进程级共享缓存（惰性初始化）
+_article_cache: Optional[ArticleCache] = None
+
+
+def get_article_cache() -> Optional[ArticleCache]:
+    """
+    获取共享的文章缓存
+
+    设置 ARTICLE_CACHE_ENABLED=false 可关闭缓存；
+    ARTICLE_CACHE_PATH 指定 SQLite 文件时文章在进程重启后仍然有效，留空则只缓存在内存中。
+    """
+    global _article_cache
+    if os.getenv("ARTICLE_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _article_cache is None:
+        path = os.getenv("ARTICLE_CACHE_PATH", "")
+        store = None
+        if path:
+            try:
+                store = SQLiteLRUStore(path, max_bytes=DEFAULT_MAX_BYTES)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to open article cache at {path}: {e}")
+        _article_cache = ArticleCache(store=store)
+    return _article_cache
@@ -0,0 +1,123 @@
+"""
+Circuit Breaker
+上游 API 熔断器
+
+- closed：正常放行，连续失败达到阈值后打开
+- open：直接拒绝请求（不等待超时），recovery_timeout 秒后进入 half_open
+- half_open：放行少量探测请求，成功则关闭，失败则重新打开
+"""
+
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """线程安全的熔断器，同步和异步调用方共用"""
+
+    def __init__(
+        self,
+        name: str = "api-sports",
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        time_func: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._time = time_func
+        self._lock = threading.Lock()
+
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._half_open_since: Optional[float] = None
+
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        now = self._time()
+        if self._state == STATE_OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_since = now
+        elif self._state == STATE_HALF_OPEN and now - self._half_open_since >= self.recovery_timeout:
+            # 探测请求没有回报结果（例如被取消），重新放行探测
+            self._half_open_calls = 0
+            self._half_open_since = now
+
+    def allow_request(self) -> bool:
+        """是否放行本次请求；拒绝时调用方应直接走降级逻辑"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        """记录一次成功"""
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = STATE_CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        """记录一次失败（超时、连接错误、5xx）"""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == STATE_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    self.times_opened += 1
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self._consecutive_failures} consecutive failures"
+                    )
+                self._state = STATE_OPEN
+                self._opened_at = self._time()
+
+    def stats(self) -> Dict[str, Any]:
+        """熔断器状态"""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(max(0.0, self.recovery_timeout - (self._time() - self._opened_at)), 1)
+                if state == STATE_OPEN else 0.0
+            }
+
+
+# 进程级共享熔断器
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """获取 API-Sports 共享熔断器"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
@@ -0,0 +1,268 @@
+"""
+Fake Anthropic Server
+本地 Anthropic Messages API 模拟服务，用于测试和性能基准，不消耗真实额度
+
+- 实现 POST /v1/messages，支持普通响应和 stream=true 的 SSE 流式响应
+- 可配置首 token 延迟（复用 LatencyProfile）和输出速度（token/秒）
+- 可注入 429（rate_limit_error）和 529（overloaded_error），带 retry-after 响应头
+- 模拟提示词缓存：带 cache_control 标记的前缀第二次出现时计为 cache_read_input_tokens，
+  首次出现计为 cache_creation_input_tokens；可按未缓存的输入 token 数模拟预填充耗时
+- 记录请求数和最大并发数，用于验证客户端的并发上限
+
+独立运行：
+    python -m services.fake_anthropic --port 8098 --latency lognormal:0.8,0.4 --tokens-per-second 60
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8098 ANTHROPIC_API_KEY=fake python main.py
+
+进程内使用（不走网络）：
+    app = create_fake_anthropic_app(latency=LatencyProfile("fixed", 0.05))
+    client = AsyncClaudeClient(api_key="fake", base_url=FAKE_BASE_URL, http_client=asgi_http_client(app))
+"""
+
+import json
+import random
+import hashlib
+import asyncio
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+try:
+    from services.fake_api_sports import LatencyProfile
+except ImportError:
+    from fake_api_sports import LatencyProfile
+
+FAKE_BASE_URL = "http://fake-anthropic"
+
+# 每个 token 大约对应的中文字符数，用于估算 usage
+CHARS_PER_TOKEN = 2
+
+_ERROR_TYPES = {
+    429: "rate_limit_error",
+    500: "api_error",
+    529: "overloaded_error",
+}
+
+
+@dataclass
+class FakeAnthropicConfig:
+    """模拟服务配置"""
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    tokens_per_second: float = 0.0
+    response_chars: int = 1200
+    error_rate: float = 0.0
+    error_status: int = 529
+    fail_first: int = 0
+    retry_after: Optional[float] = None
+    prefill_tokens_per_second: float = 0.0
+    cache_min_tokens: int = 0
+    seed: Optional[int] = None
+
+
+def _prompt_text(body: Dict[str, Any]) -> str:
+    """请求中全部用户消息的文本"""
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+    return "\n".join(parts)
+
+
+def _prompt_blocks(body: Dict[str, Any]) -> List[Tuple[str, bool]]:
+    """按顺序列出 system 和消息中的文本块：(文本, 是否带 cache_control 标记)"""
+    blocks = []
+    for part in [body.get("system") or ""] + [m.get("content", "") for m in body.get("messages", [])]:
+        if isinstance(part, str):
+            blocks.append((part, False))
+        else:
+            blocks.extend((b.get("text", ""), "cache_control" in b) for b in part if isinstance(b, dict))
+    return blocks
+
+
+def _cacheable_prefix(body: Dict[str, Any]) -> Tuple[Optional[str], int, int]:
+    """(最后一个缓存标记之前前缀的哈希, 前缀 token 数, 全部输入 token 数)"""
+    blocks = _prompt_blocks(body)
+    total = sum(len(text) for text, _ in blocks) // CHARS_PER_TOKEN
+    marked = [i for i, (_, has_marker) in enumerate(blocks) if has_marker]
+    if not marked:
+        return None, 0, total
+    prefix = [text for text, _ in blocks[:marked[-1] + 1]]
+    digest = hashlib.sha256(json.dumps([body.get("model"), prefix], ensure_ascii=False).encode("utf-8")).hexdigest()
+    return digest, sum(len(text) for text in prefix) // CHARS_PER_TOKEN, total
+
+
+def fake_article(prompt: str, length: int) -> str:
+    """由提示词生成确定性的模拟文章（同一提示词总是同一篇）"""
+    headline = next((line.strip() for line in prompt.splitlines() if line.strip()), "比赛预测")
+    filler = "模拟分析：双方状态平稳，预计比分2-1，置信度70%。"
+    body = (filler * (length // len(filler) + 1))[:max(0, length - len(headline) - 1)]
+    return f"{headline}\n{body}"
+
+
+def _chunks(text: str, size: int = 4) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def create_fake_anthropic_app(config: FakeAnthropicConfig = None, **overrides) -> FastAPI:
+    """
+    创建模拟 Anthropic Messages API 的 ASGI 应用
+
+    可以传入 FakeAnthropicConfig，或直接用关键字参数覆盖其字段。
+    """
+    config = config or FakeAnthropicConfig()
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    rng = random.Random(config.seed)
+    message_ids = itertools.count(1)
+
+    app = FastAPI(title="Fake Anthropic", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.config = config
+    app.state.request_count = 0
+    app.state.error_count = 0
+    app.state.in_flight = 0
+    app.state.peak_in_flight = 0
+    app.state.requests = []
+    app.state.prompt_cache = set()
+
+    def error_response(status: int) -> JSONResponse:
+        app.state.error_count += 1
+        headers = {"retry-after": str(config.retry_after)} if config.retry_after is not None else {}
+        return JSONResponse(
+            status_code=status,
+            content={"type": "error", "error": {"type": _ERROR_TYPES.get(status, "api_error"), "message": "Injected failure"}},
+            headers=headers
+        )
+
+    def _prompt_usage(body: Dict[str, Any]) -> Dict[str, int]:
+        """按提示词缓存的命中情况拆分输入 token"""
+        digest, prefix_tokens, total = _cacheable_prefix(body)
+        usage = {"input_tokens": max(1, total), "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+        if digest is None or prefix_tokens < max(1, config.cache_min_tokens):
+            return usage
+        if digest in app.state.prompt_cache:
+            usage["cache_read_input_tokens"] = prefix_tokens
+        else:
+            app.state.prompt_cache.add(digest)
+            usage["cache_creation_input_tokens"] = prefix_tokens
+        usage["input_tokens"] = max(1, total - prefix_tokens)
+        return usage
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        app.state.request_count += 1
+        app.state.requests.append(body)
+        number = app.state.request_count
+
+        app.state.in_flight += 1
+        app.state.peak_in_flight = max(app.state.peak_in_flight, app.state.in_flight)
+        try:
+            latency = config.latency.sample(rng)
+            if latency:
+                await asyncio.sleep(latency)
+            if number <= config.fail_first or (config.error_rate and rng.random() < config.error_rate):
+                return error_response(config.error_status)
+
+            usage = _prompt_usage(body)
+            if config.prefill_tokens_per_second:
+                await asyncio.sleep(usage["input_tokens"] / config.prefill_tokens_per_second)
+
+            text = fake_article(_prompt_text(body), config.response_chars)
+            output_tokens = max(1, len(text) // CHARS_PER_TOKEN)
+            message = {
+                "id": f"msg_fake_{next(message_ids):06d}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "fake-model"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {**usage, "output_tokens": output_tokens},
+            }
+
+            if not body.get("stream"):
+                if config.tokens_per_second:
+                    await asyncio.sleep(output_tokens / config.tokens_per_second)
+                return JSONResponse(content=message)
+        finally:
+            app.state.in_flight -= 1
+
+        return StreamingResponse(_stream(message, text), media_type="text/event-stream")
+
+    async def _stream(message: Dict[str, Any], text: str):
+        def event(name: str, data: Dict[str, Any]) -> str:
+            return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        start = {**message, "content": [], "stop_reason": None,
+                 "usage": {**message["usage"], "output_tokens": 1}}
+        yield event("message_start", {"type": "message_start", "message": start})
+        yield event("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {"type": "text", "text": ""}})
+        delay = 4 / CHARS_PER_TOKEN / config.tokens_per_second if config.tokens_per_second else 0
+        for chunk in _chunks(text):
+            if delay:
+                await asyncio.sleep(delay)
+            yield event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": chunk}})
+        yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield event("message_delta", {"type": "message_delta",
+                                      "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                      "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+        yield event("message_stop", {"type": "message_stop"})
+
+    return app
+
+
+def asgi_http_client(app: FastAPI):
+    """
+    进程内连接模拟服务的异步 HTTP 客户端
+
+    新版 anthropic SDK 使用自带的 httpx2，旧版使用 httpx，按已安装的实现创建。
+    """
+    try:
+        import httpx2 as http
+    except ImportError:
+        import httpx as http
+    return http.AsyncClient(transport=http.ASGITransport(app=app), base_url=FAKE_BASE_URL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Anthropic Messages API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8098)
+    parser.add_argument("--latency", default="fixed:0", help='time to first token, e.g. "fixed:0.5", "lognormal:0.8,0.4"')
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="0 = no output pacing")
+    parser.add_argument("--response-chars", type=int, default=1200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=529)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0, help="0 = uncached input adds no latency")
+    parser.add_argument("--cache-min-tokens", type=int, default=1024, help="shortest prefix the prompt cache accepts")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_fake_anthropic_app(FakeAnthropicConfig(
+        latency=LatencyProfile.parse(args.latency),
+        tokens_per_second=args.tokens_per_second,
+        response_chars=args.response_chars,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        cache_min_tokens=args.cache_min_tokens,
+        seed=args.seed
+    ))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
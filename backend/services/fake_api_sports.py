@@ -0,0 +1,273 @@
+"""
+Fake API-Sports Server
+本地 API-Sports 模拟服务，用于压测和性能基准，不消耗真实配额
+
+- 回放 data/api_sports_recordings/ 下录制的 JSON（/fixtures、/standings、/teams/statistics、
+  /fixtures/headtohead、/fixtures/statistics、/injuries、/odds）
+- 可配置延迟分布（固定、均匀、正态、对数正态）和错误率
+- 返回与真实服务一致的限流响应头，超出限额时返回 429
+
+独立运行：
+    python -m services.fake_api_sports --port 8099 --latency lognormal:0.15,0.5 --error-rate 0.01
+    FOOTBALL_API_BASE_URL=http://127.0.0.1:8099 python main.py
+
+进程内使用（不走网络）：
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.05))
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    client = FootballAPIClient(api_key="fake", base_url="http://fake-api-sports", async_http_client=http_client)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RECORDINGS_DIR = os.path.join(BACKEND_DIR, "data", "api_sports_recordings")
+
+# 录制文件名与端点的对应关系
+RECORDED_ENDPOINTS = {
+    "/fixtures": "fixtures.json",
+    "/fixtures/headtohead": "fixtures_headtohead.json",
+    "/fixtures/statistics": "fixtures_statistics.json",
+    "/standings": "standings.json",
+    "/teams/statistics": "teams_statistics.json",
+    "/injuries": "injuries.json",
+    "/odds": "odds.json",
+}
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+@dataclass
+class LatencyProfile:
+    """
+    响应延迟分布（秒）
+
+    distribution: fixed(a) / uniform(a, b) / normal(均值 a, 标准差 b) / lognormal(中位数 a, sigma b)
+    """
+    distribution: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """解析 "lognormal:0.15,0.5" 形式的配置"""
+        name, _, args = spec.partition(":")
+        values = [float(x) for x in args.split(",") if x.strip()] if args else []
+        values += [0.0] * (2 - len(values))
+        return cls(name.strip() or "fixed", values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.distribution == "lognormal":
+            value = self.a * rng.lognormvariate(0.0, self.b) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+@dataclass
+class FakeServerConfig:
+    """模拟服务配置"""
+    recordings_dir: str = DEFAULT_RECORDINGS_DIR
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    endpoint_latency: Dict[str, LatencyProfile] = field(default_factory=dict)
+    error_rate: float = 0.0
+    error_status: int = 500
+    per_minute_limit: int = 300
+    daily_limit: int = 7500
+    enforce_rate_limit: bool = True
+    seed: Optional[int] = None
+
+
+class Recordings:
+    """
+    录制数据
+
+    每个端点一个文件：{"endpoint": ..., "entries": [{"params": {...}, "response": ...}]}
+    params 中的 "*" 匹配任意值，匹配时选择具体参数最多的条目。
+    """
+
+    def __init__(self, recordings_dir: str = DEFAULT_RECORDINGS_DIR):
+        self.entries: Dict[str, List[Dict]] = {}
+        for endpoint, filename in RECORDED_ENDPOINTS.items():
+            path = os.path.join(recordings_dir, filename)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self.entries[endpoint] = json.load(f).get("entries", [])
+
+    def lookup(self, endpoint: str, params: Dict[str, str]) -> Tuple[Optional[Any], bool]:
+        """返回 (响应数据, 端点是否已录制)"""
+        entries = self.entries.get(endpoint)
+        if entries is None:
+            return None, False
+
+        best, best_score = None, -1
+        for entry in entries:
+            wanted = entry.get("params", {})
+            if set(wanted) - set(params):
+                continue
+            if any(value != "*" and str(value) != params[key] for key, value in wanted.items()):
+                continue
+            score = sum(1 for value in wanted.values() if value != "*")
+            if score > best_score:
+                best, best_score = entry, score
+
+        if best is None:
+            return [], True
+        response = best["response"]
+        if endpoint == "/fixtures" and "date" in params:
+            response = self._shift_dates(response, params["date"])
+        return response, True
+
+    @staticmethod
+    def _shift_dates(fixtures: List[Dict], date: str) -> List[Dict]:
+        """按日期查询时，把录制的比赛日期改为请求的日期（保留开球时间）"""
+        shifted = []
+        for fixture in fixtures:
+            fixture = json.loads(json.dumps(fixture))
+            fixture["fixture"]["date"] = _DATE_RE.sub(date, fixture["fixture"]["date"])
+            shifted.append(fixture)
+        return shifted
+
+
+class _RateLimitCounter:
+    """按分钟和按天计数，生成与 API-Sports 一致的限流响应头"""
+
+    def __init__(self, per_minute: int, daily: int):
+        self.per_minute = per_minute
+        self.daily = daily
+        self._lock = threading.Lock()
+        self._minute = int(time.time() // 60)
+        self._minute_count = 0
+        self._day = time.strftime("%Y-%m-%d", time.gmtime())
+        self._day_count = 0
+
+    def hit(self) -> Tuple[bool, Dict[str, str]]:
+        """记录一次请求，返回 (是否超限, 响应头)"""
+        with self._lock:
+            minute = int(time.time() // 60)
+            if minute != self._minute:
+                self._minute, self._minute_count = minute, 0
+            day = time.strftime("%Y-%m-%d", time.gmtime())
+            if day != self._day:
+                self._day, self._day_count = day, 0
+
+            limited = self._minute_count >= self.per_minute or self._day_count >= self.daily
+            if not limited:
+                self._minute_count += 1
+                self._day_count += 1
+            headers = {
+                "x-ratelimit-requests-limit": str(self.daily),
+                "x-ratelimit-requests-remaining": str(max(0, self.daily - self._day_count)),
+                "X-RateLimit-Limit": str(self.per_minute),
+                "X-RateLimit-Remaining": str(max(0, self.per_minute - self._minute_count)),
+            }
+            return limited, headers
+
+
+def create_fake_api_sports_app(config: FakeServerConfig = None, **overrides) -> FastAPI:
+    """
+    创建模拟 API-Sports 的 ASGI 应用
+
+    可以传入 FakeServerConfig，或直接用关键字参数覆盖其字段。
+    """
+    config = config or FakeServerConfig()
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    recordings = Recordings(config.recordings_dir)
+    counter = _RateLimitCounter(config.per_minute_limit, config.daily_limit)
+    rng = random.Random(config.seed)
+
+    app = FastAPI(title="Fake API-Sports", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.config = config
+    app.state.request_counts = {}
+
+    @app.get("/{endpoint:path}")
+    async def replay(endpoint: str, request: Request):
+        endpoint = "/" + endpoint
+        params = dict(request.query_params)
+        app.state.request_counts[endpoint] = app.state.request_counts.get(endpoint, 0) + 1
+
+        limited, headers = counter.hit()
+        latency = config.endpoint_latency.get(endpoint, config.latency).sample(rng)
+        if latency:
+            await asyncio.sleep(latency)
+
+        if limited and config.enforce_rate_limit:
+            return JSONResponse(
+                status_code=429,
+                content={"errors": {"rateLimit": "Too many requests"}, "response": []},
+                headers=headers
+            )
+        if config.error_rate and rng.random() < config.error_rate:
+            return JSONResponse(
+                status_code=config.error_status,
+                content={"message": "Injected failure"},
+                headers=headers
+            )
+
+        response, recorded = recordings.lookup(endpoint, params)
+        if not recorded:
+            return JSONResponse(
+                content={"get": endpoint.lstrip("/"), "parameters": params,
+                         "errors": {"endpoint": "This endpoint is not recorded"}, "results": 0, "response": []},
+                headers=headers
+            )
+        return JSONResponse(
+            content={
+                "get": endpoint.lstrip("/"),
+                "parameters": params,
+                "errors": [],
+                "results": len(response) if isinstance(response, list) else 1,
+                "paging": {"current": 1, "total": 1},
+                "response": response
+            },
+            headers=headers
+        )
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake API-Sports server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_DIR)
+    parser.add_argument("--latency", default="fixed:0", help='e.g. "fixed:0.1", "uniform:0.05,0.3", "lognormal:0.15,0.5"')
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--per-minute", type=int, default=300)
+    parser.add_argument("--daily", type=int, default=7500)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_fake_api_sports_app(FakeServerConfig(
+        recordings_dir=args.recordings,
+        latency=LatencyProfile.parse(args.latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        per_minute_limit=args.per_minute,
+        daily_limit=args.daily,
+        seed=args.seed
+    ))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Fixture Store
+按日期批量获取的比赛数据共享存储
+
+每个日期只向上游发一次 /fixtures?date= 请求（不带联赛参数），
+在本地按关注的联赛过滤并解析一次，所有调用方读取同一份结果。
+增加关注的联赛不会增加上游请求次数。
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from services.response_cache import DEFAULT_TTL_POLICIES
+except ImportError:
+    from response_cache import DEFAULT_TTL_POLICIES
+
+# 默认关注的联赛：韩K联(292)、日职联(98)，可用 FOOTBALL_API_LEAGUES=292,98,169 配置
+DEFAULT_LEAGUE_IDS = tuple(
+    int(x) for x in os.getenv("FOOTBALL_API_LEAGUES", "292,98").split(",") if x.strip()
+)
+
+# 与 /fixtures 响应缓存的 TTL 保持一致
+FIXTURE_STORE_TTL = DEFAULT_TTL_POLICIES["/fixtures"]
+
+
+class FixtureStore:
+    """
+    按日期存储已解析的比赛，按联赛分组
+
+    只保留关注联赛的比赛；关注的联赛增加时清空已有数据，下次读取时从原始响应重新过滤。
+    """
+
+    def __init__(
+        self,
+        league_ids: Iterable[int] = DEFAULT_LEAGUE_IDS,
+        ttl: float = FIXTURE_STORE_TTL,
+        time_func: Callable[[], float] = time.time
+    ):
+        self.league_ids = frozenset(int(x) for x in league_ids)
+        self.ttl = ttl
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._dates: Dict[str, Tuple[Dict[int, List[Dict]], float]] = {}
+
+    def track(self, league_ids: Iterable[int]) -> None:
+        """确保这些联赛在关注范围内"""
+        wanted = frozenset(int(x) for x in league_ids)
+        with self._lock:
+            if not wanted <= self.league_ids:
+                self.league_ids = self.league_ids | wanted
+                self._dates.clear()
+
+    def get(self, date: str) -> Optional[Dict[int, List[Dict]]]:
+        """读取某天按联赛分组的比赛，未缓存或已过期返回 None"""
+        with self._lock:
+            item = self._dates.get(date)
+            if item is None:
+                return None
+            by_league, expires_at = item
+            if expires_at <= self._time():
+                del self._dates[date]
+                return None
+            return by_league
+
+    def put(self, date: str, fixtures: List[Dict], parse: Callable[[Dict], Dict]) -> Dict[int, List[Dict]]:
+        """过滤并解析某天的原始比赛列表"""
+        league_ids = self.league_ids
+        by_league: Dict[int, List[Dict]] = {}
+        for fixture in fixtures:
+            league_id = fixture['league']['id']
+            if league_id in league_ids:
+                by_league.setdefault(league_id, []).append(parse(fixture))
+        with self._lock:
+            if league_ids == self.league_ids:
+                self._dates[date] = (by_league, self._time() + self.ttl)
+        return by_league
+
+    def select(self, by_league: Dict[int, List[Dict]], league_ids: Iterable[int]) -> List[Dict]:
+        """按联赛顺序取出比赛"""
+        return [fixture for league_id in league_ids for fixture in by_league.get(int(league_id), [])]
+
+    def invalidate(self, date: str = None) -> None:
+        """使某天（或全部）的数据失效"""
+        with self._lock:
+            if date is None:
+                self._dates.clear()
+            else:
+                self._dates.pop(date, None)
+
+
+# 进程级共享存储
+_fixture_store: Optional[FixtureStore] = None
+
+
+def get_fixture_store() -> FixtureStore:
+    """获取共享的比赛存储"""
+    global _fixture_store
+    if _fixture_store is None:
+        _fixture_store = FixtureStore()
+    return _fixture_store
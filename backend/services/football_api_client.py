@@ -4,15 +4,118 @@ Football API Client
 """
 
 import os
+import asyncio
 import requests
+import httpx
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 from dataclasses import dataclass
 import logging
+from urllib.parse import urlparse
+
+try:
+    from services.response_cache import ResponseCache, MISS, PRODUCTION_BASE_URL, get_response_cache, make_cache_key
+    from services.request_coalescer import (
+        RequestCoalescer, get_request_coalescer, request_scope, scope_get, scope_set
+    )
+    from services.rate_limiter import (
+        QuotaAwareRateLimiter, QuotaExhaustedError, RateLimitTimeoutError,
+        PRIORITY_CRITICAL, get_rate_limiter, priority_for
+    )
+    from services.standings_index import StandingsIndex, StandingsIndexCache, get_standings_index_cache
+    from services.fixture_store import FixtureStore, DEFAULT_LEAGUE_IDS, get_fixture_store
+    from services.circuit_breaker import CircuitBreaker, get_circuit_breaker
+except ImportError:
+    from response_cache import ResponseCache, MISS, PRODUCTION_BASE_URL, get_response_cache, make_cache_key
+    from request_coalescer import (
+        RequestCoalescer, get_request_coalescer, request_scope, scope_get, scope_set
+    )
+    from rate_limiter import (
+        QuotaAwareRateLimiter, QuotaExhaustedError, RateLimitTimeoutError,
+        PRIORITY_CRITICAL, get_rate_limiter, priority_for
+    )
+    from standings_index import StandingsIndex, StandingsIndexCache, get_standings_index_cache
+    from fixture_store import FixtureStore, DEFAULT_LEAGUE_IDS, get_fixture_store
+    from circuit_breaker import CircuitBreaker, get_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 需要安装 h2，未安装时自动退回 HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 上游地址，可指向本地模拟服务（services/fake_api_sports.py）
+# 响应缓存按上游地址分文件（见 response_cache.cache_path_for）
+DEFAULT_BASE_URL = os.getenv('FOOTBALL_API_BASE_URL', PRODUCTION_BASE_URL)
+
+# 单次请求超时（秒）
+DEFAULT_TIMEOUT = float(os.getenv('FOOTBALL_API_TIMEOUT', '10'))
+
+# 并发聚合时每个数据分支的截止时间（秒），超时则使用部分数据
+DEFAULT_BRANCH_TIMEOUT = float(os.getenv('FOOTBALL_API_BRANCH_TIMEOUT', '8'))
+
+# 请求在限流队列中的最长等待时间（秒）
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv('FOOTBALL_API_QUEUE_TIMEOUT', '30'))
+
+# 距开赛（或开赛后）多长时间内的赔率请求视为最高优先级
+IMMINENT_KICKOFF_WINDOW = timedelta(hours=2)
+
+# 进程级共享连接池：同步路径用 requests.Session，异步路径用 httpx.AsyncClient
+_http_session: Optional[requests.Session] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_async_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_session() -> requests.Session:
+    """获取进程内共享的 requests.Session（keep-alive 连接复用）"""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    获取进程内共享的 httpx.AsyncClient
+
+    连接池绑定在事件循环上，事件循环变化时（例如测试中多次 asyncio.run）会重新创建。
+    """
+    global _async_http_client, _async_http_client_loop
+    loop = asyncio.get_running_loop()
+    if (
+        _async_http_client is None
+        or _async_http_client.is_closed
+        or _async_http_client_loop is not loop
+    ):
+        _async_http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=30.0
+            )
+        )
+        _async_http_client_loop = loop
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """关闭共享的异步连接池（应用关闭时调用）"""
+    global _async_http_client, _async_http_client_loop
+    if _async_http_client is not None and not _async_http_client.is_closed:
+        await _async_http_client.aclose()
+    _async_http_client = None
+    _async_http_client_loop = None
+
 @dataclass
 class TeamStats:
     """球队统计数据"""
@@ -47,33 +150,201 @@ class FootballAPIClient:
         "j_league_1": 98,   # 日本J联赛1
     }
     
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = None,
+        timeout: float = None,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        coalescer: Optional[RequestCoalescer] = None,
+        rate_limiter: Optional[QuotaAwareRateLimiter] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+        standings_indexes: Optional[StandingsIndexCache] = None,
+        fixture_store: Optional[FixtureStore] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         self.api_key = api_key or os.getenv('FOOTBALL_API_KEY')
         if not self.api_key:
             raise ValueError("FOOTBALL_API_KEY not provided")
             
-        self.base_url = "https://v3.football.api-sports.io"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.cache = (cache or get_response_cache(self.base_url)) if use_cache else None
+        self.coalescer = coalescer or get_request_coalescer()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.queue_timeout = DEFAULT_QUEUE_TIMEOUT
+        self.standings_indexes = standings_indexes or get_standings_index_cache()
+        self.fixture_store = fixture_store or get_fixture_store()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        # 指定时使用该连接池（测试桩、本地模拟服务），否则使用进程共享连接池
+        self._async_http_client = async_http_client
         self.headers = {
             "x-rapidapi-key": self.api_key,
-            "x-rapidapi-host": "v3.football.api-sports.io"
+            "x-rapidapi-host": urlparse(self.base_url).netloc
         }
         
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """发送API请求"""
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        timeout: float = None,
+        priority: int = None
+    ) -> Dict:
+        """
+        发送API请求
+        
+        依次查找：当前聚合范围 -> 响应缓存 -> 进行中的相同请求 -> 上游API
+        发往上游的请求经过限流队列，priority 默认按端点决定。
+        """
+        key = self._request_key(endpoint, params)
+        scoped = scope_get(key)
+        if scoped is not None:
+            self.coalescer.scope_hits += 1
+            return scoped
+            
+        if self.cache:
+            cached = self.cache.get(endpoint, params)
+            if cached is not MISS:
+                scope_set(key, cached)
+                return cached
+                
+        result = self.coalescer.do(key, lambda: self._fetch(endpoint, params, timeout, priority))
+        scope_set(key, result)
+        return result
+        
+    def _request_key(self, endpoint: str, params: Dict = None) -> str:
+        """进行中请求合并和聚合范围的键，带上游地址（共享合并器的客户端可能指向不同上游）"""
+        return f"{self.base_url}{make_cache_key(endpoint, params)}"
+        
+    def _fetch(self, endpoint: str, params: Dict = None, timeout: float = None, priority: int = None) -> Dict:
+        """向上游发送请求并写入缓存（熔断打开时直接返回 None）"""
+        if not self.circuit_breaker.allow_request():
+            logger.debug(f"Circuit open, skipping request to {endpoint}")
+            return None
+            
+        try:
+            self.rate_limiter.acquire_sync(
+                priority_for(endpoint) if priority is None else priority,
+                timeout=self.queue_timeout
+            )
+        except (QuotaExhaustedError, RateLimitTimeoutError) as e:
+            logger.warning(f"Request to {endpoint} not sent: {e}")
+            return None
+            
         url = f"{self.base_url}{endpoint}"
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = get_http_session().get(
+                url, headers=self.headers, params=params, timeout=timeout or self.timeout
+            )
+            self._record_rate_limit(response.status_code, response.headers)
+            self._record_upstream_health(response.status_code)
             response.raise_for_status()
-            data = response.json()
+            result = self._extract_response(response.json())
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Request failed: {e}")
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.circuit_breaker.record_failure()
+            logger.error(f"Request failed: {e}")
+            return None
             
-            if data.get('errors'):
-                logger.error(f"API Error: {data['errors']}")
-                return None
+        if self.cache:
+            self.cache.set(endpoint, params, result)
+        return result
+            
+    async def _make_request_async(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        timeout: float = None,
+        priority: int = None,
+        refresh: bool = False
+    ) -> Dict:
+        """
+        发送异步API请求（查找顺序同 _make_request；共享连接池，不阻塞事件循环）
+        
+        refresh 为 True 时跳过聚合范围和响应缓存，直接请求上游（仍合并进行中的相同请求），成功后更新缓存。
+        """
+        key = self._request_key(endpoint, params)
+        scoped = None if refresh else scope_get(key)
+        if scoped is not None:
+            self.coalescer.scope_hits += 1
+            return scoped
+            
+        if self.cache and not refresh:
+            cached = self.cache.get(endpoint, params)
+            if cached is not MISS:
+                scope_set(key, cached)
+                return cached
                 
-            return data.get('response', [])
-        except requests.exceptions.RequestException as e:
+        result = await self.coalescer.do_async(key, lambda: self._fetch_async(endpoint, params, timeout, priority))
+        scope_set(key, result)
+        return result
+        
+    async def _fetch_async(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        timeout: float = None,
+        priority: int = None
+    ) -> Dict:
+        """向上游发送异步请求并写入缓存（熔断打开时直接返回 None）"""
+        if not self.circuit_breaker.allow_request():
+            logger.debug(f"Circuit open, skipping request to {endpoint}")
+            return None
+            
+        try:
+            await self.rate_limiter.acquire(
+                priority_for(endpoint) if priority is None else priority,
+                timeout=self.queue_timeout
+            )
+        except (QuotaExhaustedError, RateLimitTimeoutError) as e:
+            logger.warning(f"Request to {endpoint} not sent: {e}")
+            return None
+            
+        url = f"{self.base_url}{endpoint}"
+        http_client = self._async_http_client or get_async_http_client()
+        try:
+            response = await http_client.get(
+                url, headers=self.headers, params=params, timeout=timeout or self.timeout
+            )
+            self._record_rate_limit(response.status_code, response.headers)
+            self._record_upstream_health(response.status_code)
+            response.raise_for_status()
+            result = self._extract_response(response.json())
+        except httpx.HTTPStatusError as e:
             logger.error(f"Request failed: {e}")
             return None
+        except (httpx.HTTPError, ValueError) as e:
+            self.circuit_breaker.record_failure()
+            logger.error(f"Request failed: {e}")
+            return None
+            
+        if self.cache:
+            self.cache.set(endpoint, params, result)
+        return result
+            
+    def _record_rate_limit(self, status_code: int, headers) -> None:
+        """用响应头校准限流器，429 时清空本地令牌"""
+        self.rate_limiter.update_from_headers(headers)
+        if status_code == 429:
+            self.rate_limiter.on_rate_limited()
+            
+    def _record_upstream_health(self, status_code: int) -> None:
+        """5xx 计为熔断失败；429 由限流器处理，不影响熔断状态"""
+        if status_code >= 500:
+            self.circuit_breaker.record_failure()
+        elif status_code != 429:
+            self.circuit_breaker.record_success()
+            
+    def _extract_response(self, data: Dict) -> Optional[List]:
+        """提取响应体中的 response 字段"""
+        if data.get('errors'):
+            logger.error(f"API Error: {data['errors']}")
+            return None
+            
+        return data.get('response', [])
             
     def get_team_statistics(self, team_id: int, league_id: int, season: int = None) -> TeamStats:
         """
@@ -88,10 +359,7 @@ class FootballAPIClient:
             season = datetime.now().year
             
         # 获取球队基本信息和联赛排名
-        standings_data = self._make_request(
-            "/standings",
-            params={"league": league_id, "season": season}
-        )
+        standings = self.get_standings_index(league_id, season)
         
         # 获取球队最近比赛
         fixtures_data = self._make_request(
@@ -105,39 +373,93 @@ class FootballAPIClient:
             params={"team": team_id, "league": league_id, "season": season}
         )
         
-        if not all([standings_data, fixtures_data, stats_data]):
+        if not all([standings, fixtures_data, stats_data]):
             return None
             
         # 解析数据
         team_stats = self._parse_team_stats(
-            standings_data, fixtures_data, stats_data, team_id
+            standings, fixtures_data, stats_data, team_id
         )
         
         return team_stats
         
+    async def get_team_statistics_async(self, team_id: int, league_id: int, season: int = None) -> TeamStats:
+        """get_team_statistics 的异步版本，三个请求并发发出"""
+        if not season:
+            season = datetime.now().year
+            
+        standings, fixtures_data, stats_data = await asyncio.gather(
+            self.get_standings_index_async(league_id, season),
+            self._make_request_async(
+                "/fixtures",
+                params={"team": team_id, "last": 5, "status": "FT"}
+            ),
+            self._make_request_async(
+                "/teams/statistics",
+                params={"team": team_id, "league": league_id, "season": season}
+            )
+        )
+        
+        if not all([standings, fixtures_data, stats_data]):
+            return None
+            
+        return self._parse_team_stats(
+            standings, fixtures_data, stats_data, team_id
+        )
+        
+    def get_standings_index(self, league_id: int, season: int) -> Optional[StandingsIndex]:
+        """
+        获取联赛积分榜索引
+        
+        积分榜解析一次后按球队ID索引，缓存到积分榜过期为止，期间同联赛的查找不再请求和遍历积分榜。
+        积分榜来自响应缓存时，索引随缓存中的响应一起过期。
+        """
+        index = self.standings_indexes.get(league_id, season)
+        if index is not None:
+            return index
+            
+        params = {"league": league_id, "season": season}
+        standings_data = self._make_request("/standings", params=params)
+        if not standings_data:
+            return None
+        return self.standings_indexes.put(
+            league_id, season, standings_data, expires_at=self._cached_until("/standings", params)
+        )
+        
+    async def get_standings_index_async(self, league_id: int, season: int) -> Optional[StandingsIndex]:
+        """get_standings_index 的异步版本"""
+        index = self.standings_indexes.get(league_id, season)
+        if index is not None:
+            return index
+            
+        params = {"league": league_id, "season": season}
+        standings_data = await self._make_request_async("/standings", params=params)
+        if not standings_data:
+            return None
+        return self.standings_indexes.put(
+            league_id, season, standings_data, expires_at=self._cached_until("/standings", params)
+        )
+        
+    def _cached_until(self, endpoint: str, params: Dict) -> Optional[float]:
+        """响应缓存中该请求的过期时间（未使用缓存或未缓存时为 None）"""
+        return self.cache.expires_at(endpoint, params) if self.cache else None
+        
     def _parse_team_stats(
         self, 
-        standings: List,
+        standings: StandingsIndex,
         fixtures: List,
         stats: Dict,
         team_id: int
     ) -> TeamStats:
         """解析球队统计数据"""
         
-        # 从积分榜获取排名和基本数据
-        team_standing = None
-        if standings and standings[0].get('league'):
-            for group in standings[0]['league']['standings']:
-                for team in group:
-                    if team['team']['id'] == team_id:
-                        team_standing = team
-                        break
-                        
+        # 从积分榜索引获取排名和基本数据
+        team_standing = standings.get(team_id) if standings else None
         if not team_standing:
             return None
             
         # 解析最近5场比赛
-        recent_form = team_standing.get('form', '')
+        recent_form = team_standing.form
         last_5_matches = []
         
         for fixture in fixtures[:5]:
@@ -150,28 +472,15 @@ class FootballAPIClient:
             }
             last_5_matches.append(match_data)
             
-        # 解析主客场战绩
-        home_record = {
-            'wins': team_standing.get('home', {}).get('win', 0),
-            'draws': team_standing.get('home', {}).get('draw', 0),
-            'losses': team_standing.get('home', {}).get('lose', 0)
-        }
-        
-        away_record = {
-            'wins': team_standing.get('away', {}).get('win', 0),
-            'draws': team_standing.get('away', {}).get('draw', 0),
-            'losses': team_standing.get('away', {}).get('lose', 0)
-        }
-        
         return TeamStats(
             team_id=team_id,
-            team_name=team_standing['team']['name'],
-            league_position=team_standing['rank'],
+            team_name=team_standing.team_name,
+            league_position=team_standing.rank,
             recent_form=recent_form,
-            goals_for=team_standing['all']['goals']['for'],
-            goals_against=team_standing['all']['goals']['against'],
-            home_record=home_record,
-            away_record=away_record,
+            goals_for=team_standing.goals_for,
+            goals_against=team_standing.goals_against,
+            home_record=dict(team_standing.home),
+            away_record=dict(team_standing.away),
             last_5_matches=last_5_matches
         )
         
@@ -194,6 +503,18 @@ class FootballAPIClient:
             
         return self._parse_h2h_data(h2h_data, team1_id, team2_id)
         
+    async def get_h2h_data_async(self, team1_id: int, team2_id: int, last: int = 5) -> H2HData:
+        """get_h2h_data 的异步版本"""
+        h2h_data = await self._make_request_async(
+            "/fixtures/headtohead",
+            params={"h2h": f"{team1_id}-{team2_id}", "last": last}
+        )
+        
+        if not h2h_data:
+            return None
+            
+        return self._parse_h2h_data(h2h_data, team1_id, team2_id)
+        
     def _parse_h2h_data(self, fixtures: List, team1_id: int, team2_id: int) -> H2HData:
         """解析历史交锋数据"""
         
@@ -240,33 +561,95 @@ class FootballAPIClient:
             recent_matches=recent_matches
         )
         
+    def get_fixtures_by_date(self, date: str) -> Optional[Dict[int, List[Dict]]]:
+        """
+        获取某天关注联赛的全部比赛（按联赛分组）
+        
+        每个日期只发一次不带联赛参数的 /fixtures 请求，本地过滤、解析后放入共享存储。
+        """
+        by_league = self.fixture_store.get(date)
+        if by_league is not None:
+            return by_league
+            
+        fixtures = self._make_request("/fixtures", params={"date": date})
+        if fixtures is None:
+            return None
+        return self.fixture_store.put(date, fixtures, self._parse_fixture)
+        
+    async def get_fixtures_by_date_async(
+        self,
+        date: str,
+        refresh: bool = False
+    ) -> Optional[Dict[int, List[Dict]]]:
+        """
+        get_fixtures_by_date 的异步版本
+        
+        refresh 为 True 时跳过共享存储和响应缓存重新请求上游；失败时保留已有数据。
+        """
+        by_league = None if refresh else self.fixture_store.get(date)
+        if by_league is not None:
+            return by_league
+            
+        fixtures = await self._make_request_async("/fixtures", params={"date": date}, refresh=refresh)
+        if fixtures is None:
+            return None
+        return self.fixture_store.put(date, fixtures, self._parse_fixture)
+        
     def get_fixtures_by_date_and_league(self, date: str, league_ids: List[int] = None) -> List[Dict]:
         """
         获取指定日期和联赛的比赛
         
         Args:
             date: 日期 (YYYY-MM-DD格式)
-            league_ids: 联赛ID列表，默认为K联赛和J联赛
+            league_ids: 联赛ID列表，默认为配置的关注联赛（K联赛和J联赛）
         """
         if league_ids is None:
-            league_ids = [self.LEAGUE_IDS["k_league_1"], self.LEAGUE_IDS["j_league_1"]]
+            league_ids = list(DEFAULT_LEAGUE_IDS)
+        self.fixture_store.track(league_ids)
         
-        all_fixtures = []
-        for league_id in league_ids:
-            fixtures = self._make_request(
-                "/fixtures",
-                params={
-                    "date": date,
-                    "league": league_id,
-                    "season": datetime.now().year
-                }
-            )
-            
-            if fixtures:
-                for fixture in fixtures:
-                    all_fixtures.append(self._parse_fixture(fixture))
+        return self.fixture_store.select(self.get_fixtures_by_date(date) or {}, league_ids)
+    
+    async def get_fixtures_by_date_and_league_async(self, date: str, league_ids: List[int] = None) -> List[Dict]:
+        """get_fixtures_by_date_and_league 的异步版本"""
+        if league_ids is None:
+            league_ids = list(DEFAULT_LEAGUE_IDS)
+        self.fixture_store.track(league_ids)
+        
+        return self.fixture_store.select(await self.get_fixtures_by_date_async(date) or {}, league_ids)
         
-        return all_fixtures
+    async def get_fixtures_by_date_range_async(
+        self,
+        date_from: str,
+        date_to: str,
+        league_ids: List[int] = None,
+        strict: bool = False,
+        refresh: bool = False
+    ) -> Optional[Dict[str, List[Dict]]]:
+        """
+        获取日期范围内（含首尾）指定联赛的比赛，各日期并发请求
+        
+        Args:
+            strict: 为 True 时任一日期获取失败即返回 None（用于区分「没有比赛」和「上游不可用」）
+            refresh: 为 True 时不读缓存，重新请求上游（见 get_fixtures_by_date_async）
+        
+        Returns:
+            {日期: 比赛列表}
+        """
+        if league_ids is None:
+            league_ids = list(DEFAULT_LEAGUE_IDS)
+        self.fixture_store.track(league_ids)
+        
+        start = datetime.strptime(date_from, "%Y-%m-%d")
+        days = (datetime.strptime(date_to, "%Y-%m-%d") - start).days
+        dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days + 1)]
+        
+        results = await asyncio.gather(*[self.get_fixtures_by_date_async(date, refresh) for date in dates])
+        if strict and any(by_league is None for by_league in results):
+            return None
+        return {
+            date: self.fixture_store.select(by_league or {}, league_ids)
+            for date, by_league in zip(dates, results)
+        }
     
     def get_today_tomorrow_matches(self) -> Dict[str, List[Dict]]:
         """
@@ -280,6 +663,31 @@ class FootballAPIClient:
             "tomorrow": self.get_fixtures_by_date_and_league(tomorrow)
         }
     
+    async def get_today_tomorrow_matches_async(
+        self,
+        strict: bool = False,
+        today: Optional[str] = None,
+        refresh: bool = False
+    ) -> Optional[Dict[str, List[Dict]]]:
+        """
+        get_today_tomorrow_matches 的异步版本（strict、refresh 含义同 get_fixtures_by_date_range_async）
+        
+        Args:
+            today: 作为「今天」的日期 (YYYY-MM-DD)，默认为当前日期
+        """
+        start = datetime.strptime(today, "%Y-%m-%d") if today else datetime.now()
+        today = start.strftime("%Y-%m-%d")
+        tomorrow = (start + timedelta(days=1)).strftime("%Y-%m-%d")
+        
+        fixtures = await self.get_fixtures_by_date_range_async(today, tomorrow, strict=strict, refresh=refresh)
+        if fixtures is None:
+            return None
+        
+        return {
+            "today": fixtures[today],
+            "tomorrow": fixtures[tomorrow]
+        }
+    
     def get_upcoming_match(self, team1_id: int, team2_id: int) -> Dict:
         """
         获取即将进行的比赛信息
@@ -298,6 +706,23 @@ class FootballAPIClient:
             }
         )
         
+        return self._find_fixture_against(fixtures, team2_id)
+        
+    async def get_upcoming_match_async(self, team1_id: int, team2_id: int) -> Dict:
+        """get_upcoming_match 的异步版本"""
+        fixtures = await self._make_request_async(
+            "/fixtures",
+            params={
+                "team": team1_id,
+                "next": 10,
+                "status": "NS"
+            }
+        )
+        
+        return self._find_fixture_against(fixtures, team2_id)
+        
+    def _find_fixture_against(self, fixtures: List, team2_id: int) -> Optional[Dict]:
+        """从比赛列表中找到与指定对手的比赛"""
         if not fixtures:
             return None
             
@@ -329,7 +754,14 @@ class FootballAPIClient:
             'league': {
                 'id': fixture['league']['id'],
                 'name': fixture['league']['name'],
-                'country': fixture['league']['country']
+                'country': fixture['league']['country'],
+                'season': fixture['league'].get('season'),
+                'round': fixture['league'].get('round')
+            },
+            'status': fixture['fixture'].get('status', {}).get('short'),
+            'goals': {
+                'home': fixture.get('goals', {}).get('home'),
+                'away': fixture.get('goals', {}).get('away')
             }
         }
         
@@ -345,6 +777,19 @@ class FootballAPIClient:
             params={"team": team_id, "current": "true"}
         )
         
+        return self._parse_injuries(injuries)
+        
+    async def get_team_injuries_async(self, team_id: int) -> List[Dict]:
+        """get_team_injuries 的异步版本"""
+        injuries = await self._make_request_async(
+            "/injuries",
+            params={"team": team_id, "current": "true"}
+        )
+        
+        return self._parse_injuries(injuries)
+        
+    def _parse_injuries(self, injuries: List) -> List[Dict]:
+        """解析伤病信息"""
         if not injuries:
             return []
             
@@ -352,21 +797,71 @@ class FootballAPIClient:
             'player': injury['player']['name'],
             'type': injury['player']['type'],
             'reason': injury['player']['reason'],
-            'return_date': injury['player']['date']
+            'return_date': injury['player'].get('date') or injury.get('fixture', {}).get('date')
         } for injury in injuries]
         
-    def get_live_odds(self, fixture_id: int) -> Dict:
+    def get_live_odds(self, fixture_id: int, kickoff=None) -> Dict:
         """
         获取实时赔率
         
         Args:
             fixture_id: 比赛ID
+            kickoff: 开赛时间（datetime 或 ISO 字符串），临近开赛时请求优先发出
         """
         odds = self._make_request(
+            "/odds",
+            params={"fixture": fixture_id},
+            priority=self._odds_priority(kickoff)
+        )
+        
+        return self._parse_odds(odds)
+        
+    async def get_live_odds_async(self, fixture_id: int, kickoff=None) -> Dict:
+        """get_live_odds 的异步版本"""
+        odds = await self._make_request_async(
+            "/odds",
+            params={"fixture": fixture_id},
+            priority=self._odds_priority(kickoff)
+        )
+        
+        return self._parse_odds(odds)
+        
+    def _odds_priority(self, kickoff) -> Optional[int]:
+        """开赛前后两小时内的赔率请求使用最高优先级，否则按端点默认优先级"""
+        if not kickoff:
+            return None
+        if isinstance(kickoff, str):
+            try:
+                kickoff = datetime.fromisoformat(kickoff.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        now = datetime.now(timezone.utc) if kickoff.tzinfo else datetime.now()
+        if abs(kickoff - now) <= IMMINENT_KICKOFF_WINDOW:
+            return PRIORITY_CRITICAL
+        return None
+        
+    async def get_bookmaker_odds_async(self, fixture_id: int) -> List[Dict]:
+        """获取比赛各博彩公司的完整赔率（未解析的 bookmakers 列表）"""
+        odds = await self._make_request_async(
             "/odds",
             params={"fixture": fixture_id}
         )
         
+        if not odds:
+            return []
+        return odds[0].get('bookmakers', [])
+        
+    async def get_fixture_statistics_async(self, fixture_id: int) -> List[Dict]:
+        """获取已完赛比赛的双方技术统计（未解析的 response 列表）"""
+        statistics = await self._make_request_async(
+            "/fixtures/statistics",
+            params={"fixture": fixture_id}
+        )
+        
+        return statistics or []
+        
+    def _parse_odds(self, odds: List) -> Optional[Dict]:
+        """解析赔率数据"""
         if not odds or not odds[0].get('bookmakers'):
             return None
             
@@ -400,40 +895,130 @@ class FootballDataAggregator:
     整合API数据用于预测文章生成
     """
     
-    def __init__(self, api_client: FootballAPIClient = None):
+    def __init__(self, api_client: FootballAPIClient = None, branch_timeout: float = None):
         self.api_client = api_client or FootballAPIClient()
+        self.branch_timeout = branch_timeout or DEFAULT_BRANCH_TIMEOUT
         
     def prepare_prediction_data(
         self, 
         home_team_id: int,
         away_team_id: int,
         league_id: int,
-        fixture_id: int = None
+        fixture_id: int = None,
+        kickoff=None
     ) -> Dict:
         """
         准备预测所需的所有数据
         
+        kickoff 为开赛时间，临近开赛时赔率请求优先发出
+        
         Returns:
             包含所有预测所需数据的字典
         """
         
-        # 获取两队统计数据
-        home_stats = self.api_client.get_team_statistics(home_team_id, league_id)
-        away_stats = self.api_client.get_team_statistics(away_team_id, league_id)
+        # 同一次聚合内相同请求（例如两队共用的积分榜）只发出一次
+        with request_scope():
+            # 获取两队统计数据
+            home_stats = self.api_client.get_team_statistics(home_team_id, league_id)
+            away_stats = self.api_client.get_team_statistics(away_team_id, league_id)
+            
+            # 获取历史交锋
+            h2h = self.api_client.get_h2h_data(home_team_id, away_team_id)
+            
+            # 获取伤病信息
+            home_injuries = self.api_client.get_team_injuries(home_team_id)
+            away_injuries = self.api_client.get_team_injuries(away_team_id)
+            
+            # 获取赔率（如果有比赛ID）
+            odds = None
+            if fixture_id:
+                odds = self.api_client.get_live_odds(fixture_id, kickoff)
+            
+        return self._build_prediction_data(
+            home_stats, away_stats, h2h, home_injuries, away_injuries, odds
+        )
         
-        # 获取历史交锋
-        h2h = self.api_client.get_h2h_data(home_team_id, away_team_id)
+    async def prepare_prediction_data_async(
+        self,
+        home_team_id: int,
+        away_team_id: int,
+        league_id: int,
+        fixture_id: int = None,
+        kickoff=None
+    ) -> Dict:
+        """
+        并发准备预测所需的所有数据
         
-        # 获取伤病信息
-        home_injuries = self.api_client.get_team_injuries(home_team_id)
-        away_injuries = self.api_client.get_team_injuries(away_team_id)
+        各数据分支相互独立，并发请求，总耗时取决于最慢的一个分支。
+        单个分支超过 branch_timeout 时放弃该分支，使用部分数据继续生成。
+        同一次聚合内相同请求（例如两队共用的积分榜）只发出一次。
         
-        # 获取赔率（如果有比赛ID）
-        odds = None
+        Returns:
+            包含所有预测所需数据的字典，missing_sources 列出超时或失败的分支
+        """
+        branches = {
+            'home_stats': (self.api_client.get_team_statistics_async(home_team_id, league_id), None),
+            'away_stats': (self.api_client.get_team_statistics_async(away_team_id, league_id), None),
+            'h2h': (self.api_client.get_h2h_data_async(home_team_id, away_team_id), None),
+            'home_injuries': (self.api_client.get_team_injuries_async(home_team_id), []),
+            'away_injuries': (self.api_client.get_team_injuries_async(away_team_id), []),
+        }
         if fixture_id:
-            odds = self.api_client.get_live_odds(fixture_id)
+            branches['odds'] = (self.api_client.get_live_odds_async(fixture_id, kickoff), None)
             
-        # 构建数据结构
+        with request_scope():
+            results = await asyncio.gather(*[
+                self._run_branch(name, coro, default)
+                for name, (coro, default) in branches.items()
+            ])
+        data = {name: value for name, (value, _) in zip(branches, results)}
+        missing_sources = [name for name, (_, ok) in zip(branches, results) if not ok]
+        
+        return self._build_prediction_data(
+            data['home_stats'],
+            data['away_stats'],
+            data['h2h'],
+            data['home_injuries'],
+            data['away_injuries'],
+            data.get('odds'),
+            missing_sources=missing_sources
+        )
+        
+    async def _run_branch(self, name: str, coro, default):
+        """
+        在截止时间内执行单个数据分支，返回 (结果, 是否成功)
+
+        分支在独立任务中运行：超时、失败，或共享的进行中请求被取消而抛出 CancelledError，
+        都只让该分支回退到默认值；只有本次聚合自身被取消时才向上抛出。
+        """
+        task = asyncio.ensure_future(coro)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.branch_timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not done:
+            task.cancel()
+            logger.warning(f"Data branch '{name}' timed out after {self.branch_timeout}s, using partial data")
+        elif task.cancelled():
+            logger.warning(f"Data branch '{name}' was cancelled, using partial data")
+        elif task.exception() is not None:
+            logger.error(f"Data branch '{name}' failed: {task.exception()}")
+        else:
+            return task.result(), True
+        return default, False
+        
+    def _build_prediction_data(
+        self,
+        home_stats: Optional[TeamStats],
+        away_stats: Optional[TeamStats],
+        h2h: Optional[H2HData],
+        home_injuries: List[Dict],
+        away_injuries: List[Dict],
+        odds: Optional[Dict],
+        missing_sources: List[str] = None
+    ) -> Dict:
+        """构建预测数据结构"""
         prediction_data = {
             'home_team': {
                 'name': home_stats.team_name if home_stats else 'Unknown',
@@ -462,7 +1047,8 @@ class FootballDataAggregator:
                 'away_win': 2.80,
                 'asian_handicap': '主队-0.5',
                 'over_under': '2.5'
-            }
+            },
+            'missing_sources': missing_sources or []
         }
         
         return prediction_data
@@ -0,0 +1,288 @@
+"""
+Quota-Aware Rate Limiter
+API-Sports 配额感知限流与优先级调度
+
+- 令牌桶按每分钟限额补充，并根据响应头自动校准：
+  X-RateLimit-Limit / X-RateLimit-Remaining（每分钟）
+  x-ratelimit-requests-limit / x-ratelimit-requests-remaining（每天）
+- 排队的请求按优先级放行：即将开赛比赛的实时赔率优先于积分榜刷新
+- 每日配额用尽时直接拒绝，调用方走缓存或降级逻辑
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# 优先级：数值越小越优先
+PRIORITY_CRITICAL = 0  # 即将开赛比赛的实时赔率
+PRIORITY_HIGH = 1      # 比赛列表、赔率
+PRIORITY_NORMAL = 2    # 伤病、历史交锋
+PRIORITY_LOW = 3       # 积分榜、赛季统计刷新
+
+PRIORITY_NAMES = {
+    PRIORITY_CRITICAL: "critical",
+    PRIORITY_HIGH: "high",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_LOW: "low",
+}
+
+ENDPOINT_PRIORITIES: Dict[str, int] = {
+    "/odds": PRIORITY_HIGH,
+    "/fixtures": PRIORITY_HIGH,
+    "/injuries": PRIORITY_NORMAL,
+    "/fixtures/headtohead": PRIORITY_NORMAL,
+    "/fixtures/statistics": PRIORITY_LOW,
+    "/teams/statistics": PRIORITY_LOW,
+    "/standings": PRIORITY_LOW,
+}
+
+DEFAULT_PER_MINUTE = int(os.getenv("FOOTBALL_API_RATE_PER_MINUTE", "10"))
+
+# 排队等待时的最长单次休眠（秒），保证高优先级请求插队后能及时被调度
+MAX_POLL_INTERVAL = 0.25
+
+
+class QuotaExhaustedError(Exception):
+    """每日配额已用尽"""
+
+
+class RateLimitTimeoutError(Exception):
+    """排队等待超时"""
+
+
+def priority_for(endpoint: str) -> int:
+    """端点的默认优先级"""
+    return ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_NORMAL)
+
+
+class _Waiter:
+    """排队中的请求"""
+
+    __slots__ = ("priority", "cancelled")
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.cancelled = False
+
+
+class QuotaAwareRateLimiter:
+    """
+    配额感知的令牌桶限流器
+
+    acquire() 供协程使用，acquire_sync() 供同步代码使用，两者共享同一个优先级队列。
+    """
+
+    def __init__(
+        self,
+        per_minute: int = DEFAULT_PER_MINUTE,
+        daily_limit: Optional[int] = None,
+        time_func: Callable[[], float] = time.monotonic
+    ):
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._queue: List = []
+        self._seq = itertools.count()
+
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self._last_refill = self._time()
+
+        self.daily_limit = daily_limit
+        self.daily_remaining: Optional[int] = None
+        self._daily_date = self._utc_date()
+
+        self.granted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.rate_limited_responses = 0
+
+    # ------------------------------------------------------------------
+    # 令牌桶
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _utc_date() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _refill(self) -> None:
+        now = self._time()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self.tokens = min(float(self.per_minute), self.tokens + elapsed * self.per_minute / 60.0)
+            self._last_refill = now
+
+        # API-Sports 每日配额在 UTC 零点重置
+        today = self._utc_date()
+        if today != self._daily_date:
+            self._daily_date = today
+            self.daily_remaining = None
+
+    def _seconds_until_token(self) -> float:
+        if self.per_minute <= 0:
+            return MAX_POLL_INTERVAL
+        return max(0.0, (1.0 - self.tokens) * 60.0 / self.per_minute)
+
+    def _enqueue(self, priority: int) -> _Waiter:
+        waiter = _Waiter(priority)
+        with self._lock:
+            self._refill()
+            if self.daily_remaining is not None and self.daily_remaining <= 0:
+                self.rejected += 1
+                raise QuotaExhaustedError("API-Sports daily quota exhausted")
+            heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+        return waiter
+
+    def _try_grant(self, waiter: _Waiter) -> Optional[float]:
+        """队首且有令牌时放行并返回 None，否则返回建议等待的秒数"""
+        with self._lock:
+            while self._queue and self._queue[0][2].cancelled:
+                heapq.heappop(self._queue)
+            self._refill()
+            if self.daily_remaining is not None and self.daily_remaining <= 0:
+                self._remove(waiter)
+                self.rejected += 1
+                raise QuotaExhaustedError("API-Sports daily quota exhausted")
+            if self._queue and self._queue[0][2] is waiter and self.tokens >= 1.0:
+                heapq.heappop(self._queue)
+                self.tokens -= 1.0
+                if self.daily_remaining is not None:
+                    self.daily_remaining -= 1
+                self.granted += 1
+                return None
+            return min(max(self._seconds_until_token(), 0.005), MAX_POLL_INTERVAL)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        waiter.cancelled = True
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> None:
+        """
+        异步获取一个请求令牌
+
+        Raises:
+            QuotaExhaustedError: 每日配额已用尽
+            RateLimitTimeoutError: 排队超过 timeout 秒
+        """
+        waiter = self._enqueue(priority)
+        started = self._time()
+        try:
+            while True:
+                delay = self._try_grant(waiter)
+                if delay is None:
+                    self.total_wait_seconds += self._time() - started
+                    return
+                if timeout is not None and self._time() - started + delay > timeout:
+                    self.timeouts += 1
+                    raise RateLimitTimeoutError(f"Waited more than {timeout}s for API-Sports quota")
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self._lock:
+                self._remove(waiter)
+            raise
+
+    def acquire_sync(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> None:
+        """同步获取一个请求令牌（异常同 acquire）"""
+        waiter = self._enqueue(priority)
+        started = self._time()
+        try:
+            while True:
+                delay = self._try_grant(waiter)
+                if delay is None:
+                    self.total_wait_seconds += self._time() - started
+                    return
+                if timeout is not None and self._time() - started + delay > timeout:
+                    self.timeouts += 1
+                    raise RateLimitTimeoutError(f"Waited more than {timeout}s for API-Sports quota")
+                time.sleep(delay)
+        except BaseException:
+            with self._lock:
+                self._remove(waiter)
+            raise
+
+    # ------------------------------------------------------------------
+    # 根据响应头校准
+    # ------------------------------------------------------------------
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """根据 API-Sports 返回的限流响应头校准令牌桶和每日配额"""
+        lowered = {k.lower(): v for k, v in headers.items()}
+
+        def _int(name: str) -> Optional[int]:
+            value = lowered.get(name)
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                return None
+
+        minute_limit = _int("x-ratelimit-limit")
+        minute_remaining = _int("x-ratelimit-remaining")
+        daily_limit = _int("x-ratelimit-requests-limit")
+        daily_remaining = _int("x-ratelimit-requests-remaining")
+
+        with self._lock:
+            self._refill()
+            if minute_limit is not None and minute_limit > 0 and minute_limit != self.per_minute:
+                logger.info(f"API-Sports per-minute limit calibrated: {self.per_minute} -> {minute_limit}")
+                self.per_minute = minute_limit
+                self.tokens = min(self.tokens, float(minute_limit))
+            if minute_remaining is not None:
+                # 服务端计数是准确的，本地令牌只能更少不能更多
+                self.tokens = min(self.tokens, float(minute_remaining))
+            if daily_limit is not None:
+                self.daily_limit = daily_limit
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+
+    def on_rate_limited(self) -> None:
+        """收到 429 时清空令牌，等待下一轮补充"""
+        with self._lock:
+            self._refill()
+            self.tokens = 0.0
+            self.rate_limited_responses += 1
+
+    # ------------------------------------------------------------------
+    # 指标
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        """队列深度与剩余配额"""
+        with self._lock:
+            self._refill()
+            pending = [entry[2] for entry in self._queue if not entry[2].cancelled]
+            by_priority = {name: 0 for name in PRIORITY_NAMES.values()}
+            for waiter in pending:
+                name = PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))
+                by_priority[name] = by_priority.get(name, 0) + 1
+            return {
+                "queue_depth": len(pending),
+                "queue_by_priority": by_priority,
+                "tokens_available": round(self.tokens, 2),
+                "per_minute_limit": self.per_minute,
+                "daily_limit": self.daily_limit,
+                "daily_remaining": self.daily_remaining,
+                "granted": self.granted,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "rate_limited_responses": self.rate_limited_responses,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.granted, 4) if self.granted else 0.0
+            }
+
+
+# 进程级共享限流器：配额是整个 API Key 共享的
+_rate_limiter: Optional[QuotaAwareRateLimiter] = None
+
+
+def get_rate_limiter() -> QuotaAwareRateLimiter:
+    """获取共享的限流器"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = QuotaAwareRateLimiter()
+    return _rate_limiter
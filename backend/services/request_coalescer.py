@@ -0,0 +1,147 @@
+"""
+Request Coalescer
+API-Sports 请求合并（single-flight）
+
+- 同一时刻对同一端点、同一参数的请求只发出一次，其他调用方等待并共享结果
+- request_scope() 内同一个键只请求一次（例如一次预测数据聚合里两队共用的积分榜）
+"""
+
+import asyncio
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 当前聚合范围内已获取的响应，None 表示不在 request_scope 中
+_scope_results: ContextVar[Optional[Dict[str, Any]]] = ContextVar("api_request_scope", default=None)
+
+
+@contextmanager
+def request_scope():
+    """
+    聚合范围：范围内同一个请求键只向上游请求一次
+
+    asyncio.gather 创建的子任务会继承同一个范围。
+    """
+    token = _scope_results.set({})
+    try:
+        yield
+    finally:
+        _scope_results.reset(token)
+
+
+def scope_get(key: str) -> Any:
+    """从当前聚合范围读取结果，未命中返回 None"""
+    results = _scope_results.get()
+    if results is None:
+        return None
+    return results.get(key)
+
+
+def scope_set(key: str, value: Any) -> None:
+    """把结果记录到当前聚合范围（失败的请求不记录）"""
+    results = _scope_results.get()
+    if results is not None and value is not None:
+        results[key] = value
+
+
+class _SyncCall:
+    """同步路径上正在进行的一次请求"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    进行中请求合并
+
+    do() 用于同步调用（多线程），do_async() 用于协程调用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_calls: Dict[str, _SyncCall] = {}
+        self._async_calls: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.scope_hits = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """执行 fn，若相同键的请求正在进行则等待其结果"""
+        with self._lock:
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = _SyncCall()
+                self._sync_calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._sync_calls.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行协程函数 fn，若相同键的请求正在进行则等待其结果
+
+        fn 在独立的任务中运行，所有调用方（包括发起方）都通过 shield 等待：某个调用方被取消
+        或超时只结束它自己的等待，不会取消共享的请求，其他调用方照常拿到结果。
+        """
+        loop = asyncio.get_running_loop()
+        task = self._async_calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._async_calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda done: self._finish_async(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_async(self, key: str, task: asyncio.Future) -> None:
+        if self._async_calls.get(key) is task:
+            del self._async_calls[key]
+        if not task.cancelled():
+            task.exception()  # 标记异常已读取，避免所有调用方都已离开时的警告
+
+    def stats(self) -> Dict[str, int]:
+        """合并统计"""
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "scope_hits": self.scope_hits,
+            "in_flight": len(self._sync_calls) + len(self._async_calls)
+        }
+
+
+# 进程级共享实例：所有客户端共享，才能合并不同用户的相同请求
+_request_coalescer: Optional[RequestCoalescer] = None
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """获取共享的请求合并器"""
+    global _request_coalescer
+    if _request_coalescer is None:
+        _request_coalescer = RequestCoalescer()
+    return _request_coalescer
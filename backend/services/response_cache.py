@@ -0,0 +1,302 @@
+"""
+API-Sports Response Cache
+API-Sports 响应的持久化读穿缓存
+
+- 按端点配置 TTL（积分榜数小时、历史交锋一天、赔率一分钟）
+- SQLite 存储，zlib 压缩，进程重启后仍然有效
+- 按最近访问时间做 LRU 淘汰，总大小有上限
+- 命中/未命中计数
+- 每个上游地址单独一个缓存文件，指向本地模拟服务时不会污染生产数据
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+# 缓存未命中的标记（缓存中的值本身可能是空列表）
+MISS = object()
+
+# 各端点的 TTL（秒），未列出的端点不缓存
+DEFAULT_TTL_POLICIES: Dict[str, int] = {
+    "/standings": 6 * 3600,
+    "/teams/statistics": 6 * 3600,
+    "/fixtures/headtohead": 24 * 3600,
+    "/injuries": 3600,
+    "/odds": 60,
+    "/fixtures": 300,
+    "/fixtures/statistics": 24 * 3600,
+}
+
+# 已完赛的比赛结果不会再变化
+FINISHED_FIXTURE_TTL = 24 * 3600
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(BACKEND_DIR, "data", "api_sports_cache.sqlite3")
+# 生产上游，使用 DEFAULT_CACHE_PATH；其他上游的缓存文件名带上主机名
+PRODUCTION_BASE_URL = "https://v3.football.api-sports.io"
+DEFAULT_MAX_BYTES = int(float(os.getenv("FOOTBALL_API_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """由端点和规范化后的参数生成缓存键（参数顺序和类型不影响结果）"""
+    if not params:
+        return endpoint
+    normalized = sorted((str(k), str(v)) for k, v in params.items() if v is not None)
+    return f"{endpoint}?{urlencode(normalized)}"
+
+
+class SQLiteLRUStore:
+    """
+    基于 SQLite 的 LRU 键值存储
+
+    值以 JSON + zlib 压缩保存，超过 max_bytes 时按最近访问时间淘汰。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        time_func: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._time = time_func
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        """读取缓存值，过期或不存在时返回 MISS"""
+        now = self._time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISS
+            value, size, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                return MISS
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(value))
+
+    def expires_at(self, key: str) -> Optional[float]:
+        """条目的过期时间，不存在时返回 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """写入缓存值"""
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        size = len(blob)
+        if size > self.max_bytes:
+            return
+        now = self._time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, size, now + ttl, now)
+            )
+            self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict(now)
+
+    def delete(self, key: str) -> None:
+        """删除缓存值"""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+
+    def delete_prefix(self, prefix: str) -> int:
+        """删除指定前缀的全部缓存值，返回删除条数"""
+        where = "substr(key, 1, ?) = ?"
+        args = (len(prefix), prefix)
+        with self._lock:
+            size, count = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries WHERE {where}", args
+            ).fetchone()
+            self._conn.execute(f"DELETE FROM entries WHERE {where}", args)
+            self._total_bytes -= size
+        return count
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def _evict(self, now: float) -> None:
+        """先清理过期条目，再按最近访问时间淘汰，直到总大小低于上限的 90%"""
+        expired = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchone()
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        self._total_bytes -= expired[0]
+        self.evictions += expired[1]
+
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 32"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= target:
+                    break
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class ResponseCache:
+    """
+    API-Sports 响应缓存
+
+    在 FootballAPIClient._make_request 下面做读穿缓存，按端点决定 TTL。
+    """
+
+    def __init__(
+        self,
+        store: SQLiteLRUStore,
+        ttl_policies: Optional[Dict[str, int]] = None
+    ):
+        self.store = store
+        self.ttl_policies = dict(DEFAULT_TTL_POLICIES if ttl_policies is None else ttl_policies)
+        self.hits = 0
+        self.misses = 0
+        self._endpoint_counters: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, endpoint: str, params: Optional[Dict] = None) -> int:
+        """获取端点的 TTL，0 表示不缓存"""
+        if endpoint == "/fixtures" and params and params.get("status") == "FT":
+            return FINISHED_FIXTURE_TTL
+        return self.ttl_policies.get(endpoint, 0)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """读取缓存，未命中返回 MISS"""
+        if self.ttl_for(endpoint, params) <= 0:
+            return MISS
+        value = self.store.get(make_cache_key(endpoint, params))
+        counters = self._endpoint_counters.setdefault(endpoint, {"hits": 0, "misses": 0})
+        if value is MISS:
+            self.misses += 1
+            counters["misses"] += 1
+        else:
+            self.hits += 1
+            counters["hits"] += 1
+        return value
+
+    def set(self, endpoint: str, params: Optional[Dict], value: Any) -> None:
+        """写入缓存（None 表示请求失败，不缓存）"""
+        ttl = self.ttl_for(endpoint, params)
+        if ttl <= 0 or value is None:
+            return
+        try:
+            self.store.set(make_cache_key(endpoint, params), value, ttl)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache {endpoint}: {e}")
+
+    def expires_at(self, endpoint: str, params: Optional[Dict] = None) -> Optional[float]:
+        """缓存条目的过期时间（由缓存中的值派生的数据不应比它活得更久），未缓存时返回 None"""
+        if self.ttl_for(endpoint, params) <= 0:
+            return None
+        return self.store.expires_at(make_cache_key(endpoint, params))
+
+    def invalidate(self, endpoint: str, params: Optional[Dict] = None) -> None:
+        """使单个缓存条目失效"""
+        self.store.delete(make_cache_key(endpoint, params))
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self.store),
+            "size_bytes": self.store.total_bytes,
+            "max_bytes": self.store.max_bytes,
+            "evictions": self.store.evictions,
+            "endpoints": {k: dict(v) for k, v in self._endpoint_counters.items()}
+        }
+
+
+def cache_path_for(base_url: str, path: str = DEFAULT_CACHE_PATH) -> str:
+    """
+    上游地址对应的缓存文件
+
+    生产上游使用 path 本身，其他上游（本地模拟服务、测试环境）在文件名后加上主机名，
+    例如 api_sports_cache.127.0.0.1_8099.sqlite3。
+    """
+    host = urlparse(base_url).netloc or base_url
+    if host == urlparse(PRODUCTION_BASE_URL).netloc:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{re.sub(r'[^A-Za-z0-9.-]+', '_', host)}{ext}"
+
+
+# 进程级共享缓存（惰性初始化），按缓存文件区分
+_response_caches: Dict[str, ResponseCache] = {}
+
+
+def get_response_cache(base_url: Optional[str] = None) -> Optional[ResponseCache]:
+    """
+    获取上游地址对应的共享响应缓存
+
+    base_url 默认取 FOOTBALL_API_BASE_URL。设置 FOOTBALL_API_CACHE_ENABLED=false 可关闭缓存，
+    FOOTBALL_API_CACHE_PATH 可指定（生产上游的）缓存文件位置。
+    """
+    if os.getenv("FOOTBALL_API_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    base_url = base_url or os.getenv("FOOTBALL_API_BASE_URL", PRODUCTION_BASE_URL)
+    path = cache_path_for(base_url, os.getenv("FOOTBALL_API_CACHE_PATH", DEFAULT_CACHE_PATH))
+    if path not in _response_caches:
+        try:
+            _response_caches[path] = ResponseCache(SQLiteLRUStore(path))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open response cache at {path}: {e}")
+            return None
+    return _response_caches[path]
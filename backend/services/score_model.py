@@ -0,0 +1,441 @@
+"""
+Score Model
+Poisson / Dixon–Coles 比分概率模型
+
+每支球队有进攻和防守两个强度参数，主队进球期望 λ = 基准 × 主场优势 × 主队进攻 × 客队防守，
+客队进球期望 μ = 基准 × 客队进攻 × 主队防守。双方进球按 Poisson 分布，低比分（0-0、1-0、
+0-1、1-1）再按 Dixon–Coles 的 ρ 修正相关性。
+
+用 NumPy 一次生成一批比赛的完整比分概率矩阵（N × 11 × 11），胜平负、大小球、双方进球和
+亚洲让球盘的概率都从矩阵求和得到；整轮比赛一次调用即可。
+
+强度参数从历史比赛拟合：进攻/防守/主场优势用 Poisson 极大似然的不动点迭代（按 bincount 向量化），
+ρ 在网格上取似然最大值。有 xG 时按权重与实际进球混合，近期比赛可以加时间衰减权重。
+"""
+
+import math
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 矩阵覆盖 0..MAX_GOALS 个进球，截断的尾部概率重新归一化
+MAX_GOALS = 10
+
+# 未拟合时的联赛平均值：客队场均进球、主场进球倍数
+DEFAULT_AWAY_GOALS = 1.15
+DEFAULT_HOME_ADVANTAGE = 1.25
+
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+ASIAN_HANDICAP_LINES = (-2.0, -1.5, -1.25, -1.0, -0.75, -0.5, -0.25, 0.0, 0.25, 0.5, 0.75, 1.0, 1.5)
+
+# ρ 的搜索网格（文献中的取值一般在 -0.2 到 0 之间）
+RHO_GRID = np.linspace(-0.25, 0.25, 101)
+
+# 进球期望的上下限，避免极端强度差得到退化的矩阵
+MIN_EXPECTED_GOALS = 0.05
+MAX_EXPECTED_GOALS = 6.0
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIAL = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, MAX_GOALS + 1)))))
+# 比分矩阵 [主队进球, 客队进球] 上的净胜球和总进球
+_DIFF = _GOALS[:, None] - _GOALS[None, :]
+_TOTAL = _GOALS[:, None] + _GOALS[None, :]
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """一场已完赛比赛（拟合用）"""
+    home: str
+    away: str
+    home_goals: int
+    away_goals: int
+    home_xg: Optional[float] = None
+    away_xg: Optional[float] = None
+    weight: float = 1.0
+
+
+def score_matrices(home_xg: Any, away_xg: Any, rho: float = 0.0) -> np.ndarray:
+    """
+    批量比分概率矩阵
+
+    Args:
+        home_xg: 主队进球期望，形状 (N,)
+        away_xg: 客队进球期望，形状 (N,)
+        rho: Dixon–Coles 低比分修正，0 即独立 Poisson
+
+    Returns:
+        形状 (N, MAX_GOALS + 1, MAX_GOALS + 1)，[n, i, j] 为第 n 场主队 i 球、客队 j 球的概率
+    """
+    lam = np.clip(np.asarray(home_xg, dtype=float), MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    mu = np.clip(np.asarray(away_xg, dtype=float), MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    home_pmf = np.exp(_GOALS * np.log(lam)[:, None] - lam[:, None] - _LOG_FACTORIAL)
+    away_pmf = np.exp(_GOALS * np.log(mu)[:, None] - mu[:, None] - _LOG_FACTORIAL)
+    matrix = home_pmf[:, :, None] * away_pmf[:, None, :]
+    if rho:
+        matrix[:, 0, 0] *= 1 - lam * mu * rho
+        matrix[:, 0, 1] *= 1 + lam * rho
+        matrix[:, 1, 0] *= 1 + mu * rho
+        matrix[:, 1, 1] *= 1 - rho
+        np.clip(matrix, 0.0, None, out=matrix)
+    matrix /= matrix.sum(axis=(1, 2), keepdims=True)
+    return matrix
+
+
+def market_probabilities(matrices: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    从比分矩阵求各玩法概率
+
+    Returns:
+        每场比赛一个字典：1x2、over_under（按盘口）、btts、asian_handicap（主队让球盘口 ->
+        赢/走/输，四分之一盘按两个半盘各一半计算）
+    """
+    n = matrices.shape[0]
+    flat = matrices.reshape(n, -1)
+    home = flat[:, (_DIFF > 0).ravel()].sum(axis=1)
+    draw = flat[:, (_DIFF == 0).ravel()].sum(axis=1)
+    away = flat[:, (_DIFF < 0).ravel()].sum(axis=1)
+    btts = flat[:, ((_GOALS[:, None] > 0) & (_GOALS[None, :] > 0)).ravel()].sum(axis=1)
+    over = {line: flat[:, (_TOTAL > line).ravel()].sum(axis=1) for line in OVER_UNDER_LINES}
+
+    # 净胜球分布：margins[k] 对应净胜 k - MAX_GOALS
+    margins = np.stack(
+        [flat[:, (_DIFF == d).ravel()].sum(axis=1) for d in range(-MAX_GOALS, MAX_GOALS + 1)], axis=1
+    )
+    margin_values = np.arange(-MAX_GOALS, MAX_GOALS + 1)
+    handicap = {}
+    for line in ASIAN_HANDICAP_LINES:
+        parts = (line - 0.25, line + 0.25) if (line * 4) % 2 else (line,)
+        win = sum(margins[:, margin_values + part > 0].sum(axis=1) for part in parts) / len(parts)
+        push = sum(margins[:, margin_values + part == 0].sum(axis=1) for part in parts) / len(parts)
+        handicap[line] = (win, push, 1 - win - push)
+
+    return [
+        {
+            "1x2": {"home": float(home[k]), "draw": float(draw[k]), "away": float(away[k])},
+            "over_under": {line: {"over": float(p[k]), "under": float(1 - p[k])} for line, p in over.items()},
+            "btts": {"yes": float(btts[k]), "no": float(1 - btts[k])},
+            "asian_handicap": {
+                line: {"win": float(w[k]), "push": float(p[k]), "lose": float(l[k])}
+                for line, (w, p, l) in handicap.items()
+            },
+        }
+        for k in range(n)
+    ]
+
+
+def rates_from_form(
+    recent_form: Sequence[str],
+    goals_scored: Optional[int] = None,
+    goals_conceded: Optional[int] = None,
+    league_goals: float = (DEFAULT_AWAY_GOALS * (1 + DEFAULT_HOME_ADVANTAGE)) / 2,
+    prior_games: float = 5.0
+) -> Tuple[float, float]:
+    """
+    没有历史比赛时按近期战绩估算 (场均进球, 场均失球)
+
+    有近期进失球数时取场均，并加入 prior_games 场联赛平均水平的虚拟比赛，避免几场比赛的
+    样本得出极端值；只有胜平负时按场均积分相对联赛平均（约 1.4 分）的偏离调整联赛场均进球。
+    """
+    games = len(recent_form)
+    if games and (goals_scored or goals_conceded):
+        prior = prior_games * league_goals
+        return (
+            ((goals_scored or 0) + prior) / (games + prior_games),
+            ((goals_conceded or 0) + prior) / (games + prior_games)
+        )
+    if not games:
+        return league_goals, league_goals
+    points = sum({"W": 3, "D": 1}.get(result, 0) for result in recent_form) / games
+    tilt = math.exp(0.35 * (points - 1.4))
+    return league_goals * tilt, league_goals / tilt
+
+
+@dataclass(frozen=True)
+class ScorePrediction:
+    """一场比赛的比分概率"""
+    home_team: str
+    away_team: str
+    home_xg: float
+    away_xg: float
+    matrix: np.ndarray = field(repr=False, compare=False)
+    markets: Dict[str, Any] = field(repr=False)
+
+    def most_likely(self, count: int = 1) -> List[str]:
+        """概率最高的几个比分，如 ["1-1", "2-1"]"""
+        order = np.argsort(self.matrix, axis=None)[::-1][:count]
+        return [f"{i}-{j}" for i, j in zip(*np.unravel_index(order, self.matrix.shape))]
+
+    def probability(self, outcome: str) -> Optional[float]:
+        """
+        某个投注结果的概率，无法定价时返回 None
+
+        支持 home_win / draw / away_win、over_2.5 / under_2.5、yes / no（双方进球）、
+        正确比分 "2-1"，以及半球盘 home_-0.5 / away_+1.5（整数和四分之一盘有走盘，不在此列）。
+        """
+        outcome = outcome.strip().lower()
+        result = {"home_win": "home", "draw": "draw", "away_win": "away"}.get(outcome)
+        if result:
+            return self.markets["1x2"][result]
+        if outcome in ("yes", "no"):
+            return self.markets["btts"][outcome]
+        side, _, value = outcome.partition("_")
+        try:
+            if side in ("over", "under"):
+                return self.markets["over_under"][float(value)][side]
+            if side in ("home", "away"):
+                line = float(value)
+                entry = self.markets["asian_handicap"].get(line if side == "home" else -line)
+                if entry is None or entry["push"] > 1e-12:
+                    return None
+                return entry["win"] if side == "home" else entry["lose"]
+            home_goals, away_goals = (int(goals) for goals in outcome.split("-"))
+            return float(self.matrix[home_goals, away_goals])
+        except (KeyError, ValueError, IndexError):
+            return None
+
+    def to_dict(self, top_scores: int = 5) -> Dict[str, Any]:
+        """JSON 友好的结果（概率保留 4 位小数）"""
+        def rounded(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {str(key): rounded(item) for key, item in value.items()}
+            return round(value, 4)
+
+        return {
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "expected_goals": {"home": round(self.home_xg, 3), "away": round(self.away_xg, 3)},
+            "most_likely_scores": [
+                {"score": score, "probability": round(self.probability(score), 4)}
+                for score in self.most_likely(top_scores)
+            ],
+            **rounded(self.markets),
+        }
+
+
+class ScoreModel:
+    """球队强度参数和比分预测"""
+
+    def __init__(
+        self,
+        teams: Sequence[str] = (),
+        attack: Optional[Sequence[float]] = None,
+        defence: Optional[Sequence[float]] = None,
+        base: float = DEFAULT_AWAY_GOALS,
+        home_advantage: float = DEFAULT_HOME_ADVANTAGE,
+        rho: float = 0.0,
+        matches: int = 0
+    ):
+        """
+        Args:
+            teams: 球队名
+            attack / defence: 与 teams 对应的强度，1.0 为联赛平均
+            base: 平均水平客队的场均进球
+            home_advantage: 主队进球期望的倍数
+            rho: Dixon–Coles 低比分修正
+            matches: 拟合用的比赛数（未拟合为 0）
+        """
+        self.teams = tuple(teams)
+        self.index = {team: k for k, team in enumerate(self.teams)}
+        self.attack = np.asarray(attack if attack is not None else np.ones(len(self.teams)), dtype=float)
+        self.defence = np.asarray(defence if defence is not None else np.ones(len(self.teams)), dtype=float)
+        self.base = float(base)
+        self.home_advantage = float(home_advantage)
+        self.rho = float(rho)
+        self.matches = matches
+
+    @property
+    def league_goals(self) -> float:
+        """平均水平球队的场均进球（主客场平均）"""
+        return self.base * (1 + self.home_advantage) / 2
+
+    @property
+    def version(self) -> str:
+        """参数指纹，模型重新拟合后变化（用于文章缓存）"""
+        digest = hashlib.sha256()
+        digest.update(repr((self.teams, self.base, self.home_advantage, self.rho)).encode("utf-8"))
+        digest.update(np.round(self.attack, 6).tobytes())
+        digest.update(np.round(self.defence, 6).tobytes())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def fit(
+        cls,
+        results: Sequence[MatchResult],
+        xg_weight: float = 0.5,
+        prior_goals: float = 2.0,
+        iterations: int = 100,
+        tolerance: float = 1e-6,
+        fit_rho: bool = True
+    ) -> "ScoreModel":
+        """
+        从历史比赛拟合
+
+        Args:
+            results: 已完赛比赛
+            xg_weight: 有 xG 时 xG 在观测进球中的权重
+            prior_goals: 每支球队向联赛平均收缩的虚拟进球数，比赛少的球队强度接近 1.0
+            iterations / tolerance: 不动点迭代的上限和收敛阈值
+            fit_rho: 是否拟合 Dixon–Coles ρ
+        """
+        if not results:
+            return cls()
+
+        teams = sorted({r.home for r in results} | {r.away for r in results})
+        index = {team: k for k, team in enumerate(teams)}
+        n = len(teams)
+        home = np.array([index[r.home] for r in results])
+        away = np.array([index[r.away] for r in results])
+        weight = np.array([r.weight for r in results], dtype=float)
+        home_goals = np.array([r.home_goals for r in results], dtype=float)
+        away_goals = np.array([r.away_goals for r in results], dtype=float)
+        home_obs = np.array([
+            r.home_goals if r.home_xg is None else (1 - xg_weight) * r.home_goals + xg_weight * r.home_xg
+            for r in results
+        ])
+        away_obs = np.array([
+            r.away_goals if r.away_xg is None else (1 - xg_weight) * r.away_goals + xg_weight * r.away_xg
+            for r in results
+        ])
+
+        # 各队加权进球 / 失球
+        scored = np.bincount(home, weight * home_obs, n) + np.bincount(away, weight * away_obs, n)
+        conceded = np.bincount(home, weight * away_obs, n) + np.bincount(away, weight * home_obs, n)
+        total_home = (weight * home_obs).sum()
+        total_away = (weight * away_obs).sum()
+
+        attack, defence = np.ones(n), np.ones(n)
+        base = max(total_away / weight.sum(), MIN_EXPECTED_GOALS)
+        gamma = max(total_home, MIN_EXPECTED_GOALS) / max(total_away, MIN_EXPECTED_GOALS)
+        for _ in range(iterations):
+            # 每场比赛在 attack=1 时的进球期望
+            home_unit = base * gamma * defence[away] * weight
+            away_unit = base * defence[home] * weight
+            new_attack = (scored + prior_goals) / (
+                np.bincount(home, home_unit, n) + np.bincount(away, away_unit, n) + prior_goals
+            )
+            home_unit = base * gamma * new_attack[home] * weight
+            away_unit = base * new_attack[away] * weight
+            new_defence = (conceded + prior_goals) / (
+                np.bincount(away, home_unit, n) + np.bincount(home, away_unit, n) + prior_goals
+            )
+            # 固定尺度：进攻和防守的几何平均都为 1，差值并入基准
+            scale_attack = np.exp(np.log(new_attack).mean())
+            scale_defence = np.exp(np.log(new_defence).mean())
+            new_attack /= scale_attack
+            new_defence /= scale_defence
+            strength = (new_attack[away] * new_defence[home] * weight).sum()
+            base = max(total_away / strength, MIN_EXPECTED_GOALS)
+            gamma = max(total_home, MIN_EXPECTED_GOALS) / (base * (new_attack[home] * new_defence[away] * weight).sum())
+            change = max(np.abs(new_attack - attack).max(), np.abs(new_defence - defence).max())
+            attack, defence = new_attack, new_defence
+            if change < tolerance:
+                break
+
+        rho = 0.0
+        if fit_rho:
+            lam = base * gamma * attack[home] * defence[away]
+            mu = base * attack[away] * defence[home]
+            rho = _fit_rho(home_goals, away_goals, lam, mu, weight)
+        return cls(teams, attack, defence, base, gamma, rho, len(results))
+
+    def expected_goals(
+        self,
+        fixtures: Sequence[Tuple[str, str]],
+        form: Optional[Mapping[str, Tuple[float, float]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        一批比赛的 (主队进球期望, 客队进球期望)
+
+        Args:
+            fixtures: (主队, 客队)
+            form: 模型中没有的球队可以给出 (场均进球, 场均失球)，否则按联赛平均
+        """
+        strengths = self._strengths({team for fixture in fixtures for team in fixture}, form or {})
+        home_attack = np.array([strengths[h][0] for h, _ in fixtures], dtype=float)
+        home_defence = np.array([strengths[h][1] for h, _ in fixtures], dtype=float)
+        away_attack = np.array([strengths[a][0] for _, a in fixtures], dtype=float)
+        away_defence = np.array([strengths[a][1] for _, a in fixtures], dtype=float)
+        home_xg = self.base * self.home_advantage * home_attack * away_defence
+        away_xg = self.base * away_attack * home_defence
+        return home_xg, away_xg
+
+    def predict_many(
+        self,
+        fixtures: Sequence[Tuple[str, str]],
+        form: Optional[Mapping[str, Tuple[float, float]]] = None
+    ) -> List[ScorePrediction]:
+        """一次计算一批比赛（如整轮比赛）的比分概率"""
+        if not fixtures:
+            return []
+        home_xg, away_xg = self.expected_goals(fixtures, form)
+        matrices = score_matrices(home_xg, away_xg, self.rho)
+        markets = market_probabilities(matrices)
+        return [
+            ScorePrediction(home, away, float(home_xg[k]), float(away_xg[k]), matrices[k], markets[k])
+            for k, (home, away) in enumerate(fixtures)
+        ]
+
+    def predict(
+        self,
+        home: str,
+        away: str,
+        form: Optional[Mapping[str, Tuple[float, float]]] = None
+    ) -> ScorePrediction:
+        """单场比赛的比分概率"""
+        return self.predict_many([(home, away)], form)[0]
+
+    def _strengths(self, teams: set, form: Mapping[str, Tuple[float, float]]) -> Dict[str, Tuple[float, float]]:
+        """球队 -> (进攻, 防守)，已拟合的球队优先"""
+        strengths = {}
+        for team in teams:
+            k = self.index.get(team)
+            if k is not None:
+                strengths[team] = (self.attack[k], self.defence[k])
+            elif team in form:
+                scored, conceded = form[team]
+                strengths[team] = (
+                    max(scored, MIN_EXPECTED_GOALS) / self.league_goals,
+                    max(conceded, MIN_EXPECTED_GOALS) / self.league_goals
+                )
+            else:
+                strengths[team] = (1.0, 1.0)
+        return strengths
+
+    def stats(self) -> Dict[str, Any]:
+        """模型参数摘要"""
+        return {
+            "version": self.version,
+            "teams": len(self.teams),
+            "matches": self.matches,
+            "base_away_goals": round(self.base, 4),
+            "home_advantage": round(self.home_advantage, 4),
+            "rho": round(self.rho, 4),
+        }
+
+
+def _fit_rho(
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    lam: np.ndarray,
+    mu: np.ndarray,
+    weight: np.ndarray
+) -> float:
+    """在 RHO_GRID 上取 Dixon–Coles 修正项的加权对数似然最大值（只有低比分比赛有贡献）"""
+    low = (home_goals <= 1) & (away_goals <= 1)
+    if not low.any():
+        return 0.0
+    x, y = home_goals[low][None, :], away_goals[low][None, :]
+    lam, mu, weight = lam[low][None, :], mu[low][None, :], weight[low]
+    rho = RHO_GRID[:, None]
+    tau = np.where(
+        (x == 0) & (y == 0), 1 - lam * mu * rho,
+        np.where((x == 0) & (y == 1), 1 + lam * rho,
+                 np.where((x == 1) & (y == 0), 1 + mu * rho, 1 - rho))
+    )
+    valid = (tau > 0).all(axis=1)
+    if not valid.any():
+        return 0.0
+    loglik = np.where(valid, (np.log(np.clip(tau, 1e-12, None)) * weight).sum(axis=1), -np.inf)
+    return float(RHO_GRID[int(np.argmax(loglik))])
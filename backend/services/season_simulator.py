@@ -0,0 +1,274 @@
+"""
+Season Simulator
+联赛剩余赛程的蒙特卡洛模拟
+
+按每场未赛比赛的胜平负概率把剩余赛程模拟 1 万到 10 万次，统计每支球队的最终排名分布，
+得到夺冠、前 N 名、降级概率和期望积分。
+
+所有模拟一次生成：赛果是 (模拟次数 × 比赛数) 的 int8 矩阵，积分用矩阵乘法累加到球队，
+排名对每次模拟按行排序。模拟次数较多时可以分块交给进程池，每块使用独立的随机种子，
+结果与单进程相同。
+
+模拟结果保留每次模拟的赛果。某场比赛结束后，把该场所有模拟的赛果替换为实际结果即可
+（各场比赛相互独立，其余比赛的模拟仍然有效），只需更新两支球队的积分再重新排名，
+不必重新模拟整个赛季。
+
+积分相同时依次比较当前净胜球和随机抽签（模拟不产生比分，剩余比赛不计入净胜球）。
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SIMULATIONS = 20000
+
+# 每块模拟的次数（控制单块内存），也是分配给进程池的单位
+CHUNK_SIZE = 10000
+
+# 少于这个次数时单进程更快（启动进程池和传回赛果矩阵的开销更大）
+MIN_PARALLEL_SIMULATIONS = 50000
+
+# 赛果编码 0 主胜 / 1 平 / 2 客胜 对应的主、客队积分
+HOME_POINTS = np.array([3, 1, 0], dtype=np.int16)
+AWAY_POINTS = np.array([0, 1, 3], dtype=np.int16)
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """一场未赛比赛及其胜平负概率"""
+    fixture_id: str
+    home: str
+    away: str
+    home_win: float
+    draw: float
+    away_win: float
+
+
+@dataclass(frozen=True)
+class Standing:
+    """球队当前积分"""
+    points: int = 0
+    goal_difference: int = 0
+    played: int = 0
+
+
+def outcome(home_goals: int, away_goals: int) -> int:
+    """比分对应的赛果编码"""
+    return 0 if home_goals > away_goals else 1 if home_goals == away_goals else 2
+
+
+def simulate_outcomes(probabilities: np.ndarray, simulations: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    按胜平负概率抽样赛果
+
+    Args:
+        probabilities: (比赛数, 3) 的主胜/平/客胜概率，按行归一化
+        simulations: 模拟次数
+        rng: 随机数生成器
+
+    Returns:
+        (simulations, 比赛数) 的 int8 赛果矩阵
+    """
+    probabilities = np.asarray(probabilities, dtype=float).reshape(-1, 3)
+    cumulative = np.cumsum(probabilities / probabilities.sum(axis=1, keepdims=True), axis=1)
+    draws = rng.random((simulations, len(probabilities)))
+    return (draws >= cumulative[:, 0]).astype(np.int8) + (draws >= cumulative[:, 1])
+
+
+# (概率, 主队序号, 客队序号, 球队数, 模拟次数, 随机种子)
+ChunkTask = Tuple[np.ndarray, np.ndarray, np.ndarray, int, int, np.random.SeedSequence]
+
+
+def _simulate_chunk(task: ChunkTask) -> Tuple[np.ndarray, np.ndarray]:
+    """模拟一块：返回赛果和每次模拟的剩余比赛积分（进程池任务，必须在模块顶层）"""
+    probabilities, home_index, away_index, teams, simulations, seed = task
+    outcomes = simulate_outcomes(probabilities, simulations, np.random.default_rng(seed))
+    return outcomes, _fixture_points(outcomes, home_index, away_index, teams)
+
+
+def _fixture_points(outcomes: np.ndarray, home_index: np.ndarray, away_index: np.ndarray, teams: int) -> np.ndarray:
+    """把每场比赛的积分累加到球队：(模拟次数, 球队数)"""
+    fixtures = len(home_index)
+    home = np.zeros((fixtures, teams), dtype=np.float32)
+    away = np.zeros((fixtures, teams), dtype=np.float32)
+    home[np.arange(fixtures), home_index] = 1
+    away[np.arange(fixtures), away_index] = 1
+    points = HOME_POINTS[outcomes].astype(np.float32) @ home + AWAY_POINTS[outcomes].astype(np.float32) @ away
+    return points.astype(np.int16)
+
+
+class SeasonSimulation:
+    """
+    一次赛季模拟的结果
+
+    保存每次模拟的赛果和最终积分；apply_result() 在比赛结束后增量更新，
+    projections() 汇总排名概率（结果缓存到下一次更新）。
+    """
+
+    def __init__(
+        self,
+        teams: Sequence[str],
+        standings: Mapping[str, Standing],
+        fixtures: Sequence[Fixture],
+        outcomes: np.ndarray,
+        fixture_points: np.ndarray,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            teams: 球队名
+            standings: 当前积分（缺少的球队按 0 分）
+            fixtures: 未赛比赛，与 outcomes 的列对应
+            outcomes: (模拟次数, 比赛数) 赛果
+            fixture_points: (模拟次数, 球队数) 剩余比赛带来的积分
+            seed: 抽签用的随机种子
+        """
+        self.teams = tuple(teams)
+        self.index = {team: k for k, team in enumerate(self.teams)}
+        self.fixtures = list(fixtures)
+        self.pending = {fixture.fixture_id: k for k, fixture in enumerate(self.fixtures)}
+        self.outcomes = outcomes
+        self.simulations = outcomes.shape[0]
+
+        current = [standings.get(team, Standing()) for team in self.teams]
+        self.points = np.array([standing.points for standing in current], dtype=np.int16)
+        self.goal_difference = np.array([standing.goal_difference for standing in current], dtype=np.int64)
+        self.played = np.array([standing.played for standing in current], dtype=np.int64)
+        self.final_points = fixture_points + self.points
+
+        # 积分和净胜球都相同时的随机抽签，整个模拟期间固定
+        self._lots = np.random.default_rng(seed).random((self.simulations, len(self.teams)))
+        self._position_counts: Optional[np.ndarray] = None
+        self.results_applied = 0
+
+    @classmethod
+    def run(
+        cls,
+        standings: Mapping[str, Standing],
+        fixtures: Sequence[Fixture],
+        simulations: int = DEFAULT_SIMULATIONS,
+        seed: Optional[int] = None,
+        workers: int = 1
+    ) -> "SeasonSimulation":
+        """
+        模拟剩余赛程
+
+        Args:
+            standings: 球队 -> 当前积分
+            fixtures: 未赛比赛及胜平负概率
+            simulations: 模拟次数
+            seed: 随机种子，相同种子的结果与 workers 无关
+            workers: 进程数，模拟次数不少于 MIN_PARALLEL_SIMULATIONS 时才使用进程池
+        """
+        teams = list(standings)
+        teams += sorted({team for fixture in fixtures for team in (fixture.home, fixture.away)} - set(standings))
+        index = {team: k for k, team in enumerate(teams)}
+        probabilities = np.array(
+            [[fixture.home_win, fixture.draw, fixture.away_win] for fixture in fixtures], dtype=float
+        ).reshape(-1, 3)
+        home_index = np.array([index[fixture.home] for fixture in fixtures], dtype=np.int64)
+        away_index = np.array([index[fixture.away] for fixture in fixtures], dtype=np.int64)
+
+        root = np.random.SeedSequence(seed)
+        lots_seed, chunk_root = root.spawn(2)
+        sizes = [min(CHUNK_SIZE, simulations - start) for start in range(0, simulations, CHUNK_SIZE)]
+        tasks = [
+            (probabilities, home_index, away_index, len(teams), size, chunk_seed)
+            for size, chunk_seed in zip(sizes, chunk_root.spawn(len(sizes)))
+        ]
+        if workers > 1 and len(tasks) > 1 and simulations >= MIN_PARALLEL_SIMULATIONS:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                chunks = list(executor.map(_simulate_chunk, tasks))
+        else:
+            chunks = [_simulate_chunk(task) for task in tasks]
+
+        outcomes = np.concatenate([chunk[0] for chunk in chunks])
+        fixture_points = np.concatenate([chunk[1] for chunk in chunks])
+        return cls(teams, standings, fixtures, outcomes, fixture_points, seed=lots_seed.generate_state(1)[0])
+
+    def apply_result(self, fixture_id: str, home_goals: int, away_goals: int) -> bool:
+        """
+        比赛结束后用实际比分替换该场的模拟赛果
+
+        Returns:
+            该场是否在模拟的剩余赛程中
+        """
+        k = self.pending.pop(fixture_id, None)
+        if k is None:
+            return False
+        fixture = self.fixtures[k]
+        home, away = self.index[fixture.home], self.index[fixture.away]
+        actual = outcome(home_goals, away_goals)
+        simulated = self.outcomes[:, k]
+        self.final_points[:, home] += HOME_POINTS[actual] - HOME_POINTS[simulated]
+        self.final_points[:, away] += AWAY_POINTS[actual] - AWAY_POINTS[simulated]
+        simulated[:] = actual
+
+        self.points[home] += HOME_POINTS[actual]
+        self.points[away] += AWAY_POINTS[actual]
+        self.goal_difference[home] += home_goals - away_goals
+        self.goal_difference[away] += away_goals - home_goals
+        self.played[[home, away]] += 1
+        self._position_counts = None
+        self.results_applied += 1
+        return True
+
+    def position_counts(self) -> np.ndarray:
+        """(球队数, 名次数) 每支球队获得各名次的次数"""
+        if self._position_counts is None:
+            # 积分优先，其次净胜球，最后抽签（净胜球和抽签都小于 1 分的间隔）
+            lowest = self.goal_difference.min(initial=0)
+            spread = self.goal_difference.max(initial=0) - lowest + 1
+            tiebreak = (self.goal_difference - lowest) / spread
+            keys = self.final_points + (tiebreak + self._lots / spread) * 0.5
+            order = np.argsort(-keys, axis=1)
+            teams = len(self.teams)
+            self._position_counts = np.stack(
+                [np.bincount(order[:, position], minlength=teams) for position in range(teams)], axis=1
+            )
+        return self._position_counts
+
+    def projections(self, top_n: int = 4, relegation: int = 3) -> List[Dict[str, Any]]:
+        """
+        每支球队的预测，按期望积分排序
+
+        Args:
+            top_n: 统计进入前 N 名（如欧战资格）的概率
+            relegation: 降级名额
+        """
+        probabilities = self.position_counts() / self.simulations
+        teams = len(self.teams)
+        expected = self.final_points.mean(axis=0)
+        remaining = np.zeros(teams, dtype=np.int64)
+        for k in self.pending.values():
+            fixture = self.fixtures[k]
+            remaining[[self.index[fixture.home], self.index[fixture.away]]] += 1
+
+        rows = [
+            {
+                "team": team,
+                "points": int(self.points[k]),
+                "goal_difference": int(self.goal_difference[k]),
+                "played": int(self.played[k]),
+                "remaining": int(remaining[k]),
+                "expected_points": round(float(expected[k]), 2),
+                "title": round(float(probabilities[k, 0]), 4),
+                "top_n": round(float(probabilities[k, :top_n].sum()), 4),
+                "relegation": round(float(probabilities[k, teams - relegation:].sum()), 4) if relegation else 0.0,
+                "positions": [round(float(p), 4) for p in probabilities[k]],
+            }
+            for k, team in enumerate(self.teams)
+        ]
+        return sorted(rows, key=lambda row: (-row["expected_points"], -row["title"]))
+
+    def stats(self) -> Dict[str, Any]:
+        """模拟规模"""
+        return {
+            "teams": len(self.teams),
+            "simulations": self.simulations,
+            "remaining_fixtures": len(self.pending),
+            "results_applied": self.results_applied,
+        }
+
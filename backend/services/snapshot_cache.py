@@ -0,0 +1,84 @@
+"""
+Snapshot Cache
+stale-while-revalidate 快照
+
+- 保存最近一次成功获取的结果
+- 快照过期后仍立即返回旧快照，同时在后台刷新
+- 上游不可用时继续返回旧快照并标记为 stale，而不是让请求等待超时
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """
+    单个结果的 stale-while-revalidate 缓存
+
+    fetch 返回 None 表示获取失败，失败时保留旧快照。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        max_age: float = 60.0,
+        time_func: Callable[[], float] = time.time
+    ):
+        self._fetch = fetch
+        self.max_age = max_age
+        self._time = time_func
+        self._value: Optional[Any] = None
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.last_error: Optional[str] = None
+
+    async def refresh(self) -> bool:
+        """立即刷新快照，返回是否成功"""
+        try:
+            value = await self._fetch()
+        except Exception as e:
+            logger.error(f"Snapshot refresh failed: {e}")
+            self.last_error = str(e)
+            return False
+        if value is None:
+            self.last_error = "upstream unavailable"
+            return False
+        self._value = value
+        self._fetched_at = self._time()
+        self.last_error = None
+        return True
+
+    def refresh_in_background(self) -> None:
+        """后台刷新（同一时刻最多一个刷新任务）"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def get(self, wait_if_empty: bool = True) -> Tuple[Optional[Any], Dict[str, Any]]:
+        """
+        获取快照
+
+        有快照时立即返回，过期则触发后台刷新；没有快照时（wait_if_empty）等待首次获取。
+
+        Returns:
+            (快照, 元信息 {stale, age_seconds, refreshing})
+        """
+        if self._value is None and wait_if_empty:
+            if self._refresh_task is not None and not self._refresh_task.done():
+                await asyncio.shield(self._refresh_task)
+            else:
+                await self.refresh()
+
+        age = self._time() - self._fetched_at if self._fetched_at is not None else None
+        stale = self._value is None or age > self.max_age or self.last_error is not None
+        if self._value is None or age > self.max_age:
+            self.refresh_in_background()
+
+        return self._value, {
+            "stale": stale,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done()
+        }
@@ -0,0 +1,142 @@
+"""
+Standings Index
+积分榜按球队ID建立索引
+
+/standings 的响应是「联赛 -> 分组 -> 球队」的嵌套列表，逐个球队查找需要遍历所有分组。
+这里把一个联赛赛季的积分榜解析一次，之后按球队ID直接查找，直到积分榜缓存过期。
+索引随来源响应一起过期：响应来自缓存时，索引不会比缓存中的响应活得更久。
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from services.response_cache import DEFAULT_TTL_POLICIES
+except ImportError:
+    from response_cache import DEFAULT_TTL_POLICIES
+
+# 与 /standings 响应缓存的 TTL 保持一致
+STANDINGS_INDEX_TTL = DEFAULT_TTL_POLICIES["/standings"]
+
+
+@dataclass(frozen=True)
+class StandingEntry:
+    """积分榜中一支球队的数据"""
+    team_id: int
+    team_name: str
+    rank: int
+    form: str
+    group: str
+    home: Dict[str, int]  # {"wins": 5, "draws": 2, "losses": 1}
+    away: Dict[str, int]
+    goals_for: int
+    goals_against: int
+
+
+def _record(split: Dict) -> Dict[str, int]:
+    return {
+        'wins': split.get('win', 0),
+        'draws': split.get('draw', 0),
+        'losses': split.get('lose', 0)
+    }
+
+
+class StandingsIndex:
+    """单个联赛赛季的积分榜索引"""
+
+    def __init__(self, standings: List):
+        self._entries: Dict[int, StandingEntry] = {}
+        if standings and standings[0].get('league'):
+            for group in standings[0]['league'].get('standings', []):
+                for row in group:
+                    team_id = row['team']['id']
+                    if team_id in self._entries:
+                        continue
+                    goals = row.get('all', {}).get('goals', {})
+                    self._entries[team_id] = StandingEntry(
+                        team_id=team_id,
+                        team_name=row['team']['name'],
+                        rank=row['rank'],
+                        form=row.get('form') or '',
+                        group=row.get('group') or '',
+                        home=_record(row.get('home', {})),
+                        away=_record(row.get('away', {})),
+                        goals_for=goals.get('for', 0),
+                        goals_against=goals.get('against', 0)
+                    )
+
+    def get(self, team_id: int) -> Optional[StandingEntry]:
+        """按球队ID查找，不在积分榜中返回 None"""
+        return self._entries.get(team_id)
+
+    def entries(self) -> List[StandingEntry]:
+        """全部球队，按排名顺序"""
+        return sorted(self._entries.values(), key=lambda entry: (entry.group, entry.rank))
+
+    def __contains__(self, team_id: int) -> bool:
+        return team_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class StandingsIndexCache:
+    """按 (联赛, 赛季) 缓存积分榜索引，过期时间与积分榜响应缓存一致
+
+    put 时传入响应的过期时间，索引在「响应过期」和「解析后 ttl」中较早的时间过期，
+    避免两层 TTL 叠加（例如缓存了 5 小时的响应再建索引，最长会旧到约 12 小时）。
+    """
+
+    def __init__(self, ttl: float = STANDINGS_INDEX_TTL, time_func: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._indexes: Dict[Tuple[int, int], Tuple[StandingsIndex, float]] = {}
+
+    def get(self, league_id: int, season: int) -> Optional[StandingsIndex]:
+        """获取未过期的索引"""
+        key = (int(league_id), int(season))
+        with self._lock:
+            item = self._indexes.get(key)
+            if item is None:
+                return None
+            index, expires_at = item
+            if expires_at <= self._time():
+                del self._indexes[key]
+                return None
+            return index
+
+    def put(
+        self,
+        league_id: int,
+        season: int,
+        standings: List,
+        expires_at: Optional[float] = None
+    ) -> StandingsIndex:
+        """解析积分榜并缓存索引（expires_at 为来源响应的过期时间）"""
+        index = StandingsIndex(standings)
+        deadline = self._time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._indexes[(int(league_id), int(season))] = (index, deadline)
+        return index
+
+    def invalidate(self, league_id: int, season: int) -> None:
+        """使索引失效（例如比赛结束后积分榜变化）"""
+        with self._lock:
+            self._indexes.pop((int(league_id), int(season)), None)
+
+
+# 进程级共享索引缓存
+_standings_index_cache: Optional[StandingsIndexCache] = None
+
+
+def get_standings_index_cache() -> StandingsIndexCache:
+    """获取共享的积分榜索引缓存"""
+    global _standings_index_cache
+    if _standings_index_cache is None:
+        _standings_index_cache = StandingsIndexCache()
+    return _standings_index_cache
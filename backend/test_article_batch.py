@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""测试比赛日批量生成文章"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.domain.models import Expert, Prediction
+from app.services.ingestion_service import IngestionService
+from app.services.article_batch_service import MAX_WORKERS, ArticleBatchJob, prediction_id, to_ndjson
+
+DAY = datetime(2025, 3, 1)
+
+
+def make_fixture(fixture_id, home, away, league_id):
+    return {
+        "fixture_id": fixture_id,
+        "date": f"{DAY.date().isoformat()}T10:00:00",
+        "venue": None,
+        "referee": None,
+        "home_team": {"id": home[0], "name": home[1], "logo": None},
+        "away_team": {"id": away[0], "name": away[1], "logo": None},
+        "league": {"id": league_id, "name": "K League 1", "country": "South-Korea", "season": 2025, "round": None},
+        "status": "NS",
+        "goals": {"home": None, "away": None},
+    }
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    fixtures = [
+        make_fixture(1, (2750, "FC Seoul"), (2749, "Ulsan Hyundai FC"), 292),
+        make_fixture(2, (2751, "Jeonbuk"), (2748, "Pohang"), 292),
+        make_fixture(3, (302, "Kawasaki Frontale"), (303, "Yokohama F. Marinos"), 98),
+    ]
+    db = session_factory()
+    service = IngestionService(db)
+    service.upsert_matches(fixtures, service.upsert_teams(fixtures))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+def test_batch_generates_every_fixture_expert_pair():
+    """每场比赛 × 每位专家一篇文章，按批写库，重复执行只更新不重复插入"""
+    session_factory = make_session_factory()
+    job = ArticleBatchJob(session_factory=session_factory, workers=2, chunk_size=7, min_parallel_tasks=0)
+    job.workers = 2  # 单核机器上 workers 会被限制为 1，这里仍然走进程池（spawn）
+
+    events = list(job.run(DAY, DAY + timedelta(days=1)))
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert (summary["fixtures"], summary["experts"], summary["articles"]) == (3, 10, 30)
+    assert (summary["inserted"], summary["updated"]) == (30, 0)
+
+    db = session_factory()
+    assert db.query(Prediction).count() == 30
+    assert db.query(Expert).count() == 10
+    first = db.get(Prediction, prediction_id(1, "medic"))
+    assert "FC Seoul vs Ulsan Hyundai FC" in first.reasoning
+    content = first.reasoning
+    db.close()
+
+    rerun = list(job.run(DAY, DAY + timedelta(days=1), league_ids=[98]))
+    assert (rerun[-1]["articles"], rerun[-1]["inserted"], rerun[-1]["updated"]) == (10, 0, 10)
+
+    db = session_factory()
+    assert db.query(Prediction).count() == 30
+    assert db.get(Prediction, prediction_id(1, "medic")).reasoning == content
+    db.close()
+    print("✓ 批量生成")
+
+
+def test_ndjson_output():
+    """每行一个 JSON 对象"""
+    session_factory = make_session_factory()
+    job = ArticleBatchJob(session_factory=session_factory, workers=1)
+    lines = list(to_ndjson(job.run(DAY, DAY + timedelta(days=1), expert_keys=["medic", "tactician"])))
+    events = [json.loads(line) for line in lines]
+    assert all(line.endswith("\n") for line in lines)
+    assert [e["event"] for e in events] == ["prediction"] * 6 + ["summary"]
+    assert {e["expert"] for e in events[:-1]} == {"medic", "tactician"}
+    print("✓ NDJSON 输出")
+
+
+def test_worker_count_is_bounded():
+    """进程数不超过 CPU 数"""
+    assert ArticleBatchJob(workers=10_000).workers == MAX_WORKERS
+    assert ArticleBatchJob(workers=0).workers == 1
+    assert ArticleBatchJob().workers == MAX_WORKERS
+    print("✓ 进程数上限")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("批量生成文章测试")
+    print("=" * 50)
+    test_batch_generates_every_fixture_expert_pair()
+    test_ndjson_output()
+    test_worker_count_is_bounded()
+    print("\n✅ 全部通过")
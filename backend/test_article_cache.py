@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""测试文章结果缓存：输入指纹、快照变化失效、LRU 淘汰、磁盘持久化"""
+
+import os
+import sys
+import tempfile
+import dataclasses
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.article_cache import ArticleCache, MISS, fingerprint
+from services.response_cache import SQLiteLRUStore
+from agents.enhanced_football_writer import (
+    EnhancedFootballWriter, TeamInfo, MatchInfo, OddsInfo, HistoricalData, SECTION_INPUTS
+)
+from app.core.claude_config import ClaudeClient, DEFAULT_MODEL
+
+
+def make_inputs():
+    home = TeamInfo("FC Seoul", ["W", "W", "D"], 2, "主场3胜", {"奇成庸": "健康"}, "状态上升")
+    away = TeamInfo("Ulsan Hyundai FC", ["L", "D", "W"], 1, "客场2胜", {"朱民奎": "伤疑"}, "状态平稳")
+    match_info = MatchInfo(home, away, "K League 1", "2025-03-01 14:00", "首尔世界杯体育场")
+    odds_info = OddsInfo(2.10, 3.20, 3.40, "主队-0.25", "2.5球")
+    historical = HistoricalData([{"winner": "home", "score": "2-1"}], "主场占优", "客场一般")
+    return match_info, odds_info, historical
+
+
+class CountingWriter(EnhancedFootballWriter):
+    """统计实际生成文章的次数"""
+
+    def __init__(self, cache):
+        super().__init__(cache=cache)
+        self.builds = 0
+
+    def _build_prediction(self, *args, **kwargs):
+        self.builds += 1
+        return super()._build_prediction(*args, **kwargs)
+
+
+def test_fingerprint():
+    """指纹与字典键顺序无关，任一输入变化都会改变指纹"""
+    match_info, odds_info, historical = make_inputs()
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    base = fingerprint(match_info, odds_info, historical)
+    assert base == fingerprint(*make_inputs())
+    assert base != fingerprint(match_info, dataclasses.replace(odds_info, home_win=2.05), historical)
+    print("✓ 输入指纹")
+
+
+def test_writer_reuses_article_until_snapshot_changes():
+    """输入不变时复用文章；赔率或伤停变化时重新生成并替换旧文章"""
+    cache = ArticleCache()
+    writer = CountingWriter(cache)
+    match_info, odds_info, historical = make_inputs()
+
+    first = writer.generate_prediction(match_info, odds_info, historical, fixture_id=1001)
+    first["title"] = "modified by caller"
+    # 正文在第一次读取时生成并写入缓存，调用方改过的头部不影响正文和缓存
+    assert writer.builds == 0
+    assert "modified by caller" not in first["full_article"]
+    second = writer.generate_prediction(match_info, odds_info, historical, fixture_id=1001)
+    assert writer.builds == 1
+    assert second["title"] != "modified by caller"
+    assert second == EnhancedFootballWriter(cache=ArticleCache())._build_prediction(
+        match_info, odds_info, historical, 80, None
+    )
+
+    moved = dataclasses.replace(odds_info, home_win=1.95)
+    writer.generate_prediction(match_info, moved, historical, fixture_id=1001).render()
+    match_info.home_team.key_players_status["奇成庸"] = "伤缺"
+    writer.generate_prediction(match_info, moved, historical, fixture_id=1001).render()
+    assert writer.builds == 3
+    # 每场比赛一篇文章 + 每个章节一条
+    assert len(cache) == 1 + len(SECTION_INPUTS)
+    # 文章 2 次；章节：赔率变化 2 个（赔率解读、综合预测），伤停变化 1 个
+    assert cache.stats()["stale"] == 5
+
+    assert cache.invalidate_fixture(1001) == 1 + len(SECTION_INPUTS)
+    writer.generate_prediction(match_info, moved, historical, fixture_id=1001).render()
+    assert writer.builds == 4
+    print("✓ 快照变化失效")
+
+
+def test_writer_keeps_one_article_per_expert():
+    """同一场比赛每位专家各占一个槽位，一位专家的新快照不会替换另一位专家的文章"""
+    cache = ArticleCache()
+    writer = CountingWriter(cache)
+    match_info, odds_info, historical = make_inputs()
+
+    for expert in ("medic", "tactician", "medic", "tactician"):
+        writer.generate_prediction(match_info, odds_info, historical, fixture_id=1002, expert=expert)["full_article"]
+    assert writer.builds == 2
+
+    moved = dataclasses.replace(odds_info, home_win=1.95)
+    writer.generate_prediction(match_info, moved, historical, fixture_id=1002, expert="medic")["full_article"]
+    writer.generate_prediction(match_info, odds_info, historical, fixture_id=1002, expert="tactician")["full_article"]
+    assert writer.builds == 3
+    # 每位专家一篇文章 + 共用的章节
+    assert len(cache) == 2 + len(SECTION_INPUTS)
+    print("✓ 按专家缓存文章")
+
+
+def test_update_rerenders_only_changed_sections():
+    """赔率变化只重写赔率解读和综合预测，伤停变化只重写伤停情况；结果与完整生成一致"""
+    writer = EnhancedFootballWriter(cache=ArticleCache())
+    match_info, odds_info, historical = make_inputs()
+
+    _, rendered = writer.update_prediction(match_info, odds_info, historical, fixture_id=1001)
+    assert rendered == list(SECTION_INPUTS)
+
+    moved = dataclasses.replace(odds_info, home_win=1.95)
+    prediction, rendered = writer.update_prediction(match_info, moved, historical, fixture_id=1001)
+    assert rendered == ["赔率解读", "综合预测"]
+    assert prediction == EnhancedFootballWriter(cache=ArticleCache())._build_prediction(
+        match_info, moved, historical, 80, None
+    )
+
+    match_info.home_team.key_players_status["奇成庸"] = "伤缺"
+    prediction, rendered = writer.update_prediction(match_info, moved, historical, fixture_id=1001)
+    assert rendered == ["伤停情况"]
+    assert "伤缺" in prediction["full_article"]
+    # 更新后的文章写回文章缓存
+    assert writer.generate_prediction(match_info, moved, historical, fixture_id=1001) == prediction
+    assert writer.sections_rendered == len(SECTION_INPUTS) + 3
+    print("✓ 只重写变化的章节")
+
+
+def test_lru_eviction():
+    """按条数和字节数上限淘汰最久未访问的文章"""
+    cache = ArticleCache(max_entries=2)
+    cache.set("w", "e", "fp1", {"text": "a"}, fixture_id=1)
+    cache.set("w", "e", "fp2", {"text": "b"}, fixture_id=2)
+    assert cache.get("w", "e", "fp1", fixture_id=1) == {"text": "a"}
+    cache.set("w", "e", "fp3", {"text": "c"}, fixture_id=3)
+    assert cache.get("w", "e", "fp2", fixture_id=2) is MISS
+    assert cache.get("w", "e", "fp1", fixture_id=1) == {"text": "a"}
+
+    small = ArticleCache(max_bytes=100)
+    small.set("w", "e", "fp1", {"text": "x" * 60}, fixture_id=1)
+    small.set("w", "e", "fp2", {"text": "y" * 60}, fixture_id=2)
+    assert len(small) == 1 and small.total_bytes <= 100
+    assert small.evictions == 1
+    print("✓ LRU 淘汰")
+
+
+def test_disk_persistence():
+    """配置磁盘存储后，新进程（新缓存实例）可以读到文章"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "articles.sqlite3")
+        ArticleCache(store=SQLiteLRUStore(path)).set("w", "medic", "fp1", {"text": "文章"}, fixture_id=7)
+
+        reopened = ArticleCache(store=SQLiteLRUStore(path))
+        assert reopened.get("w", "medic", "fp1", fixture_id=7) == {"text": "文章"}
+        assert len(reopened) == 1
+        assert reopened.get("w", "medic", "fp2", fixture_id=7) is MISS
+        assert len(reopened.store) == 0
+
+        reopened.set("w", "medic", "fp3", {"text": "新文章"}, fixture_id=7)
+        reopened.set("w", "tactician", "fp3", {"text": "战术"}, fixture_id=7)
+        reopened.set("w", "medic", "fp3", {"text": "其他比赛"}, fixture_id=70)
+        reopened.invalidate_fixture(7)
+        assert len(reopened.store) == 1
+    print("✓ 磁盘持久化")
+
+
+def test_claude_results_are_cached():
+    """Claude 生成结果只在成功时缓存；换模型（如高峰期改用 Haiku）后继续复用"""
+    client = ClaudeClient(api_key="test-key", cache=ArticleCache())
+    calls = []
+
+    def fake_create_message(prompt, max_tokens=4096, temperature=0.7, system=None, model=None):
+        calls.append(prompt)
+        if len(calls) == 1:
+            return {"success": False, "error": "overloaded", "model": client.model}
+        return {"success": True, "content": "预测文章", "model": client.model, "usage": {}}
+
+    client.create_message = fake_create_message
+    match_data = {"fixture_id": 1001, "home_team": {"name": "FC Seoul"}, "away_team": {"name": "Ulsan"}}
+
+    assert client.generate_prediction(match_data)["success"] is False
+    assert client.generate_prediction(match_data)["prediction"] == "预测文章"
+    cached = client.generate_prediction(match_data)
+    assert cached["prediction"] == "预测文章" and cached["cached"] is True
+    assert len(calls) == 2
+
+    client.set_model("claude-3-haiku")
+    cached = client.generate_prediction(match_data)
+    assert cached["cached"] is True and cached["model"] == DEFAULT_MODEL
+    assert len(calls) == 2
+    print("✓ Claude 结果缓存")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("文章缓存测试")
+    print("=" * 50)
+    test_fingerprint()
+    test_writer_reuses_article_until_snapshot_changes()
+    test_writer_keeps_one_article_per_expert()
+    test_update_rerenders_only_changed_sections()
+    test_lru_eviction()
+    test_disk_persistence()
+    test_claude_results_are_cached()
+    print("\n✅ 全部通过")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""测试文章按 (比赛, 专家, 数据版本) 固定种子生成"""
+
+import os
+import sys
+import random
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.article_templates import article_seed, seeded_rng
+from agents.prediction_experts import PredictionExpertProfiles
+
+
+MATCH_INFO = {"fixture_id": 1208001, "home_team": "FC Seoul", "away_team": "Ulsan Hyundai FC", "league": "K League 1"}
+
+
+def test_seed_is_stable():
+    """种子只由输入决定"""
+    assert article_seed(1208001, "medic") == article_seed("1208001", "medic")
+    assert article_seed(1208001, "medic") != article_seed(1208001, "medic", "v2")
+    assert article_seed(1208001, "medic") != article_seed(1208002, "medic")
+    assert seeded_rng(1, "x").random() == seeded_rng(1, "x").random()
+    print("✓ 稳定种子")
+
+
+def test_detailed_prediction_is_deterministic():
+    """同一比赛和专家总是生成同一篇文章，不受全局 random 状态影响"""
+    profiles = PredictionExpertProfiles()
+    random.seed(1)
+    first = profiles.generate_detailed_prediction("medic", "FC Seoul", "Ulsan Hyundai FC", 1208001)
+    random.seed(2)
+    second = profiles.generate_detailed_prediction("medic", "FC Seoul", "Ulsan Hyundai FC", 1208001)
+    assert first == second
+    assert first != profiles.generate_detailed_prediction("medic", "FC Seoul", "Ulsan Hyundai FC", 1208002)
+    assert first != profiles.generate_detailed_prediction(
+        "medic", "FC Seoul", "Ulsan Hyundai FC", 1208001, data_version="odds-2"
+    )
+    print("✓ 详细预测可复现")
+
+
+def test_comprehensive_analysis_is_deterministic():
+    """综合分析的正文、分节和 confidence_level 都可复现，落款日期取比赛日期"""
+    profiles = PredictionExpertProfiles()
+    expert = profiles.experts["handicap_master"]
+    first = profiles.generate_comprehensive_analysis(expert, MATCH_INFO)
+    second = profiles.generate_comprehensive_analysis(expert, MATCH_INFO)
+    assert first["sections"] == second["sections"]
+    assert first["content"] == second["content"]
+    assert first["confidence_level"] == second["confidence_level"]
+    assert first["recommendations"] == second["recommendations"]
+
+    other = profiles.generate_comprehensive_analysis(expert, MATCH_INFO, data_version="lineups")
+    assert other["sections"] != first["sections"]
+
+    dated = profiles.generate_comprehensive_analysis(expert, dict(MATCH_INFO, date="2025-03-01T10:00:00+00:00"))
+    assert dated["content"].endswith("2025年03月01日")
+
+    article = profiles.generate_expert_article("medic", MATCH_INFO, {}, {})
+    assert article == profiles.generate_expert_article("medic", MATCH_INFO, {}, {})
+    print("✓ 综合分析可复现")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("文章固定种子测试")
+    print("=" * 50)
+    test_seed_is_stable()
+    test_detailed_prediction_is_deterministic()
+    test_comprehensive_analysis_is_deterministic()
+    print("\n✅ 全部通过")
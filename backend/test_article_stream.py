@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""测试流式生成文章（SSE）"""
+
+import os
+import sys
+import json
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.core.claude_config import ClaudeClient
+from app.domain.models import Prediction
+from app.services.article_stream_service import demo_match_inputs, stream_article
+from agents.enhanced_football_writer import EnhancedFootballWriter
+from services.article_cache import ArticleCache
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def parse_sse(lines):
+    """把 SSE 文本解析为 (事件名, 数据) 列表"""
+    events = []
+    for block in "".join(lines).split("\n\n"):
+        if block:
+            event, data = block.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+class FakeClaude:
+    """按给定事件序列模拟 ClaudeClient.stream_prediction"""
+
+    def __init__(self, events):
+        self.events = events
+        self.match_data = None
+
+    def stream_prediction(self, match_data, expert_style=None):
+        self.match_data = match_data
+        yield from self.events
+
+
+def test_writer_streams_sections():
+    """模板写作器逐章节产出，拼接后与完整文章相同"""
+    match_info, odds_info, historical = demo_match_inputs()
+    writer = EnhancedFootballWriter(cache=ArticleCache())
+    parts = list(writer.stream_prediction(match_info, odds_info, historical, fixture_id=1))
+    full = EnhancedFootballWriter(cache=ArticleCache()).generate_prediction(match_info, odds_info, historical)
+    assert [name for name, _ in parts] == ["标题"] + list(full["sections"]) + ["最终预测"]
+    assert "".join(text for _, text in parts) == full["full_article"]
+    # 缓存命中时按章节回放
+    assert list(writer.stream_prediction(match_info, odds_info, historical, fixture_id=1)) == parts
+    print("✓ 按章节流式输出")
+
+
+def test_claude_tokens_are_forwarded_and_saved():
+    """逐 token 转发，结束后保存到 Prediction.reasoning"""
+    session_factory = make_session_factory()
+    claude = FakeClaude([
+        {"type": "text", "text": "主队"},
+        {"type": "text", "text": "占优"},
+        {"type": "done", "content": "主队占优", "model": "m", "usage": {}},
+    ])
+    events = parse_sse(stream_article(1001, "medic", session_factory, claude=claude))
+    assert [name for name, _ in events] == ["meta", "delta", "delta", "done"]
+    assert events[0][1]["expert"]["key"] == "medic"
+    done = events[-1][1]
+    assert done["source"] == "claude" and done["length"] == 4
+    # 赔率和历史交锋与完整预测一起交给 Claude
+    _, odds_info, historical = demo_match_inputs()
+    assert claude.match_data["odds"]["home_win"] == odds_info.home_win
+    assert claude.match_data["history"]["h2h_results"] == historical.h2h_results
+
+    db = session_factory()
+    assert db.get(Prediction, done["prediction_id"]).reasoning == "主队占优"
+    db.close()
+    print("✓ Claude 逐 token 转发")
+
+
+def test_fallbacks():
+    """Claude 首个 token 前失败时改用模板；中途失败不保存"""
+    session_factory = make_session_factory()
+    failed = FakeClaude([{"type": "error", "error": "overloaded"}])
+    writer = EnhancedFootballWriter(cache=ArticleCache())
+    events = parse_sse(stream_article(1001, "medic", session_factory, claude=failed, writer=writer))
+    deltas = [data for name, data in events if name == "delta"]
+    assert events[-1][1]["source"] == "writer"
+    assert deltas[1]["section"] == "比赛背景"
+
+    events = parse_sse(stream_article(1001, "medic", session_factory))
+    assert events[-1][1]["source"] == "template"
+    db = session_factory()
+    saved = db.get(Prediction, events[-1][1]["prediction_id"]).reasoning
+    assert saved == "".join(data["text"] for name, data in events if name == "delta")
+    db.close()
+
+    broken = FakeClaude([{"type": "text", "text": "主队"}, {"type": "error", "error": "reset"}])
+    events = parse_sse(stream_article(1001, "medic", session_factory, claude=broken, writer=writer))
+    assert events[-1][0] == "error"
+    db = session_factory()
+    assert db.query(Prediction).count() == 2
+    db.close()
+    print("✓ 回退与失败处理")
+
+
+def test_client_streams_with_sdk():
+    """ClaudeClient 使用 SDK 流式接口，完成后写入缓存"""
+
+    class FakeStream:
+        text_stream = iter(["比分", "2-1"])
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def get_final_message(self):
+            return SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="比分2-1")],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=4)
+            )
+
+    requests = []
+    client = ClaudeClient(api_key="test-key", cache=ArticleCache())
+    client.client = SimpleNamespace(messages=SimpleNamespace(
+        stream=lambda **kwargs: requests.append(kwargs) or FakeStream()
+    ))
+
+    match_data = {"fixture_id": 1001, "home_team": {"name": "FC Seoul"}, "away_team": {"name": "Ulsan"}}
+    events = list(client.stream_prediction(match_data))
+    assert [e["type"] for e in events] == ["text", "text", "done"]
+    assert events[-1]["result"]["prediction"] == "比分2-1"
+    assert events[-1]["usage"]["input_tokens"] == 10 and events[-1]["usage"]["output_tokens"] == 4
+
+    replay = list(client.stream_prediction(match_data))
+    assert [e["type"] for e in replay] == ["text", "done"] and replay[-1]["result"]["cached"] is True
+    assert client.generate_prediction(match_data)["prediction"] == "比分2-1"
+    assert len(requests) == 1
+    print("✓ SDK 流式接口")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("流式生成测试")
+    print("=" * 50)
+    test_writer_streams_sections()
+    test_claude_tokens_are_forwarded_and_saved()
+    test_fallbacks()
+    test_client_streams_with_sdk()
+    print("\n✅ 全部通过")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""测试编译模板：与 random 直接调用的抽取结果一致"""
+
+import os
+import sys
+import random
+from types import SimpleNamespace
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.article_templates import compile_template, TemplateSyntaxError
+from agents.prediction_experts import PredictionExpertProfiles, WritingStyle
+
+
+def test_slots_match_random_calls():
+    """同一种子下，各类槽位与 random 调用逐字相同，且抽取后随机状态一致"""
+    template = compile_template(
+        "{team}:{randint:1,6}/{choice:4-3-3|4-2-3-1|3-5-2}/{uniform:0.85,0.95:2}/"
+        "{pick:expert.phrases}/{expert.phrases[1]}/{randint:0,5000}"
+    )
+    context = {"team": "FC Seoul", "expert": SimpleNamespace(phrases=("甲", "乙", "丙"))}
+    for seed in range(200):
+        rng = random.Random(seed)
+        expected = (
+            f"FC Seoul:{rng.randint(1, 6)}/{rng.choice(['4-3-3', '4-2-3-1', '3-5-2'])}/"
+            f"{round(rng.uniform(0.85, 0.95), 2)}/{rng.choice(('甲', '乙', '丙'))}/乙/{rng.randint(0, 5000)}"
+        )
+        after_expected = rng.random()
+
+        rng = random.Random(seed)
+        assert template.render(context, rng) == expected
+        assert rng.random() == after_expected
+    assert template.slot_count == 7
+    print("✓ 槽位抽取一致")
+
+
+def test_draw_and_fill():
+    """取值向量与静态片段分开"""
+    template = compile_template("【{title}】{randint:1,3}球")
+    values = template.draw({"title": "比分"}, random.Random(1))
+    assert values[0] == "比分" and values[1] in ("1", "2", "3")
+    assert template.fill(["X", "9"]) == "【X】9球"
+    try:
+        compile_template("{not a slot}")
+    except TemplateSyntaxError:
+        pass
+    else:
+        raise AssertionError("invalid slot should fail to compile")
+    print("✓ 取值向量")
+
+
+def test_expert_articles_are_seed_stable():
+    """同一种子生成的专家文章相同"""
+    profiles = PredictionExpertProfiles()
+    first = profiles.generate_detailed_prediction("medic", "FC Seoul", "Ulsan Hyundai FC", rng=random.Random(42))
+    second = profiles.generate_detailed_prediction("medic", "FC Seoul", "Ulsan Hyundai FC", rng=random.Random(42))
+    assert first == second
+    assert "FC Seoul vs Ulsan Hyundai FC" in first and "{" not in first
+
+    match_info = {"home_team": "FC Seoul", "away_team": "Ulsan Hyundai FC", "league": "K League 1"}
+    for expert in profiles.get_all_experts():
+        opening = profiles._generate_detailed_opening(expert, match_info, rng=random.Random(3))
+        assert opening == profiles._generate_detailed_opening(expert, match_info, rng=random.Random(3))
+        marker = {WritingStyle.NARRATIVE: "精彩对决", WritingStyle.TECHNICAL: "战术分析"}
+        assert marker.get(expert.writing_style, "赛事前瞻") in opening
+    print("✓ 专家文章可复现")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("编译模板测试")
+    print("=" * 50)
+    test_slots_match_random_calls()
+    test_draw_and_fill()
+    test_expert_articles_are_seed_stable()
+    print("\n✅ 全部通过")
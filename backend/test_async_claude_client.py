@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""测试异步 Claude 客户端：并发上限、429/529 重试、调用超时（使用本地模拟服务）"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.claude_config import AsyncClaudeClient
+from services.article_cache import ArticleCache
+from services.fake_anthropic import create_fake_anthropic_app, asgi_http_client, FAKE_BASE_URL
+from services.fake_api_sports import LatencyProfile
+
+
+def make_client(app, **kwargs):
+    return AsyncClaudeClient(
+        api_key="fake",
+        base_url=FAKE_BASE_URL,
+        http_client=asgi_http_client(app),
+        cache=ArticleCache(),
+        rng=random.Random(0),
+        **kwargs
+    )
+
+
+def test_concurrency_is_bounded():
+    """同时在途的请求不超过上限，等待期间事件循环不被阻塞"""
+    app = create_fake_anthropic_app(latency=LatencyProfile("fixed", 0.05))
+    client = make_client(app, max_concurrency=3)
+    ticks = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        started = time.perf_counter()
+        results, _ = await asyncio.gather(
+            asyncio.gather(*(client.create_message(f"比赛{i}", max_tokens=100) for i in range(10))),
+            ticker()
+        )
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(main())
+    assert all(r["success"] for r in results)
+    assert results[3]["content"].startswith("比赛3")
+    assert app.state.peak_in_flight == 3
+    assert elapsed >= 0.18  # 至少 4 批 × 50ms
+    assert len(ticks) == 10 and ticks[-1] - ticks[0] < 0.5
+    assert client.stats()["in_flight"] == 0 and client.stats()["calls"] == 10
+    print("✓ 并发上限")
+
+
+def test_retries_on_overload_and_rate_limit():
+    """429/529 按抖动退避重试，遵守 retry-after；其他错误不重试"""
+    delays = []
+
+    async def record_sleep(delay):
+        delays.append(delay)
+
+    app = create_fake_anthropic_app(fail_first=2, error_status=529)
+    client = make_client(app, sleep=record_sleep)
+    result = asyncio.run(client.create_message("比赛"))
+    assert result["success"] and app.state.request_count == 3
+    assert client.retries == 2
+    assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+
+    delays.clear()
+    app = create_fake_anthropic_app(fail_first=1, error_status=429, retry_after=2)
+    client = make_client(app, sleep=record_sleep)
+    assert asyncio.run(client.create_message("比赛"))["success"]
+    assert delays == [2.0]
+
+    app = create_fake_anthropic_app(fail_first=10, error_status=529)
+    client = make_client(app, sleep=record_sleep, max_retries=2)
+    result = asyncio.run(client.create_message("比赛"))
+    assert not result["success"] and result["status"] == 529
+    assert app.state.request_count == 3
+
+    app = create_fake_anthropic_app(fail_first=1, error_status=500)
+    client = make_client(app, sleep=record_sleep)
+    assert not asyncio.run(client.create_message("比赛"))["success"]
+    assert app.state.request_count == 1
+    print("✓ 429/529 重试")
+
+
+def test_deadline():
+    """超过调用期限时快速失败；退避时间超出期限时不再重试"""
+    app = create_fake_anthropic_app(latency=LatencyProfile("fixed", 1.0))
+    client = make_client(app)
+    started = time.perf_counter()
+    result = asyncio.run(client.create_message("比赛", deadline=0.1))
+    assert result["timeout"] is True and not result["success"]
+    assert time.perf_counter() - started < 0.5
+    assert client.stats()["timeouts"] == 1
+
+    app = create_fake_anthropic_app(fail_first=1, error_status=429, retry_after=30)
+    client = make_client(app)
+    started = time.perf_counter()
+    result = asyncio.run(client.create_message("比赛", deadline=5))
+    assert not result["success"] and result["status"] == 429
+    assert time.perf_counter() - started < 0.5 and app.state.request_count == 1
+    print("✓ 调用期限")
+
+
+def test_generate_prediction_is_cached():
+    """异步生成与同步客户端使用同一缓存键"""
+    app = create_fake_anthropic_app()
+    client = make_client(app)
+    match_data = {"fixture_id": 1001, "home_team": {"name": "FC Seoul"}, "away_team": {"name": "Ulsan"}}
+
+    async def main():
+        first = await client.generate_prediction(match_data, expert_style="数据派")
+        second = await client.generate_prediction(match_data, expert_style="数据派")
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first["success"] and first["prediction"]
+    assert second["cached"] is True and second["prediction"] == first["prediction"]
+    assert app.state.request_count == 1
+    content = app.state.requests[0]["messages"][0]["content"]
+    assert "FC Seoul" in content[0]["text"] and content[-1]["text"].endswith("数据派")
+    print("✓ 生成结果缓存")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("异步 Claude 客户端测试")
+    print("=" * 50)
+    test_concurrency_is_bounded()
+    test_retries_on_overload_and_rate_limit()
+    test_deadline()
+    test_generate_prediction_is_cached()
+    print("\n✅ 全部通过")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""测试熔断器与 stale-while-revalidate 快照"""
+
+import os
+import sys
+import time
+import asyncio
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.circuit_breaker import CircuitBreaker
+from services.snapshot_cache import SnapshotCache
+from services.fake_api_sports import create_fake_api_sports_app, LatencyProfile
+from services.football_api_client import FootballAPIClient
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore, FIXTURE_STORE_TTL
+from services.response_cache import ResponseCache, SQLiteLRUStore
+from services.standings_index import StandingsIndexCache
+from app.api.v1 import real_matches
+
+
+class FakeClock:
+    """可控的时钟"""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_state_transitions():
+    """连续失败后打开，恢复时间后半开探测，探测成功后关闭"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30, time_func=clock)
+
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # 只放行一个探测请求
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["times_opened"] == 2
+    print("✓ 熔断状态切换")
+
+
+def test_today_tomorrow_served_from_snapshot_during_outage():
+    """上游故障时立即返回上次成功的快照并标记 stale"""
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.2))
+    clock = FakeClock()
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(ttl=0),
+                circuit_breaker=CircuitBreaker(failure_threshold=2)
+            )
+            snapshot = SnapshotCache(
+                lambda: client.get_today_tomorrow_matches_async(strict=True), max_age=60, time_func=clock
+            )
+
+            first, meta = await snapshot.get()
+            assert len(first["today"]) == 4 and meta["stale"] is False
+
+            # 上游开始返回 500
+            app.state.config.error_rate = 1.0
+            for _ in range(2):
+                clock.now += 61
+                started = time.perf_counter()
+                matches, meta = await snapshot.get()
+                assert time.perf_counter() - started < 0.05  # 不等待上游
+                assert matches == first and meta["stale"] is True
+                await snapshot._refresh_task
+
+            assert client.circuit_breaker.state == "open"
+
+            # 熔断打开后刷新直接短路，不再请求上游
+            requests_before = sum(app.state.request_counts.values())
+            clock.now += 61
+            matches, meta = await snapshot.get()
+            await snapshot._refresh_task
+            assert matches == first and meta["stale"] is True
+            assert sum(app.state.request_counts.values()) == requests_before
+
+    asyncio.run(main())
+    print("✓ 故障期间返回旧快照")
+
+
+def test_snapshot_is_not_served_for_another_date():
+    """快照按日期区分：过了午夜上游仍故障时不返回前一天的比赛列表"""
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.01))
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(ttl=0),
+                circuit_breaker=CircuitBreaker(failure_threshold=100)
+            )
+            snapshot = real_matches.get_matches_snapshot(client, "2025-03-01")
+            first, _ = await snapshot.get()
+            assert real_matches.get_matches_snapshot(client, "2025-03-01") is snapshot
+
+            app.state.config.error_rate = 1.0
+            next_day, meta = await real_matches.get_matches_snapshot(client, "2025-03-02").get()
+            return first, next_day, meta
+
+    try:
+        first, next_day, meta = asyncio.run(main())
+    finally:
+        real_matches._matches_snapshot = None
+    assert first["today"] and all(f["date"].startswith("2025-03-01") for f in first["today"])
+    assert all(f["date"].startswith("2025-03-02") for f in first["tomorrow"])
+    assert next_day is None and meta["stale"] is True
+    print("✓ 快照按日期区分")
+
+
+def test_snapshot_refresh_revalidates_upstream():
+    """快照刷新绕过比赛存储和响应缓存，真正重新请求上游；其他调用方仍读缓存"""
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.01))
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(league_ids=[292, 98])
+            )
+            client.cache = ResponseCache(SQLiteLRUStore(":memory:"))
+            snapshot = real_matches.get_matches_snapshot(client, "2025-03-01")
+            await snapshot.get()
+            first = app.state.request_counts["/fixtures"]
+            assert await snapshot.refresh()
+            refreshed = app.state.request_counts["/fixtures"]
+            await client.get_today_tomorrow_matches_async(today="2025-03-01")
+            return first, refreshed, app.state.request_counts["/fixtures"]
+
+    try:
+        first, refreshed, cached_read = asyncio.run(main())
+    finally:
+        real_matches._matches_snapshot = None
+    assert (first, refreshed, cached_read) == (2, 4, 4)
+    assert real_matches.MATCHES_SNAPSHOT_MAX_AGE >= FIXTURE_STORE_TTL
+    print("✓ 快照刷新重新请求上游")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("熔断器与快照测试")
+    print("=" * 50)
+    test_breaker_state_transitions()
+    test_today_tomorrow_served_from_snapshot_during_outage()
+    test_snapshot_is_not_served_for_another_date()
+    test_snapshot_refresh_revalidates_upstream()
+    print("\n✅ 全部通过")
@@ -3,6 +3,7 @@
 
 import os
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 
 # Add backend to path
@@ -131,7 +132,7 @@ def test_enhanced_writer():
     result = writer.generate_prediction(match_info, odds_info, historical_data)
     
     # 提取文章内容
-    if isinstance(result, dict):
+    if isinstance(result, Mapping):
         article = result.get('content', '')
     else:
         article = result
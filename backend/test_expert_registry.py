@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""测试专家注册表：稳定 id、索引查找、不可变"""
+
+import os
+import sys
+import dataclasses
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.prediction_experts import (
+    PredictionExpertProfiles, ExpertiseArea, expert_id, get_expert_registry
+)
+
+
+def test_registry_is_shared_and_ids_are_stable():
+    """注册表只构建一次，id 由专家 key 决定"""
+    registry = get_expert_registry()
+    assert get_expert_registry() is registry
+    assert PredictionExpertProfiles().experts is registry.by_key
+    assert len(registry) == 10
+    assert registry.by_key["data_wizard"].id == expert_id("data_wizard")
+    assert len(registry.by_id) == 10
+    print("✓ 共享注册表与稳定 id")
+
+
+def test_indexed_lookups():
+    """按 id、昵称、专长查找"""
+    registry = get_expert_registry()
+    profiles = PredictionExpertProfiles()
+    wizard = registry.by_key["data_wizard"]
+    assert profiles.get_expert_by_id(wizard.id) is wizard
+    assert registry.key_by_id[wizard.id] == "data_wizard"
+    assert profiles.get_expert_by_nickname(wizard.nickname) is wizard
+    assert wizard in profiles.get_experts_by_expertise(ExpertiseArea.STATISTICS)
+    assert profiles.get_expert_by_id("missing") is None
+    assert profiles.get_all_experts() == list(registry.by_key.values())
+    print("✓ 索引查找")
+
+
+def test_profiles_are_read_only():
+    """专家资料和索引不可修改"""
+    registry = get_expert_registry()
+    wizard = registry.by_key["data_wizard"]
+    for mutate in (
+        lambda: setattr(wizard, "win_rate", 0),
+        lambda: wizard.signature_phrases.append("x"),
+        lambda: wizard.article_templates.__setitem__("opening", "x"),
+        lambda: registry.by_key.__setitem__("x", wizard),
+    ):
+        try:
+            mutate()
+        except (dataclasses.FrozenInstanceError, AttributeError, TypeError):
+            continue
+        raise AssertionError("registry should be immutable")
+    print("✓ 不可变")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("专家注册表测试")
+    print("=" * 50)
+    test_registry_is_shared_and_ids_are_stable()
+    test_indexed_lookups()
+    test_profiles_are_read_only()
+    print("\n✅ 全部通过")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""测试本地 API-Sports 模拟服务"""
+
+import os
+import sys
+import time
+import asyncio
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.fake_api_sports import create_fake_api_sports_app, LatencyProfile
+from services.football_api_client import FootballAPIClient, FootballDataAggregator
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndexCache
+
+
+def make_client(http_client):
+    return FootballAPIClient(
+        api_key="fake",
+        base_url="http://fake-api-sports",
+        use_cache=False,
+        coalescer=RequestCoalescer(),
+        rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+        async_http_client=http_client,
+        standings_indexes=StandingsIndexCache(),
+        fixture_store=FixtureStore(league_ids=[292, 98])
+    )
+
+
+def test_aggregation_against_recordings():
+    """预测数据聚合可以完整跑在录制数据上，日期查询返回请求的日期"""
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.05), seed=1)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = make_client(http_client)
+            started = time.perf_counter()
+            data = await FootballDataAggregator(client).prepare_prediction_data_async(
+                home_team_id=2750, away_team_id=2749, league_id=292, fixture_id=1208001
+            )
+            elapsed = time.perf_counter() - started
+            fixtures = await client.get_fixtures_by_date_and_league_async("2025-03-01")
+            return data, elapsed, fixtures, client.rate_limiter.metrics()
+
+    data, elapsed, fixtures, limiter = asyncio.run(main())
+    assert data["missing_sources"] == []
+    assert data["home_team"]["name"] == "FC Seoul"
+    assert data["away_team"]["league_position"] == 2
+    assert data["odds_info"]["home_win"] == 2.10
+    assert "Kim Jin-su" in data["home_team"]["key_players_status"]
+    assert elapsed < 0.5  # 分支并发，总耗时接近单次延迟
+    assert len(fixtures) == 4 and all(f["date"].startswith("2025-03-01") for f in fixtures)
+    assert limiter["per_minute_limit"] == 300 and limiter["daily_remaining"] is not None
+    print("✓ 录制数据回放")
+
+
+def test_slow_branch_falls_back_to_partial_data():
+    """单个分支超过截止时间时放弃该分支，其余数据照常返回"""
+    app = create_fake_api_sports_app(
+        latency=LatencyProfile("fixed", 0.02), endpoint_latency={"/injuries": LatencyProfile("fixed", 2.0)}, seed=1
+    )
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            aggregator = FootballDataAggregator(make_client(http_client), branch_timeout=0.3)
+            started = time.perf_counter()
+            data = await aggregator.prepare_prediction_data_async(
+                home_team_id=2750, away_team_id=2749, league_id=292, fixture_id=1208001
+            )
+            return data, time.perf_counter() - started
+
+    data, elapsed = asyncio.run(main())
+    assert data["missing_sources"] == ["home_injuries", "away_injuries"]
+    assert data["home_team"]["name"] == "FC Seoul" and data["home_team"]["key_players_status"] == {}
+    assert data["odds_info"]["home_win"] == 2.10
+    assert elapsed < 1.0
+    print("✓ 慢分支超时回退")
+
+
+class CancelledBranchClient:
+    """历史交锋分支抛出 CancelledError（共享的进行中请求被取消），其他分支正常返回"""
+
+    async def get_team_statistics_async(self, team_id, league_id):
+        return None
+
+    async def get_h2h_data_async(self, home_team_id, away_team_id):
+        await asyncio.sleep(0.01)
+        raise asyncio.CancelledError()
+
+    async def get_team_injuries_async(self, team_id):
+        return [{"player": f"球员{team_id}", "reason": "伤停"}]
+
+    async def get_live_odds_async(self, fixture_id, kickoff=None):
+        await asyncio.sleep(1.0)
+        return {"home_win": 1.9}
+
+
+def test_cancelled_branch_degrades_instead_of_failing():
+    """分支内的取消只让该分支缺失；聚合本身被取消时仍然向上抛出"""
+    aggregator = FootballDataAggregator(CancelledBranchClient(), branch_timeout=5)
+
+    data = asyncio.run(aggregator.prepare_prediction_data_async(1, 2, 292))
+    assert data["missing_sources"] == ["h2h"]
+    assert data["home_team"]["key_players_status"] == {"球员1": "伤停"}
+
+    async def cancelled():
+        try:
+            await asyncio.wait_for(aggregator.prepare_prediction_data_async(1, 2, 292, fixture_id=9), 0.1)
+        except asyncio.TimeoutError:
+            await asyncio.sleep(0)
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        raise AssertionError("aggregation should have timed out")
+
+    assert asyncio.run(cancelled()) == []
+    print("✓ 分支取消回退")
+
+
+def test_error_injection_and_rate_limit():
+    """注入错误率和超出限额时的 429"""
+    app = create_fake_api_sports_app(error_rate=1.0, error_status=503, per_minute_limit=2)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake") as http_client:
+            return [await http_client.get("/injuries", params={"team": 2750}) for _ in range(3)]
+
+    responses = asyncio.run(main())
+    assert [r.status_code for r in responses] == [503, 503, 429]
+    assert responses[-1].headers["X-RateLimit-Remaining"] == "0"
+    print("✓ 错误注入与限流")
+
+
+def test_latency_profile_parsing():
+    """延迟分布配置解析"""
+    profile = LatencyProfile.parse("uniform:0.1,0.2")
+    assert (profile.distribution, profile.a, profile.b) == ("uniform", 0.1, 0.2)
+    import random
+    rng = random.Random(0)
+    assert all(0.1 <= profile.sample(rng) <= 0.2 for _ in range(100))
+    assert LatencyProfile.parse("fixed:0.3").sample(rng) == 0.3
+    print("✓ 延迟分布")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("API-Sports 模拟服务测试")
+    print("=" * 50)
+    test_aggregation_against_recordings()
+    test_slow_branch_falls_back_to_partial_data()
+    test_cancelled_branch_degrades_instead_of_failing()
+    test_error_injection_and_rate_limit()
+    test_latency_profile_parsing()
+    print("\n✅ 全部通过")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""测试两阶段专家文章：比赛分析一次，按专家风格改写"""
+
+import os
+import sys
+import json
+import random
+import asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.fixture_analysis import FixtureAnalysisPipeline, ANALYSIS_TOPICS
+from agents.prediction_experts import get_expert_registry
+from app.core.claude_config import AsyncClaudeClient
+from app.core.llm_telemetry import LLMTelemetry
+from app.services.article_stream_service import demo_match_inputs
+from services.article_cache import ArticleCache
+from services.fake_anthropic import create_fake_anthropic_app, asgi_http_client, FAKE_BASE_URL
+
+
+class CountingPipeline(FixtureAnalysisPipeline):
+    """统计第一阶段实际调用写作器的次数"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer_calls = 0
+        generate = self.writer.generate_prediction
+
+        def counted(*args, **kw):
+            self.writer_calls += 1
+            return generate(*args, **kw)
+
+        self.writer.generate_prediction = counted
+
+
+class ScriptedClient:
+    """返回固定回复的 AsyncClaudeClient 替身"""
+
+    def __init__(self, content):
+        self.content = content
+        self.prompts = []
+
+    def select_model(self, task, **kwargs):
+        return "fake-model"
+
+    async def create_message(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return {"success": True, "content": self.content, "model": "fake-model", "usage": {}}
+
+
+def test_template_fan_out_shares_one_analysis():
+    """所有专家共用一次比赛分析；章节按专长排序，风格各不相同"""
+    pipeline = CountingPipeline(cache=ArticleCache())
+    inputs = demo_match_inputs()
+    articles = pipeline.expert_articles(*inputs, fixture_id=1001)
+    pipeline.expert_articles(*inputs, fixture_id=1001)
+
+    assert pipeline.writer_calls == 1
+    assert set(articles) == set(get_expert_registry().keys)
+    assert len({a["full_article"] for a in articles.values()}) == len(articles)
+    assert len({a["predicted_score"] for a in articles.values()}) == 1
+
+    assert list(articles["tactician"]["sections"])[:2] == ["战术分析", "关键对位"]
+    assert list(articles["historian"]["sections"])[0] == "历史交锋"
+    assert not articles["tactician"]["sections"]["战术分析"].startswith("五、")
+    # 同样的输入总是同一篇文章
+    assert pipeline.expert_articles(*inputs, fixture_id=1001) == articles
+    print("✓ 模板扇出共用分析")
+
+
+def test_claude_analysis_and_fallback():
+    """Claude 返回 JSON 时使用其分析；回复无法解析时回退到模板写作器"""
+    inputs = demo_match_inputs()
+    reply = json.dumps({
+        "topics": {topic: f"{title}的分析" for topic, title in ANALYSIS_TOPICS.items()},
+        "predicted_score": "3-1",
+        "selection": "主队-1",
+        "confidence": 68
+    }, ensure_ascii=False)
+    client = ScriptedClient(f"分析如下：\n{reply}")
+    pipeline = FixtureAnalysisPipeline(cache=ArticleCache())
+    analysis = asyncio.run(pipeline.analyze_with_claude(client, *inputs, fixture_id=7))
+    assert analysis.source == "claude" and analysis.predicted_score == "3-1"
+    assert analysis.topics["odds"] == "赔率解读的分析"
+    assert analysis.odds == inputs[1].home_win
+    asyncio.run(pipeline.analyze_with_claude(client, *inputs, fixture_id=7))
+    assert len(client.prompts) == 1
+
+    broken = FixtureAnalysisPipeline(cache=ArticleCache())
+    analysis = asyncio.run(broken.analyze_with_claude(ScriptedClient("无法给出分析"), *inputs, fixture_id=7))
+    assert analysis.source == "writer" and analysis.topics["form"]
+
+    # 赔率取自推荐的一方；大小球等无法对应胜平负的推荐不带赔率
+    match_info, odds_info = inputs[0], inputs[1]
+    for selection, odds in (
+        ("客队+0.5", odds_info.away_win),
+        (f"{match_info.away_team.name}不败", odds_info.away_win),
+        ("平局", odds_info.draw),
+        ("大球2.5", None),
+    ):
+        reply = json.dumps({"topics": {"form": "近况"}, "selection": selection}, ensure_ascii=False)
+        pipeline = FixtureAnalysisPipeline(cache=ArticleCache())
+        analysis = asyncio.run(pipeline.analyze_with_claude(ScriptedClient(reply), *inputs, fixture_id=8))
+        assert analysis.odds == odds, selection
+    assert "赔率" not in analysis.to_prompt().splitlines()[2]
+    print("✓ Claude 分析与回退")
+
+
+def test_claude_stylization_reads_cached_analysis():
+    """每位专家一次短调用，共享分析前缀；失败的专家改用模板"""
+    app = create_fake_anthropic_app()
+    client = AsyncClaudeClient(
+        api_key="fake", base_url=FAKE_BASE_URL, http_client=asgi_http_client(app),
+        cache=ArticleCache(), telemetry=LLMTelemetry(), rng=random.Random(0)
+    )
+    pipeline = FixtureAnalysisPipeline(cache=ArticleCache())
+    inputs = demo_match_inputs()
+    keys = list(get_expert_registry().keys)
+
+    articles = asyncio.run(pipeline.expert_articles_with_claude(client, *inputs, fixture_id=1001))
+    # 模拟服务不返回 JSON，第一阶段回退到模板分析；第二阶段每位专家一次调用
+    assert app.state.request_count == 1 + len(keys)
+    assert all(a["source"] == "claude" for a in articles.values())
+    stylize_requests = app.state.requests[1:]
+    assert all(r["max_tokens"] == 1500 for r in stylize_requests)
+    assert len({r["messages"][0]["content"][0]["text"] for r in stylize_requests}) == 1
+    assert client.tokens["cache_creation_input_tokens"] > 0
+    assert client.tokens["cache_read_input_tokens"] == client.tokens["cache_creation_input_tokens"] * (len(keys) - 1)
+
+    analysis = pipeline.analyze(*inputs, fixture_id=1001)
+    cached = asyncio.run(pipeline.stylize_with_claude(client, analysis, keys[:2]))
+    assert all(a["cached"] for a in cached.values())
+
+    app.state.config.fail_first, app.state.config.error_status = 10**6, 500
+    fresh = FixtureAnalysisPipeline(cache=ArticleCache())
+    fallback = asyncio.run(fresh.stylize_with_claude(client, analysis, keys[:2]))
+    assert [a["source"] for a in fallback.values()] == ["template", "template"]
+    print("✓ Claude 改写共享分析前缀")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("两阶段专家文章测试")
+    print("=" * 50)
+    test_template_fan_out_shares_one_analysis()
+    test_claude_analysis_and_fallback()
+    test_claude_stylization_reads_cached_analysis()
+    print("\n✅ 全部通过")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""测试按日期批量获取的比赛存储：本地联赛过滤、只解析一次、关注联赛变化、过期"""
+
+import os
+import sys
+import asyncio
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.fake_api_sports import create_fake_api_sports_app
+from services.football_api_client import FootballAPIClient
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndexCache
+
+
+def raw_fixture(fixture_id, league_id, season=2025):
+    """/fixtures?date= 响应中的一场比赛（只保留存储用到的字段）"""
+    return {"fixture": {"id": fixture_id}, "league": {"id": league_id, "season": season}}
+
+
+RAW = [
+    raw_fixture(1, 292),
+    raw_fixture(2, 39, 2024),
+    raw_fixture(3, 98),
+    raw_fixture(4, 292),
+    raw_fixture(5, 169),
+]
+
+
+class CountingParser:
+    """记录解析过的比赛"""
+
+    def __init__(self):
+        self.parsed = []
+
+    def __call__(self, fixture):
+        self.parsed.append(fixture["fixture"]["id"])
+        return {"fixture_id": fixture["fixture"]["id"], "league": fixture["league"]}
+
+
+def test_local_league_filtering():
+    """一天的全部比赛只在本地按关注联赛过滤，只解析保留的比赛"""
+    store = FixtureStore(league_ids=[292, 98])
+    parse = CountingParser()
+    by_league = store.put("2025-03-01", RAW, parse)
+
+    assert sorted(by_league) == [98, 292]
+    assert parse.parsed == [1, 3, 4]
+    assert store.get("2025-03-01") is by_league
+    assert [f["fixture_id"] for f in store.select(by_league, [98, 292])] == [3, 1, 4]
+    assert [f["fixture_id"] for f in store.select(by_league, ["292"])] == [1, 4]
+    assert store.select(by_league, [39]) == []
+    print("✓ 本地联赛过滤")
+
+
+def test_tracking_more_leagues_refilters():
+    """关注的联赛增加时清空已有数据；过滤期间关注范围变化的结果不写入存储"""
+    store = FixtureStore(league_ids=[292, 98])
+    store.put("2025-03-01", RAW, CountingParser())
+    store.track([292])
+    assert store.get("2025-03-01") is not None
+
+    store.track([169])
+    assert store.get("2025-03-01") is None
+    by_league = store.put("2025-03-01", RAW, CountingParser())
+    assert sorted(by_league) == [98, 169, 292]
+
+    def parse_while_tracking(fixture):
+        store.track([39])
+        return {"fixture_id": fixture["fixture"]["id"]}
+
+    by_league = store.put("2025-03-02", RAW, parse_while_tracking)
+    assert 39 not in by_league and store.get("2025-03-02") is None
+    print("✓ 关注联赛变化")
+
+
+def test_expiry_and_invalidation():
+    """按日期过期，可以按日期或整体失效"""
+    now = [1000.0]
+    store = FixtureStore(league_ids=[292], ttl=60, time_func=lambda: now[0])
+    for date in ("2025-03-01", "2025-03-02", "2025-03-03"):
+        store.put(date, RAW, CountingParser())
+
+    store.invalidate("2025-03-01")
+    assert store.get("2025-03-01") is None and store.get("2025-03-02") is not None
+    store.invalidate()
+    assert store.get("2025-03-02") is None
+
+    store.put("2025-03-01", RAW, CountingParser())
+    now[0] += 60
+    assert store.get("2025-03-01") is None
+    print("✓ 过期与失效")
+
+
+def test_client_fetches_each_date_once():
+    """客户端：每个日期一次不带联赛参数的上游请求，各联赛、日期范围的调用共享结果"""
+    app = create_fake_api_sports_app(seed=1)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(league_ids=[292, 98])
+            )
+            k_league = await client.get_fixtures_by_date_and_league_async("2025-03-01", [292])
+            j_league = await client.get_fixtures_by_date_and_league_async("2025-03-01", [98])
+            by_date = await client.get_fixtures_by_date_range_async("2025-03-01", "2025-03-03")
+            counts = dict(app.state.request_counts)
+            premier_league = await client.get_fixtures_by_date_and_league_async("2025-03-01", [39])
+            return k_league, j_league, by_date, counts, premier_league
+
+    k_league, j_league, by_date, counts, premier_league = asyncio.run(main())
+    assert k_league and {f["league"]["id"] for f in k_league} == {292}
+    assert j_league and {f["league"]["id"] for f in j_league} == {98}
+    assert list(by_date) == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert by_date["2025-03-01"] == k_league + j_league
+    assert all(f["date"].startswith("2025-03-02") for f in by_date["2025-03-02"])
+    assert counts["/fixtures"] == 3
+    # 新增关注的联赛后重新请求一次该日期
+    assert premier_league and {f["league"]["id"] for f in premier_league} == {39}
+    assert app.state.request_counts["/fixtures"] == 4
+    print("✓ 客户端每个日期只请求一次")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("比赛存储测试")
+    print("=" * 50)
+    test_local_league_filtering()
+    test_tracking_more_leagues_refilters()
+    test_expiry_and_invalidation()
+    test_client_fetches_each_date_once()
+    print("\n✅ 全部通过")
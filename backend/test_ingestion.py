@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""测试比赛数据同步（API-Sports -> 本地数据库）"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.domain.models import Team, Match, BettingOdds, Statistics
+from app.services.ingestion_service import FixtureIngestionWorker
+from app.services.match_service import MatchService
+from app.services.score_model_service import cached_score_model
+from services.football_api_client import FootballAPIClient
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndexCache
+
+TODAY = datetime.now().strftime("%Y-%m-%d")
+YESTERDAY = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def make_fixture(fixture_id, date, status, goals, league_id=292):
+    return {
+        "fixture": {"id": fixture_id, "date": f"{date}T10:00:00+00:00", "referee": None,
+                    "venue": {"name": "Seoul World Cup Stadium"}, "status": {"short": status}},
+        "league": {"id": league_id, "name": "K League 1", "country": "South-Korea",
+                   "season": 2024, "round": "Regular Season - 30"},
+        "teams": {"home": {"id": 2750, "name": "FC Seoul", "logo": "seoul.png"},
+                  "away": {"id": 2749, "name": "Ulsan", "logo": "ulsan.png"}},
+        "goals": goals,
+    }
+
+
+def api_sports_stub(request):
+    """按端点返回固定数据的 API-Sports 桩"""
+    path, params = request.url.path, request.url.params
+    if path == "/fixtures" and params.get("date") == TODAY:
+        response = [make_fixture(1, TODAY, "NS", {"home": None, "away": None}),
+                    make_fixture(9, TODAY, "NS", {"home": None, "away": None}, league_id=39)]
+    elif path == "/fixtures" and params.get("date") == YESTERDAY:
+        response = [make_fixture(2, YESTERDAY, "FT", {"home": 2, "away": 1})]
+    elif path == "/odds":
+        response = [{"bookmakers": [{"id": 8, "name": "Bet365", "bets": [
+            {"name": "Match Winner", "values": [
+                {"value": "Home", "odd": "2.10"}, {"value": "Draw", "odd": "3.20"}, {"value": "Away", "odd": "3.40"}]},
+            {"name": "Goals Over/Under", "values": [{"value": "Over 2.5", "odd": "1.95"}]},
+        ]}]}]
+    elif path == "/fixtures/statistics":
+        response = [{"team": {"id": team_id}, "statistics": [
+            {"type": "Ball Possession", "value": possession}, {"type": "Total Shots", "value": 12}]}
+            for team_id, possession in ((2750, "55%"), (2749, "45%"))]
+    elif path == "/standings":
+        response = [{"league": {"standings": [[
+            {"rank": 1, "team": {"id": 2749, "name": "Ulsan"}, "form": "WWWDW"},
+            {"rank": 4, "team": {"id": 2750, "name": "FC Seoul"}, "form": "LDWWL"},
+        ]]}}]
+    else:
+        response = []
+    return httpx.Response(200, json={"errors": [], "response": response})
+
+
+def test_ingestion_upserts_by_api_fixture_id():
+    """同步写入球队、比赛、赔率、技术统计和排名，重复执行不产生重复数据"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(api_sports_stub)) as http_client:
+            client = FootballAPIClient(
+                api_key="test",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(league_ids=[292])
+            )
+            worker = FixtureIngestionWorker(
+                client=client, session_factory=session_factory, days_back=1, days_ahead=0, league_ids=[292]
+            )
+            first = await worker.run_once()
+            client.fixture_store.invalidate()
+            await worker.run_once()
+            return first
+
+    result = asyncio.run(main())
+    assert result == {"fixtures": 2, "odds": 1, "statistics": 2, "standings": 2}
+    # 同步后在工作线程中重新拟合比分模型，请求处理只读取缓存的模型
+    model = cached_score_model()
+    assert model.matches == 1 and set(model.teams) == {"FC Seoul", "Ulsan"}
+
+    db = session_factory()
+    assert db.query(Team).count() == 2
+    assert db.query(Match).count() == 2
+    assert db.query(BettingOdds).count() == 1
+    assert db.query(Statistics).count() == 2
+
+    finished = db.query(Match).filter(Match.api_fixture_id == 2).one()
+    assert (finished.status, finished.home_score, finished.away_score) == ("finished", 2, 1)
+    odds = db.query(BettingOdds).one()
+    assert (odds.home_win, odds.over_2_5) == (2.10, 1.95)
+    home_stats = db.query(Statistics).filter(Statistics.is_home.is_(True)).one()
+    assert home_stats.possession == 55.0
+    assert db.query(Team).filter(Team.api_team_id == 2749).one().league_position == 1
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    fixtures = MatchService(db).get_ingested_fixtures(today - timedelta(days=2), today + timedelta(days=2))
+    assert [f["fixture_id"] for f in fixtures] == [2, 1]
+    assert fixtures[0]["home_team"]["name"] == "FC Seoul"
+    # 与 FootballAPIClient._parse_fixture 相同：API 状态代码和带时区的时间
+    assert [f["status"] for f in fixtures] == ["FT", "NS"]
+    assert datetime.fromisoformat(fixtures[0]["date"]) == datetime.fromisoformat(f"{YESTERDAY}T10:00:00+00:00")
+    db.close()
+    print("✓ 比赛数据同步")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("比赛数据同步测试")
+    print("=" * 50)
+    test_ingestion_upserts_by_api_fixture_id()
+    print("\n✅ 全部通过")
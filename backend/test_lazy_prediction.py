@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""测试按需渲染的预测结果和预测列表摘要"""
+
+import os
+import sys
+import json
+import asyncio
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.domain.models import Prediction
+from app.services.article_stream_service import demo_match_inputs, save_prediction
+from app.api.v1.real_matches import get_match_predictions
+from agents.enhanced_football_writer import EnhancedFootballWriter
+from agents.football_prediction_writer import FootballPredictionWriter
+from agents.football_prediction_writer import TeamInfo, MatchInfo, OddsInfo, HistoricalData
+from agents.lazy_prediction import LazyPrediction
+from agents.prediction_experts import get_expert_registry
+from services.article_cache import ArticleCache
+
+
+def test_header_fields_do_not_render_article():
+    """只读头部字段不生成章节；第一次读取正文时生成一次，结果与直接生成相同"""
+    writer = EnhancedFootballWriter(cache=ArticleCache())
+    inputs = demo_match_inputs()
+    prediction = writer.generate_prediction(*inputs, fixture_id=1)
+
+    assert isinstance(prediction, LazyPrediction)
+    assert prediction["predicted_score"] and prediction["recommendation"]["selection"]
+    assert "full_article" in prediction and len(prediction) == 7
+    assert list(prediction)[-2:] == ["sections", "full_article"]
+    assert not prediction.rendered and writer.sections_rendered == 0
+
+    article = prediction["full_article"]
+    assert prediction.rendered and writer.sections_rendered == 8
+    assert prediction["sections"] and prediction["full_article"] is article
+    assert writer.sections_rendered == 8
+    assert prediction == EnhancedFootballWriter(cache=None)._build_prediction(*inputs, 80, None)
+    # 生成后写入缓存，再次请求直接命中
+    assert writer.generate_prediction(*inputs, fixture_id=1) == prediction
+    assert writer.sections_rendered == 8
+    print("✓ 头部字段不触发正文生成")
+
+
+def test_mapping_behaviour():
+    """修改和删除未生成的字段不触发生成；JSON 序列化得到完整文章"""
+    renders = []
+
+    def render():
+        renders.append(1)
+        return {"title": "ignored", "sections": {"a": "A"}, "full_article": "全文"}
+
+    prediction = LazyPrediction({"title": "标题"}, render)
+    prediction["full_article"] = "调用方的正文"
+    del prediction["sections"]
+    assert not renders and prediction.rendered
+    assert prediction.to_dict() == {"title": "标题", "full_article": "调用方的正文"}
+
+    prediction = LazyPrediction({"title": "标题"}, render)
+    assert prediction.header() == {"title": "标题"}
+    assert jsonable_encoder({"data": prediction}) == {
+        "data": {"title": "标题", "sections": {"a": "A"}, "full_article": "全文"}
+    }
+    assert len(renders) == 1
+    assert json.loads(json.dumps(prediction.to_dict(), ensure_ascii=False))["full_article"] == "全文"
+
+    home = TeamInfo("横滨水手", ["W", "W", "D"], 2, "主场3胜", {}, "状态上升")
+    away = TeamInfo("川崎前锋", ["L", "D", "W"], 5, "客场2胜", {}, "状态平稳")
+    basic = FootballPredictionWriter().generate_prediction(
+        MatchInfo(home, away, "日职联", "08/24 18:00", "日产体育场"),
+        OddsInfo(2.28, 3.40, 2.52, "主队-0.5", "2.5球"),
+        HistoricalData([{"date": "2024-03-15", "score": "2-1", "winner": "home"}], "主场占优", "客场一般")
+    )
+    assert not basic.rendered and basic["title"].startswith("日职联")
+    assert basic["full_article"].startswith(f"【{basic['title']}】") and len(basic["sections"]) == 4
+    print("✓ 字典接口")
+
+
+def test_prediction_list_reads_only_summaries():
+    """列表只查询一次，不加载文章正文；没有摘要的旧数据回退到截取正文"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    long_article = "长" * 1500
+    save_prediction(db, 1001, "medic", long_article)
+    save_prediction(db, 1002, "tactician", "短文章")
+    db.expire_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    result = asyncio.run(get_match_predictions(db=db))["data"]
+    assert len(statements) == 1
+    assert "reasoning" not in statements[0].split("FROM")[0]
+    assert sorted(item["summary"] for item in result) == ["短文章", "长" * 100 + "..."]
+    registry = get_expert_registry().by_key
+    assert {item["expert"]["name"] for item in result} == {registry["medic"].name, registry["tactician"].name}
+
+    # 摘要列出现之前保存的预测
+    legacy = db.query(Prediction).filter(Prediction.match_id == "1001").one()
+    legacy.summary = None
+    db.commit()
+    db.expire_all()
+    statements.clear()
+    result = asyncio.run(get_match_predictions(db=db))["data"]
+    assert len(statements) == 2
+    assert "长" * 100 + "..." in [item["summary"] for item in result]
+    db.close()
+    print("✓ 列表只读取摘要")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("按需渲染测试")
+    print("=" * 50)
+    test_header_fields_do_not_render_article()
+    test_mapping_behaviour()
+    test_prediction_list_reads_only_summaries()
+    print("\n✅ 全部通过")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""测试 LLM 调用遥测：延迟分位数、token 速度、成本估算、客户端埋点"""
+
+import os
+import sys
+import random
+import asyncio
+from types import SimpleNamespace
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from app.core.llm_telemetry import LLMTelemetry, estimate_cost, get_llm_telemetry
+from app.core.claude_config import AsyncClaudeClient, ClaudeClient, CLAUDE_MODELS
+from services.article_cache import ArticleCache
+from services.fake_anthropic import create_fake_anthropic_app, asgi_http_client, FAKE_BASE_URL
+
+SONNET = CLAUDE_MODELS["claude-4-sonnet"]
+HAIKU = CLAUDE_MODELS["claude-4-haiku"]
+
+
+def test_cost_estimate():
+    """缓存写入按 1.25 倍、缓存读取按 0.1 倍输入价格计费"""
+    usage = {"input_tokens": 1_000_000, "output_tokens": 1_000_000}
+    assert estimate_cost(SONNET, usage) == 18.0
+    assert estimate_cost(SONNET, {"cache_read_input_tokens": 1_000_000}) == 0.3
+    assert estimate_cost(SONNET, {"cache_creation_input_tokens": 1_000_000}) == 3.75
+    assert estimate_cost("unknown-model", usage) is None
+    print("✓ 成本估算")
+
+
+def test_rolling_summary_per_model():
+    """按模型汇总最近调用；窗口之外的调用只计入累计值"""
+    telemetry = LLMTelemetry(window=10)
+    for i in range(20):
+        telemetry.record(SONNET, latency=1.0 + i, usage={"input_tokens": 1000, "output_tokens": 500})
+    telemetry.record(SONNET, latency=0.5, outcome="timeout", retries=2)
+    telemetry.record(HAIKU, latency=2.0, usage={"input_tokens": 1000, "output_tokens": 1000})
+
+    summary = telemetry.summary()
+    sonnet = summary["models"][SONNET]
+    window = sonnet["window"]
+    assert window["calls"] == 10 and window["successes"] == 9 and window["timeouts"] == 1
+    assert window["retries"] == 2
+    assert window["latency_p50"] == 16.0 and window["latency_p95"] == 20.0
+    assert window["output_tokens_per_second"] == round(9 * 500 / sum(range(12, 21)), 4)
+    assert window["cost_per_article_usd"] == round(estimate_cost(SONNET, {"input_tokens": 1000, "output_tokens": 500}), 6)
+    assert sonnet["totals"]["calls"] == 21 and sonnet["totals"]["output_tokens"] == 10_000
+
+    haiku = summary["models"][HAIKU]["window"]
+    assert haiku["output_tokens_per_second"] == 500.0
+    assert haiku["cost_per_article_usd"] < window["cost_per_article_usd"]
+    assert telemetry.recent(1)[0]["model"] == HAIKU
+    print("✓ 按模型滚动汇总")
+
+
+def test_async_client_records_calls():
+    """异步客户端记录成功、重试和失败的调用"""
+    async def no_sleep(delay):
+        pass
+
+    telemetry = LLMTelemetry()
+    app = create_fake_anthropic_app(fail_first=1, error_status=529)
+    client = AsyncClaudeClient(
+        api_key="fake", base_url=FAKE_BASE_URL, http_client=asgi_http_client(app),
+        cache=ArticleCache(), telemetry=telemetry, rng=random.Random(0), sleep=no_sleep
+    )
+    assert asyncio.run(client.create_message("比赛"))["success"]
+
+    app.state.config.error_status, app.state.config.fail_first = 500, 10
+    assert not asyncio.run(client.create_message("比赛"))["success"]
+
+    first, second = telemetry.recent(2)[::-1]
+    assert first["outcome"] == "success" and first["retries"] == 1 and first["output_tokens"] > 0
+    assert second["outcome"] == "error" and second["retries"] == 0
+    assert telemetry.summary()["models"][client.model]["totals"]["errors"] == 1
+    print("✓ 异步客户端埋点")
+
+
+def test_sync_client_and_endpoint():
+    """同步客户端的流式调用记录首 token 时间；/metrics/llm 返回共享遥测"""
+
+    class FakeStream:
+        text_stream = iter(["比分", "2-1"])
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def get_final_message(self):
+            return SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="比分2-1")],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=4)
+            )
+
+    telemetry = get_llm_telemetry()
+    telemetry.reset()
+    client = ClaudeClient(api_key="test-key", cache=ArticleCache())
+    client.client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: FakeStream()))
+    assert [e["type"] for e in client.stream_message("比赛")] == ["text", "text", "done"]
+
+    from main import app
+    data = TestClient(app).get("/api/v1/metrics/llm", params={"recent": 5}).json()
+    window = data["models"][client.model]["window"]
+    assert window["successes"] == 1 and window["output_tokens"] == 4
+    assert window["time_to_first_token_p50"] is not None
+    assert data["recent"][0]["streamed"] is True
+    print("✓ 同步客户端与接口")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("LLM 遥测测试")
+    print("=" * 50)
+    test_cost_estimate()
+    test_rolling_summary_per_model()
+    test_async_client_records_calls()
+    test_sync_client_and_endpoint()
+    print("\n✅ 全部通过")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""测试按请求的模型路由：任务类型、队列负载、延迟和成本预算"""
+
+import os
+import sys
+import random
+import asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core import claude_config
+from app.core.claude_config import AsyncClaudeClient, CLAUDE_MODELS
+from app.core.llm_telemetry import LLMTelemetry
+from app.core.model_router import ModelRouter, TASK_ARTICLE, TASK_QUICK
+from services.article_cache import ArticleCache
+from services.fake_anthropic import create_fake_anthropic_app, asgi_http_client, FAKE_BASE_URL
+from services.fake_api_sports import LatencyProfile
+
+SONNET = CLAUDE_MODELS["claude-4-sonnet"]
+HAIKU = CLAUDE_MODELS["claude-4-haiku"]
+
+
+def make_router(telemetry=None, peak_load=0.75):
+    return ModelRouter(
+        {TASK_ARTICLE: [SONNET, HAIKU], TASK_QUICK: [HAIKU]},
+        peak_load=peak_load,
+        telemetry=telemetry or LLMTelemetry()
+    )
+
+
+def test_routes_by_task_and_load():
+    """简短预测走 Haiku；文章空闲时走 Sonnet，高峰时走 Haiku"""
+    router = make_router()
+    assert router.route(TASK_QUICK).model == HAIKU
+    assert router.route(TASK_ARTICLE, load=0.5).model == SONNET
+    peak = router.route(TASK_ARTICLE, load=1.5)
+    assert peak.model == HAIKU and peak.reason == "peak_load"
+
+    stats = router.stats()
+    assert stats["decisions"][TASK_ARTICLE] == {SONNET: 1, HAIKU: 1}
+    assert stats["reasons"] == {"preferred": 2, "peak_load": 1}
+    assert stats["recent"][-1]["load"] == 1.5
+    print("✓ 按任务和负载路由")
+
+
+def test_routes_by_budget():
+    """Sonnet 最近 p95 延迟或单篇成本超出预算时改用 Haiku"""
+    telemetry = LLMTelemetry()
+    router = make_router(telemetry)
+    for _ in range(4):
+        telemetry.record(SONNET, latency=30.0, usage={"input_tokens": 2000, "output_tokens": 2000})
+    # 样本太少，不据此路由
+    assert router.route(TASK_ARTICLE, latency_budget=20).model == SONNET
+
+    telemetry.record(SONNET, latency=30.0, usage={"input_tokens": 2000, "output_tokens": 2000})
+    decision = router.route(TASK_ARTICLE, latency_budget=20)
+    assert decision.model == HAIKU and decision.reason == "latency_budget"
+    assert router.route(TASK_ARTICLE, latency_budget=40).model == SONNET
+
+    decision = router.route(TASK_ARTICLE, cost_budget=0.02)
+    assert decision.model == HAIKU and decision.reason == "cost_budget"
+    # 还没有 Haiku 调用记录时按 max_tokens 估算成本
+    assert make_router().route(TASK_ARTICLE, max_tokens=4096, cost_budget=0.02).model == HAIKU
+    assert make_router().route(TASK_ARTICLE, max_tokens=4096, cost_budget=0.001).reason == "no_model_within_budget"
+    print("✓ 按延迟和成本预算路由")
+
+
+def test_async_client_switches_model_under_load():
+    """队列排满后新的文章请求改用 Haiku；批量专家文章使用同一模型"""
+    app = create_fake_anthropic_app(latency=LatencyProfile("fixed", 0.02))
+    router = make_router()
+    client = AsyncClaudeClient(
+        api_key="fake", base_url=FAKE_BASE_URL, http_client=asgi_http_client(app),
+        cache=ArticleCache(), telemetry=LLMTelemetry(), router=router,
+        max_concurrency=2, rng=random.Random(0)
+    )
+
+    async def burst():
+        return await asyncio.gather(*(
+            client.generate_prediction({"fixture_id": i, "home_team": {"name": f"主队{i}"}}) for i in range(6)
+        ))
+
+    results = asyncio.run(burst())
+    assert all(r["success"] for r in results)
+    assert [r["model"] for r in results] == [SONNET, SONNET, HAIKU, HAIKU, HAIKU, HAIKU]
+    assert [body["model"] for body in app.state.requests].count(HAIKU) == 4
+
+    experts = asyncio.run(client.generate_expert_predictions({"fixture_id": 99}, {"a": "数据派", "b": "战术派", "c": "伤病派"}))
+    assert {r["model"] for r in experts.values()} == {SONNET}
+
+    client.set_model("claude-3-haiku")
+    assert client.router is None and client.select_model(TASK_ARTICLE) == CLAUDE_MODELS["claude-3-haiku"]
+    print("✓ 异步客户端按负载切换模型")
+
+
+def test_pinned_client_leaves_shared_client_routed():
+    """get_claude_client(model) 返回固定模型的副本，共享客户端和其他调用方仍按路由选择模型"""
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    os.environ["ANTHROPIC_API_KEY"] = api_key or "test-key"
+    claude_config._claude_client = None
+    try:
+        pinned = claude_config.get_claude_client(HAIKU)
+        shared = claude_config.get_claude_client()
+        assert pinned is not shared and pinned.client is shared.client and pinned.cache is shared.cache
+        assert pinned.router is None and pinned.select_model(TASK_ARTICLE) == HAIKU
+        assert shared.router is not None and shared.model == CLAUDE_MODELS["claude-4-sonnet"]
+        assert claude_config.get_claude_client() is shared
+    finally:
+        claude_config._claude_client = None
+        if api_key is None:
+            del os.environ["ANTHROPIC_API_KEY"]
+    print("✓ 固定模型不影响共享客户端")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("模型路由测试")
+    print("=" * 50)
+    test_routes_by_task_and_load()
+    test_routes_by_budget()
+    test_async_client_switches_model_under_load()
+    test_pinned_client_leaves_shared_client_routed()
+    print("\n✅ 全部通过")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""测试提示词缓存：前缀达到缓存下限时，同一场比赛的多位专家共享缓存前缀"""
+
+import os
+import sys
+import random
+import asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.claude_config import AsyncClaudeClient, BaseClaudeClient, CLAUDE_MODELS, PROMPT_CACHE_MIN_TOKENS
+from agents.prediction_experts import get_expert_registry
+from services.article_cache import ArticleCache
+from services.fake_anthropic import create_fake_anthropic_app, asgi_http_client, FAKE_BASE_URL
+from services.fake_api_sports import LatencyProfile
+
+MATCH_DATA = {
+    "fixture_id": 1208001,
+    "home_team": {"name": "FC Seoul", "league_position": 3, "recent_performance": "3胜1平1负"},
+    "away_team": {"name": "Ulsan Hyundai FC", "league_position": 1, "recent_performance": "4胜1平"},
+    "odds_info": {"home_win": 2.10, "draw": 3.20, "away_win": 3.40},
+}
+
+# 带完整历史交锋的比赛数据，共享前缀超过 Sonnet 的缓存下限
+LONG_MATCH_DATA = dict(MATCH_DATA, history={
+    "h2h_results": [
+        {"date": f"2024-{month:02d}-15", "home": "FC Seoul", "away": "Ulsan Hyundai FC",
+         "score": f"{month % 3}-{month % 2}", "competition": "K League 1"}
+        for month in range(1, 13)
+    ] * 2,
+    "home_team_home_record": "3胜2平1负",
+    "away_team_away_record": "2胜2平2负",
+})
+
+
+def expert_styles():
+    return {key: f"{p.name}，{p.bio}" for key, p in get_expert_registry().by_key.items()}
+
+
+def test_prompt_prefix_is_shared():
+    """不同专家的请求只有最后的风格块不同，缓存标记在共享前缀末尾"""
+    system_a, content_a = BaseClaudeClient._prediction_prompts(MATCH_DATA, "数据派")
+    system_b, content_b = BaseClaudeClient._prediction_prompts(MATCH_DATA, "战术派")
+    assert system_a == system_b and content_a[0] == content_b[0]
+    assert content_a[0]["cache_control"] == {"type": "ephemeral"}
+    assert content_a[1] != content_b[1] and "cache_control" not in content_a[1]
+    assert "Ulsan Hyundai FC" in content_a[0]["text"] and "3.4" in content_a[0]["text"]
+    print("✓ 共享前缀")
+
+
+def test_cache_minimum_per_model():
+    """只有球队概况的前缀低于缓存下限；完整历史交锋数据超过 Sonnet 的下限，但不到 Haiku 的"""
+    sonnet, haiku = CLAUDE_MODELS["claude-4-sonnet"], CLAUDE_MODELS["claude-4-haiku"]
+    assert not BaseClaudeClient.cacheable_prefix(MATCH_DATA, sonnet)
+    assert BaseClaudeClient.cacheable_prefix(LONG_MATCH_DATA, sonnet)
+    assert not BaseClaudeClient.cacheable_prefix(LONG_MATCH_DATA, haiku)
+    print("✓ 各模型的缓存下限")
+
+
+def run_expert_takes(match_data):
+    """按真实缓存下限模拟，十位专家各写一篇，返回 (结果, 模拟服务, 客户端)"""
+    app = create_fake_anthropic_app(cache_min_tokens=PROMPT_CACHE_MIN_TOKENS, latency=LatencyProfile("fixed", 0.05))
+    client = AsyncClaudeClient(
+        api_key="fake", base_url=FAKE_BASE_URL, http_client=asgi_http_client(app),
+        cache=ArticleCache(), rng=random.Random(0), max_concurrency=10
+    )
+    results = asyncio.run(client.generate_expert_predictions(match_data, expert_styles()))
+    assert len(results) == 10 and all(r["success"] for r in results.values())
+    return results, app, client
+
+
+def test_expert_takes_read_the_cached_prefix():
+    """前缀达到缓存下限：第一篇写入缓存，其余九篇并发读取缓存"""
+    results, app, client = run_expert_takes(LONG_MATCH_DATA)
+    usages = [r["usage"] for r in results.values()]
+    assert sum(1 for u in usages if u["cache_creation_input_tokens"]) == 1
+    assert sum(1 for u in usages if u["cache_read_input_tokens"]) == 9
+    assert app.state.peak_in_flight == 9
+    tokens = client.stats()["tokens"]
+    # 缓存读取的 token 远多于未缓存的输入
+    assert tokens["cache_read_input_tokens"] > 3 * tokens["input_tokens"]
+    print("✓ 专家文章读取缓存前缀")
+
+
+def test_short_prefix_is_not_cached():
+    """前缀低于缓存下限：不会写入或读取缓存，也不先单独预热，十篇直接并发"""
+    results, app, client = run_expert_takes(MATCH_DATA)
+    tokens = client.stats()["tokens"]
+    assert tokens["cache_creation_input_tokens"] == 0 and tokens["cache_read_input_tokens"] == 0
+    assert app.state.peak_in_flight == 10
+    print("✓ 短前缀不缓存")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("提示词缓存测试")
+    print("=" * 50)
+    test_prompt_prefix_is_shared()
+    test_cache_minimum_per_model()
+    test_expert_takes_read_the_cached_prefix()
+    test_short_prefix_is_not_cached()
+    print("\n✅ 全部通过")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""测试 API-Sports 配额感知限流"""
+
+import os
+import sys
+import asyncio
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.rate_limiter import (
+    QuotaAwareRateLimiter, QuotaExhaustedError, PRIORITY_CRITICAL, PRIORITY_LOW
+)
+from services.request_coalescer import RequestCoalescer
+from services.football_api_client import FootballAPIClient
+
+
+def make_stub_transport(calls, daily_remaining):
+    """模拟 API-Sports：返回空结果和限流响应头"""
+
+    def handler(request):
+        calls.append(request.url.path)
+        remaining = daily_remaining.pop(0) if daily_remaining else 0
+        return httpx.Response(
+            200,
+            json={"errors": [], "response": []},
+            headers={
+                "x-ratelimit-requests-limit": "100",
+                "x-ratelimit-requests-remaining": str(remaining),
+                "X-RateLimit-Limit": "300",
+                "X-RateLimit-Remaining": "299",
+            }
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_priority_order_when_throttled():
+    """令牌不足时高优先级请求先放行"""
+    limiter = QuotaAwareRateLimiter(per_minute=600)
+    limiter.tokens = 0.0
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def main():
+        low = asyncio.create_task(request("standings", PRIORITY_LOW))
+        await asyncio.sleep(0)
+        critical = asyncio.create_task(request("odds", PRIORITY_CRITICAL))
+        await asyncio.sleep(0)
+        assert limiter.metrics()["queue_depth"] == 2
+        await asyncio.gather(low, critical)
+
+    asyncio.run(main())
+    assert order == ["odds", "standings"]
+    assert limiter.metrics()["queue_depth"] == 0
+    print("✓ 优先级调度")
+
+
+def test_calibration_and_daily_quota_from_headers():
+    """根据响应头校准限额，每日配额用尽后不再请求上游"""
+    calls = []
+
+    async def main():
+        async with httpx.AsyncClient(transport=make_stub_transport(calls, [1, 0])) as http_client:
+            client = FootballAPIClient(
+                api_key="test",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=10),
+                async_http_client=http_client
+            )
+            assert await client.get_team_injuries_async(1) == []
+            metrics = client.rate_limiter.metrics()
+            assert metrics["per_minute_limit"] == 300
+            assert metrics["daily_limit"] == 100
+            assert metrics["daily_remaining"] == 1
+
+            assert await client._make_request_async("/injuries", {"team": 2}) == []
+            assert client.rate_limiter.metrics()["daily_remaining"] == 0
+
+            # 配额用尽：直接返回 None，不发请求
+            assert await client._make_request_async("/injuries", {"team": 3}) is None
+            return client.rate_limiter
+
+    limiter = asyncio.run(main())
+    assert len(calls) == 2
+    assert limiter.metrics()["rejected"] == 1
+
+    try:
+        limiter.acquire_sync()
+        assert False, "expected QuotaExhaustedError"
+    except QuotaExhaustedError:
+        pass
+    print("✓ 响应头校准与每日配额")
+
+
+def test_rate_limited_response_drains_tokens():
+    """收到 429 后本地令牌清零"""
+    limiter = QuotaAwareRateLimiter(per_minute=60)
+    limiter.on_rate_limited()
+    metrics = limiter.metrics()
+    assert metrics["tokens_available"] < 1
+    assert metrics["rate_limited_responses"] == 1
+    print("✓ 429 处理")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("API-Sports 限流测试")
+    print("=" * 50)
+    test_priority_order_when_throttled()
+    test_calibration_and_daily_quota_from_headers()
+    test_rate_limited_response_drains_tokens()
+    print("\n✅ 全部通过")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""测试进行中请求合并（single-flight）"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.fake_api_sports import create_fake_api_sports_app, LatencyProfile
+from services.football_api_client import FootballAPIClient
+from services.request_coalescer import RequestCoalescer, request_scope
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndexCache
+
+
+def test_sync_calls_share_one_request():
+    """多个线程同时请求同一个键时 fn 只执行一次"""
+    coalescer = RequestCoalescer()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"response": [1]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(coalescer.do("k", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and results == [{"response": [1]}] * 5
+    assert coalescer.stats() == {"executed": 1, "coalesced": 4, "scope_hits": 0, "in_flight": 0}
+    print("✓ 同步请求合并")
+
+
+def test_async_leader_and_followers():
+    """发起方和跟随方共享结果和异常；完成后同一个键重新请求"""
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"response": len(calls)}
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream")
+
+    async def main():
+        shared = await asyncio.gather(*(coalescer.do_async("k", fetch) for _ in range(4)))
+        again = await coalescer.do_async("k", fetch)
+        errors = await asyncio.gather(*(coalescer.do_async("bad", fail) for _ in range(3)), return_exceptions=True)
+        return shared, again, errors
+
+    shared, again, errors = asyncio.run(main())
+    assert shared == [{"response": 1}] * 4
+    assert again == {"response": 2}
+    assert [type(error) for error in errors] == [ValueError] * 3
+    assert coalescer.stats() == {"executed": 3, "coalesced": 5, "scope_hits": 0, "in_flight": 0}
+    print("✓ 异步请求合并")
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    """发起方超时或被取消时，等待时间更长的跟随方仍然拿到结果"""
+    coalescer = RequestCoalescer()
+
+    async def fetch():
+        await asyncio.sleep(0.3)
+        return "ok"
+
+    async def main():
+        leader = asyncio.wait_for(coalescer.do_async("k", fetch), 0.1)
+        follower = asyncio.wait_for(coalescer.do_async("k", fetch), 5)
+        timed_out = await asyncio.gather(leader, follower, return_exceptions=True)
+
+        cancelled_leader = asyncio.ensure_future(coalescer.do_async("c", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(coalescer.do_async("c", fetch))
+        await asyncio.sleep(0.05)
+        cancelled_leader.cancel()
+        return timed_out, await asyncio.gather(cancelled_leader, follower, return_exceptions=True)
+
+    timed_out, cancelled = asyncio.run(main())
+    assert isinstance(timed_out[0], asyncio.TimeoutError) and timed_out[1] == "ok"
+    assert isinstance(cancelled[0], asyncio.CancelledError) and cancelled[1] == "ok"
+    assert coalescer.stats()["in_flight"] == 0
+    print("✓ 发起方取消不影响跟随方")
+
+
+def test_client_scope_hit_and_coalescing():
+    """客户端：并发的相同请求合并为一次上游请求；聚合范围内重复请求直接命中"""
+    app = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.05), seed=1)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(ttl=0)
+            )
+            params = {"league": 292, "season": 2025}
+            concurrent = await asyncio.gather(
+                *(client._make_request_async("/standings", params) for _ in range(3))
+            )
+            with request_scope():
+                first = await client._make_request_async("/standings", params)
+                second = await client._make_request_async("/standings", params)
+            return client.coalescer.stats(), concurrent, first, second
+
+    stats, concurrent, first, second = asyncio.run(main())
+    assert concurrent[0] is not None and concurrent.count(concurrent[0]) == 3
+    assert first == second == concurrent[0]
+    assert app.state.request_counts["/standings"] == 2
+    assert stats == {"executed": 2, "coalesced": 2, "scope_hits": 1, "in_flight": 0}
+    print("✓ 客户端合并与聚合范围命中")
+
+
+def test_clients_with_different_upstreams_do_not_share():
+    """客户端：共享合并器的两个客户端指向不同上游时，相同的端点和参数不合并"""
+    production = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.05), seed=1)
+    staging = create_fake_api_sports_app(latency=LatencyProfile("fixed", 0.05), seed=2)
+    coalescer = RequestCoalescer()
+
+    def make_client(base_url, http_client):
+        return FootballAPIClient(
+            api_key="fake",
+            base_url=base_url,
+            use_cache=False,
+            coalescer=coalescer,
+            rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+            async_http_client=http_client,
+            standings_indexes=StandingsIndexCache(),
+            fixture_store=FixtureStore(ttl=0)
+        )
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=production)) as production_http, \
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=staging)) as staging_http:
+            clients = [
+                make_client("http://fake-api-sports", production_http),
+                make_client("http://staging-api-sports", staging_http),
+            ]
+            params = {"league": 292, "season": 2025}
+            with request_scope():
+                results = await asyncio.gather(
+                    *(client._make_request_async("/standings", params) for client in clients)
+                )
+                again = await clients[1]._make_request_async("/standings", params)
+            return results, again
+
+    results, again = asyncio.run(main())
+    assert results[0] is not None and results[1] is not None
+    assert again == results[1]
+    assert production.state.request_counts["/standings"] == 1
+    assert staging.state.request_counts["/standings"] == 1
+    assert coalescer.stats() == {"executed": 2, "coalesced": 0, "scope_hits": 1, "in_flight": 0}
+    print("✓ 不同上游不合并")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("请求合并测试")
+    print("=" * 50)
+    test_sync_calls_share_one_request()
+    test_async_leader_and_followers()
+    test_cancelled_leader_does_not_cancel_followers()
+    test_client_scope_hit_and_coalescing()
+    test_clients_with_different_upstreams_do_not_share()
+    print("\n✅ 全部通过")
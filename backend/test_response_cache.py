@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""测试 API-Sports 响应缓存"""
+
+import os
+import sys
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.response_cache import (
+    DEFAULT_CACHE_PATH, PRODUCTION_BASE_URL, ResponseCache, SQLiteLRUStore, MISS,
+    cache_path_for, get_response_cache, make_cache_key
+)
+
+
+class FakeClock:
+    """可控的时钟，用于测试 TTL"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalization():
+    """参数顺序和类型不影响缓存键"""
+    assert make_cache_key("/standings", {"league": 292, "season": 2024}) == \
+        make_cache_key("/standings", {"season": "2024", "league": "292"})
+    print("✓ 缓存键规范化")
+
+
+def test_ttl_policies_and_counters():
+    """按端点 TTL 过期，并统计命中/未命中"""
+    clock = FakeClock()
+    cache = ResponseCache(SQLiteLRUStore(":memory:", time_func=clock))
+
+    cache.set("/odds", {"fixture": 1}, [{"odd": 2.1}])
+    cache.set("/standings", {"league": 292, "season": 2024}, [{"rank": 1}])
+    assert cache.get("/odds", {"fixture": 1}) == [{"odd": 2.1}]
+
+    clock.now += 120
+    assert cache.get("/odds", {"fixture": 1}) is MISS
+    assert cache.get("/standings", {"season": 2024, "league": 292}) == [{"rank": 1}]
+
+    # 已完赛比赛使用更长的 TTL，未配置的端点不缓存
+    assert cache.ttl_for("/fixtures", {"status": "FT"}) > cache.ttl_for("/fixtures", {"date": "2024-08-24"})
+    cache.set("/status", None, {"ok": True})
+    assert cache.get("/status") is MISS
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["endpoints"]["/odds"] == {"hits": 1, "misses": 1}
+    print("✓ TTL 策略与命中统计")
+
+
+def test_lru_eviction_under_size_cap():
+    """超过大小上限时淘汰最久未访问的条目"""
+    clock = FakeClock()
+    payload = os.urandom(600).hex()  # 压缩率很低的数据
+    store = SQLiteLRUStore(":memory:", time_func=clock)
+    store.set("probe", payload, ttl=3600)
+    entry_size = store.total_bytes
+    store.clear()
+    store.max_bytes = int(entry_size * 3.5)  # 最多容纳 3 个条目
+
+    for i in range(3):
+        clock.now += 1
+        store.set(f"k{i}", payload, ttl=3600)
+    clock.now += 1
+    assert store.get("k0") == payload  # k0 变为最近访问
+
+    clock.now += 1
+    store.set("k3", payload, ttl=3600)
+
+    assert store.total_bytes <= store.max_bytes
+    assert store.get("k1") is MISS
+    assert store.get("k0") == payload
+    assert store.get("k3") == payload
+    assert store.evictions == 1
+    print("✓ LRU 淘汰")
+
+
+def test_persistence_across_restarts():
+    """缓存写入磁盘，重新打开后仍然可用"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        ResponseCache(SQLiteLRUStore(path)).set("/fixtures/headtohead", {"h2h": "1-2"}, [{"id": 7}])
+
+        reopened = ResponseCache(SQLiteLRUStore(path))
+        assert reopened.get("/fixtures/headtohead", {"h2h": "1-2"}) == [{"id": 7}]
+        assert reopened.stats()["size_bytes"] > 0
+    print("✓ 持久化")
+
+
+def test_cache_file_per_upstream():
+    """本地模拟服务的响应写入单独的缓存文件，不会被生产上游读到"""
+    assert cache_path_for(PRODUCTION_BASE_URL) == DEFAULT_CACHE_PATH
+    assert cache_path_for("http://127.0.0.1:8099").endswith("api_sports_cache.127.0.0.1_8099.sqlite3")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["FOOTBALL_API_CACHE_PATH"] = os.path.join(tmp, "cache.sqlite3")
+        try:
+            fake = get_response_cache("http://127.0.0.1:8099")
+            production = get_response_cache(PRODUCTION_BASE_URL)
+            fake.set("/standings", {"league": 292}, [{"fake": True}])
+            assert production is not fake and get_response_cache("http://127.0.0.1:8099") is fake
+            assert production.get("/standings", {"league": 292}) is MISS
+            assert {"cache.127.0.0.1_8099.sqlite3", "cache.sqlite3"} <= set(os.listdir(tmp))
+        finally:
+            del os.environ["FOOTBALL_API_CACHE_PATH"]
+    print("✓ 按上游分文件")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("API-Sports 响应缓存测试")
+    print("=" * 50)
+    test_cache_key_normalization()
+    test_ttl_policies_and_counters()
+    test_lru_eviction_under_size_cap()
+    test_persistence_across_restarts()
+    test_cache_file_per_upstream()
+    print("\n✅ 全部通过")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""测试 Poisson / Dixon–Coles 比分模型"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.domain.models import Expert, Match, Prediction, Statistics, Team
+from app.services.score_model_service import ScoreModelService, get_score_model
+from app.services.statistics_service import StatisticsService
+from app.services.article_stream_service import demo_match_inputs
+from agents.enhanced_football_writer import EnhancedFootballWriter
+from services.score_model import MatchResult, ScoreModel, market_probabilities, rates_from_form, score_matrices
+
+TEAMS = [f"球队{k:02d}" for k in range(12)]
+
+
+def simulate_season(seed=0, rounds=4):
+    """按已知强度模拟双循环比赛"""
+    rng = np.random.default_rng(seed)
+    attack = np.exp(rng.normal(0, 0.3, len(TEAMS)))
+    defence = np.exp(rng.normal(0, 0.2, len(TEAMS)))
+    results = []
+    for _ in range(rounds):
+        for h in range(len(TEAMS)):
+            for a in range(len(TEAMS)):
+                if h != a:
+                    results.append(MatchResult(
+                        TEAMS[h], TEAMS[a],
+                        int(rng.poisson(1.1 * 1.3 * attack[h] * defence[a])),
+                        int(rng.poisson(1.1 * attack[a] * defence[h]))
+                    ))
+    return results, attack, defence
+
+
+def test_fit_recovers_strengths():
+    """拟合出的进攻、防守强度和主场优势接近模拟用的真实值"""
+    results, attack, defence = simulate_season()
+    model = ScoreModel.fit(results)
+    order = [model.index[team] for team in TEAMS]
+    assert np.corrcoef(np.log(attack), np.log(model.attack[order]))[0, 1] > 0.85
+    assert np.corrcoef(np.log(defence), np.log(model.defence[order]))[0, 1] > 0.6
+    assert 1.1 < model.home_advantage < 1.5
+    assert model.stats()["matches"] == len(results)
+    # 没有比赛时得到未拟合的模型
+    assert ScoreModel.fit([]).matches == 0
+    print("✓ 拟合球队强度")
+
+
+def test_markets_follow_from_matrix():
+    """各玩法概率与比分矩阵一致；批量结果与逐场结果相同"""
+    matrices = score_matrices([1.6, 0.9], [1.1, 1.4], rho=-0.1)
+    assert np.allclose(matrices.sum(axis=(1, 2)), 1.0)
+    first, second = market_probabilities(matrices)
+    assert abs(sum(first["1x2"].values()) - 1) < 1e-9
+    assert first["1x2"]["home"] > first["1x2"]["away"] and second["1x2"]["away"] > second["1x2"]["home"]
+    overs = [first["over_under"][line]["over"] for line in (0.5, 1.5, 2.5, 3.5)]
+    assert overs == sorted(overs, reverse=True)
+
+    handicap = first["asian_handicap"]
+    assert abs(handicap[-0.5]["win"] - first["1x2"]["home"]) < 1e-12 and handicap[-0.5]["push"] == 0
+    assert abs(handicap[0.0]["push"] - first["1x2"]["draw"]) < 1e-12
+    # 四分之一盘是相邻两个盘口各一半
+    assert abs(handicap[-0.25]["win"] - (handicap[0.0]["win"] + handicap[-0.5]["win"]) / 2) < 1e-12
+
+    model = ScoreModel.fit(simulate_season()[0])
+    fixtures = [(TEAMS[k], TEAMS[-k - 1]) for k in range(6)]
+    batch = model.predict_many(fixtures)
+    single = model.predict(*fixtures[3])
+    assert np.allclose(batch[3].matrix, single.matrix)
+    assert np.allclose(list(batch[3].markets["1x2"].values()), list(single.markets["1x2"].values()))
+
+    prediction = batch[0]
+    assert prediction.probability("home_win") == prediction.markets["1x2"]["home"]
+    assert prediction.probability("over_2.5") == prediction.markets["over_under"][2.5]["over"]
+    assert abs(prediction.probability("away_+0.5") - (1 - prediction.markets["1x2"]["home"])) < 1e-12
+    assert prediction.probability("yes") == prediction.markets["btts"]["yes"]
+    assert prediction.probability(prediction.most_likely(1)[0]) == prediction.matrix.max()
+    assert prediction.probability("home_-1") is None and prediction.probability("corners") is None
+    print("✓ 由比分矩阵推出各玩法")
+
+
+def test_writer_uses_score_model():
+    """写作器的预测比分来自比分模型；模型重新拟合后文章指纹变化"""
+    match_info, odds_info, historical = demo_match_inputs()
+    home, away = match_info.home_team, match_info.away_team
+    writer = EnhancedFootballWriter(cache=None)
+    form = {team.name: rates_from_form(team.recent_form, team.goals_scored, team.goals_conceded) for team in (home, away)}
+    expected = ScoreModel().predict(home.name, away.name, form).most_likely(2)
+    assert writer.generate_prediction(match_info, odds_info, historical)["predicted_score"] == " 或 ".join(expected)
+
+    fitted = ScoreModel.fit([MatchResult(home.name, away.name, 3, 0)] * 5 + [MatchResult(away.name, home.name, 0, 2)] * 5)
+    strong = EnhancedFootballWriter(cache=None, score_model=fitted)
+    score = strong.generate_prediction(match_info, odds_info, historical)["predicted_score"].split(" 或 ")[0]
+    home_goals, away_goals = (int(goals) for goals in score.split("-"))
+    assert home_goals > away_goals
+    inputs = (match_info, odds_info, historical, 80, None)
+    assert writer._input_fingerprints(*inputs)["model"] != strong._input_fingerprints(*inputs)["model"]
+    print("✓ 写作器使用比分模型")
+
+
+def test_service_fits_from_database_and_prices_value_bets():
+    """从数据库比赛和 xG 拟合；整轮比赛一次定价；价值投注按模型概率计算"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    teams = {name: Team(id=str(uuid.uuid4()), name=name) for name in TEAMS}
+    db.add_all(teams.values())
+    kickoff = datetime(2025, 3, 1, 15)
+    results, _, _ = simulate_season(rounds=2)
+    for k, result in enumerate(results):
+        match = Match(
+            id=str(uuid.uuid4()), home_team_id=teams[result.home].id, away_team_id=teams[result.away].id,
+            league="K League 1", match_date=kickoff - timedelta(days=k % 60), status="finished",
+            home_score=result.home_goals, away_score=result.away_goals
+        )
+        db.add(match)
+        if k % 3 == 0:
+            db.add(Statistics(id=str(uuid.uuid4()), match_id=match.id, team_id=match.home_team_id,
+                              is_home=True, expected_goals=result.home_goals + 0.3))
+    upcoming = [
+        Match(id=str(uuid.uuid4()), home_team_id=teams[TEAMS[k]].id, away_team_id=teams[TEAMS[k + 6]].id,
+              league="K League 1", match_date=kickoff + timedelta(days=7, hours=k), status="scheduled")
+        for k in range(6)
+    ]
+    db.add_all(upcoming)
+    db.commit()
+
+    service = ScoreModelService(db)
+    loaded = service.load_results(now=kickoff)
+    assert len(loaded) == len(results)
+    assert sum(result.home_xg is not None for result in loaded) == len(range(0, len(results), 3))
+    assert max(result.weight for result in loaded) == 1.0 and min(result.weight for result in loaded) < 1.0
+
+    model = get_score_model(db)
+    assert model.matches == len(results) and get_score_model(db) is model
+
+    fixtures = service.predict_matchday(kickoff + timedelta(days=7), "K League 1", model)
+    assert [f["match_id"] for f in fixtures] == [match.id for match in upcoming]
+    assert abs(sum(fixtures[0]["1x2"].values()) - 1) < 1e-3 and "2.5" in fixtures[0]["over_under"]
+
+    expert = Expert(id=str(uuid.uuid4()), name="数据专家")
+    db.add(expert)
+    probability = model.predict(TEAMS[0], TEAMS[6]).markets["1x2"]["home"]
+    fair_odds = 1 / probability
+    for odds in (fair_odds * 1.2, fair_odds * 0.9):
+        db.add(Prediction(
+            id=str(uuid.uuid4()), match_id=upcoming[0].id, expert_id=expert.id, prediction_type="match_result",
+            predicted_outcome="home_win", confidence=95, odds=round(odds, 2)
+        ))
+    db.commit()
+    value_bets = StatisticsService(db, score_model=model)._get_value_bets(db.query(Prediction).all())
+    assert len(value_bets) == 1
+    assert value_bets[0]["model_probability"] == round(probability, 4)
+    assert value_bets[0]["expected_value"] == round(probability * round(fair_odds * 1.2, 2), 2)
+
+    # 新的完赛结果使共享模型重新拟合
+    upcoming[0].status, upcoming[0].home_score, upcoming[0].away_score = "finished", 4, 0
+    db.commit()
+    refitted = get_score_model(db)
+    assert refitted is not model and refitted.matches == len(results) + 1
+    db.close()
+    print("✓ 数据库拟合与批量定价")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("比分模型测试")
+    print("=" * 50)
+    test_fit_recovers_strengths()
+    test_markets_follow_from_matrix()
+    test_writer_uses_score_model()
+    test_service_fits_from_database_and_prices_value_bets()
+    print("\n✅ 全部通过")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""测试赛季蒙特卡洛模拟和积分榜预测"""
+
+import os
+import sys
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Base
+from app.domain.models import Match, Team
+from app.services import season_projection_service
+from app.services.season_projection_service import SeasonProjectionService, get_season_projections, simulation_size
+from app.api.v1.endpoints.statistics import get_league_projections
+from services.score_model import ScoreModel
+from services.season_simulator import (
+    MIN_PARALLEL_SIMULATIONS, Fixture, SeasonSimulation, Standing, _fixture_points, simulate_outcomes
+)
+
+TEAMS = [f"球队{k:02d}" for k in range(8)]
+
+
+def round_robin(probabilities=(0.45, 0.27, 0.28)):
+    """剩余的单循环赛程"""
+    return [
+        Fixture(f"{home}-{away}", home, away, *probabilities)
+        for k, home in enumerate(TEAMS) for away in TEAMS[k + 1:]
+    ]
+
+
+def test_outcomes_follow_probabilities():
+    """抽样频率接近给定概率；确定的结果总是出现"""
+    outcomes = simulate_outcomes(np.array([[0.5, 0.3, 0.2], [1.0, 0.0, 0.0], [2, 1, 1]]), 40000, np.random.default_rng(0))
+    assert outcomes.dtype == np.int8 and outcomes.shape == (40000, 3)
+    frequencies = [np.bincount(outcomes[:, k], minlength=3) / 40000 for k in range(3)]
+    assert np.allclose(frequencies[0], [0.5, 0.3, 0.2], atol=0.01)
+    assert frequencies[1][0] == 1.0
+    # 未归一化的概率按行归一化
+    assert np.allclose(frequencies[2], [0.5, 0.25, 0.25], atol=0.01)
+    print("✓ 赛果抽样")
+
+
+def test_projections():
+    """期望积分与解析值一致；名次概率每行、每列和为 1；结果与进程数无关"""
+    standings = {team: Standing(points=2 * k, goal_difference=k - 4, played=7) for k, team in enumerate(TEAMS)}
+    fixtures = round_robin()
+    simulation = SeasonSimulation.run(standings, fixtures, 20000, seed=1)
+    projections = {row["team"]: row for row in simulation.projections(top_n=2, relegation=2)}
+
+    for k, team in enumerate(TEAMS):
+        home_games = sum(fixture.home == team for fixture in fixtures)
+        away_games = sum(fixture.away == team for fixture in fixtures)
+        expected = 2 * k + home_games * (3 * 0.45 + 0.27) + away_games * (3 * 0.28 + 0.27)
+        assert abs(projections[team]["expected_points"] - expected) < 0.1
+        assert projections[team]["remaining"] == len(TEAMS) - 1
+        assert abs(sum(projections[team]["positions"]) - 1) < 1e-3
+    assert abs(sum(row["title"] for row in projections.values()) - 1) < 1e-3
+    assert abs(sum(row["relegation"] for row in projections.values()) - 2) < 1e-3
+    assert projections[TEAMS[-1]]["title"] > projections[TEAMS[0]]["title"]
+    assert projections[TEAMS[0]]["relegation"] > projections[TEAMS[-1]]["relegation"]
+    assert simulation.stats() == {"teams": 8, "simulations": 20000, "remaining_fixtures": 28, "results_applied": 0}
+
+    single = SeasonSimulation.run(standings, fixtures, MIN_PARALLEL_SIMULATIONS, seed=7)
+    parallel = SeasonSimulation.run(standings, fixtures, MIN_PARALLEL_SIMULATIONS, seed=7, workers=2)
+    assert np.array_equal(single.final_points, parallel.final_points)
+    assert single.projections() == parallel.projections()
+    print("✓ 排名概率")
+
+
+def test_ties_break_on_goal_difference_then_lots():
+    """积分相同时净胜球多的排在前面；净胜球也相同时各占一半"""
+    standings = {"甲": Standing(10, 5), "乙": Standing(10, 2), "丙": Standing(10, 2)}
+    projections = {row["team"]: row for row in SeasonSimulation.run(standings, [], 10000, seed=2).projections(1, 1)}
+    assert projections["甲"]["title"] == 1.0
+    assert abs(projections["乙"]["relegation"] - 0.5) < 0.03
+    assert abs(projections["乙"]["relegation"] + projections["丙"]["relegation"] - 1) < 1e-9
+    print("✓ 同分排名")
+
+
+def test_apply_result_conditions_existing_simulations():
+    """比赛结束后只替换该场赛果，结果与按新积分模拟其余比赛一致"""
+    fixtures = round_robin()
+    simulation = SeasonSimulation.run({team: Standing() for team in TEAMS}, fixtures, 20000, seed=3)
+    finished = fixtures[0]
+    assert simulation.apply_result(finished.fixture_id, 0, 2)
+    assert not simulation.apply_result(finished.fixture_id, 0, 2)
+    assert not simulation.apply_result("unknown", 1, 0)
+
+    home, away = simulation.index[finished.home], simulation.index[finished.away]
+    assert (simulation.points[home], simulation.points[away]) == (0, 3)
+    assert (simulation.goal_difference[home], simulation.goal_difference[away]) == (-2, 2)
+    assert list(simulation.played[[home, away]]) == [1, 1]
+
+    rest = [k for k, fixture in enumerate(fixtures) if fixture.fixture_id in simulation.pending]
+    index = simulation.index
+    expected = simulation.points + _fixture_points(
+        simulation.outcomes[:, rest],
+        np.array([index[fixtures[k].home] for k in rest]),
+        np.array([index[fixtures[k].away] for k in rest]),
+        len(TEAMS)
+    )
+    assert np.array_equal(simulation.final_points, expected)
+    rows = {row["team"]: row for row in simulation.projections()}
+    assert rows[finished.away]["points"] == 3 and rows[finished.away]["remaining"] == len(TEAMS) - 2
+    assert simulation.stats()["results_applied"] == 1
+    print("✓ 增量更新")
+
+
+def test_service_updates_cached_simulation():
+    """从数据库计算积分；比赛结束时增量更新缓存，赛程变化时重新模拟"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    teams = {name: Team(id=str(uuid.uuid4()), name=name) for name in TEAMS[:4]}
+    db.add_all(teams.values())
+    kickoff = datetime(2025, 3, 1, 15)
+    matches = []
+    for k, (home, away) in enumerate((home, away) for home in teams for away in teams if home != away):
+        matches.append(Match(
+            id=str(uuid.uuid4()), home_team_id=teams[home].id, away_team_id=teams[away].id,
+            league="K League 1", season="2025", match_date=kickoff + timedelta(days=7 * k), status="scheduled"
+        ))
+    db.add_all(matches)
+    matches[0].status, matches[0].home_score, matches[0].away_score = "finished", 3, 1
+    matches[1].status, matches[1].home_score, matches[1].away_score = "finished", 1, 1
+    db.commit()
+
+    standings = SeasonProjectionService(db).standings(matches)
+    assert standings[TEAMS[0]] == Standing(points=4, goal_difference=2, played=2)
+    assert standings[TEAMS[1]] == Standing(points=0, goal_difference=-2, played=1)
+
+    assert get_season_projections(db, "Unknown League") is None
+    first = get_season_projections(db, "K League 1", "2025", simulations=5000)
+    # 请求的模拟次数向上取整到缓存规格
+    assert first["remaining_fixtures"] == len(matches) - 2 and first["simulations"] == simulation_size(5000) == 10000
+    assert abs(sum(row["title"] for row in first["teams"]) - 1) < 1e-3
+
+    matches[2].status, matches[2].home_score, matches[2].away_score = "finished", 0, 2
+    db.commit()
+    second = get_season_projections(db, "K League 1", "2025", simulations=5000)
+    assert second["simulated_at"] == first["simulated_at"] and second["results_applied"] == 1
+    assert second["remaining_fixtures"] == first["remaining_fixtures"] - 1
+    assert get_season_projections(db, "K League 1", "2025", simulations=5000)["results_applied"] == 1
+
+    # 比分更正后重新模拟
+    matches[2].away_score = 3
+    db.commit()
+    assert get_season_projections(db, "K League 1", "2025", simulations=5000)["results_applied"] == 0
+    assert get_season_projections(db, "K League 1", "2025", simulations=5000, refresh=True)["results_applied"] == 0
+
+    # 新增比赛后重新模拟
+    db.add(Match(
+        id=str(uuid.uuid4()), home_team_id=teams[TEAMS[0]].id, away_team_id=teams[TEAMS[1]].id,
+        league="K League 1", season="2025", match_date=kickoff + timedelta(days=120), status="scheduled"
+    ))
+    db.commit()
+    third = get_season_projections(db, "K League 1", "2025", simulations=5000)
+    assert third["remaining_fixtures"] == len(matches) - 2 and third["simulated_at"] != first["simulated_at"]
+
+    # 缓存条数有上限，最久未使用的先淘汰
+    limit = season_projection_service.SEASON_PROJECTION_MAX_ENTRIES
+    season_projection_service.SEASON_PROJECTION_MAX_ENTRIES = 1
+    try:
+        assert get_season_projections(db, "K League 1", "2025", simulations=100000)["simulations"] == 100000
+        assert list(season_projection_service._simulations) == [("K League 1", "2025", 100000)]
+        assert set(season_projection_service._key_locks) == {("K League 1", "2025", 100000)}
+    finally:
+        season_projection_service.SEASON_PROJECTION_MAX_ENTRIES = limit
+    # 同步路由：整季模拟在线程池中运行，不阻塞事件循环
+    assert not asyncio.iscoroutinefunction(get_league_projections)
+
+    # 模拟使用注入的比分模型
+    strong = ScoreModel(TEAMS[:4], attack=[3.0, 1.0, 1.0, 1.0], defence=[0.3, 1.0, 1.0, 1.0])
+    simulation = SeasonProjectionService(db, score_model=strong).simulate("K League 1", "2025", 5000, seed=4)
+    assert simulation.projections()[0]["team"] == TEAMS[0]
+    db.close()
+    print("✓ 数据库与缓存")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("赛季模拟测试")
+    print("=" * 50)
+    test_outcomes_follow_probabilities()
+    test_projections()
+    test_ties_break_on_goal_difference_then_lots()
+    test_apply_result_conditions_existing_simulations()
+    test_service_updates_cached_simulation()
+    print("\n✅ 全部通过")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""测试积分榜索引：多分组积分榜、缺少的球队、按联赛赛季缓存"""
+
+import os
+import sys
+import asyncio
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.fake_api_sports import create_fake_api_sports_app
+from services.football_api_client import FootballAPIClient
+from services.request_coalescer import RequestCoalescer
+from services.rate_limiter import QuotaAwareRateLimiter
+from services.fixture_store import FixtureStore
+from services.standings_index import StandingsIndex, StandingsIndexCache
+from services.response_cache import ResponseCache, SQLiteLRUStore
+
+
+def row(team_id, name, rank, group, home=(0, 0, 0), away=(0, 0, 0), goals=(0, 0)):
+    """API-Sports /standings 的一行"""
+    return {
+        "rank": rank,
+        "team": {"id": team_id, "name": name},
+        "form": "WDL",
+        "group": group,
+        "all": {"goals": {"for": goals[0], "against": goals[1]}},
+        "home": {"win": home[0], "draw": home[1], "lose": home[2]},
+        "away": {"win": away[0], "draw": away[1], "lose": away[2]},
+    }
+
+
+def split_standings():
+    """分组赛制（如 K 联赛分上下半区）：每个分组一张表，同一球队可能在总表和分组表中各出现一次"""
+    return [{
+        "league": {
+            "id": 292,
+            "season": 2025,
+            "standings": [
+                [
+                    row(2762, "Ulsan Hyundai FC", 1, "Championship Round", (5, 1, 0), (3, 2, 1), (30, 12)),
+                    row(2767, "FC Seoul", 2, "Championship Round", (4, 2, 0), (2, 2, 2), (25, 18)),
+                ],
+                [
+                    row(2746, "Incheon United", 1, "Relegation Round", (2, 1, 3), (1, 1, 4), (15, 24)),
+                    row(2750, "Daegu FC", 2, "Relegation Round", (1, 2, 3), (1, 0, 5), (12, 28)),
+                ],
+                [
+                    row(2762, "Ulsan Hyundai FC", 1, "Regular Season"),
+                ],
+            ],
+        }
+    }]
+
+
+def test_multi_group_lookup():
+    """各分组的球队都能按 ID 查到，重复出现的球队保留第一次出现的分组"""
+    index = StandingsIndex(split_standings())
+    assert len(index) == 4
+
+    seoul = index.get(2767)
+    assert (seoul.team_name, seoul.rank, seoul.group) == ("FC Seoul", 2, "Championship Round")
+    assert seoul.home == {"wins": 4, "draws": 2, "losses": 0}
+    assert seoul.away == {"wins": 2, "draws": 2, "losses": 2}
+    assert (seoul.goals_for, seoul.goals_against) == (25, 18)
+
+    daegu = index.get(2750)
+    assert (daegu.rank, daegu.group) == (2, "Relegation Round")
+    assert index.get(2762).group == "Championship Round"
+    assert [entry.team_id for entry in index.entries()] == [2762, 2767, 2746, 2750]
+    print("✓ 多分组积分榜查找")
+
+
+def test_missing_teams():
+    """不在积分榜中的球队返回 None；空响应或缺少 league 的响应得到空索引"""
+    index = StandingsIndex(split_standings())
+    assert index.get(9999) is None and 9999 not in index and 2746 in index
+
+    for standings in ([], [{}], [{"league": {}}]):
+        empty = StandingsIndex(standings)
+        assert len(empty) == 0 and empty.get(2767) is None and empty.entries() == []
+    print("✓ 缺少的球队")
+
+
+def test_cache_expiry_and_invalidation():
+    """按 (联赛, 赛季) 缓存，过期或失效后重新解析"""
+    now = [1000.0]
+    cache = StandingsIndexCache(ttl=60, time_func=lambda: now[0])
+    index = cache.put("292", "2025", split_standings())
+    assert cache.get(292, 2025) is index
+    assert cache.get(292, 2024) is None and cache.get(98, 2025) is None
+
+    now[0] += 60
+    assert cache.get(292, 2025) is None
+
+    cache.put(292, 2025, split_standings())
+    cache.invalidate(292, 2025)
+    assert cache.get(292, 2025) is None
+
+    # 来源响应更早过期时，索引随响应一起过期
+    cache.put(292, 2025, split_standings(), expires_at=now[0] + 10)
+    now[0] += 10
+    assert cache.get(292, 2025) is None
+    cache.put(292, 2025, split_standings(), expires_at=now[0] + 600)
+    now[0] += 60
+    assert cache.get(292, 2025) is None
+    print("✓ 索引缓存过期与失效")
+
+
+def test_client_parses_standings_once():
+    """客户端：同一联赛赛季只请求一次积分榜，之后直接按球队查找"""
+    app = create_fake_api_sports_app(seed=1)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                use_cache=False,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=StandingsIndexCache(),
+                fixture_store=FixtureStore(ttl=0)
+            )
+            first = await client.get_standings_index_async(292, 2025)
+            second = await client.get_standings_index_async(292, 2025)
+            return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second and len(first) > 0
+    team = first.entries()[0]
+    assert first.get(team.team_id) == team and first.get(-1) is None
+    assert app.state.request_counts["/standings"] == 1
+    print("✓ 客户端积分榜只解析一次")
+
+
+def test_index_expires_with_cached_response():
+    """客户端：积分榜来自响应缓存时，索引在缓存中的响应过期时过期，两层 TTL 不叠加"""
+    app = create_fake_api_sports_app(seed=1)
+    now = [1000.0]
+    cache = ResponseCache(SQLiteLRUStore(":memory:", time_func=lambda: now[0]))
+    indexes = StandingsIndexCache(time_func=lambda: now[0])
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+            client = FootballAPIClient(
+                api_key="fake",
+                base_url="http://fake-api-sports",
+                cache=cache,
+                coalescer=RequestCoalescer(),
+                rate_limiter=QuotaAwareRateLimiter(per_minute=1000),
+                async_http_client=http_client,
+                standings_indexes=indexes,
+                fixture_store=FixtureStore(ttl=0)
+            )
+            await client.get_standings_index_async(292, 2025)
+            indexes.invalidate(292, 2025)
+            # 响应在缓存中已存放 5 小时，再由它建立索引
+            now[0] += 5 * 3600
+            index = await client.get_standings_index_async(292, 2025)
+            cached_counts = app.state.request_counts["/standings"]
+            now[0] += 3600
+            expired = indexes.get(292, 2025)
+            refreshed = await client.get_standings_index_async(292, 2025)
+            return index, cached_counts, expired, refreshed
+
+    index, cached_counts, expired, refreshed = asyncio.run(main())
+    assert len(index) > 0 and cached_counts == 1
+    assert expired is None
+    assert len(refreshed) > 0 and app.state.request_counts["/standings"] == 2
+    print("✓ 索引随缓存响应过期")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("积分榜索引测试")
+    print("=" * 50)
+    test_multi_group_lookup()
+    test_missing_teams()
+    test_cache_expiry_and_invalidation()
+    test_client_parses_standings_once()
+    test_index_expires_with_cached_response()
+    print("\n✅ 全部通过")